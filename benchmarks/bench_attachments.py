@@ -0,0 +1,68 @@
+# benchmarks/bench_attachments.py
+"""
+Benchmark: a report with twenty 12-megapixel correspondence photos.
+Compares embedding the originals with the attachment pipeline, cold (decoding
+in a process pool) and warm (renditions cached), by time and report size.
+"""
+import os
+import tempfile
+import time
+
+from common import time_per_call
+
+from src.data.form_snapshot import FormSnapshot
+from src.document.attachments import PATH_SEPARATOR, AttachmentPipeline, pillow_available
+from src.document.report_generator import ReportGenerator
+
+PHOTOS = 20
+PHOTO_SIZE = (4000, 3000)
+
+
+def write_photos(directory):
+    from PIL import Image
+
+    noise = Image.merge('RGB', [Image.effect_noise(PHOTO_SIZE, sigma) for sigma in (40, 60, 80)])
+    paths = []
+    for i in range(PHOTOS):
+        path = os.path.join(directory, f'photo_{i}.jpg')
+        # Shift the content so every photo hashes differently
+        noise.rotate(i * 2).save(path, quality=90)
+        paths.append(path)
+    return paths
+
+
+def render(generator, snapshot):
+    start = time.perf_counter()
+    report = generator.render_bytes(snapshot)
+    return time.perf_counter() - start, len(report) / (1024 * 1024)
+
+
+def main():
+    if not pillow_available():
+        print("Pillow is not installed; nothing to compare")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = write_photos(tmp_dir)
+        originals_mb = sum(os.path.getsize(path) for path in paths) / (1024 * 1024)
+        print(f"{PHOTOS} photos, {PHOTO_SIZE[0]}x{PHOTO_SIZE[1]}, {originals_mb:.1f} MB")
+
+        # The field as the report would see it without the pipeline: the original files
+        originals = FormSnapshot({'report_images': PATH_SEPARATOR.join(paths), 'report_image_digests': ''})
+        seconds, size_mb = render(ReportGenerator(), originals)
+        print(f"embed originals:      {seconds:6.2f} s  report {size_mb:6.1f} MB")
+
+        snapshot = FormSnapshot({'correspondence_image': PATH_SEPARATOR.join(paths)})
+        pipeline = AttachmentPipeline(os.path.join(tmp_dir, 'cache'))
+        try:
+            seconds, size_mb = render(ReportGenerator(attachments=pipeline), snapshot)
+            print(f"pipeline, cold:       {seconds:6.2f} s  report {size_mb:6.1f} MB")
+            seconds, size_mb = render(ReportGenerator(attachments=pipeline), snapshot)
+            print(f"pipeline, cached:     {seconds:6.2f} s  report {size_mb:6.1f} MB")
+            print(f"thumbnails, cached:   {time_per_call(lambda: pipeline.prepare(paths), 5) * 1000:6.1f} ms")
+        finally:
+            pipeline.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_blob_store.py
+"""
+Benchmark: the content-addressed attachment store.
+Hashes a large video in chunks and through mmap, adds a photo that is new,
+already stored, and stored under another name, and collects garbage by
+walking the claim index versus loading every claim record.
+"""
+import hashlib
+import os
+import tempfile
+import time
+
+from common import time_per_call
+
+from src.data import blob_store
+from src.data.blob_store import BlobStore, hash_file, make_reference
+from src.data.storage import SQLiteStorageBackend, StorageBackend
+
+VIDEO_SIZE = 512 * 1024 * 1024
+PHOTO_SIZE = 8 * 1024 * 1024
+CLAIMS = 5_000
+
+
+def write_random(path, size):
+    with open(path, 'wb') as f:
+        for _ in range(size // (1024 * 1024)):
+            f.write(os.urandom(1024 * 1024))
+    return path
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"  {label:32} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        video = write_random(os.path.join(tmp_dir, 'call.mp4'), VIDEO_SIZE)
+        print(f"Hashing a {VIDEO_SIZE // (1024 * 1024)} MB video (file in page cache):")
+        hash_file(video)
+        threshold = blob_store.MMAP_THRESHOLD
+        blob_store.MMAP_THRESHOLD = VIDEO_SIZE + 1
+        timed("chunked reads", lambda: hash_file(video))
+        blob_store.MMAP_THRESHOLD = threshold
+        timed("mmap", lambda: hash_file(video))
+
+        store = BlobStore(os.path.join(tmp_dir, 'attachments'))
+        photo = write_random(os.path.join(tmp_dir, 'photo.jpg'), PHOTO_SIZE)
+        print(f"Adding an {PHOTO_SIZE // (1024 * 1024)} MB photo:")
+        timed("new blob (one pass)", lambda: store.put(photo))
+        print(f"  {'same file again (stat only)':32} {time_per_call(lambda: store.put(photo), 20):8.3f}s")
+        copy = os.path.join(tmp_dir, 'copy.jpg')
+        with open(photo, 'rb') as src, open(copy, 'wb') as dst:
+            dst.write(src.read())
+        timed("same contents, other file", lambda: store.put(copy))
+
+        print(f"Referenced blobs of {CLAIMS} claims:")
+        backend = SQLiteStorageBackend(os.path.join(tmp_dir, 'claims.sqlite3'))
+        try:
+            with backend.batch():
+                for i in range(CLAIMS):
+                    digest = hashlib.sha256(str(i % 1000).encode()).hexdigest()
+                    backend.save_by_claim_number(str(i), {
+                        'full_name': 'ניצן אברג\'יל',
+                        'circumstances': 'נסיבות האירוע ' * 40,
+                        'correspondence_image': make_reference(digest, f'{i}.jpg'),
+                    })
+            from_index = timed("walking the claim index", backend.referenced_blobs)
+            scanned = timed("loading every record", lambda: StorageBackend.referenced_blobs(backend))
+            assert from_index == scanned
+        finally:
+            backend.close()
+
+
+if __name__ == '__main__':
+    main()
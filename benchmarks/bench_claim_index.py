@@ -0,0 +1,52 @@
+# benchmarks/bench_claim_index.py
+"""
+Benchmark: claim listing and filtering through the SQLite claim index with 100k claims.
+"""
+import os
+import random
+import tempfile
+import time
+
+from common import time_per_call
+
+from src.data.claim_index import ClaimIndex
+from src.data.constants import Constants
+
+CLAIMS = 100_000
+NAMES = ['ניצן', 'יובל', 'משה', 'דנה', 'רונית', 'אבי', 'שירה', 'יוסי']
+SURNAMES = ['כהן', 'לוי', 'אברג\'יל', 'מזרחי', 'פרץ', 'ביטון']
+
+
+def make_entries(count):
+    rng = random.Random(1)
+    for i in range(count):
+        data = {
+            'event_type': rng.choice(Constants.EVENT_TYPES),
+            'full_name': f"{rng.choice(NAMES)} {rng.choice(SURNAMES)}",
+            'event_date': f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(2015, 2025)}",
+        }
+        yield str(100000 + i), data, 1_600_000_000 + rng.random() * 100_000_000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index = ClaimIndex(os.path.join(tmp_dir, 'claim_index.sqlite3'))
+
+        start = time.perf_counter()
+        index.update_many(make_entries(CLAIMS))
+        print(f"indexing {CLAIMS} claims: {time.perf_counter() - start:.2f}s")
+
+        queries = {
+            'recent(10)': lambda: index.recent(10),
+            'recent by event type': lambda: index.recent(10, event_type='נזקי מים'),
+            'name contains': lambda: index.recent(10, name_contains='אברג'),
+            'event date range': lambda: index.recent(10, date_from='01/01/2024', date_to='31/03/2024'),
+            'all claim numbers': index.all_claim_numbers,
+        }
+        for label, query in queries.items():
+            print(f"{label:22} {time_per_call(query, 20) * 1000:8.2f} ms")
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
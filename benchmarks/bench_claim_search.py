@@ -0,0 +1,67 @@
+# benchmarks/bench_claim_search.py
+"""
+Benchmark: full-text claim search through the claim index with 100k claims.
+"""
+import os
+import random
+import tempfile
+import time
+
+from common import time_per_call
+
+from src.data.claim_index import ClaimIndex
+from src.data.constants import Constants
+
+CLAIMS = 100_000
+NAMES = ['ניצן', 'יובל', 'משה', 'דנה', 'רונית', 'אבי', 'שירה', 'יוסי']
+SURNAMES = ['כהן', 'לוי', 'אברג\'יל', 'מזרחי', 'פרץ', 'ביטון']
+WORDS = (
+    'המבוטח טען כי הרכב חנה ליד ביתו ובבוקר גילה שהוא נגנב מהחניון '
+    'לדבריו לא ראה דבר חשוד והשכנים לא שמעו רעש התאונה ארעה בצומת '
+    'בשעות הערב בזמן גשם כבד הנזק נגרם לדלת הנהג ולפגוש הקדמי '
+    'נמצאה דליפה בצנרת המים שגרמה להצפה בדירה ולנזק לרהיטים'
+).split()
+
+
+def make_entries(count):
+    rng = random.Random(1)
+    for i in range(count):
+        data = {
+            'event_type': rng.choice(Constants.EVENT_TYPES),
+            'full_name': f"{rng.choice(NAMES)} {rng.choice(SURNAMES)}",
+            'claim_number': str(100000 + i),
+            'circumstances': ' '.join(rng.choices(WORDS, k=60)),
+            'investigation': ' '.join(rng.choices(WORDS, k=120)),
+            'summary': ' '.join(rng.choices(WORDS, k=40)),
+        }
+        yield str(100000 + i), data, 1_600_000_000 + rng.random() * 100_000_000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index = ClaimIndex(os.path.join(tmp_dir, 'claim_index.sqlite3'))
+
+        start = time.perf_counter()
+        index.update_many(make_entries(CLAIMS))
+        print(f"indexing {CLAIMS} claims: {time.perf_counter() - start:.2f}s")
+
+        queries = {
+            'name prefix': 'אברג',
+            'full name': 'משה כהן',
+            'phrase words': 'דליפה צנרת',
+            'attached prefix': 'חניון נגנב',
+            'claim number': '150123',
+            'no match': 'שריפה',
+        }
+        for label, query in queries.items():
+            per_call = time_per_call(lambda: index.search(query, 20), 20)
+            print(f"{label:16} {per_call * 1000:8.2f} ms")
+
+        start = time.perf_counter()
+        index.update('100500', {'full_name': 'שם חדש', 'summary': 'עדכון'}, time.time())
+        print(f"single update    {(time.perf_counter() - start) * 1000:8.2f} ms")
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
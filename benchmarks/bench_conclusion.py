@@ -0,0 +1,67 @@
+# benchmarks/bench_conclusion.py
+"""
+Benchmark: drafting conclusions for a batch of claims against a local fake
+endpoint with model-like latency - one request at a time, with bounded
+concurrency, and again from the cache.
+"""
+import asyncio
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from common import time_per_call
+
+from src.document.conclusion import ConclusionCache, ConclusionClient, GeminiBackend
+
+CLAIMS = 24
+LATENCY = 0.25
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        time.sleep(LATENCY)
+        data = json.dumps({'candidates': [{'content': {'parts': [{'text': 'לסיכום'}]}}]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    backend = GeminiBackend(
+        api_key='bench', endpoint=f'http://127.0.0.1:{server.server_address[1]}/{{model}}'
+    )
+    snapshots = [{'full_name': f'מבוטח {i}', 'circumstances': 'הרכב נגנב מחניון הבית. ' * 50}
+                 for i in range(CLAIMS)]
+
+    def run(max_concurrency, cache_dir):
+        client = ConclusionClient(backend, ConclusionCache(cache_dir), max_concurrency=max_concurrency)
+        asyncio.run(client.draft_many(snapshots))
+
+    try:
+        with tempfile.TemporaryDirectory() as serial_dir, tempfile.TemporaryDirectory() as bounded_dir:
+            serial = time_per_call(lambda: run(1, serial_dir), 1)
+            bounded = time_per_call(lambda: run(4, bounded_dir), 1)
+            cached = time_per_call(lambda: run(4, bounded_dir), 1)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(f"{CLAIMS} claims, {LATENCY * 1000:.0f} ms per request")
+    print(f"one at a time:      {serial:6.2f} s")
+    print(f"4 in flight:        {bounded:6.2f} s")
+    print(f"from cache:         {cached * 1000:6.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/bench_dirty_tracking.py
+"""
+Benchmark: collecting form values with dirty-field tracking versus reading
+every widget, on forms of several hundred fields. Needs a display for Tk.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+from common import time_per_call
+
+from src.data.form_model import FormModel
+from src.data.widget_handlers import WidgetHandlerFactory
+
+FIELD_COUNTS = (100, 300, 600)
+EDITED_FIELDS = 3
+
+
+def build_form(root, field_count):
+    """Entries, comboboxes and Text widgets in roughly the app's proportions."""
+    model = FormModel()
+    for i in range(field_count):
+        if i % 10 == 0:
+            widget = tk.Text(root, height=3)
+            widget.insert('1.0', f'טקסט ארוך {i}\n' * 5)
+        elif i % 5 == 0:
+            widget = ttk.Combobox(root, values=['א', 'ב', 'ג'])
+            widget.set('ב')
+        else:
+            widget = ttk.Entry(root)
+            widget.insert(0, f'ערך {i}')
+        model[f'field_{i}'] = widget
+    return model
+
+
+def read_every_widget(model):
+    """What DataManager did before: a handler lookup and a read per widget."""
+    values = {}
+    for key, widget in model.items():
+        values[key] = WidgetHandlerFactory.get_handler(widget).get_value(widget)
+    return values
+
+
+def main():
+    root = tk.Tk()
+    root.withdraw()
+    try:
+        for field_count in FIELD_COUNTS:
+            model = build_form(root, field_count)
+            model.current_values()
+            edited = list(model)[:EDITED_FIELDS]
+
+            def edit_then_collect():
+                for name in edited:
+                    model.mark_dirty(name)
+                model.current_values()
+
+            full = time_per_call(lambda: read_every_widget(model), 20)
+            tracked = time_per_call(edit_then_collect, 20)
+            print(f"{field_count:4} fields: every widget {full * 1000:7.2f} ms, "
+                  f"{EDITED_FIELDS} dirty {tracked * 1000:7.2f} ms ({full / tracked:5.1f}x)")
+
+            for child in root.winfo_children():
+                child.destroy()
+    finally:
+        root.destroy()
+
+
+if __name__ == '__main__':
+    main()
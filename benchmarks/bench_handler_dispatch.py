@@ -0,0 +1,50 @@
+# benchmarks/bench_handler_dispatch.py
+"""
+Benchmark: WidgetHandlerFactory.get_handler dispatch per widget type, against
+the isinstance chain it replaced (imports and a new handler on every call).
+Widgets are created without Tk, so this runs without a display.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+from common import time_per_call
+
+from src.data.widget_handlers import WidgetHandlerFactory
+
+CALLS = 200_000
+
+
+class DateEntry(ttk.Entry):
+    """Stands in for tkcalendar.DateEntry, which is matched by class name."""
+
+
+def isinstance_chain_handler(widget):
+    """The factory's previous dispatch, kept as the baseline."""
+    from src.data.widget_handlers.text_widget_handler import TextWidgetHandler
+    from src.data.widget_handlers.entry_widget_handler import EntryWidgetHandler
+    from src.data.widget_handlers.combobox_widget_handler import ComboboxWidgetHandler
+    from src.data.widget_handlers.date_widget_handler import DateWidgetHandler
+
+    if widget.__class__.__name__ == 'DateEntry':
+        return DateWidgetHandler()
+    if isinstance(widget, tk.Text):
+        return TextWidgetHandler()
+    if isinstance(widget, ttk.Combobox):
+        return ComboboxWidgetHandler()
+    if isinstance(widget, (ttk.Entry, tk.Entry)):
+        return EntryWidgetHandler()
+    raise ValueError(f"Unsupported widget type: {type(widget).__name__}")
+
+
+def main():
+    print(f"{'':10} {'isinstance chain':>18} {'registry':>12}")
+    for widget_class in (tk.Text, ttk.Entry, ttk.Combobox, DateEntry):
+        widget = widget_class.__new__(widget_class)
+        baseline = time_per_call(lambda: isinstance_chain_handler(widget), CALLS)
+        registry = time_per_call(lambda: WidgetHandlerFactory.get_handler(widget), CALLS)
+        print(f"{widget_class.__name__:10} {baseline * 1e9:15.0f} ns {registry * 1e9:9.0f} ns"
+              f"  ({baseline / registry:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+# benchmarks/bench_layout.py
+"""
+Benchmark: compiling the report layout versus reusing the cached render plan,
+and rendering every section from the plan.
+"""
+from common import time_per_call
+
+from src.data.form_snapshot import FormSnapshot
+from src.document.layout import RenderPlanCache
+from src.document.report_generator import ReportGenerator
+
+REPEAT = 200
+
+
+def main():
+    snapshot = FormSnapshot({
+        'full_name': 'ישראל ישראלי',
+        'event_type': 'גניבת רכב',
+        'vehicle_company': 'טויוטה',
+        'vehicle_model': 'קורולה',
+        'circumstances': 'המבוטח טען כי הרכב חנה ליד ביתו. ' * 20,
+        'summary': 'לסיכום, לא נמצאו ממצאים חריגים.',
+    })
+
+    def compile_plan():
+        RenderPlanCache().get(snapshot['event_type'])
+
+    cache = RenderPlanCache()
+    cache.get(snapshot['event_type'])
+    print(f"compile layout:       {time_per_call(compile_plan, REPEAT) * 1000:8.3f} ms")
+    print(f"cached plan lookup:   {time_per_call(lambda: cache.get(snapshot['event_type']), REPEAT) * 1000:8.3f} ms")
+
+    generator = ReportGenerator()
+    plan = generator.render_plan(snapshot)
+    print(f"resolve fields:       {time_per_call(lambda: plan.resolve(snapshot), REPEAT) * 1000:8.3f} ms")
+
+    docs = iter([generator._create_blank_document() for _ in range(REPEAT)])
+    sections = time_per_call(lambda: generator._run_sections(next(docs), snapshot), REPEAT)
+    print(f"render all sections:  {sections * 1000:8.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
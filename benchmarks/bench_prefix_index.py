@@ -0,0 +1,51 @@
+# benchmarks/bench_prefix_index.py
+"""
+Benchmark: claim/policy/license number autocomplete with 100k claims.
+Each keystroke is one ClaimIndex.suggest call; the target is under 5 ms.
+"""
+import random
+import time
+
+from common import time_per_call
+
+from src.data.claim_index import ClaimIndex
+
+CLAIMS = 100_000
+
+
+def make_entries(count):
+    rng = random.Random(1)
+    for i in range(count):
+        data = {
+            'claim_number': str(100000 + i),
+            'policy_number': str(rng.randrange(10**7, 10**8)),
+            'vehicle_license_number': f"{rng.randrange(10, 100)}-{rng.randrange(100, 1000)}-{rng.randrange(10, 100)}",
+        }
+        yield str(100000 + i), data, 1_600_000_000 + i
+
+
+def main():
+    index = ClaimIndex(':memory:')
+    index.update_many(make_entries(CLAIMS))
+
+    start = time.perf_counter()
+    index.suggest('claim_number', '1')
+    print(f"first use (load {CLAIMS} claims): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for field, typed in (('claim_number', '150123'),
+                         ('policy_number', '4512'),
+                         ('vehicle_license_number', '12-34')):
+        worst = 0.0
+        for length in range(1, len(typed) + 1):
+            prefix = typed[:length]
+            worst = max(worst, time_per_call(lambda: index.suggest(field, prefix, 8), 200))
+        print(f"{field:24} worst keystroke {worst * 1000:.3f} ms")
+
+    start = time.perf_counter()
+    index.update('100500', {'claim_number': '100500', 'policy_number': '999'}, time.time())
+    print(f"save with prefix update  {(time.perf_counter() - start) * 1000:.2f} ms")
+    index.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+# benchmarks/bench_report_cache.py
+"""
+Benchmark: regenerating an unchanged report (reprint/resend) with and without
+the on-disk report cache.
+"""
+import tempfile
+
+from common import time_per_call
+
+from src.data.form_snapshot import FormSnapshot
+from src.document.report_cache import ReportCache
+from src.document.report_generator import ReportGenerator
+
+REPEAT = 20
+
+
+def main():
+    snapshot = FormSnapshot({
+        'full_name': 'ישראל ישראלי',
+        'event_type': 'נזק לרכב',
+        'vehicle_company': 'טויוטה',
+        'circumstances': 'המבוטח טען כי הרכב חנה ליד ביתו. ' * 200,
+        'summary': 'לסיכום, לא נמצאו ממצאים חריגים. ' * 50,
+    })
+
+    uncached = ReportGenerator()
+    before = time_per_call(lambda: uncached.render_bytes(snapshot), REPEAT)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ReportCache(cache_dir)
+        cached = ReportGenerator(report_cache=cache)
+        cached.render_bytes(snapshot)  # the first render fills the cache
+        after = time_per_call(lambda: cached.render_bytes(snapshot), REPEAT)
+        stats = cache.stats()
+
+    print(f"render, no cache:   {before * 1000:8.2f} ms/report")
+    print(f"render, cache hit:  {after * 1000:8.2f} ms/report")
+    print(f"hits {stats['hits']}, misses {stats['misses']}, {stats['bytes'] / 1024:.0f} KB cached")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+# benchmarks/bench_section_cache.py
+"""
+Benchmark: building a report after a one-field edit, with and without the section cache.
+The cache skips the unchanged sections; template loading and saving are unaffected.
+"""
+from itertools import count
+
+from common import time_per_call
+
+from src.data.form_snapshot import FormSnapshot
+from src.document.report_generator import ReportGenerator
+from src.document.section_cache import SectionCache
+
+REPEAT = 50
+
+SNAPSHOT = FormSnapshot({
+    'full_name': 'ישראל ישראלי',
+    'event_type': 'נזק לרכב',
+    'event_date': '01/02/2026',
+    'claim_number': '12345',
+    'vehicle_company': 'טויוטה',
+    'vehicle_model': 'קורולה',
+    'vehicle_license_number': '12-345-67',
+    'circumstances': 'הרכב נפגע בחניה. ' * 200,
+    'summary': 'סיכום קצר',
+})
+
+
+def main():
+    uncached = ReportGenerator()
+    cached = ReportGenerator(section_cache=SectionCache())
+    cached.build_document(SNAPSHOT)
+    edits = count()
+
+    def edit_summary(generator):
+        return lambda: generator.build_document(SNAPSHOT.replace(summary=f'סיכום {next(edits)}'))
+
+    before = time_per_call(edit_summary(uncached), REPEAT)
+    after = time_per_call(edit_summary(cached), REPEAT)
+    stats = cached.section_cache.stats()
+
+    print(f"build, no section cache:  {before * 1000:8.2f} ms/report")
+    print(f"build, summary edited:    {after * 1000:8.2f} ms/report")
+    print(f"hits {stats['hits']}, misses {stats['misses']}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/bench_startup.py
+"""
+Benchmark: cold start of the GUI.
+Measures, in fresh interpreters, the time to import src.gui.app and the time
+from interpreter start to the first idle Tk loop with the main window built
+(the latter needs a display). Also lists heavy modules loaded at startup.
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+RUNS = 5
+HEAVY_MODULES = ('docx', 'lxml', 'tkcalendar', 'babel')
+
+IMPORT_SCRIPT = f'''
+import sys, time
+start = time.perf_counter()
+import src.gui.app
+print(time.perf_counter() - start)
+print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))
+'''
+
+FIRST_IDLE_SCRIPT = '''
+import time
+start = time.perf_counter()
+import tkinter as tk
+from src.gui.app import ModernInsuranceApp
+root = tk.Tk()
+app = ModernInsuranceApp(root)
+def on_idle():
+    print(time.perf_counter() - start)
+    root.destroy()
+root.after_idle(on_idle)
+root.mainloop()
+'''
+
+
+def run_script(script):
+    result = subprocess.run(
+        [sys.executable, '-c', script], cwd=REPO_ROOT,
+        capture_output=True, text=True, encoding='utf-8'
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return result.stdout.split('\n')
+
+
+def main():
+    import_times = []
+    heavy = ''
+    for _ in range(RUNS):
+        seconds, heavy = run_script(IMPORT_SCRIPT)[:2]
+        import_times.append(float(seconds))
+    print(f"import src.gui.app:   {statistics.median(import_times) * 1000:7.1f} ms (median of {RUNS})")
+    print(f"heavy modules loaded: {heavy or 'none'}")
+
+    try:
+        idle_times = [float(run_script(FIRST_IDLE_SCRIPT)[0]) for _ in range(RUNS)]
+    except RuntimeError as e:
+        print(f"time to first idle:   skipped ({e})")
+        return
+    print(f"time to first idle:   {statistics.median(idle_times) * 1000:7.1f} ms (median of {RUNS})")
+
+
+if __name__ == '__main__':
+    main()
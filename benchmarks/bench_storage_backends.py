@@ -0,0 +1,81 @@
+# benchmarks/bench_storage_backends.py
+"""
+Benchmark: JSON-files backend vs SQLite backend.
+Saves, loads, lists and (for SQLite) bulk-imports a few thousand claims.
+"""
+import os
+import random
+import tempfile
+import time
+
+from common import time_per_call
+
+from src.data.file_persistence import FilePersistenceHandler
+from src.data.storage import SQLiteStorageBackend
+
+CLAIMS = 5_000
+LOADS = 1_000
+
+
+def make_claim(i):
+    return {
+        'event_type': 'צד ג\' - רכב',
+        'claim_number': str(i),
+        'full_name': 'ניצן אברג\'יל',
+        'policy_number': str(200000 + i),
+        'vehicle_company': 'פורד',
+        'vehicle_model': 'מוסטנג',
+        'circumstances': 'נסיבות האירוע ' * 40,
+        'investigation': 'חקירה התבצעה ' * 40,
+        'summary': 'לסיכום ' * 20,
+    }
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"  {label:28} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def run(name, backend, save_all):
+    print(name)
+    claim_numbers = [str(i) for i in range(CLAIMS)]
+    sample = random.Random(1).sample(claim_numbers, LOADS)
+    timed(f"save {CLAIMS}", save_all)
+    timed(f"load {LOADS} random", lambda: [backend.load_by_claim_number(c) for c in sample])
+    list_time = time_per_call(backend.get_all_claim_numbers, 10)
+    print(f"  {'list all claim numbers':28} {list_time:8.3f}s")
+    recent_time = time_per_call(lambda: backend.get_recent_claim_numbers(10), 10)
+    print(f"  {'10 most recent':28} {recent_time:8.5f}s")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_dir = os.path.join(tmp_dir, 'saved_data')
+        json_backend = FilePersistenceHandler(json_dir)
+        run("JSON files", json_backend, lambda: [
+            json_backend.save_by_claim_number(str(i), make_claim(i)) for i in range(CLAIMS)
+        ])
+        json_backend.close()
+
+        sqlite_backend = SQLiteStorageBackend(os.path.join(tmp_dir, 'one_by_one.sqlite3'))
+        run("SQLite, one save per transaction", sqlite_backend, lambda: [
+            sqlite_backend.save_by_claim_number(str(i), make_claim(i)) for i in range(CLAIMS)
+        ])
+        sqlite_backend.close()
+
+        sqlite_backend = SQLiteStorageBackend(os.path.join(tmp_dir, 'batched.sqlite3'))
+        run("SQLite, batched", sqlite_backend, lambda: sqlite_backend.save_many(
+            (str(i), make_claim(i)) for i in range(CLAIMS)
+        ))
+        sqlite_backend.close()
+
+        imported = SQLiteStorageBackend(os.path.join(tmp_dir, 'imported.sqlite3'))
+        print("SQLite bulk import")
+        timed(f"import {CLAIMS} JSON files", lambda: imported.import_json_directory(json_dir))
+        imported.close()
+
+
+if __name__ == '__main__':
+    main()
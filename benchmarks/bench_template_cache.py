@@ -0,0 +1,51 @@
+# benchmarks/bench_template_cache.py
+"""
+Benchmark: cost per report of obtaining a clean template document.
+
+Before: parse example.docx and delete paragraphs one at a time through doc.paragraphs.
+After:  TemplateCache hands out a deep copy of a template parsed and stripped once.
+"""
+import os
+import tempfile
+
+from common import make_sample_template, time_per_call
+
+from docx import Document
+from src.document.report_generator import EXAMPLE_TEMPLATE_PATH, ReportGenerator
+from src.document.template_cache import TemplateCache
+
+REPEAT = 30
+
+
+def load_uncached(template_path):
+    """The original per-report template loading."""
+    doc = Document(template_path)
+    for i in range(len(doc.paragraphs) - 1, -1, -1):
+        p_element = doc.paragraphs[i]._element
+        p_element.getparent().remove(p_element)
+    return doc
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        template_path = EXAMPLE_TEMPLATE_PATH
+        if not os.path.exists(template_path):
+            template_path = make_sample_template(os.path.join(tmp_dir, 'example.docx'))
+            print("example.docx not found, using a synthetic 300 paragraph template")
+
+        cache = TemplateCache()
+        cache.get_document(template_path)  # warm up
+
+        before = time_per_call(lambda: load_uncached(template_path), REPEAT)
+        after = time_per_call(lambda: cache.get_document(template_path), REPEAT)
+        print(f"template load, uncached: {before * 1000:8.2f} ms/report")
+        print(f"template load, cached:   {after * 1000:8.2f} ms/report")
+
+        generator = ReportGenerator()
+        form_data = {'full_name': 'ישראל ישראלי', 'summary': 'לסיכום'}
+        full = time_per_call(lambda: generator.build_document(form_data), REPEAT)
+        print(f"full build_document:     {full * 1000:8.2f} ms/report")
+
+
+if __name__ == '__main__':
+    main()
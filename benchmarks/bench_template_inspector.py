@@ -0,0 +1,63 @@
+# benchmarks/bench_template_inspector.py
+"""
+Benchmark: dumping a large template's structure with the streaming inspector
+versus loading it into python-docx. Each run is a fresh interpreter; peak memory
+is its VmHWM from /proc (Linux only; ru_maxrss would include this parent process).
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+from common import make_sample_template
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SIZES = (2_000, 10_000, 40_000)  # body paragraphs; ~40 per page
+
+INSPECTOR_SCRIPT = '''
+import os, sys, time
+def peak_kb():
+    with open('/proc/self/status') as status:
+        return next(line.split()[1] for line in status if line.startswith('VmHWM'))
+from src.document.template_inspector import write_structure
+start = time.perf_counter()
+with open(os.devnull, 'w', encoding='utf-8') as output:
+    write_structure(sys.argv[1], output)
+print(time.perf_counter() - start, peak_kb())
+'''
+
+PYTHON_DOCX_SCRIPT = '''
+import json, os, sys, time
+def peak_kb():
+    with open('/proc/self/status') as status:
+        return next(line.split()[1] for line in status if line.startswith('VmHWM'))
+from docx import Document
+start = time.perf_counter()
+doc = Document(sys.argv[1])
+paragraphs = [{'text': p.text, 'alignment': str(p.alignment)} for p in doc.paragraphs]
+with open(os.devnull, 'w', encoding='utf-8') as output:
+    json.dump(paragraphs, output, ensure_ascii=False, indent=2)
+print(time.perf_counter() - start, peak_kb())
+'''
+
+
+def run_script(script, path):
+    result = subprocess.run(
+        [sys.executable, '-c', script, path], cwd=REPO_ROOT,
+        capture_output=True, text=True, encoding='utf-8', check=True
+    )
+    seconds, peak = result.stdout.split()
+    return float(seconds), int(peak) / 1024
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in SIZES:
+            path = make_sample_template(os.path.join(tmp_dir, f'template_{size}.docx'), size)
+            for label, script in (('inspector', INSPECTOR_SCRIPT), ('python-docx', PYTHON_DOCX_SCRIPT)):
+                seconds, peak_mb = run_script(script, path)
+                print(f"{size:7} paragraphs, {label:11}  {seconds * 1000:8.1f} ms  peak {peak_mb:6.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
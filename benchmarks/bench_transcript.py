@@ -0,0 +1,68 @@
+# benchmarks/bench_transcript.py
+"""
+Benchmark: ingesting a long call transcript.
+Streams a transcript into question/answer pairs and compares peak memory with
+reading the whole file at once, then times one GUI tick's worth of pairs.
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+from common import time_per_call
+
+from src.data.transcript import (
+    iter_qa_pairs, iter_turns, format_pair, parse_qa_text, read_transcript, strip_timestamps
+)
+
+TURNS = 100_000
+
+
+def write_transcript(path):
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(TURNS):
+            seconds = i * 7 % (10 * 3600)
+            stamp = f'[{seconds // 3600:02}:{seconds // 60 % 60:02}:{seconds % 60:02}]'
+            f.write(f'{stamp} חוקר: שאלה מספר {i} על נסיבות האירוע ועל מה שקרה לאחריו?\n')
+            f.write(f'{stamp} מבוטח: ' + 'תשובה מפורטת של המבוטח ' * 8 + '\n')
+
+
+def measure(label, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = func()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:28} {seconds:7.2f}s  peak {peak / (1024 * 1024):7.1f} MB  ({count} pairs)")
+
+
+def read_all(path):
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    return sum(1 for _ in iter_qa_pairs(iter_turns(strip_timestamps(lines))))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'call.txt')
+        write_transcript(path)
+        print(f"Transcript of {TURNS} exchanges, {os.path.getsize(path) / (1024 * 1024):.0f} MB:")
+        measure("whole file in memory", lambda: read_all(path))
+        measure("streamed", lambda: sum(1 for _ in read_transcript(path)))
+
+        pairs = []
+        for pair in read_transcript(path):
+            pairs.append(pair)
+            if len(pairs) == 40:
+                break
+        batch = time_per_call(lambda: ''.join(format_pair(pair) for pair in pairs), 1000)
+        print(f"Formatting one GUI tick (40 pairs): {batch * 1000:.3f} ms")
+
+        text = ''.join(format_pair(pair) for pair in read_transcript(path))
+        print(f"Parsing the field back on save ({len(text) / (1024 * 1024):.0f} MB): "
+              f"{time_per_call(lambda: parse_qa_text(text), 3):.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/bench_vehicle_catalog.py
+"""
+Benchmark: vehicle catalog lookups with 60k catalog rows.
+Type-ahead and auto-fill lookups should take under a millisecond.
+"""
+import csv
+import os
+import random
+import tempfile
+import time
+
+from common import time_per_call
+
+from src.data.vehicle_catalog import CSV_COLUMNS, VehicleCatalog, build_catalog
+
+MANUFACTURERS = 120
+MODELS_PER_MANUFACTURER = 25
+YEARS = range(2005, 2025)
+
+
+def write_csv(path):
+    rng = random.Random(1)
+    rows = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS)
+        for m in range(MANUFACTURERS):
+            for model in range(MODELS_PER_MANUFACTURER):
+                for year in YEARS:
+                    writer.writerow([
+                        f"יצרן {m}", f"דגם {model}", year,
+                        rng.choice(['בנזין', 'דיזל', 'היברידי']),
+                        rng.choice([1200, 1400, 1600, 2000]),
+                        rng.randrange(80, 250),
+                        rng.choice(['ידני', 'אוטומטי'])
+                    ])
+                    rows += 1
+    return rows
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, 'catalog.csv')
+        catalog_path = os.path.join(tmp_dir, 'vehicle_catalog.sqlite3')
+        rows = write_csv(csv_path)
+
+        start = time.perf_counter()
+        build_catalog(csv_path, catalog_path)
+        print(f"build {rows} rows: {time.perf_counter() - start:.2f}s, "
+              f"{os.path.getsize(catalog_path) / 1024:.0f} KB")
+
+        catalog = VehicleCatalog(catalog_path)
+        start = time.perf_counter()
+        catalog.manufacturers()
+        print(f"first lookup (opens catalog) {(time.perf_counter() - start) * 1000:.2f} ms")
+
+        timings = {
+            'manufacturer type-ahead': lambda: catalog.manufacturers('יצרן 7'),
+            'model type-ahead': lambda: catalog.models('יצרן 42', 'דגם 1'),
+            'auto-fill specs': lambda: catalog.common_specs('יצרן 42', 'דגם 13', '2015'),
+        }
+        for label, func in timings.items():
+            print(f"{label:24} {time_per_call(func, 1000) * 1000:.3f} ms")
+        catalog.close()
+
+
+if __name__ == '__main__':
+    main()
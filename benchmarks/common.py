@@ -0,0 +1,46 @@
+# benchmarks/common.py
+"""
+Shared helpers for the benchmark scripts.
+Run benchmarks from the repository root, e.g. `python benchmarks/bench_template_cache.py`.
+"""
+import os
+import sys
+import time
+
+# Make the src package importable when running a script directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def time_per_call(func, repeat):
+    """
+    Run func `repeat` times and return the average seconds per call.
+
+    Args:
+        func: Callable taking no arguments
+        repeat: Number of calls
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def make_sample_template(path, paragraphs=300):
+    """
+    Write a template resembling example.docx: header, footer and a body
+    of Hebrew paragraphs that the report generator strips.
+
+    Args:
+        path: Destination .docx path
+        paragraphs: Number of body paragraphs
+    """
+    from docx import Document
+
+    doc = Document()
+    section = doc.sections[0]
+    section.header.paragraphs[0].add_run('אניגמה חקירות  |  ENIGMA INVESTIGATIONS')
+    section.footer.paragraphs[0].add_run('רחוב בית הלל 28, תל-אביב')
+    for i in range(paragraphs):
+        doc.add_paragraph(f'פסקה לדוגמה מספר {i} עם טקסט בעברית לצורך מדידה.')
+    doc.save(path)
+    return path
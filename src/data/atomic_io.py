@@ -0,0 +1,77 @@
+# src/data/atomic_io.py
+"""
+Crash-safe file writes.
+Data is written to a temporary file in the target's directory, flushed to disk
+and then renamed over the target, so a crash leaves either the old or the new
+file - never a truncated one. The directory is flushed too, so the rename
+itself survives a power failure.
+"""
+import json
+import os
+import stat
+import tempfile
+from pathlib import Path
+
+# mkstemp() creates files readable by their owner only; new files get the
+# permissions open() would give them instead. Read once: umask() can only be
+# read by setting it, which isn't safe once other threads are running.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def atomic_write_bytes(path, payload):
+    """
+    Atomically replace a file's contents.
+
+    Args:
+        path: Destination file path
+        payload: Bytes to write
+    """
+    path = Path(path)
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # Keep the replaced file's permissions
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(path.parent)
+
+
+def _fsync_directory(directory):
+    """
+    Flush a directory's entries to disk, making a rename in it durable.
+    Windows can't open directories for fsync; there this is a no-op.
+    """
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_json(path, data, indent=4):
+    """
+    Atomically write data as UTF-8 JSON, formatted like the rest of saved_data/.
+
+    Args:
+        path: Destination file path
+        data: JSON-serializable data
+        indent: JSON indentation
+    """
+    payload = json.dumps(data, ensure_ascii=False, indent=indent).encode('utf-8')
+    atomic_write_bytes(path, payload)
@@ -0,0 +1,368 @@
+# src/data/blob_store.py
+"""
+Content-addressed store for claim attachments (correspondence images, videos).
+Every file is stored once, under the SHA-256 of its contents, and claim records
+refer to it as 'blob:<digest>/<original name>' instead of by its original path.
+References keep working when the originals move, and a photo attached to
+several claims takes up space once.
+
+Blobs live in <store>/<first two hex digits>/<digest>. Unreferenced blobs are
+found by walking the claim index (see ClaimIndex.referenced_digests) and the
+form saved without a claim number (saved_data.json).
+
+Maintenance from the command line:
+    python -m src.data.blob_store verify
+    python -m src.data.blob_store gc --backend json --location saved_data
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REFERENCE_PREFIX = 'blob:'
+
+# Files at least this large are hashed through a memory map: one update over
+# the whole file instead of a read and a copy per chunk
+MMAP_THRESHOLD = 16 * 1024 * 1024
+
+_CHUNK_SIZE = 1024 * 1024
+
+# Blobs younger than this are never collected: they may belong to a form
+# that hasn't been saved yet
+GC_GRACE_SECONDS = 24 * 60 * 60
+
+_REFERENCE_PATTERN = re.compile(re.escape(REFERENCE_PREFIX) + r'([0-9a-f]{64})(?:/|$)', re.MULTILINE)
+_DIGEST_PATTERN = re.compile(r'[0-9a-f]{64}')
+
+
+def hash_file(path):
+    """
+    SHA-256 hex digest of a file, read in chunks or, for large files, through mmap.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+        else:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def make_reference(digest, name=''):
+    """
+    Args:
+        digest: The blob's digest
+        name: Original file name, kept for display only
+
+    Returns:
+        str: Reference to store in a claim record
+    """
+    return f'{REFERENCE_PREFIX}{digest}/{name}'
+
+
+def parse_reference(value):
+    """
+    Args:
+        value: A form value: a blob reference or a plain path
+
+    Returns:
+        str: The referenced digest, or None if the value isn't a reference
+    """
+    match = _REFERENCE_PATTERN.match(value or '')
+    return match.group(1) if match else None
+
+
+def referenced_digests(data):
+    """
+    Every blob digest referenced by a claim record, in any field.
+
+    Args:
+        data: Claim data dictionary
+
+    Returns:
+        set: Hex digests
+    """
+    digests = set()
+    for value in (data or {}).values():
+        if isinstance(value, str) and REFERENCE_PREFIX in value:
+            digests.update(_REFERENCE_PATTERN.findall(value))
+    return digests
+
+
+def file_referenced_digests(path):
+    """
+    Every blob digest referenced by a form saved to a single JSON file,
+    such as saved_data.json.
+
+    Args:
+        path: The JSON file
+
+    Returns:
+        set: Hex digests; empty if the file is missing or unreadable
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return set()
+    except (OSError, ValueError) as e:
+        print(f"Cannot read {path} for blob references: {e}")
+        return set()
+    return referenced_digests(data) if isinstance(data, dict) else set()
+
+
+class BlobStore:
+    """Stores attachment files once each under their content digest."""
+
+    DEFAULT_DIRECTORY = 'attachments'
+
+    def __init__(self, directory=DEFAULT_DIRECTORY):
+        """
+        Args:
+            directory: Store directory; created on the first put()
+        """
+        self.directory = Path(directory)
+        # (absolute path, size, mtime_ns) -> digest of the files put so far,
+        # so putting an unchanged file again reads nothing
+        self._known = {}
+
+    def path(self, digest):
+        """
+        Args:
+            digest: Hex digest of a blob
+
+        Returns:
+            Path: Where the blob is (or would be) stored
+        """
+        return self.directory / digest[:2] / digest
+
+    def put(self, source):
+        """
+        Add a file to the store, unless a blob with the same contents is there already.
+
+        Args:
+            source: Path of the file to add
+
+        Returns:
+            str: Reference to the stored blob (see make_reference)
+
+        Raises:
+            OSError: If the file can't be read or the store can't be written
+        """
+        name = os.path.basename(source)
+        stat = os.stat(source)
+        key = (os.path.abspath(source), stat.st_size, stat.st_mtime_ns)
+        digest = self._known.get(key)
+        if digest is not None and self._is_stored(digest, stat.st_size):
+            return make_reference(digest, name)
+        # A new file, or its blob is missing or truncated: hash while copying,
+        # so the file is read once
+        digest = self._copy_in(source)
+        self._known[key] = digest
+        return make_reference(digest, name)
+
+    def _is_stored(self, digest, size):
+        try:
+            return self.path(digest).stat().st_size == size
+        except FileNotFoundError:
+            return False
+
+    def _copy_in(self, source):
+        """
+        Copy a file into the store, hashing what is actually copied, so a file
+        that changes meanwhile is still stored under its own digest. A copy of
+        a blob that is already stored intact is dropped.
+
+        Returns:
+            str: Digest of the copied contents
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(prefix='.', suffix='.tmp', dir=self.directory)
+        try:
+            with open(source, 'rb') as src, os.fdopen(fd, 'wb') as dst:
+                for chunk in iter(lambda: src.read(_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    dst.write(chunk)
+                    size += len(chunk)
+                duplicate = self._is_stored(digest.hexdigest(), size)
+                if not duplicate:
+                    dst.flush()
+                    os.fsync(dst.fileno())
+            if duplicate:
+                os.remove(tmp_path)
+            else:
+                blob_path = self.path(digest.hexdigest())
+                blob_path.parent.mkdir(exist_ok=True)
+                os.replace(tmp_path, blob_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return digest.hexdigest()
+
+    def import_paths(self, value, separator='\n'):
+        """
+        Replace the plain file paths in a form value with blob references.
+        References are kept; paths that can't be read are kept as they are.
+
+        Args:
+            value: Paths and references separated by `separator`, or None
+            separator: Line separator of the value
+
+        Returns:
+            str: The value with every readable file stored, or the value itself if empty
+        """
+        if not value:
+            return value
+        items = []
+        for item in value.split(separator):
+            item = item.strip()
+            if not item:
+                continue
+            if parse_reference(item) is None:
+                try:
+                    item = self.put(item)
+                except OSError as e:
+                    print(f"Cannot store attachment {item}: {e}")
+            items.append(item)
+        return separator.join(items)
+
+    def resolve(self, value):
+        """
+        Args:
+            value: A blob reference, or a plain path from an older record
+
+        Returns:
+            str: Path of the file to read
+        """
+        digest = parse_reference(value)
+        return str(self.path(digest)) if digest else value
+
+    def digests(self):
+        """
+        Returns:
+            list: Digest of every stored blob
+        """
+        found = []
+        if not self.directory.is_dir():
+            return found
+        with os.scandir(self.directory) as fan_out:
+            for bucket in fan_out:
+                if len(bucket.name) != 2 or not bucket.is_dir():
+                    continue
+                with os.scandir(bucket.path) as entries:
+                    found.extend(entry.name for entry in entries
+                                 if _DIGEST_PATTERN.fullmatch(entry.name))
+        return found
+
+    def verify(self, digests=None, remove=False):
+        """
+        Re-hash blobs and report those whose contents no longer match their digest.
+
+        Args:
+            digests: Digests to check (default: every blob)
+            remove: Delete corrupt blobs, so adding the original again restores them
+
+        Returns:
+            list: Digests of corrupt or unreadable blobs
+        """
+        corrupt = []
+        for digest in (self.digests() if digests is None else digests):
+            blob_path = self.path(digest)
+            try:
+                ok = hash_file(blob_path) == digest
+            except OSError as e:
+                print(f"Cannot read blob {digest}: {e}")
+                ok = False
+            if not ok:
+                corrupt.append(digest)
+                if remove:
+                    try:
+                        blob_path.unlink()
+                    except OSError:
+                        pass
+        return corrupt
+
+    def collect_garbage(self, referenced, grace_seconds=GC_GRACE_SECONDS):
+        """
+        Delete blobs that no claim references, and temporary files left by
+        interrupted copies.
+
+        Args:
+            referenced: Set of digests still in use (see ClaimIndex.referenced_digests)
+            grace_seconds: Keep blobs modified more recently than this
+
+        Returns:
+            int: Number of files deleted
+        """
+        if not self.directory.is_dir():
+            return 0
+        cutoff = time.time() - grace_seconds
+        removed = 0
+        candidates = [self.path(digest) for digest in self.digests() if digest not in referenced]
+        candidates.extend(self.directory.glob('.*.tmp'))
+        for path in candidates:
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError as e:
+                print(f"Cannot remove blob {path}: {e}")
+        return removed
+
+
+def main(argv=None):
+    """Verify the attachment store or collect its garbage. Returns an exit code."""
+    parser = argparse.ArgumentParser(description="Maintain the attachment store.")
+    parser.add_argument('command', choices=('verify', 'gc'))
+    parser.add_argument('--store', default=BlobStore.DEFAULT_DIRECTORY, help="Store directory")
+    parser.add_argument('--remove', action='store_true', help="verify: delete corrupt blobs")
+    parser.add_argument('--backend', default='json', help="gc: claim storage backend (json or sqlite)")
+    parser.add_argument('--location', default=None, help="gc: claim directory or database")
+    parser.add_argument('--saved-form', default='saved_data.json',
+                        help="gc: form saved without a claim number")
+    args = parser.parse_args(argv)
+
+    store = BlobStore(args.store)
+    start = time.perf_counter()
+    if args.command == 'verify':
+        corrupt = store.verify(remove=args.remove)
+        for digest in corrupt:
+            print(f"CORRUPT {digest}")
+        print(f"Verified {args.store} in {time.perf_counter() - start:.2f}s")
+        return 1 if corrupt else 0
+
+    # Imported here: opening a backend pulls in the claim index
+    from .storage import create_storage_backend
+
+    backend = create_storage_backend(args.backend, args.location)
+    try:
+        referenced = backend.referenced_blobs() | file_referenced_digests(args.saved_form)
+        removed = store.collect_garbage(referenced)
+    finally:
+        backend.close()
+    print(f"Removed {removed} unreferenced blobs in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,420 @@
+# src/data/claim_index.py
+"""
+Persistent SQLite index of saved claims.
+Keeps the few fields needed for listing and filtering (claim number, event type,
+insured name, event date and file mtime), so the claim list never has to be
+rebuilt from the JSON files. An FTS5 table alongside it indexes the names and
+free-text fields for ranked full-text search, the claim, policy and license
+numbers feed an in-memory prefix index for autocomplete, and the attachment
+blobs each claim references are recorded for the blob store's garbage collection.
+"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from .blob_store import referenced_digests
+from .constants import Constants
+from .prefix_index import PREFIX_FIELDS, PrefixIndex, make_entries
+from .search_index import SEARCH_COLUMNS, build_match_query, search_columns
+
+_INSERT_TEXT_SQL = 'INSERT INTO claim_text (rowid, {}) VALUES (?, {})'.format(
+    ', '.join(name for name, _ in SEARCH_COLUMNS),
+    ', '.join('?' for _ in SEARCH_COLUMNS)
+)
+
+
+class ClaimIndex:
+    """SQLite-backed index of claim summaries, ordered by modification time."""
+
+    # Bump when the table layout changes; older index files are rebuilt
+    SCHEMA_VERSION = 4
+
+    def __init__(self, db_path, connection=None, lock=None):
+        """
+        Open (or create) the index database.
+
+        Args:
+            db_path: Path of the SQLite file
+            connection: Connection to the same file to share instead of opening
+                one; it must be in autocommit mode (isolation_level=None). Index
+                writes then join the transaction its owner has open.
+            lock: The RLock guarding a shared connection
+        """
+        self.db_path = str(db_path)
+        self._owns_connection = connection is None
+        self._lock = lock or threading.RLock()
+        self._conn = connection or sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        self.has_search = False
+        # Loaded from the claim_keys table on the first suggest() call
+        self._prefix_index = None
+        self._create_schema()
+
+    def _create_schema(self):
+        """Create the tables, dropping an index built with an older layout."""
+        with self._lock, self._transaction():
+            version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+            if version != self.SCHEMA_VERSION:
+                self._conn.execute('DROP TABLE IF EXISTS claim_text')
+                self._conn.execute('DROP TABLE IF EXISTS claim_keys')
+                self._conn.execute('DROP TABLE IF EXISTS claim_blobs')
+                self._conn.execute('DROP TABLE IF EXISTS claims')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS claims (
+                    claim_number TEXT PRIMARY KEY,
+                    event_type TEXT,
+                    full_name TEXT,
+                    event_date TEXT,
+                    event_date_iso TEXT,
+                    mtime REAL NOT NULL
+                )
+            ''')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS claims_by_mtime ON claims (mtime)')
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS claims_by_event_type ON claims (event_type, mtime)'
+            )
+            # Prefix index entries, normalized in Python (see prefix_index.make_entries)
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS claim_keys (
+                    field TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    claim_number TEXT NOT NULL,
+                    value TEXT NOT NULL
+                )
+            ''')
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS claim_keys_by_claim ON claim_keys (claim_number)'
+            )
+            # Attachment blobs referenced by each claim (see blob_store)
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS claim_blobs (
+                    claim_number TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    PRIMARY KEY (claim_number, digest)
+                )
+            ''')
+            self._create_search_table()
+            self._conn.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+
+    def _create_search_table(self):
+        """
+        Create the full-text table; its rowids match the claims table's.
+        Search is disabled if this SQLite build lacks FTS5.
+        """
+        columns = ', '.join(name for name, _ in SEARCH_COLUMNS)
+        weights = ', '.join(str(weight) for _, weight in SEARCH_COLUMNS)
+        try:
+            exists = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'claim_text'"
+            ).fetchone()
+            if not exists:
+                self._conn.execute(
+                    f"CREATE VIRTUAL TABLE claim_text USING fts5({columns}, "
+                    f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+                )
+                self._conn.execute(
+                    f"INSERT INTO claim_text (claim_text, rank) VALUES ('rank', 'bm25({weights})')"
+                )
+            self.has_search = True
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search unavailable: {e}")
+
+    def update(self, claim_number, data, mtime):
+        """
+        Add or replace a claim's entry.
+
+        Args:
+            claim_number: Claim number (the saved file's name)
+            data: The claim's saved data dictionary
+            mtime: Modification time of the saved file
+        """
+        self.update_many([(claim_number, data, mtime)])
+
+    def update_many(self, entries):
+        """
+        Add or replace many entries in one transaction.
+
+        Args:
+            entries: Iterable of (claim_number, data, mtime) tuples
+        """
+        rows = [
+            (
+                self._row(claim_number, data, mtime),
+                search_columns(data),
+                make_entries(str(claim_number), self._prefix_values(claim_number, data)),
+                referenced_digests(data)
+            )
+            for claim_number, data, mtime in entries
+        ]
+        with self._lock, self._transaction():
+            for row, texts, keys, digests in rows:
+                # Upsert rather than replace, so the rowid shared with claim_text is stable
+                self._conn.execute(
+                    'INSERT INTO claims VALUES (?, ?, ?, ?, ?, ?) '
+                    'ON CONFLICT (claim_number) DO UPDATE SET '
+                    'event_type = excluded.event_type, full_name = excluded.full_name, '
+                    'event_date = excluded.event_date, event_date_iso = excluded.event_date_iso, '
+                    'mtime = excluded.mtime',
+                    row
+                )
+                if self.has_search:
+                    rowid = self._conn.execute(
+                        'SELECT rowid FROM claims WHERE claim_number = ?', (row[0],)
+                    ).fetchone()[0]
+                    self._conn.execute('DELETE FROM claim_text WHERE rowid = ?', (rowid,))
+                    self._conn.execute(_INSERT_TEXT_SQL, (rowid,) + texts)
+                self._remove_keys(row[0])
+                self._conn.executemany(
+                    'INSERT INTO claim_keys VALUES (?, ?, ?, ?)',
+                    [(field,) + entry for field, entry in keys]
+                )
+                if self._prefix_index is not None:
+                    for field, entry in keys:
+                        self._prefix_index.insert(field, entry)
+                self._conn.execute('DELETE FROM claim_blobs WHERE claim_number = ?', (row[0],))
+                self._conn.executemany(
+                    'INSERT INTO claim_blobs VALUES (?, ?)',
+                    [(row[0], digest) for digest in digests]
+                )
+
+    def remove(self, claim_number):
+        """Remove a claim's entry if present."""
+        self._remove_many([claim_number])
+
+    def _remove_many(self, claim_numbers):
+        with self._lock, self._transaction():
+            for claim_number in claim_numbers:
+                row = self._conn.execute(
+                    'SELECT rowid FROM claims WHERE claim_number = ?', (claim_number,)
+                ).fetchone()
+                if row is None:
+                    continue
+                if self.has_search:
+                    self._conn.execute('DELETE FROM claim_text WHERE rowid = ?', row)
+                self._conn.execute('DELETE FROM claims WHERE rowid = ?', row)
+                self._conn.execute('DELETE FROM claim_blobs WHERE claim_number = ?', (claim_number,))
+                self._remove_keys(claim_number)
+
+    def _remove_keys(self, claim_number):
+        """Delete a claim's prefix index entries; call with the lock held."""
+        if self._prefix_index is not None:
+            stale = self._conn.execute(
+                'SELECT field, key, claim_number, value FROM claim_keys WHERE claim_number = ?',
+                (claim_number,)
+            ).fetchall()
+            for field, *entry in stale:
+                self._prefix_index.discard(field, tuple(entry))
+        self._conn.execute('DELETE FROM claim_keys WHERE claim_number = ?', (claim_number,))
+
+    def sync(self, backend):
+        """
+        Bring the index up to date with a storage backend.
+        Only claims whose mtime changed are loaded; entries for deleted claims are dropped.
+
+        Args:
+            backend: StorageBackend providing get_modification_times() and load_by_claim_number()
+
+        Returns:
+            int: Number of entries added, updated or removed
+        """
+        current = backend.get_modification_times()
+
+        with self._lock:
+            indexed = dict(self._conn.execute('SELECT claim_number, mtime FROM claims'))
+
+        changed = [
+            (claim_number, backend.load_by_claim_number(claim_number), mtime)
+            for claim_number, mtime in current.items()
+            if indexed.get(claim_number) != mtime
+        ]
+        removed = [claim_number for claim_number in indexed if claim_number not in current]
+
+        if changed:
+            self.update_many(changed)
+        if removed:
+            self._remove_many(removed)
+
+        return len(changed) + len(removed)
+
+    def all_claim_numbers(self):
+        """
+        Returns:
+            list: Every indexed claim number, sorted
+        """
+        with self._lock:
+            rows = self._conn.execute('SELECT claim_number FROM claims ORDER BY claim_number')
+            return [row[0] for row in rows]
+
+    def referenced_digests(self):
+        """
+        Returns:
+            set: Every attachment blob digest referenced by an indexed claim
+        """
+        with self._lock:
+            return {row[0] for row in self._conn.execute('SELECT DISTINCT digest FROM claim_blobs')}
+
+    def recent(self, limit=10, event_type=None, name_contains=None,
+               date_from=None, date_to=None):
+        """
+        Most recently saved claims first, optionally filtered.
+
+        Args:
+            limit: Maximum number of claims to return (None for all)
+            event_type: Only claims of this event type
+            name_contains: Only claims whose insured name contains this text
+            date_from: Only events on or after this date (datetime or dd/mm/yyyy string)
+            date_to: Only events on or before this date (datetime or dd/mm/yyyy string)
+
+        Returns:
+            list: Dictionaries with claim_number, event_type, full_name, event_date and mtime
+        """
+        conditions, params = [], []
+        if event_type:
+            conditions.append('event_type = ?')
+            params.append(event_type)
+        if name_contains:
+            conditions.append("full_name LIKE ? ESCAPE '\\'")
+            params.append('%' + self._escape_like(name_contains) + '%')
+        if date_from:
+            conditions.append('event_date_iso >= ?')
+            params.append(self._to_iso_date(date_from))
+        if date_to:
+            conditions.append('event_date_iso <= ?')
+            params.append(self._to_iso_date(date_to))
+
+        query = 'SELECT claim_number, event_type, full_name, event_date, mtime FROM claims'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY mtime DESC'
+        if limit:
+            query += ' LIMIT ?'
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        keys = ('claim_number', 'event_type', 'full_name', 'event_date', 'mtime')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def search(self, query, limit=20):
+        """
+        Ranked full-text search over names, identifying details and free text.
+        Every word of the query must match the start of a word in the claim;
+        Hebrew is normalized on both sides (see search_index.normalize_hebrew).
+
+        Args:
+            query: Free text, e.g. part of a name or a phrase from the circumstances
+            limit: Maximum number of claims to return (None for all)
+
+        Returns:
+            list: Dictionaries with claim_number, event_type, full_name, event_date,
+                mtime and score (lower is a better match), best match first
+        """
+        match = build_match_query(query)
+        if not match or not self.has_search:
+            return []
+
+        # Every match is ranked; FTS5 keeps only the best `limit` while sorting
+        sql = (
+            'SELECT c.claim_number, c.event_type, c.full_name, c.event_date, c.mtime, t.rank '
+            'FROM (SELECT rowid, rank FROM claim_text WHERE claim_text MATCH ? '
+            'ORDER BY rank LIMIT ?) t '
+            'JOIN claims c ON c.rowid = t.rowid ORDER BY t.rank'
+        )
+        params = (match, limit or -1)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        keys = ('claim_number', 'event_type', 'full_name', 'event_date', 'mtime', 'score')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def suggest(self, field, prefix, limit=10):
+        """
+        Autocomplete a claim, policy or license number.
+        The prefix index is loaded on first use and then kept up to date by
+        update_many() and remove().
+
+        Args:
+            field: One of prefix_index.PREFIX_FIELDS
+            prefix: Text typed so far
+            limit: Maximum number of suggestions
+
+        Returns:
+            list: Dictionaries with claim_number and value, in key order
+        """
+        with self._lock:
+            if self._prefix_index is None:
+                self._prefix_index = PrefixIndex()
+                for key_field in PREFIX_FIELDS:
+                    self._prefix_index.load(key_field, self._conn.execute(
+                        'SELECT key, claim_number, value FROM claim_keys '
+                        'WHERE field = ? ORDER BY key, claim_number, value',
+                        (key_field,)
+                    ).fetchall())
+            return self._prefix_index.suggest(field, prefix, limit)
+
+    def discard_cached_keys(self):
+        """
+        Drop the in-memory prefix index, to be reloaded on the next suggest().
+        Call when a transaction that updated the index is rolled back.
+        """
+        with self._lock:
+            self._prefix_index = None
+
+    def close(self):
+        """Close the database connection, unless it is shared."""
+        if self._owns_connection:
+            with self._lock:
+                self._conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Run the block in a savepoint: a transaction of its own, or part of
+        the one the shared connection's owner has open.
+        """
+        self._conn.execute('SAVEPOINT claim_index')
+        try:
+            yield
+        except BaseException:
+            self._conn.execute('ROLLBACK TO claim_index')
+            self._conn.execute('RELEASE claim_index')
+            self._prefix_index = None
+            raise
+        self._conn.execute('RELEASE claim_index')
+
+    def _row(self, claim_number, data, mtime):
+        data = data or {}
+        event_date = data.get('event_date', '') or ''
+        return (
+            str(claim_number),
+            data.get('event_type', '') or '',
+            data.get('full_name', '') or '',
+            event_date,
+            self._to_iso_date(event_date),
+            mtime
+        )
+
+    @staticmethod
+    def _prefix_values(claim_number, data):
+        """Prefix-indexed fields of a claim; the claim number is its storage key."""
+        values = dict(data or {})
+        values['claim_number'] = str(claim_number)
+        return values
+
+    @staticmethod
+    def _to_iso_date(value):
+        """Convert a datetime or a date string in any supported format to YYYY-MM-DD ('' if unknown)."""
+        if isinstance(value, datetime):
+            return value.strftime('%Y-%m-%d')
+        for date_format in Constants.DATE_FORMATS:
+            try:
+                return datetime.strptime(str(value), date_format).strftime('%Y-%m-%d')
+            except ValueError:
+                continue
+        return ''
+
+    @staticmethod
+    def _escape_like(text):
+        return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
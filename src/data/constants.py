@@ -1,4 +1,7 @@
 class Constants:
+    # Date formats accepted when reading saved dates; the first is the one written
+    DATE_FORMATS = ['%d/%m/%Y', '%Y-%m-%d', '%d.%m.%Y', '%d-%m-%Y']
+
     EVENT_TYPES = [
         'גניבת רכב',
         'צד ג\' - רכב',
@@ -9,16 +9,40 @@ import os
 from tkinter import messagebox
 
 from .widget_handlers import WidgetHandlerFactory
+from .atomic_io import atomic_write_json
+from .blob_store import BlobStore
 from .file_persistence import FilePersistenceHandler
+from .form_model import FormModel
+from .form_snapshot import FormSnapshot
+from .transcript import parse_qa_text
 
 
 class DataManager:
-    def __init__(self):
-        self.form_data = {}
+    def __init__(self, storage_backend=None, blob_store=None):
+        """
+        Args:
+            storage_backend: StorageBackend for claims; defaults to JSON files in saved_data/
+            blob_store: BlobStore for attached files; defaults to attachments/
+        """
+        # Field name -> widget; also caches values and tracks edited fields
+        self.form_data = FormModel()
+        self.blob_store = blob_store or BlobStore()
+        # Attachments are blob references, stored in the background when the
+        # files are picked (see store_attachments_async); the plain paths
+        # stand in until then. Records saved before the store existed hold
+        # plain paths until the files are picked again
         self.uploaded_video = None
+        # Correspondence images, one per line (see document.attachments)
         self.uploaded_image = None
-        self.file_persistence = FilePersistenceHandler()
+        self._importer = None
+        if storage_backend is None:
+            storage_backend = FilePersistenceHandler()
+        self.file_persistence = storage_backend
         self.current_claim_number = None
+        # (claim_number, values) as last saved or loaded, to save only what changed
+        self._last_saved = None
+        # (investigation text, its question/answer pairs) as last parsed
+        self._parsed_investigation = ('', [])
 
     def load_saved_data(self):
         """
@@ -93,6 +117,11 @@ class DataManager:
             saved_data (dict): Dictionary with field names and values
         """
         for key, value in saved_data.items():
+            if self.form_data.is_pending(key):
+                # Its tab isn't built yet; applied when the widget is created
+                self.form_data.stage(key, value)
+                continue
+
             if key not in self.form_data:
                 print(f"Field {key} not found in form")
                 continue
@@ -117,6 +146,9 @@ class DataManager:
             print(f"Cannot set value for {field_name}: {e}")
         except Exception as e:
             print(f"Error setting value for {field_name}: {e}")
+        finally:
+            # Programmatic changes don't fire the widgets' change events
+            self.form_data.mark_dirty(field_name)
 
     def _load_file_paths(self, saved_data):
         """
@@ -130,6 +162,51 @@ class DataManager:
         if 'correspondence_image' in saved_data:
             self.uploaded_image = saved_data['correspondence_image']
 
+    def store_attachments(self, paths):
+        """
+        Copy files into the blob store.
+
+        Args:
+            paths: Paths of the files the user picked
+
+        Returns:
+            str: Their blob references, one per line
+        """
+        return self.blob_store.import_paths('\n'.join(paths))
+
+    def store_attachments_async(self, paths):
+        """
+        Copy files into the blob store on a background thread, one import at a time.
+
+        Args:
+            paths: Paths of the files the user picked
+
+        Returns:
+            Future: Resolves to their blob references; poll done() from the Tk loop
+        """
+        if self._importer is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._importer = ThreadPoolExecutor(max_workers=1)
+        return self._importer.submit(self.store_attachments, list(paths))
+
+    def apply_stored_attachments(self, attribute, paths, references):
+        """
+        Replace picked paths with their blob references once they are stored,
+        unless other files were picked or a claim was loaded meanwhile.
+
+        Args:
+            attribute: 'uploaded_video' or 'uploaded_image'
+            paths: The paths that were stored
+            references: Result of store_attachments(paths)
+
+        Returns:
+            bool: True if the references were applied
+        """
+        if getattr(self, attribute) != '\n'.join(paths):
+            return False
+        setattr(self, attribute, references)
+        return True
+
     def save_data(self):
         """
         Saves the current form data.
@@ -139,13 +216,19 @@ class DataManager:
         try:
             data_to_save = self._collect_widget_values()
             self._add_file_paths_to_save(data_to_save)
+            self._add_investigation_pairs(data_to_save)
 
             # Get claim number
             claim_number = data_to_save.get('claim_number', '').strip()
 
             if claim_number:
                 # Save to file-based storage (saved_data/claim_number.json)
-                self.file_persistence.save_by_claim_number(claim_number, data_to_save)
+                changes = self._changes_since_last_save(claim_number, data_to_save)
+                if changes is None:
+                    self.file_persistence.save_by_claim_number(claim_number, data_to_save)
+                elif changes:
+                    self.file_persistence.save_changes(claim_number, changes)
+                self._last_saved = (claim_number, data_to_save)
                 self.current_claim_number = claim_number
                 messagebox.showinfo("הצלחה", f"הנתונים נשמרו בהצלחה!\nתיק: {claim_number}")
             else:
@@ -173,9 +256,7 @@ class DataManager:
         try:
             data = self.file_persistence.load_by_claim_number(claim_number)
             if data:
-                self.load_data_from_json(data)
-                self.current_claim_number = claim_number
-                print(f"Loaded data for claim: {claim_number}")
+                self.apply_claim_data(claim_number, data)
             else:
                 messagebox.showwarning(
                     "לא נמצא",
@@ -188,37 +269,102 @@ class DataManager:
                 f"שגיאה בטעינת נתוני התיק: {str(e)}"
             )
 
+    def apply_claim_data(self, claim_number, data):
+        """
+        Load a saved claim's data into the form and make it the current claim.
+
+        Args:
+            claim_number: The claim's number
+            data (dict): The claim's saved data
+        """
+        self.load_data_from_json(data)
+        self.current_claim_number = claim_number
+        self._last_saved = (claim_number, dict(data))
+        print(f"Loaded data for claim: {claim_number}")
+
+    def _changes_since_last_save(self, claim_number, data):
+        """
+        Work out which fields changed since the claim was last saved or loaded.
+
+        Args:
+            claim_number: Claim number being saved
+            data (dict): Values about to be saved
+
+        Returns:
+            dict: Changed fields, or None if the whole record must be rewritten
+                (a different claim, a missing file or fields that were removed)
+        """
+        if self._last_saved is None:
+            return None
+
+        last_claim_number, last_data = self._last_saved
+        if last_claim_number != claim_number or not self.file_persistence.file_exists(claim_number):
+            return None
+        if any(key not in data for key in last_data):
+            return None
+
+        return {key: value for key, value in data.items() if last_data.get(key) != value}
+
     def get_recent_claims(self, limit=10):
         """
-        Get list of recent claim numbers.
+        Get list of recently saved claim numbers.
 
         Args:
             limit: Maximum number of claims to return
 
         Returns:
-            list: List of claim numbers
+            list: List of claim numbers, most recently saved first
+        """
+        return self.file_persistence.get_recent_claim_numbers(limit or None)
+
+    def search_claims(self, query, limit=20):
+        """
+        Full-text search across all saved claims.
+
+        Args:
+            query: Free text, e.g. part of a name or a phrase from the circumstances
+            limit: Maximum number of results
+
+        Returns:
+            list: Result dictionaries, best match first (see ClaimIndex.search)
+        """
+        return self.file_persistence.search_claims(query, limit)
+
+    def suggest_claims(self, field, prefix, limit=10):
+        """
+        Saved claims whose claim, policy or license number starts with a prefix.
+
+        Args:
+            field: 'claim_number', 'policy_number' or 'vehicle_license_number'
+            prefix: Text typed so far
+            limit: Maximum number of suggestions
+
+        Returns:
+            list: Dictionaries with claim_number and value (the matching field)
+        """
+        return self.file_persistence.suggest_claims(field, prefix, limit)
+
+    def build_snapshot(self):
+        """
+        Capture the current form values in a single pass over the widgets.
+
+        Returns:
+            FormSnapshot: Immutable copy of the field values and file paths
         """
-        all_claims = self.file_persistence.get_all_claim_numbers()
-        return all_claims[-limit:] if limit else all_claims
+        values = self._collect_widget_values()
+        self._add_file_paths_to_save(values)
+        self._add_investigation_pairs(values)
+        return FormSnapshot(values)
 
     def _collect_widget_values(self):
         """
-        Collect values from all widgets using appropriate handlers.
+        Collect values from all widgets.
+        Only fields edited since the last collection are read from their widgets.
 
         Returns:
             dict: Dictionary with field names and their values
         """
-        data_to_save = {}
-        for key, widget in self.form_data.items():
-            try:
-                handler = WidgetHandlerFactory.get_handler(widget)
-                data_to_save[key] = handler.get_value(widget)
-            except ValueError:
-                # Unsupported widget type, skip it
-                print(f"Skipping unsupported widget type for {key}")
-            except Exception as e:
-                print(f"Error getting value for {key}: {e}")
-        return data_to_save
+        return self.form_data.current_values()
 
     def _add_file_paths_to_save(self, data_dict):
         """
@@ -232,16 +378,30 @@ class DataManager:
         if self.uploaded_image:
             data_dict['correspondence_image'] = self.uploaded_image
 
+    def _add_investigation_pairs(self, data_dict):
+        """
+        Add the investigation's question/answer pairs as the investigation_qa
+        list, read back from the field's "ש:" / "ת:" lines (see data.transcript).
+
+        Args:
+            data_dict (dict): Dictionary with the investigation text
+        """
+        text = data_dict.get('investigation') or ''
+        if text != self._parsed_investigation[0]:
+            self._parsed_investigation = (text, parse_qa_text(text))
+        pairs = self._parsed_investigation[1]
+        if pairs:
+            data_dict['investigation_qa'] = pairs
+
     def _write_to_json_file(self, data, filename='saved_data.json'):
         """
-        Write data dictionary to a JSON file.
+        Atomically write data dictionary to a JSON file.
 
         Args:
             data (dict): Data to write
             filename (str): Name of the file to write to
         """
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        atomic_write_json(filename, data)
 
     def get_field_value(self, field_name):
         """
@@ -253,16 +413,10 @@ class DataManager:
         Returns:
             str: The field's value, or empty string if not found
         """
-        if field_name not in self.form_data:
+        if not self.form_data.has_field(field_name):
             return ""
 
-        widget = self.form_data[field_name]
-        try:
-            handler = WidgetHandlerFactory.get_handler(widget)
-            return handler.get_value(widget)
-        except Exception as e:
-            print(f"Error getting value for {field_name}: {e}")
-            return ""
+        return self.form_data.current_value(field_name, "")
 
     def set_field_value(self, field_name, value):
         """
@@ -272,6 +426,10 @@ class DataManager:
             field_name (str): Name of the field to set value for
             value: The value to set
         """
+        if self.form_data.is_pending(field_name):
+            self.form_data.stage(field_name, value)
+            return
+
         if field_name not in self.form_data:
             return
 
@@ -288,6 +446,8 @@ class DataManager:
                 handler.clear_value(widget)
             except Exception as e:
                 print(f"Error clearing widget: {e}")
+        self.form_data.mark_all_dirty()
+        self.form_data.reset_pending()
 
         self.uploaded_video = None
         self.uploaded_image = None
@@ -323,17 +483,11 @@ class DataManager:
         }
 
         empty_fields = []
-        for field_name, widget in self.form_data.items():
-            try:
-                handler = WidgetHandlerFactory.get_handler(widget)
-                value = handler.get_value(widget)
-
-                # Check if value is empty (empty string or whitespace only)
-                if not value or str(value).strip() == '':
-                    hebrew_label = field_labels.get(field_name, field_name)
-                    empty_fields.append((field_name, hebrew_label))
-            except Exception as e:
-                print(f"Error checking field {field_name}: {e}")
+        for field_name, value in self.form_data.current_values().items():
+            # Check if value is empty (empty string or whitespace only)
+            if not value or str(value).strip() == '':
+                hebrew_label = field_labels.get(field_name, field_name)
+                empty_fields.append((field_name, hebrew_label))
 
         return empty_fields
 
@@ -345,5 +499,5 @@ class DataManager:
             empty_field_names: List of field names to fill
         """
         for field_name in empty_field_names:
-            if field_name in self.form_data:
+            if self.form_data.has_field(field_name):
                 self.set_field_value(field_name, 'NOT_FILLED')
\ No newline at end of file
@@ -0,0 +1,165 @@
+# src/data/edit_journal.py
+"""
+Append-only journal of field-level edits.
+Saving a few changed fields costs one small append instead of rewriting the
+claim's whole file. The journal is periodically compacted into the main
+records and replayed on startup to recover edits made before a crash.
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from .atomic_io import atomic_write_bytes
+
+
+class EditJournal:
+    """
+    Journal of {"claim": <claim number>, "fields": {<field>: <value>}} records,
+    one JSON object per line.
+
+    Appends are durable once committed (written and fsynced). Appends made
+    inside group() are committed together with a single write and fsync.
+    """
+
+    def __init__(self, path, compact_threshold=200):
+        """
+        Open the journal, loading any edits not yet compacted.
+
+        Args:
+            path: Journal file path
+            compact_threshold: Number of journaled edits after which
+                should_compact() returns True
+        """
+        self.path = Path(path)
+        self.compact_threshold = compact_threshold
+        self._lock = threading.RLock()
+        self._buffer = []
+        self._group_depth = 0
+        self._record_count = 0
+        # claim number -> merged field changes not yet compacted
+        self._changes = {}
+
+        self._load_existing()
+        self._file = open(self.path, 'ab')
+
+    def append(self, claim_number, changes):
+        """
+        Journal changed field values for a claim.
+
+        Args:
+            claim_number: Claim the fields belong to
+            changes: Dictionary of field name -> new value
+        """
+        if not changes:
+            return
+        line = json.dumps({'claim': claim_number, 'fields': changes}, ensure_ascii=False)
+        with self._lock:
+            self._buffer.append(line.encode('utf-8') + b'\n')
+            self._apply(claim_number, changes)
+            if self._group_depth == 0:
+                self.commit()
+
+    @contextmanager
+    def group(self):
+        """Commit every append made inside the block with a single write and fsync."""
+        with self._lock:
+            self._group_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._group_depth -= 1
+                if self._group_depth == 0:
+                    self.commit()
+
+    def commit(self):
+        """Write and fsync all buffered appends."""
+        with self._lock:
+            if not self._buffer:
+                return
+            self._file.write(b''.join(self._buffer))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._buffer = []
+
+    def pending_changes(self, claim_number):
+        """
+        Args:
+            claim_number: Claim to look up
+
+        Returns:
+            dict: Journaled field changes for the claim not yet compacted
+        """
+        with self._lock:
+            return dict(self._changes.get(claim_number, {}))
+
+    def has_pending_changes(self, claim_number):
+        with self._lock:
+            return claim_number in self._changes
+
+    def should_compact(self):
+        """True once the journal holds enough edits to be worth compacting."""
+        with self._lock:
+            return self._record_count >= self.compact_threshold
+
+    def compact(self, apply_changes):
+        """
+        Fold the journal into the main records, then empty it.
+        If a crash interrupts compaction the journal is still intact, and
+        replaying it again is harmless.
+
+        Args:
+            apply_changes: Callable(claim_number, changes) that writes the
+                merged changes into the claim's main record
+
+        Returns:
+            int: Number of claims updated
+        """
+        with self._lock:
+            self.commit()
+            for claim_number, changes in self._changes.items():
+                apply_changes(claim_number, changes)
+
+            self._file.close()
+            atomic_write_bytes(self.path, b'')
+            self._file = open(self.path, 'ab')
+
+            compacted = len(self._changes)
+            self._changes = {}
+            self._record_count = 0
+            return compacted
+
+    def close(self):
+        """Commit pending appends and close the file."""
+        with self._lock:
+            self.commit()
+            self._file.close()
+
+    def _apply(self, claim_number, changes):
+        self._changes.setdefault(claim_number, {}).update(changes)
+        self._record_count += 1
+
+    def _load_existing(self):
+        """
+        Replay the journal file into memory. A torn final write is cut off,
+        so the next append starts on a line of its own.
+        """
+        if not self.path.exists():
+            return
+        with open(self.path, 'r+b') as f:
+            end = 0
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # Interrupted append; it was never acknowledged
+                end += len(line)
+                try:
+                    record = json.loads(line.decode('utf-8'))
+                    self._apply(str(record['claim']), dict(record['fields']))
+                except (ValueError, KeyError, TypeError):
+                    continue
+            if f.seek(0, os.SEEK_END) > end:
+                f.truncate(end)
+                f.flush()
+                os.fsync(f.fileno())
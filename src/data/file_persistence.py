@@ -2,25 +2,51 @@
 """
 File-based persistence handler for saving/loading data by claim number.
 Each claim gets its own JSON file in saved_data/ directory.
+A SQLite claim index alongside the files serves listings and lookups.
+Files are replaced atomically; small edits go to an append-only journal that
+is folded back into the files periodically and on startup.
 """
 import json
 import os
+from contextlib import contextmanager
 from pathlib import Path
 
+from .atomic_io import atomic_write_json
+from .claim_index import ClaimIndex
+from .edit_journal import EditJournal
+from .storage.base_backend import StorageBackend
 
-class FilePersistenceHandler:
+
+class FilePersistenceHandler(StorageBackend):
     """Handles saving and loading data files organized by claim number."""
 
-    def __init__(self, base_dir='saved_data'):
+    INDEX_FILENAME = 'claim_index.sqlite3'
+    JOURNAL_FILENAME = 'edits.journal'
+
+    def __init__(self, base_dir='saved_data', use_index=True, use_journal=True):
         """
         Initialize file persistence handler.
 
         Args:
             base_dir: Directory to store claim data files
+            use_index: Keep a claim index for listings; it is brought up to
+                date with the files' mtimes here
+            use_journal: Journal save_changes() edits instead of rewriting
+                files; edits left over from a crash are replayed here
         """
         self.base_dir = Path(base_dir)
         self._ensure_directory_exists()
 
+        self.index = None
+        self.journal = None
+        if use_journal:
+            self.journal = EditJournal(self.base_dir / self.JOURNAL_FILENAME)
+            self.compact_journal()
+
+        if use_index:
+            self.index = ClaimIndex(self.base_dir / self.INDEX_FILENAME)
+            self.index.sync(self)
+
     def _ensure_directory_exists(self):
         """Create the saved_data directory if it doesn't exist."""
         if not self.base_dir.exists():
@@ -42,10 +68,87 @@ class FilePersistenceHandler:
 
         # Sanitize claim number for filename
         safe_filename = self._sanitize_filename(claim_number)
+
+        # Older journaled edits must not be replayed over the new file
+        if self.journal and self.journal.has_pending_changes(safe_filename):
+            self.compact_journal()
+
+        return self._write_file(safe_filename, data)
+
+    def save_changes(self, claim_number, changes):
+        """
+        Save changed fields with a single journal append instead of a full rewrite.
+
+        Args:
+            claim_number: Claim number to update
+            changes: Dictionary of changed field values
+
+        Returns:
+            Path: Path of the claim's file
+        """
+        if not claim_number:
+            raise ValueError("Claim number cannot be empty")
+
+        safe_filename = self._sanitize_filename(claim_number)
+        file_path = self.base_dir / f"{safe_filename}.json"
+
+        if not self.journal or not file_path.exists():
+            return super().save_changes(claim_number, changes)
+
+        self.journal.append(safe_filename, changes)
+
+        if self.index:
+            # Touch the file, so the claim sorts as recently saved, and index its
+            # real mtime, so the next sync() doesn't read it again
+            os.utime(file_path)
+            self.index.update(safe_filename, self.load_by_claim_number(safe_filename),
+                              file_path.stat().st_mtime)
+
+        if self.journal.should_compact():
+            self.compact_journal()
+
+        return file_path
+
+    @contextmanager
+    def batch(self):
+        """Commit the edits journaled inside the block with a single write and fsync."""
+        if not self.journal:
+            yield self
+            return
+        with self.journal.group():
+            yield self
+
+    def compact_journal(self):
+        """
+        Fold journaled edits into the claim files and empty the journal.
+
+        Returns:
+            int: Number of claim files rewritten
+        """
+        if not self.journal:
+            return 0
+        return self.journal.compact(self._apply_journaled_changes)
+
+    def _apply_journaled_changes(self, safe_filename, changes):
+        """Merge journaled changes into a claim's file, skipping deleted claims."""
         file_path = self.base_dir / f"{safe_filename}.json"
+        if not file_path.exists():
+            return
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        data = self._read_file(file_path)
+        if data is None:
+            print(f"Cannot apply journaled edits to unreadable file: {file_path}")
+            return
+        data.update(changes)
+        self._write_file(safe_filename, data)
+
+    def _write_file(self, safe_filename, data):
+        """Atomically write a claim's file and update its index entry."""
+        file_path = self.base_dir / f"{safe_filename}.json"
+        atomic_write_json(file_path, data)
+
+        if self.index:
+            self.index.update(safe_filename, data, file_path.stat().st_mtime)
 
         return file_path
 
@@ -68,6 +171,13 @@ class FilePersistenceHandler:
         if not file_path.exists():
             return None
 
+        data = self._read_file(file_path)
+        if data is not None and self.journal:
+            data.update(self.journal.pending_changes(safe_filename))
+        return data
+
+    def _read_file(self, file_path):
+        """Read a claim file; returns None if it isn't valid JSON."""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 return json.load(f)
@@ -81,6 +191,9 @@ class FilePersistenceHandler:
         Returns:
             list: Sorted list of claim numbers
         """
+        if self.index:
+            return self.index.all_claim_numbers()
+
         claim_numbers = []
 
         for file_path in self.base_dir.glob('*.json'):
@@ -106,12 +219,98 @@ class FilePersistenceHandler:
         safe_filename = self._sanitize_filename(claim_number)
         file_path = self.base_dir / f"{safe_filename}.json"
 
+        if self.journal and self.journal.has_pending_changes(safe_filename):
+            self.compact_journal()
+
+        if self.index:
+            self.index.remove(safe_filename)
+
         if file_path.exists():
             file_path.unlink()
             return True
 
         return False
 
+    def get_modification_times(self):
+        """
+        Get the modification time of every claim file.
+
+        Returns:
+            dict: Claim number -> file mtime
+        """
+        mtimes = {}
+        with os.scandir(self.base_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.json') and entry.is_file():
+                    mtimes[entry.name[:-len('.json')]] = entry.stat().st_mtime
+        return mtimes
+
+    def find_claims(self, limit=None, **filters):
+        """
+        Find claims through the claim index, most recently saved first.
+
+        Args:
+            limit: Maximum number of claims to return (None for all)
+            **filters: event_type, name_contains, date_from, date_to (see ClaimIndex.recent)
+
+        Returns:
+            list: Dictionaries with claim_number, event_type, full_name, event_date and mtime
+        """
+        if self.index:
+            return self.index.recent(limit, **filters)
+
+        # No persistent index: build a throwaway one from the files
+        index = ClaimIndex(':memory:')
+        try:
+            index.sync(self)
+            return index.recent(limit, **filters)
+        finally:
+            index.close()
+
+    def search_claims(self, query, limit=20):
+        """
+        Ranked full-text search through the claim index.
+
+        Args:
+            query: Free text, e.g. part of a name or a phrase from the circumstances
+            limit: Maximum number of claims to return (None for all)
+
+        Returns:
+            list: Dictionaries as from ClaimIndex.search, plus a 'snippet'
+        """
+        if not self.index:
+            return super().search_claims(query, limit)
+        return self._add_snippets(self.index.search(query, limit), query)
+
+    def suggest_claims(self, field, prefix, limit=10):
+        """
+        Autocomplete a claim, policy or license number through the claim index.
+
+        Args:
+            field: One of prefix_index.PREFIX_FIELDS
+            prefix: Text typed so far
+            limit: Maximum number of suggestions
+
+        Returns:
+            list: Dictionaries with claim_number and value, in key order
+        """
+        if not self.index:
+            return super().suggest_claims(field, prefix, limit)
+        return self.index.suggest(field, prefix, limit)
+
+    def referenced_blobs(self):
+        """
+        Attachment blob digests referenced by any claim, from the claim index.
+        The index is synced first, so files edited outside the app count too.
+
+        Returns:
+            set: Hex digests
+        """
+        if not self.index:
+            return super().referenced_blobs()
+        self.index.sync(self)
+        return self.index.referenced_digests()
+
     def _sanitize_filename(self, claim_number):
         """
         Sanitize claim number for use as filename.
@@ -148,3 +347,10 @@ class FilePersistenceHandler:
         file_path = self.base_dir / f"{safe_filename}.json"
 
         return file_path.exists()
+
+    def close(self):
+        """Close the claim index and the edit journal."""
+        if self.index:
+            self.index.close()
+        if self.journal:
+            self.journal.close()
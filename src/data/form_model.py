@@ -0,0 +1,212 @@
+# src/data/form_model.py
+"""
+Form field registry with a cached value model.
+Widgets report edits through their handler's change events, so saving,
+validating and snapshotting the form only reads back the fields that changed.
+Fields can also be declared before their widgets exist (tabs that are built
+lazily); values loaded into them are staged and applied when the widget arrives.
+"""
+from .widget_handlers import WidgetHandlerFactory
+
+
+class FormModel(dict):
+    """
+    Mapping of field name -> widget, as DataManager.form_data always was.
+
+    Registering a widget binds its change events and marks the field dirty.
+    current_values() reads only dirty fields from their widgets and serves
+    every other field from the cache.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._values = {}
+        self._dirty = set()
+        self._handlers = {}
+        # Declared fields without a widget yet: field name -> default value
+        self._pending_defaults = {}
+        # Fields left out of current_values(), e.g. on hidden tabs
+        self._inactive = frozenset()
+
+    def __setitem__(self, field_name, widget):
+        super().__setitem__(field_name, widget)
+        staged = self._values.get(field_name) if field_name in self._pending_defaults else None
+        self._pending_defaults.pop(field_name, None)
+        self._dirty.add(field_name)
+
+        try:
+            handler = WidgetHandlerFactory.get_handler(widget)
+        except ValueError:
+            handler = None
+            self._values.pop(field_name, None)
+        self._handlers[field_name] = handler
+
+        if handler is not None:
+            try:
+                handler.bind_change(widget, lambda: self._on_widget_changed(field_name, widget))
+            except Exception as e:
+                # Without change events the field is simply read on every refresh
+                print(f"Cannot watch {field_name} for changes: {e}")
+                self._handlers[field_name] = _UnwatchedHandler(handler)
+
+            if staged:
+                try:
+                    handler.set_value(widget, staged)
+                except Exception as e:
+                    print(f"Error applying staged value for {field_name}: {e}")
+
+    def __delitem__(self, field_name):
+        super().__delitem__(field_name)
+        self._forget(field_name)
+
+    def pop(self, field_name, *default):
+        if field_name in self:
+            self._forget(field_name)
+        return super().pop(field_name, *default)
+
+    def clear(self):
+        super().clear()
+        self._values.clear()
+        self._dirty.clear()
+        self._handlers.clear()
+        self._pending_defaults.clear()
+
+    def update(self, *args, **kwargs):
+        for field_name, widget in dict(*args, **kwargs).items():
+            self[field_name] = widget
+
+    def setdefault(self, field_name, widget=None):
+        if field_name not in self:
+            self[field_name] = widget
+        return self[field_name]
+
+    def declare(self, field_name, default=''):
+        """
+        Declare a field whose widget will be created later.
+        Until then the field reports `default`, or whatever is staged for it.
+        A widget already registered under the name is dropped.
+
+        Args:
+            field_name: Field name
+            default: Value the widget will have when created
+        """
+        if dict.__contains__(self, field_name):
+            super().__delitem__(field_name)
+            self._handlers.pop(field_name, None)
+            self._dirty.discard(field_name)
+        self._pending_defaults[field_name] = default
+        self._values[field_name] = default
+
+    def is_pending(self, field_name):
+        """True if the field is declared but its widget doesn't exist yet."""
+        return field_name in self._pending_defaults
+
+    def has_field(self, field_name):
+        """True for fields with a widget and for declared fields."""
+        return field_name in self or field_name in self._pending_defaults
+
+    def stage(self, field_name, value):
+        """
+        Set a pending field's value; it is applied to the widget once created.
+
+        Args:
+            field_name: A field for which is_pending() is True
+            value: Value to stage
+        """
+        if field_name not in self._pending_defaults:
+            raise KeyError(field_name)
+        self._values[field_name] = value
+
+    def reset_pending(self):
+        """Put every pending field back to its declared default."""
+        for field_name, default in self._pending_defaults.items():
+            self._values[field_name] = default
+
+    def set_inactive(self, field_names):
+        """
+        Leave fields out of current_values() while keeping their widgets and values.
+
+        Args:
+            field_names: Every field that should be inactive (replaces the previous set)
+        """
+        self._inactive = frozenset(field_names)
+
+    @property
+    def dirty_fields(self):
+        """Names of fields whose widgets must be read on the next refresh."""
+        return frozenset(self._dirty)
+
+    def mark_dirty(self, field_name):
+        """Note that a field's widget may hold a new value."""
+        if field_name in self:
+            self._dirty.add(field_name)
+
+    def mark_all_dirty(self):
+        """Force every field to be read again, e.g. after a bulk change."""
+        self._dirty.update(self.keys())
+
+    def current_values(self):
+        """
+        Returns:
+            dict: Field name -> current value for every active supported widget
+        """
+        self.refresh()
+        if not self._inactive:
+            return dict(self._values)
+        return {key: value for key, value in self._values.items() if key not in self._inactive}
+
+    def current_value(self, field_name, default=''):
+        """
+        Args:
+            field_name: Field to read
+            default: Returned for unknown or unreadable fields
+
+        Returns:
+            The field's current value
+        """
+        if field_name in self._dirty:
+            self._read(field_name)
+        return self._values.get(field_name, default)
+
+    def refresh(self):
+        """Read back every dirty field (and every unwatched one) from its widget."""
+        for field_name in list(self._dirty):
+            self._read(field_name)
+        for field_name, handler in self._handlers.items():
+            if isinstance(handler, _UnwatchedHandler):
+                self._read(field_name)
+
+    def _read(self, field_name):
+        self._dirty.discard(field_name)
+        handler = self._handlers.get(field_name)
+        if handler is None:
+            print(f"Skipping unsupported widget type for {field_name}")
+            return
+        try:
+            self._values[field_name] = handler.get_value(self[field_name])
+        except Exception as e:
+            print(f"Error getting value for {field_name}: {e}")
+            self._values.pop(field_name, None)
+            # Try again next time rather than serving a stale value
+            self._dirty.add(field_name)
+
+    def _on_widget_changed(self, field_name, widget):
+        # Ignore events from a widget that has since been replaced
+        if dict.get(self, field_name) is widget:
+            self._dirty.add(field_name)
+
+    def _forget(self, field_name):
+        self._values.pop(field_name, None)
+        self._dirty.discard(field_name)
+        self._handlers.pop(field_name, None)
+        self._pending_defaults.pop(field_name, None)
+
+
+class _UnwatchedHandler:
+    """Wraps the handler of a widget whose change events could not be bound."""
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    def get_value(self, widget):
+        return self.handler.get_value(widget)
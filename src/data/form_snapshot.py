@@ -0,0 +1,121 @@
+# src/data/form_snapshot.py
+"""
+Immutable snapshot of the form's values.
+Holds plain strings only, so report generation can run away from the Tk
+thread, be sent to worker processes and be cached by value. Structured values
+(such as the investigation_qa list) are kept as JSON text.
+"""
+import json
+from collections.abc import Mapping
+
+
+class FormSnapshot(Mapping):
+    """
+    Read-only, hashable mapping of field names to string values.
+
+    Missing fields read as empty strings through get(), matching what an
+    empty widget would return.
+    """
+
+    __slots__ = ('_values', '_hash')
+
+    def __init__(self, values=None):
+        """
+        Args:
+            values: Mapping of field names to plain values. None values become '',
+                lists and dicts JSON text ('' when empty).
+        """
+        normalized = {}
+        for key, value in (values or {}).items():
+            if isinstance(value, (list, dict)):
+                value = json.dumps(value, ensure_ascii=False) if value else None
+            normalized[str(key)] = '' if value is None else str(value)
+        object.__setattr__(self, '_values', normalized)
+        object.__setattr__(self, '_hash', None)
+
+    @classmethod
+    def from_widgets(cls, form_data):
+        """
+        Build a snapshot by reading each widget once through its handler.
+        Entries that are already plain values are kept as they are.
+
+        Args:
+            form_data: Mapping of field names to widgets or plain values
+
+        Returns:
+            FormSnapshot: The captured values
+        """
+        # Imported here so worker processes never need the widget layer
+        from .widget_handlers import WidgetHandlerFactory
+
+        values = {}
+        for key, widget in form_data.items():
+            if widget is None or isinstance(widget, (str, int, float, list, dict)):
+                values[key] = widget
+                continue
+            try:
+                handler = WidgetHandlerFactory.get_handler(widget)
+                values[key] = handler.get_value(widget)
+            except ValueError:
+                # Unsupported widget type, skip it
+                print(f"Skipping unsupported widget type for {key}")
+            except Exception as e:
+                print(f"Error getting value for {key}: {e}")
+        return cls(values)
+
+    @classmethod
+    def coerce(cls, form_data):
+        """
+        Return form_data as a snapshot, reading widgets if needed.
+
+        Args:
+            form_data: A FormSnapshot, or a mapping of widgets or plain values
+        """
+        if isinstance(form_data, cls):
+            return form_data
+        return cls.from_widgets(form_data or {})
+
+    def get(self, key, default=''):
+        """Get a field's value, or default if the field is missing."""
+        return self._values.get(key, default)
+
+    def replace(self, **changes):
+        """Return a new snapshot with some fields changed."""
+        values = dict(self._values)
+        values.update(changes)
+        return FormSnapshot(values)
+
+    def to_dict(self):
+        """Return a mutable copy of the values, e.g. for saving as JSON."""
+        return dict(self._values)
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __hash__(self):
+        if self._hash is None:
+            object.__setattr__(self, '_hash', hash(frozenset(self._values.items())))
+        return self._hash
+
+    def __eq__(self, other):
+        if isinstance(other, FormSnapshot):
+            return self._values == other._values
+        return NotImplemented
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FormSnapshot is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("FormSnapshot is immutable")
+
+    def __reduce__(self):
+        return (FormSnapshot, (self._values,))
+
+    def __repr__(self):
+        return f"FormSnapshot({self._values!r})"
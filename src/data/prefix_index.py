@@ -0,0 +1,132 @@
+# src/data/prefix_index.py
+"""
+In-memory prefix index over short claim identifiers, for autocomplete.
+Each field's keys are kept in a sorted list, so a lookup is a binary search
+plus a short scan however many claims are saved, and a saved claim's
+entries are moved with single insorts. ClaimIndex also keeps the entries in
+SQLite, so loading the index is one sorted query per field.
+"""
+import bisect
+
+# Claim fields offered for autocomplete
+PREFIX_FIELDS = ('claim_number', 'policy_number', 'vehicle_license_number')
+
+# Typed differently from claim to claim (12-345-67, 12 345 67, 1234567)
+_DROP_SEPARATORS = str.maketrans('', '', ' \t\r\n-./\\')
+
+
+def normalize_key(value):
+    """
+    Args:
+        value: An identifier as typed (None is treated as empty)
+
+    Returns:
+        str: The identifier upper-cased and without separators
+    """
+    if value is None:
+        return ''
+    return str(value).translate(_DROP_SEPARATORS).upper()
+
+
+def make_entries(claim_number, values, fields=PREFIX_FIELDS):
+    """
+    Index entries of one claim.
+
+    Args:
+        claim_number: The claim's number (its storage key)
+        values: Dict with (some of) the indexed fields
+        fields: Fields to make entries for
+
+    Returns:
+        list: (field, (key, claim_number, value)) pairs for the non-empty fields
+    """
+    entries = []
+    for field in fields:
+        value = values.get(field)
+        if not value:
+            continue
+        value = str(value).strip()
+        key = value.translate(_DROP_SEPARATORS).upper()
+        if key:
+            entries.append((field, (key, claim_number, value)))
+    return entries
+
+
+class PrefixIndex:
+    """Sorted (key, claim number, original value) entries per field."""
+
+    def __init__(self, fields=PREFIX_FIELDS):
+        """
+        Args:
+            fields: Names of the fields to index
+        """
+        self.fields = tuple(fields)
+        self._entries = {field: [] for field in self.fields}
+
+    def load(self, field, entries):
+        """
+        Set all of a field's entries at once.
+
+        Args:
+            field: One of the indexed fields
+            entries: (key, claim_number, value) tuples as from make_entries(),
+                already sorted
+        """
+        self._entries[field] = list(entries)
+
+    def build(self, records):
+        """
+        Index many claims at once; faster than inserting them one at a time.
+
+        Args:
+            records: Iterable of (claim_number, values) pairs
+        """
+        for claim_number, values in records:
+            for field, entry in make_entries(claim_number, values, self.fields):
+                self._entries[field].append(entry)
+        for entries in self._entries.values():
+            entries.sort()
+
+    def insert(self, field, entry):
+        """
+        Add one entry, keeping the field's entries sorted.
+
+        Args:
+            field: One of the indexed fields
+            entry: (key, claim_number, value) tuple as from make_entries()
+        """
+        bisect.insort(self._entries[field], entry)
+
+    def discard(self, field, entry):
+        """Remove one entry if present."""
+        entries = self._entries[field]
+        position = bisect.bisect_left(entries, entry)
+        if position < len(entries) and entries[position] == entry:
+            del entries[position]
+
+    def suggest(self, field, prefix, limit=10):
+        """
+        Claims whose field starts with a prefix, in key order.
+
+        Args:
+            field: One of the indexed fields
+            prefix: Text typed so far (normalized like the keys)
+            limit: Maximum number of suggestions
+
+        Returns:
+            list: Dictionaries with claim_number and value (the field as saved)
+        """
+        key = normalize_key(prefix)
+        entries = self._entries.get(field)
+        if not key or not entries:
+            return []
+
+        suggestions = []
+        position = bisect.bisect_left(entries, (key,))
+        while position < len(entries) and len(suggestions) < limit:
+            entry_key, claim_number, value = entries[position]
+            if not entry_key.startswith(key):
+                break
+            suggestions.append({'claim_number': claim_number, 'value': value})
+            position += 1
+        return suggestions
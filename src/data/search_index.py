@@ -0,0 +1,167 @@
+# src/data/search_index.py
+"""
+Hebrew-aware text normalization for full-text search over claims.
+The claim index stores normalized text in an SQLite FTS5 table; queries are
+normalized the same way, so final letters, niqqud, geresh and gershayim never
+get in the way of a match (צד ג' matches צד ג, נח"ל matches נחל).
+"""
+import re
+
+# Claim fields indexed for search, in FTS column order, with their bm25 weights
+SEARCH_COLUMNS = (
+    ('full_name', 5.0),
+    ('third_party_name', 5.0),
+    ('details', 3.0),
+    ('circumstances', 1.0),
+    ('investigation', 1.0),
+    ('summary', 1.0),
+)
+
+# Short identifying fields searched together as the 'details' column
+DETAIL_FIELDS = (
+    'claim_number', 'policy_number', 'event_type', 'vehicle_license_number',
+    'vehicle_company', 'vehicle_model', 'third_party_policy_number',
+)
+
+# Fields a result snippet is taken from, in order of preference
+SNIPPET_FIELDS = ('circumstances', 'investigation', 'summary', 'full_name', 'third_party_name')
+
+# Prepositions and conjunctions written attached to the following word
+# (ו, ה, ב, כ, ל, מ, ש), e.g. מהצפה = מ + ה + הצפה
+PREFIX_LETTERS = frozenset('והבכלמש')
+
+_FINAL_LETTERS = {'ך': 'כ', 'ם': 'מ', 'ן': 'נ', 'ף': 'פ', 'ץ': 'צ'}
+
+# Geresh / gershayim and the ASCII and typographic quotes typed in their place
+_DELETED_MARKS = '\'"`\u05f3\u05f4\u2018\u2019\u201c\u201d'
+
+# Hebrew points and cantillation marks (U+0591-U+05C7), except punctuation
+_HEBREW_PUNCTUATION = '\u05be\u05c0\u05c3\u05c6'
+_NIQQUD = [chr(c) for c in range(0x0591, 0x05C8) if chr(c) not in _HEBREW_PUNCTUATION]
+
+_TRANSLATION = str.maketrans({
+    **_FINAL_LETTERS,
+    **{mark: None for mark in _DELETED_MARKS},
+    **{point: None for point in _NIQQUD},
+    '\u05be': ' ',  # maqaf
+    '\u05c0': ' ',  # paseq
+    '\u05c3': ' ',  # sof pasuq
+})
+
+# FTS5's unicode61 tokenizer splits on anything but letters and digits
+_TOKEN_PATTERN = re.compile(r'[^\W_]+')
+
+
+def normalize_hebrew(text):
+    """
+    Normalize text for indexing and searching.
+
+    Args:
+        text: Any text (None is treated as empty)
+
+    Returns:
+        str: Lower-cased text with final letters replaced by their regular
+            forms and niqqud, geresh and gershayim removed
+    """
+    if not text:
+        return ''
+    return str(text).translate(_TRANSLATION).lower()
+
+
+def query_tokens(query):
+    """Split a search query into normalized tokens."""
+    return _TOKEN_PATTERN.findall(normalize_hebrew(query))
+
+
+def build_match_query(query):
+    """
+    Build an FTS5 MATCH expression: every token must appear, as a word prefix.
+
+    Args:
+        query: Free text typed by the user
+
+    Returns:
+        str: MATCH expression, or '' if the query has no searchable tokens
+    """
+    return ' '.join(f'"{token}"*' for token in query_tokens(query))
+
+
+def search_columns(data):
+    """
+    Args:
+        data: A claim's saved data dictionary
+
+    Returns:
+        tuple: Normalized text for each of SEARCH_COLUMNS
+    """
+    data = data or {}
+    details = ' '.join(str(data.get(field) or '') for field in DETAIL_FIELDS)
+    values = {'details': details}
+    return tuple(
+        _with_prefix_variants(normalize_hebrew(values[name] if name in values else data.get(name)))
+        for name, _ in SEARCH_COLUMNS
+    )
+
+
+def _with_prefix_variants(text):
+    """
+    Append each word with up to two attached prefix letters stripped, so that
+    searching for הצפה also finds מהצפה. Stripping stops at three letters.
+    """
+    variants = []
+    for token in _TOKEN_PATTERN.findall(text):
+        for stripped in range(1, 3):
+            if len(token) - stripped < 3 or token[stripped - 1] not in PREFIX_LETTERS:
+                break
+            variants.append(token[stripped:])
+    if not variants:
+        return text
+    return text + ' ' + ' '.join(variants)
+
+
+def make_snippet(data, query, width=80):
+    """
+    Excerpt of a claim's original text around the first match of a query.
+
+    Args:
+        data: The claim's saved data dictionary
+        query: The search query
+        width: Approximate snippet length in characters
+
+    Returns:
+        str: The excerpt, or '' if no snippet field matches
+    """
+    tokens = query_tokens(query)
+    if not tokens or not data:
+        return ''
+
+    prefixes = ''.join(sorted(PREFIX_LETTERS))
+    pattern = re.compile('|'.join(
+        rf'(?<![^\W_])[{prefixes}]{{0,2}}' + re.escape(token) for token in tokens
+    ))
+    for field in SNIPPET_FIELDS:
+        text = str(data.get(field) or '')
+        if not pattern.search(normalize_hebrew(text)):
+            continue
+
+        # Map the match back to the original, un-normalized text
+        normalized, positions = _normalize_with_positions(text)
+        start = positions[pattern.search(normalized).start()]
+        begin = max(0, start - width // 3)
+        end = min(len(text), begin + width)
+        excerpt = ' '.join(text[begin:end].split())
+        return ('…' if begin > 0 else '') + excerpt + ('…' if end < len(text) else '')
+    return ''
+
+
+def _normalize_with_positions(text):
+    """Normalize text, keeping the original index of every normalized character."""
+    chars, positions = [], []
+    for index, char in enumerate(text):
+        mapped = _TRANSLATION.get(ord(char), char)
+        if mapped is None:
+            continue
+        for normalized_char in mapped.lower():
+            chars.append(normalized_char)
+            positions.append(index)
+    return ''.join(chars), positions
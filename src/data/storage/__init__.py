@@ -0,0 +1,39 @@
+# src/data/storage/__init__.py
+"""
+Storage backends for saved claims.
+Every backend implements the StorageBackend interface (the FilePersistenceHandler API).
+"""
+
+from .base_backend import StorageBackend
+from .sqlite_backend import SQLiteStorageBackend
+
+
+def create_storage_backend(kind='json', location=None):
+    """
+    Create a storage backend by name.
+
+    Args:
+        kind: 'json' for one file per claim (the default) or 'sqlite' for a single database
+        location: Directory (json) or database file (sqlite); None for the default
+
+    Returns:
+        StorageBackend: The new backend
+
+    Raises:
+        ValueError: If kind is not supported
+    """
+    if kind == 'json':
+        # Imported here to avoid circular imports
+        from ..file_persistence import FilePersistenceHandler
+        return FilePersistenceHandler(location or 'saved_data')
+
+    if kind == 'sqlite':
+        return SQLiteStorageBackend(location or 'saved_data.sqlite3')
+
+    raise ValueError(
+        f"Unsupported storage backend: {kind}. "
+        f"Supported backends: json, sqlite"
+    )
+
+
+__all__ = ['StorageBackend', 'SQLiteStorageBackend', 'create_storage_backend']
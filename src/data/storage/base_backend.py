@@ -0,0 +1,208 @@
+# src/data/storage/base_backend.py
+"""
+Base class for claim storage backends.
+"""
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+
+class StorageBackend(ABC):
+    """
+    Abstract base class for claim storage.
+    Every backend stores one data dictionary per claim number and keeps the
+    FilePersistenceHandler API, so callers can switch backends freely.
+    """
+
+    @abstractmethod
+    def save_by_claim_number(self, claim_number: str, data: Dict[str, Any]) -> Any:
+        """
+        Save a claim's data, replacing any previous version.
+
+        Args:
+            claim_number: Claim number to save under
+            data: Dictionary of data to save
+
+        Raises:
+            ValueError: If claim number is empty
+        """
+        pass
+
+    @abstractmethod
+    def load_by_claim_number(self, claim_number: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a claim's data.
+
+        Args:
+            claim_number: Claim number to load
+
+        Returns:
+            The saved data, or None if there is none
+        """
+        pass
+
+    @abstractmethod
+    def delete_by_claim_number(self, claim_number: str) -> bool:
+        """
+        Delete a claim's data.
+
+        Args:
+            claim_number: Claim number to delete
+
+        Returns:
+            True if deleted, False if it didn't exist
+        """
+        pass
+
+    @abstractmethod
+    def file_exists(self, claim_number: str) -> bool:
+        """
+        Check whether data is saved for a claim number.
+
+        Args:
+            claim_number: Claim number to check
+        """
+        pass
+
+    @abstractmethod
+    def get_all_claim_numbers(self) -> List[str]:
+        """
+        Returns:
+            Sorted list of all saved claim numbers
+        """
+        pass
+
+    @abstractmethod
+    def get_modification_times(self) -> Dict[str, float]:
+        """
+        Returns:
+            Mapping of every saved claim number to its last modification time
+        """
+        pass
+
+    @abstractmethod
+    def find_claims(self, limit: Optional[int] = None, **filters) -> List[Dict[str, Any]]:
+        """
+        Find claims, most recently saved first.
+
+        Args:
+            limit: Maximum number of claims to return (None for all)
+            **filters: event_type, name_contains, date_from, date_to (see ClaimIndex.recent)
+
+        Returns:
+            Dictionaries with claim_number, event_type, full_name, event_date and mtime
+        """
+        pass
+
+    def save_changes(self, claim_number: str, changes: Dict[str, Any]) -> Any:
+        """
+        Save only the fields that changed since the claim was last saved.
+        The default merges them into the stored record; backends with a
+        cheaper incremental path (e.g. an edit journal) override this.
+
+        Args:
+            claim_number: Claim number to update
+            changes: Dictionary of changed field values
+        """
+        data = self.load_by_claim_number(claim_number) or {}
+        data.update(changes)
+        return self.save_by_claim_number(claim_number, data)
+
+    @contextmanager
+    def batch(self) -> Iterator['StorageBackend']:
+        """
+        Group the saves made inside the block, for callers saving many claims.
+        This default writes each save as it is made; backends that can write
+        a group more cheaply (one transaction, one journal fsync) override it.
+        """
+        yield self
+
+    def search_claims(self, query: str, limit: Optional[int] = 20) -> List[Dict[str, Any]]:
+        """
+        Ranked full-text search over the claims' names and free-text fields.
+        This default builds a throwaway in-memory index; backends with a
+        persistent claim index override it.
+
+        Args:
+            query: Free text, e.g. part of a name or a phrase from the circumstances
+            limit: Maximum number of claims to return (None for all)
+
+        Returns:
+            Dictionaries as from ClaimIndex.search, plus a 'snippet' of matching text
+        """
+        from ..claim_index import ClaimIndex
+
+        index = ClaimIndex(':memory:')
+        try:
+            index.sync(self)
+            return self._add_snippets(index.search(query, limit), query)
+        finally:
+            index.close()
+
+    def suggest_claims(self, field: str, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Autocomplete a claim, policy or license number.
+        This default scans every record; backends with a persistent claim
+        index override it.
+
+        Args:
+            field: One of prefix_index.PREFIX_FIELDS
+            prefix: Text typed so far
+            limit: Maximum number of suggestions
+
+        Returns:
+            Dictionaries with claim_number and value, in key order
+        """
+        from ..prefix_index import PrefixIndex
+
+        index = PrefixIndex()
+        index.build(
+            (claim_number, dict(data, claim_number=claim_number))
+            for claim_number, data in self.iter_records()
+        )
+        return index.suggest(field, prefix, limit)
+
+    def referenced_blobs(self) -> Set[str]:
+        """
+        Digests of every attachment blob the saved claims reference, for the
+        blob store's garbage collection. This default scans every record;
+        backends with a persistent claim index override it.
+        """
+        from ..blob_store import referenced_digests
+
+        digests = set()
+        for _, data in self.iter_records():
+            digests |= referenced_digests(data)
+        return digests
+
+    def _add_snippets(self, results: List[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
+        """Add a snippet of each result's original text around the match."""
+        from ..search_index import make_snippet
+
+        for result in results:
+            data = self.load_by_claim_number(result['claim_number'])
+            result['snippet'] = make_snippet(data, query)
+        return results
+
+    def get_recent_claim_numbers(self, limit: Optional[int] = 10) -> List[str]:
+        """
+        Get claim numbers ordered from most to least recently saved.
+
+        Args:
+            limit: Maximum number of claims to return (None for all)
+        """
+        return [claim['claim_number'] for claim in self.find_claims(limit=limit)]
+
+    def iter_records(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Iterate over every saved claim as (claim_number, data) pairs.
+        Backends may override this with a faster bulk read.
+        """
+        for claim_number in self.get_all_claim_numbers():
+            data = self.load_by_claim_number(claim_number)
+            if data is not None:
+                yield claim_number, data
+
+    def close(self) -> None:
+        """Release any open resources."""
+        pass
@@ -0,0 +1,316 @@
+# src/data/storage/sqlite_backend.py
+"""
+SQLite storage backend.
+Keeps every claim as a compact JSON row in a single database file, which is
+far friendlier to shared drives, backups and antivirus scans than tens of
+thousands of small files.
+
+One-shot import of an existing saved_data/ directory:
+    python -m src.data.storage.sqlite_backend --import-dir saved_data --db saved_data.sqlite3
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from ..claim_index import ClaimIndex
+from .base_backend import StorageBackend
+
+
+class SQLiteStorageBackend(StorageBackend):
+    """Stores claims in one SQLite file in WAL mode, with batched writes."""
+
+    def __init__(self, db_path='saved_data.sqlite3'):
+        """
+        Open (or create) the database.
+
+        Args:
+            db_path: Path of the SQLite file
+        """
+        self.db_path = str(db_path)
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._pending_index_entries = []
+
+        # Autocommit mode; batch() opens explicit transactions
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS claim_records (
+                claim_number TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                mtime REAL NOT NULL
+            )
+        ''')
+
+        # The claim index lives in the same file and shares the connection, so
+        # a claim and its index entry are written in one transaction
+        self.index = ClaimIndex(self.db_path, connection=self._conn, lock=self._lock)
+        self.index.sync(self)
+
+    def save_by_claim_number(self, claim_number, data):
+        """
+        Save data for a claim number.
+
+        Args:
+            claim_number: Claim number to save under
+            data: Dictionary of data to save
+
+        Returns:
+            str: The claim number the data was saved under
+        """
+        if not claim_number:
+            raise ValueError("Claim number cannot be empty")
+
+        claim_number = str(claim_number)
+        self._write(claim_number, data, time.time())
+        return claim_number
+
+    def save_many(self, items):
+        """
+        Save many claims in a single transaction.
+
+        Args:
+            items: Iterable of (claim_number, data) pairs
+
+        Returns:
+            int: Number of claims saved
+        """
+        count = 0
+        with self.batch():
+            for claim_number, data in items:
+                self.save_by_claim_number(claim_number, data)
+                count += 1
+        return count
+
+    @contextmanager
+    def batch(self):
+        """
+        Group every save and delete made inside the block into one
+        transaction, index updates included. Nested batches join the outermost one.
+        The batch holds the connection's lock throughout, so other threads
+        wait for it to finish instead of writing into its transaction.
+        """
+        with self._lock:
+            if self._batch_depth == 0:
+                self._conn.execute('BEGIN')
+            self._batch_depth += 1
+
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._rollback()
+                raise
+
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                try:
+                    self._flush_index()
+                except BaseException:
+                    self._rollback()
+                    raise
+                self._conn.execute('COMMIT')
+
+    def _flush_index(self):
+        """Write the index entries of the batch's saves, inside its transaction."""
+        entries, self._pending_index_entries = self._pending_index_entries, []
+        if entries:
+            self.index.update_many(entries)
+
+    def _rollback(self):
+        self._pending_index_entries = []
+        self._conn.execute('ROLLBACK')
+        # The in-memory prefix index may hold keys that were rolled back
+        self.index.discard_cached_keys()
+
+    def load_by_claim_number(self, claim_number):
+        """
+        Load data for a claim number.
+
+        Args:
+            claim_number: Claim number to load
+
+        Returns:
+            dict: Loaded data or None if not found
+        """
+        if not claim_number:
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data FROM claim_records WHERE claim_number = ?', (str(claim_number),)
+            ).fetchone()
+        if row is None:
+            return None
+
+        try:
+            return json.loads(row[0])
+        except json.JSONDecodeError:
+            return None
+
+    def delete_by_claim_number(self, claim_number):
+        """
+        Delete saved data for a claim number.
+
+        Args:
+            claim_number: Claim number to delete
+
+        Returns:
+            bool: True if deleted, False if didn't exist
+        """
+        if not claim_number:
+            return False
+
+        with self._lock, self.batch():
+            cursor = self._conn.execute(
+                'DELETE FROM claim_records WHERE claim_number = ?', (str(claim_number),)
+            )
+            # A save of this claim earlier in the batch must not re-add it afterwards
+            self._flush_index()
+            self.index.remove(str(claim_number))
+        return cursor.rowcount > 0
+
+    def file_exists(self, claim_number):
+        """
+        Check if data is saved for the given claim number.
+
+        Args:
+            claim_number: Claim number to check
+
+        Returns:
+            bool: True if saved
+        """
+        if not claim_number:
+            return False
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT 1 FROM claim_records WHERE claim_number = ?', (str(claim_number),)
+            ).fetchone()
+        return row is not None
+
+    def get_all_claim_numbers(self):
+        """
+        Returns:
+            list: Sorted list of claim numbers
+        """
+        with self._lock:
+            rows = self._conn.execute('SELECT claim_number FROM claim_records ORDER BY claim_number')
+            return [row[0] for row in rows]
+
+    def get_modification_times(self):
+        """
+        Returns:
+            dict: Claim number -> time of its last save
+        """
+        with self._lock:
+            return dict(self._conn.execute('SELECT claim_number, mtime FROM claim_records'))
+
+    def find_claims(self, limit=None, **filters):
+        """Find claims through the claim index, most recently saved first."""
+        return self.index.recent(limit, **filters)
+
+    def search_claims(self, query, limit=20):
+        """Ranked full-text search through the claim index, with snippets."""
+        return self._add_snippets(self.index.search(query, limit), query)
+
+    def suggest_claims(self, field, prefix, limit=10):
+        """Autocomplete a claim, policy or license number through the prefix index."""
+        return self.index.suggest(field, prefix, limit)
+
+    def referenced_blobs(self):
+        """Attachment blob digests referenced by any claim, from the claim index."""
+        return self.index.referenced_digests()
+
+    def iter_records(self):
+        """Iterate over every claim as (claim_number, data) pairs in one query."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT claim_number, data FROM claim_records ORDER BY claim_number'
+            ).fetchall()
+        for claim_number, payload in rows:
+            try:
+                yield claim_number, json.loads(payload)
+            except json.JSONDecodeError:
+                continue
+
+    def import_json_directory(self, json_dir, chunk_size=1000):
+        """
+        Import every <claim_number>.json file from a directory, keeping each
+        file's mtime as the claim's save time.
+
+        Args:
+            json_dir: Directory in the FilePersistenceHandler layout
+            chunk_size: Number of claims per transaction
+
+        Returns:
+            tuple: (number imported, list of file names that could not be read)
+        """
+        imported, skipped = 0, []
+        with os.scandir(json_dir) as entries:
+            paths = sorted(e.path for e in entries if e.name.endswith('.json') and e.is_file())
+
+        for start in range(0, len(paths), chunk_size):
+            with self.batch():
+                for path in paths[start:start + chunk_size]:
+                    try:
+                        with open(path, 'r', encoding='utf-8') as f:
+                            data = json.load(f)
+                    except (OSError, json.JSONDecodeError):
+                        skipped.append(os.path.basename(path))
+                        continue
+                    claim_number = os.path.basename(path)[:-len('.json')]
+                    self._write(claim_number, data, os.path.getmtime(path))
+                    imported += 1
+
+        return imported, skipped
+
+    def close(self):
+        """Close the database connection."""
+        self.index.close()
+        with self._lock:
+            self._conn.close()
+
+    def _write(self, claim_number, data, mtime):
+        """
+        Write one row in a batch (the open one, if any); its index entry is
+        written with the rest of the batch's, just before the commit.
+        """
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        with self._lock, self.batch():
+            self._conn.execute(
+                'INSERT OR REPLACE INTO claim_records VALUES (?, ?, ?)',
+                (claim_number, payload, mtime)
+            )
+            self._pending_index_entries.append((claim_number, data, mtime))
+
+
+def main(argv=None):
+    """Import a saved_data/ directory into a SQLite database. Returns an exit code."""
+    parser = argparse.ArgumentParser(description="Import claim JSON files into a SQLite database.")
+    parser.add_argument('--import-dir', default='saved_data', help="Directory of claim JSON files")
+    parser.add_argument('--db', default='saved_data.sqlite3', help="SQLite database to import into")
+    args = parser.parse_args(argv)
+
+    backend = SQLiteStorageBackend(args.db)
+    try:
+        start = time.perf_counter()
+        imported, skipped = backend.import_json_directory(args.import_dir)
+        print(f"Imported {imported} claims into {args.db} in {time.perf_counter() - start:.2f}s")
+        for name in skipped:
+            print(f"SKIPPED {name}: unreadable JSON")
+    finally:
+        backend.close()
+
+    return 1 if skipped else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
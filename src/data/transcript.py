@@ -0,0 +1,342 @@
+# src/data/transcript.py
+"""
+Call transcript ingestion for the investigation field.
+A transcript text file is read in fixed-size chunks, split into speaker turns
+("חוקר: ...", "[00:01:23] דובר 2: ...") and folded into question/answer pairs:
+the investigator's turns are the questions, everyone else's the answers.
+Every stage is a generator, so memory is bounded by the longest single turn,
+not by the length of the call.
+
+Pairs are stored on the claim as the investigation_qa list and shown in the
+investigation field as "ש: ..." / "ת: ..." lines; parse_qa_text() reads them
+back from the field, so edits made there are what gets saved. TranscriptImport
+parses on a worker thread and hands pairs over through a bounded queue, for
+the Tk thread to insert a batch at a time.
+"""
+import codecs
+import itertools
+import queue
+import re
+import threading
+
+QUESTION_LABEL = 'ש'
+ANSWER_LABEL = 'ת'
+
+# Speaker labels that identify the investigator, compared in lower case
+INVESTIGATOR_LABELS = frozenset({
+    QUESTION_LABEL, 'חוקר', 'חוקרת', 'החוקר', 'החוקרת', 'שואל', 'שאלה',
+    'investigator', 'interviewer', 'q',
+})
+
+# Labels that identify the person being questioned
+INTERVIEWEE_LABELS = frozenset({
+    ANSWER_LABEL, 'מבוטח', 'מבוטחת', 'המבוטח', 'המבוטחת', 'נחקר', 'נחקרת', 'הנחקר', 'הנחקרת',
+    'עונה', 'תשובה', 'a',
+})
+
+READ_SIZE = 64 * 1024
+
+# Longer lines are split at a space, so a transcript without line breaks
+# is still read a piece at a time
+MAX_LINE_LENGTH = 64 * 1024
+
+# How far iter_qa_pairs looks for a known investigator label before it
+# settles for the first speaker
+LOOKAHEAD_TURNS = 50
+LOOKAHEAD_SIZE = 64 * 1024
+
+_TIMESTAMP = r'[\[(]?\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d+)?[\])]?'
+_LEADING_TIMESTAMP = re.compile(rf'^\s*{_TIMESTAMP}\s*(?:-\s*)?')
+
+# "speaker: text", the speaker being at most three words without sentence punctuation
+_TURN = re.compile(r'^(?P<speaker>[^\s:.,?!"\d[(][^:.,?!"]{0,29}?)\s*:\s*(?P<text>.*)$')
+
+# Subtitle-style noise: cue numbers and timestamp-only lines ("00:00:01,000 --> 00:00:04,000")
+_NOISE = re.compile(rf'\d+|{_TIMESTAMP}(?:\s*-->\s*{_TIMESTAMP})?')
+
+
+def open_transcript(path, encoding=None):
+    """
+    Open a transcript as text.
+
+    Args:
+        path: Transcript file path
+        encoding: Text encoding; by default UTF-8 (with or without a BOM), or
+            Windows-1255 for files that aren't valid UTF-8
+
+    Returns:
+        file object: Text stream; undecodable bytes read as U+FFFD
+    """
+    if encoding is None:
+        with open(path, 'rb') as f:
+            sample = f.read(READ_SIZE)
+        if sample.startswith(codecs.BOM_UTF8):
+            encoding = 'utf-8-sig'
+        elif sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            encoding = 'utf-16'
+        else:
+            try:
+                # The sample may end inside a character; final=False allows that
+                codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+                encoding = 'utf-8'
+            except UnicodeDecodeError:
+                encoding = 'cp1255'
+    return open(path, 'r', encoding=encoding, errors='replace')
+
+
+def iter_lines(stream):
+    """
+    Yield the lines of a text stream, reading READ_SIZE characters at a time.
+    Lines longer than MAX_LINE_LENGTH are yielded in pieces.
+
+    Args:
+        stream: Text file object
+    """
+    pending = ''
+    while True:
+        chunk = stream.read(READ_SIZE)
+        if not chunk:
+            break
+        lines = (pending + chunk).split('\n')
+        pending = lines.pop()
+        yield from lines
+        while len(pending) > MAX_LINE_LENGTH:
+            cut = pending.rfind(' ', 0, MAX_LINE_LENGTH)
+            if cut <= 0:
+                cut = MAX_LINE_LENGTH
+            yield pending[:cut]
+            pending = pending[cut:].lstrip(' ')
+    if pending:
+        yield pending
+
+
+def strip_timestamps(lines):
+    """
+    Drop cue numbers and timestamp-only lines, and leading timestamps from
+    the rest, as found in exported call transcripts and subtitles.
+
+    Args:
+        lines: Iterable of text lines
+    """
+    for line in lines:
+        line = line.strip()
+        if line and not _NOISE.fullmatch(line):
+            yield _LEADING_TIMESTAMP.sub('', line)
+
+
+def iter_turns(lines, labels=None):
+    """
+    Group lines into speaker turns.
+    A line starting with "speaker:" starts a turn; any other line continues
+    the current one.
+
+    Args:
+        lines: Iterable of text lines
+        labels: Only these speaker labels start turns (default: any label)
+
+    Yields:
+        tuple: (speaker, text); speaker is None for text before the first label
+    """
+    speaker, parts = None, []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        match = _TURN.match(line)
+        if match and len(match['speaker'].split()) <= 3 and (
+                labels is None or match['speaker'] in labels):
+            if parts:
+                yield speaker, '\n'.join(parts)
+            speaker = match['speaker']
+            parts = [match['text'].strip()] if match['text'].strip() else []
+        else:
+            parts.append(line)
+    if parts:
+        yield speaker, '\n'.join(parts)
+
+
+def iter_qa_pairs(turns, investigator=None):
+    """
+    Fold speaker turns into question/answer pairs.
+    Consecutive turns on the same side are joined. The first speaker with a
+    known label (see INVESTIGATOR_LABELS) within the first LOOKAHEAD_TURNS
+    turns (or LOOKAHEAD_SIZE characters) is the investigator. Without one,
+    the first speaker to talk after the interviewee - or the very first
+    speaker - is taken instead.
+
+    Args:
+        turns: Iterable of (speaker, text) from iter_turns()
+        investigator: The investigator's speaker label, if known
+
+    Yields:
+        dict: {'question': ..., 'answer': ...}; either may be empty
+    """
+    if investigator is None:
+        turns, investigator = _find_investigator(turns)
+
+    question, answer = [], []
+    for speaker, text in turns:
+        if speaker is not None and speaker == investigator:
+            if answer:
+                yield _pair(question, answer)
+                question, answer = [], []
+            question.append(text)
+        else:
+            answer.append(text)
+    if question or answer:
+        yield _pair(question, answer)
+
+
+def _find_investigator(turns):
+    """
+    Read a bounded number of turns ahead for a speaker with a known
+    investigator label.
+
+    Returns:
+        tuple: (the turns, including those read ahead, investigator label or None)
+    """
+    turns = iter(turns)
+    read = []
+    size = 0
+    guess = None
+    for speaker, text in turns:
+        read.append((speaker, text))
+        size += len(text)
+        if speaker is not None:
+            label = speaker.lower()
+            if label in INVESTIGATOR_LABELS:
+                return itertools.chain(read, turns), speaker
+            if guess is None and label not in INTERVIEWEE_LABELS:
+                guess = speaker
+        if len(read) >= LOOKAHEAD_TURNS or size >= LOOKAHEAD_SIZE:
+            break
+    return itertools.chain(read, turns), guess
+
+
+def _pair(question, answer):
+    return {'question': '\n'.join(question), 'answer': '\n'.join(answer)}
+
+
+def read_transcript(path, encoding=None, investigator=None):
+    """
+    Stream a transcript file's question/answer pairs.
+
+    Args:
+        path: Transcript file path
+        encoding: See open_transcript()
+        investigator: The investigator's speaker label, if known
+
+    Yields:
+        dict: {'question': ..., 'answer': ...} pairs in call order
+    """
+    with open_transcript(path, encoding) as stream:
+        yield from iter_qa_pairs(iter_turns(strip_timestamps(iter_lines(stream))), investigator)
+
+
+def format_pair(pair):
+    """
+    Args:
+        pair: {'question': ..., 'answer': ...}
+
+    Returns:
+        str: The pair as "ש: ..." / "ת: ..." lines for the investigation field,
+            ending with a blank line
+    """
+    lines = []
+    if pair.get('question'):
+        lines.append(f"{QUESTION_LABEL}: {pair['question']}")
+    if pair.get('answer'):
+        lines.append(f"{ANSWER_LABEL}: {pair['answer']}")
+    return '\n'.join(lines) + '\n\n'
+
+
+def parse_qa_text(text):
+    """
+    Read question/answer pairs back from the investigation field.
+    Only "ש:" and "ת:" start turns; other text stays part of the turn it is
+    in, or becomes an answer without a question when it comes first.
+
+    Args:
+        text: The investigation field's text
+
+    Returns:
+        list: Pairs as from iter_qa_pairs(), or [] if the text has no "ש:"/"ת:" lines
+    """
+    if not text or (f'{QUESTION_LABEL}:' not in text and f'{ANSWER_LABEL}:' not in text):
+        return []
+    turns = list(iter_turns(text.split('\n'), labels=(QUESTION_LABEL, ANSWER_LABEL)))
+    if all(speaker is None for speaker, _ in turns):
+        return []
+    return list(iter_qa_pairs(turns, investigator=QUESTION_LABEL))
+
+
+class TranscriptImport:
+    """
+    Reads a transcript on a background thread.
+    At most QUEUE_SIZE pairs wait for the consumer; the reader blocks until
+    poll() takes some, so memory stays bounded however long the call.
+    """
+
+    QUEUE_SIZE = 500
+
+    def __init__(self, path, encoding=None, investigator=None):
+        """
+        Args:
+            path: Transcript file path
+            encoding: See open_transcript()
+            investigator: The investigator's speaker label, if known
+        """
+        self.path = path
+        self.encoding = encoding
+        self.investigator = investigator
+        self.error = None
+        self._pairs = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self._finished = threading.Event()
+        self._cancel_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """Start reading in the background."""
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Stop reading; pairs already queued are dropped."""
+        self._cancel_event.set()
+
+    def poll(self, max_pairs):
+        """
+        Take the pairs read so far, without blocking.
+
+        Args:
+            max_pairs: Most pairs to return
+
+        Returns:
+            tuple: (list of pairs, done); done is True once every pair has
+                been returned. Check `error` when done.
+        """
+        pairs = []
+        while len(pairs) < max_pairs:
+            try:
+                pairs.append(self._pairs.get_nowait())
+            except queue.Empty:
+                break
+        done = self._finished.is_set() and self._pairs.empty()
+        return pairs, done
+
+    def _run(self):
+        """Worker thread body."""
+        try:
+            for pair in read_transcript(self.path, self.encoding, self.investigator):
+                while not self._cancel_event.is_set():
+                    try:
+                        self._pairs.put(pair, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if self._cancel_event.is_set():
+                    break
+        except Exception as e:
+            self.error = e
+        finally:
+            self._finished.set()
@@ -0,0 +1,308 @@
+# src/data/vehicle_catalog.py
+"""
+Vehicle catalog: manufacturer -> model -> year -> engine and gearbox details.
+The catalog is a read-only SQLite file built from a CSV export (see main()).
+It is opened on first lookup and memory-mapped, so tens of thousands of rows
+cost nothing at startup; the short manufacturer and model lists are cached.
+Without a catalog file the manufacturers come from Constants.CAR_MANUFACTURERS.
+
+Build it with:
+    python -m src.data.vehicle_catalog catalog.csv --output vehicle_catalog.sqlite3
+"""
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+from .constants import Constants
+from .search_index import normalize_hebrew
+
+# Catalog columns with the form fields they fill in
+SPEC_FIELDS = {
+    'engine_type': 'vehicle_engine_type',
+    'engine_capacity': 'vehicle_engine_capacity',
+    'engine_power': 'vehicle_engine_power',
+    'gearbox': 'vehicle_gearbox',
+}
+
+CSV_COLUMNS = ('manufacturer', 'model', 'year') + tuple(SPEC_FIELDS)
+
+# Bytes of the catalog file to memory-map
+MMAP_SIZE = 256 * 1024 * 1024
+
+
+def filter_names(names, typed, limit=None):
+    """
+    Names matching type-ahead text, those starting with it first.
+
+    Args:
+        names: List of (normalized, name) pairs, as cached by VehicleCatalog
+        typed: Text typed so far; matched ignoring case, final letters and geresh
+        limit: Maximum number of names (None for all)
+
+    Returns:
+        list: Matching names in their original order within each group
+    """
+    query = normalize_hebrew(typed).strip()
+    if not query:
+        matches = [name for _, name in names]
+    else:
+        starting = [name for normalized, name in names if normalized.startswith(query)]
+        containing = [
+            name for normalized, name in names
+            if query in normalized and not normalized.startswith(query)
+        ]
+        matches = starting + containing
+    return matches[:limit] if limit else matches
+
+
+class VehicleCatalog:
+    """Lazily opened, read-only vehicle catalog."""
+
+    DEFAULT_PATH = 'vehicle_catalog.sqlite3'
+
+    def __init__(self, path=DEFAULT_PATH):
+        """
+        Args:
+            path: Catalog file built by build_catalog(); it need not exist
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._manufacturers = None
+        self._models = {}  # manufacturer -> [(normalized, model)]
+
+    @property
+    def available(self):
+        """True if the catalog file exists."""
+        return self.path.is_file()
+
+    def _connection(self):
+        """Open the catalog on first use; call with the lock held. None if missing."""
+        if self._conn is None and self.available:
+            try:
+                self._conn = sqlite3.connect(
+                    f"{self.path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False
+                )
+                self._conn.execute(f'PRAGMA mmap_size = {MMAP_SIZE}')
+            except sqlite3.Error as e:
+                print(f"Cannot open vehicle catalog {self.path}: {e}")
+                self._conn = None
+        return self._conn
+
+    def manufacturers(self, typed='', limit=None):
+        """
+        Args:
+            typed: Type-ahead text to filter by
+            limit: Maximum number of names (None for all)
+
+        Returns:
+            list: Manufacturer names, sorted
+        """
+        with self._lock:
+            if self._manufacturers is None:
+                conn = self._connection()
+                if conn is None:
+                    names = Constants.CAR_MANUFACTURERS
+                else:
+                    names = [row[0] for row in conn.execute(
+                        'SELECT DISTINCT manufacturer FROM vehicles ORDER BY manufacturer'
+                    )]
+                self._manufacturers = [(normalize_hebrew(name), name) for name in names]
+            return filter_names(self._manufacturers, typed, limit)
+
+    def models(self, manufacturer, typed='', limit=None):
+        """
+        Args:
+            manufacturer: Manufacturer name as listed by manufacturers()
+            typed: Type-ahead text to filter by
+            limit: Maximum number of names (None for all)
+
+        Returns:
+            list: The manufacturer's model names, sorted ([] if unknown)
+        """
+        with self._lock:
+            models = self._models.get(manufacturer)
+            if models is None:
+                conn = self._connection()
+                names = [] if conn is None else [row[0] for row in conn.execute(
+                    'SELECT DISTINCT model FROM vehicles WHERE manufacturer = ? ORDER BY model',
+                    (manufacturer,)
+                )]
+                models = self._models[manufacturer] = [
+                    (normalize_hebrew(name), name) for name in names
+                ]
+            return filter_names(models, typed, limit)
+
+    def specs(self, manufacturer, model, year=None):
+        """
+        Catalog rows for a model, optionally for one manufacture year.
+        Rows without a year apply to every year.
+
+        Args:
+            manufacturer: Manufacturer name
+            model: Model name
+            year: Manufacture year (int or digit string); None or '' for all years
+
+        Returns:
+            list: Dictionaries with year and the SPEC_FIELDS columns
+        """
+        query = f"SELECT year, {', '.join(SPEC_FIELDS)} FROM vehicles WHERE manufacturer = ? AND model = ?"
+        params = [manufacturer, model]
+        year = str(year or '').strip()
+        if year:
+            if not year.isdigit():
+                return []
+            query += ' AND (year = ? OR year IS NULL)'
+            params.append(int(year))
+
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return []
+            rows = conn.execute(query, params).fetchall()
+        keys = ('year',) + tuple(SPEC_FIELDS)
+        return [dict(zip(keys, row)) for row in rows]
+
+    def common_specs(self, manufacturer, model, year=None):
+        """
+        Details shared by every catalog variant of a model, to fill into the form.
+        A detail that differs between variants (e.g. two engine sizes) is left out.
+
+        Args:
+            manufacturer: Manufacturer name
+            model: Model name
+            year: Manufacture year; None or '' for all years
+
+        Returns:
+            dict: Form field name (see SPEC_FIELDS) -> value
+        """
+        variants = self.specs(manufacturer, model, year)
+        if not variants:
+            return {}
+
+        filled = {}
+        for column, field_name in SPEC_FIELDS.items():
+            values = {variant[column] for variant in variants}
+            if len(values) == 1:
+                value = values.pop()
+                if value not in (None, ''):
+                    filled[field_name] = str(value)
+        return filled
+
+    def close(self):
+        """Close the catalog file if open."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._manufacturers = None
+            self._models.clear()
+
+
+def build_catalog(csv_path, output_path, chunk_size=5000):
+    """
+    Build a catalog file from a CSV with the CSV_COLUMNS header.
+    The CSV is streamed; the catalog is written to a temporary file and moved
+    into place, so a running app never sees a half-built catalog.
+
+    Args:
+        csv_path: UTF-8 CSV file (Excel's UTF-8 BOM is accepted)
+        output_path: Catalog file to create or replace
+        chunk_size: Rows inserted per executemany() call
+
+    Returns:
+        int: Number of rows in the catalog
+
+    Raises:
+        ValueError: If the CSV lacks the manufacturer or model column
+    """
+    output_path = Path(output_path)
+    temp_path = output_path.with_name(output_path.name + '.tmp')
+    if temp_path.exists():
+        temp_path.unlink()
+
+    conn = sqlite3.connect(temp_path)
+    try:
+        conn.execute('''
+            CREATE TABLE vehicles (
+                manufacturer TEXT NOT NULL,
+                model TEXT NOT NULL,
+                year INTEGER,
+                engine_type TEXT,
+                engine_capacity TEXT,
+                engine_power TEXT,
+                gearbox TEXT
+            )
+        ''')
+        count = 0
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            missing = {'manufacturer', 'model'} - set(reader.fieldnames or ())
+            if missing:
+                raise ValueError(f"CSV is missing columns: {', '.join(sorted(missing))}")
+
+            chunk = []
+            for record in reader:
+                row = _catalog_row(record)
+                if row is None:
+                    continue
+                chunk.append(row)
+                if len(chunk) >= chunk_size:
+                    conn.executemany('INSERT INTO vehicles VALUES (?, ?, ?, ?, ?, ?, ?)', chunk)
+                    count += len(chunk)
+                    chunk = []
+            conn.executemany('INSERT INTO vehicles VALUES (?, ?, ?, ?, ?, ?, ?)', chunk)
+            count += len(chunk)
+
+        # Serves manufacturers(), models() and specs() straight from the index
+        conn.execute('CREATE INDEX vehicles_by_model ON vehicles (manufacturer, model, year)')
+        conn.commit()
+        conn.execute('VACUUM')
+    except BaseException:
+        conn.close()
+        temp_path.unlink()
+        raise
+    conn.close()
+
+    os.replace(temp_path, output_path)
+    return count
+
+
+def _catalog_row(record):
+    """One CSV record as a vehicles row, or None if it has no manufacturer or model."""
+    values = {column: (record.get(column) or '').strip() for column in CSV_COLUMNS}
+    if not values['manufacturer'] or not values['model']:
+        return None
+    year = values['year']
+    return (
+        values['manufacturer'],
+        values['model'],
+        int(year) if year.isdigit() else None,
+        *(values[column] for column in SPEC_FIELDS)
+    )
+
+
+def main(argv=None):
+    """Build a vehicle catalog file from a CSV export. Returns an exit code."""
+    parser = argparse.ArgumentParser(description="Build the vehicle catalog from a CSV file.")
+    parser.add_argument('csv', help=f"CSV with the columns: {', '.join(CSV_COLUMNS)}")
+    parser.add_argument('--output', default=VehicleCatalog.DEFAULT_PATH, help="Catalog file to write")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        count = build_catalog(args.csv, args.output)
+    except (OSError, ValueError) as e:
+        print(f"Error building vehicle catalog: {e}")
+        return 1
+    print(f"Wrote {count} vehicles to {args.output} in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,9 +3,10 @@
 Base class for widget handlers and factory for creating appropriate handlers.
 """
 from abc import ABC, abstractmethod
+import threading
 import tkinter as tk
 from tkinter import ttk
-from typing import Any
+from typing import Any, Callable, Union
 
 
 class BaseWidgetHandler(ABC):
@@ -14,6 +15,9 @@ class BaseWidgetHandler(ABC):
     Each handler manages a specific type of Tkinter widget.
     """
 
+    # Events after which the widget's value may have changed
+    CHANGE_EVENTS = ('<KeyRelease>', '<FocusOut>', '<<Paste>>', '<<Cut>>')
+
     @abstractmethod
     def get_value(self, widget: Any) -> Any:
         """
@@ -48,14 +52,60 @@ class BaseWidgetHandler(ABC):
         """
         pass
 
+    def bind_change(self, widget: Any, callback: Callable[[], None]) -> None:
+        """
+        Call callback whenever the user may have changed the widget's value.
+        Existing bindings are kept.
+
+        Args:
+            widget: The Tkinter widget to watch
+            callback: Called without arguments
+        """
+        for sequence in self.CHANGE_EVENTS:
+            widget.bind(sequence, lambda event: callback(), add='+')
+
 
 class WidgetHandlerFactory:
     """
     Factory class for creating appropriate widget handlers.
+
+    Handlers are stateless, so one instance per widget type is shared.
+    Widget types are registered by class, or by class name for widgets from
+    optional libraries (tkcalendar's DateEntry) that shouldn't be imported
+    here. A widget resolves to the first registered class in its MRO, and
+    the result is memoized per widget class.
     """
 
-    @staticmethod
-    def get_handler(widget: Any) -> BaseWidgetHandler:
+    _handlers_by_type = {}
+    _handlers_by_name = {}
+    _resolved = {}
+    _builtins_registered = False
+    _lock = threading.Lock()
+
+    @classmethod
+    def register(cls, widget_type: Union[type, str], handler: Union[BaseWidgetHandler, type]) -> None:
+        """
+        Register the handler for a widget type and its subclasses.
+
+        Args:
+            widget_type: Widget class, or class name (matched anywhere in a widget's MRO)
+            handler: BaseWidgetHandler instance or subclass (instantiated once)
+        """
+        if isinstance(handler, type):
+            handler = handler()
+        if not isinstance(handler, BaseWidgetHandler):
+            raise TypeError(f"Handler must be a BaseWidgetHandler, got {type(handler).__name__}")
+
+        cls._ensure_builtins()
+        with cls._lock:
+            if isinstance(widget_type, str):
+                cls._handlers_by_name[widget_type] = handler
+            else:
+                cls._handlers_by_type[widget_type] = handler
+            cls._resolved.clear()
+
+    @classmethod
+    def get_handler(cls, widget: Any) -> BaseWidgetHandler:
         """
         Get the appropriate handler for the given widget type.
 
@@ -63,36 +113,58 @@ class WidgetHandlerFactory:
             widget: The Tkinter widget to get handler for
 
         Returns:
-            An instance of the appropriate widget handler
+            The shared instance of the appropriate widget handler
 
         Raises:
             ValueError: If widget type is not supported
         """
-        # Import handlers here to avoid circular imports
-        from .text_widget_handler import TextWidgetHandler
-        from .entry_widget_handler import EntryWidgetHandler
-        from .combobox_widget_handler import ComboboxWidgetHandler
-        from .date_widget_handler import DateWidgetHandler
-
-        # Check for DateEntry first (before Entry, as it might inherit from it)
-        widget_class_name = widget.__class__.__name__
-        if widget_class_name == 'DateEntry':
-            return DateWidgetHandler()
-
-        # Check for Text widget
-        if isinstance(widget, tk.Text):
-            return TextWidgetHandler()
-
-        # Check for Combobox (before Entry, as Combobox inherits from Entry)
-        if isinstance(widget, ttk.Combobox):
-            return ComboboxWidgetHandler()
-
-        # Check for Entry
-        if isinstance(widget, (ttk.Entry, tk.Entry)):
-            return EntryWidgetHandler()
-
-        # Unsupported widget type
-        raise ValueError(
-            f"Unsupported widget type: {type(widget).__name__}. "
-            f"Supported types: Text, Entry, Combobox, DateEntry"
-        )
+        widget_class = type(widget)
+        try:
+            handler = cls._resolved[widget_class]
+        except KeyError:
+            handler = cls._resolve(widget_class)
+
+        if handler is None:
+            # Unsupported widget type
+            raise ValueError(
+                f"Unsupported widget type: {widget_class.__name__}. "
+                f"Supported types: Text, Entry, Combobox, DateEntry"
+            )
+        return handler
+
+    @classmethod
+    def _resolve(cls, widget_class):
+        """Find and memoize the handler for a widget class (None if unsupported)."""
+        cls._ensure_builtins()
+        with cls._lock:
+            handler = None
+            # Most specific class first, so Combobox and DateEntry win over Entry
+            for klass in widget_class.__mro__:
+                handler = cls._handlers_by_type.get(klass) or cls._handlers_by_name.get(klass.__name__)
+                if handler is not None:
+                    break
+            cls._resolved[widget_class] = handler
+            return handler
+
+    @classmethod
+    def _ensure_builtins(cls):
+        if cls._builtins_registered:
+            return
+        with cls._lock:
+            if cls._builtins_registered:
+                return
+            # Import handlers here to avoid circular imports
+            from .text_widget_handler import TextWidgetHandler
+            from .entry_widget_handler import EntryWidgetHandler
+            from .combobox_widget_handler import ComboboxWidgetHandler
+            from .date_widget_handler import DateWidgetHandler
+
+            entry_handler = EntryWidgetHandler()
+            cls._handlers_by_type.update({
+                tk.Text: TextWidgetHandler(),
+                ttk.Combobox: ComboboxWidgetHandler(),
+                ttk.Entry: entry_handler,
+                tk.Entry: entry_handler,
+            })
+            cls._handlers_by_name['DateEntry'] = DateWidgetHandler()
+            cls._builtins_registered = True
@@ -8,6 +8,8 @@ from .base_handler import BaseWidgetHandler
 class ComboboxWidgetHandler(BaseWidgetHandler):
     """Handler for ttk.Combobox dropdown widgets."""
 
+    CHANGE_EVENTS = BaseWidgetHandler.CHANGE_EVENTS + ('<<ComboboxSelected>>',)
+
     def get_value(self, widget: ttk.Combobox) -> str:
         """Get selected value from Combobox widget."""
         return widget.get()
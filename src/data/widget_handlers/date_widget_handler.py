@@ -2,6 +2,7 @@
 """Handler for DateEntry widgets from tkcalendar."""
 from datetime import datetime
 from typing import Union
+from ..constants import Constants
 from .base_handler import BaseWidgetHandler
 
 
@@ -9,7 +10,9 @@ class DateWidgetHandler(BaseWidgetHandler):
     """Handler for tkcalendar DateEntry widgets."""
 
     # Supported date formats for parsing
-    DATE_FORMATS = ['%d/%m/%Y', '%Y-%m-%d', '%d.%m.%Y', '%d-%m-%Y']
+    DATE_FORMATS = Constants.DATE_FORMATS
+
+    CHANGE_EVENTS = BaseWidgetHandler.CHANGE_EVENTS + ('<<DateEntrySelected>>',)
 
     def get_value(self, widget) -> str:
         """
@@ -20,3 +20,15 @@ class TextWidgetHandler(BaseWidgetHandler):
     def clear_value(self, widget: tk.Text) -> None:
         """Clear Text widget content."""
         widget.delete('1.0', tk.END)
+
+    def bind_change(self, widget: tk.Text, callback) -> None:
+        """Watch for edits through the Text widget's modified flag."""
+        super().bind_change(widget, callback)
+
+        def on_modified(event):
+            # Resetting the flag re-fires <<Modified>> with the flag off
+            if widget.edit_modified():
+                widget.edit_modified(False)
+                callback()
+
+        widget.bind('<<Modified>>', on_modified, add='+')
@@ -0,0 +1,276 @@
+# src/document/attachments.py
+"""
+Attachment pipeline for the correspondence images.
+Each image is decoded once, in a worker process, into two renditions: a
+downscaled JPEG for embedding in the report and a small PNG thumbnail for the
+GUI (Tk shows PNG without Pillow). Renditions are cached on disk under the
+SHA-256 of the original file, so an image is decoded again only when its
+contents change, wherever it is stored. Images kept in the blob store are
+referenced by that same digest and are never hashed here.
+
+Pillow is optional. Without it the original files are embedded in the report
+as they are and the GUI lists file names instead of thumbnails.
+"""
+import functools
+import io
+import os
+import threading
+from pathlib import Path
+
+from ..data.atomic_io import atomic_write_bytes
+from ..data.blob_store import BlobStore, hash_file, parse_reference
+
+# Several images are kept in one form field, one path per line
+PATH_SEPARATOR = '\n'
+
+# Largest report rendition: 6 inches of page width at about 200 dpi
+REPORT_MAX_SIZE = (1280, 1280)
+THUMBNAIL_MAX_SIZE = (96, 96)
+JPEG_QUALITY = 82
+
+# Part of every rendition's file name: bump when the settings above change
+PIPELINE_VERSION = 1
+
+
+def split_paths(value):
+    """
+    Args:
+        value: The correspondence_image field: blob references or paths
+            separated by PATH_SEPARATOR
+
+    Returns:
+        list: Non-empty references and paths in order
+    """
+    return [path.strip() for path in (value or '').split(PATH_SEPARATOR) if path.strip()]
+
+
+@functools.lru_cache(maxsize=None)
+def _load_pillow():
+    """
+    Pillow's Image and ImageOps modules, or None if Pillow isn't installed.
+    Imported on first use, as Pillow adds to the GUI's cold start.
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return None
+    return Image, ImageOps
+
+
+def pillow_available():
+    """True if Pillow is installed, so images can be downscaled and thumbnailed."""
+    return _load_pillow() is not None
+
+
+def render_renditions(source, report_path, thumbnail_path):
+    """
+    Decode an image once and write its report and thumbnail renditions.
+    Runs in a worker process.
+
+    Args:
+        source: Original image path
+        report_path: Destination of the downscaled JPEG
+        thumbnail_path: Destination of the PNG thumbnail
+    """
+    Image, ImageOps = _load_pillow()
+    with Image.open(source) as image:
+        # Let the JPEG decoder skip detail we'd throw away anyway: a 12 MP
+        # photo is decoded at 1/2-1/8 scale instead of at full size
+        image.draft('RGB', REPORT_MAX_SIZE)
+        image = ImageOps.exif_transpose(image)
+        if image.mode != 'RGB':
+            # Flatten transparency onto white; JPEG has no alpha channel
+            background = Image.new('RGB', image.size, 'white')
+            background.paste(image, mask=image.convert('RGBA').getchannel('A'))
+            image = background
+        image.thumbnail(REPORT_MAX_SIZE, Image.LANCZOS)
+
+        buffer = io.BytesIO()
+        image.save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+        atomic_write_bytes(report_path, buffer.getvalue())
+
+        image.thumbnail(THUMBNAIL_MAX_SIZE, Image.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, 'PNG')
+        atomic_write_bytes(thumbnail_path, buffer.getvalue())
+
+
+class Attachment:
+    """An original image and its cached renditions."""
+
+    __slots__ = ('source', 'name', 'digest', 'report_path', 'thumbnail_path')
+
+    def __init__(self, source, name, digest, report_path, thumbnail_path):
+        """
+        Args:
+            source: Path of the original image (its blob, for blob references)
+            name: The original's file name, for display
+            digest: SHA-256 of the original's contents
+            report_path: Image to embed in the report (the original without Pillow)
+            thumbnail_path: PNG thumbnail, or None without Pillow or if decoding failed
+        """
+        self.source = source
+        self.name = name
+        self.digest = digest
+        self.report_path = report_path
+        self.thumbnail_path = thumbnail_path
+
+
+class AttachmentPipeline:
+    """Prepares correspondence images for the report and the GUI, caching renditions by content."""
+
+    DEFAULT_DIRECTORY = 'attachment_cache'
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_workers=None, store=None):
+        """
+        Args:
+            directory: Where renditions are cached; created on first use
+            max_workers: Decoding processes, or None for the CPU count.
+                1 decodes in the calling process without a pool.
+            store: BlobStore that blob references are resolved against
+                (default: the one in the working directory)
+        """
+        self.directory = Path(directory)
+        self.max_workers = max_workers
+        self.store = store or BlobStore()
+        self._executor = None
+        self._background = None
+        self._lock = threading.Lock()
+
+    def prepare(self, paths):
+        """
+        Make sure every image has its renditions, decoding only the uncached ones.
+        Missing or unreadable files are skipped.
+
+        Args:
+            paths: Blob references or original image paths
+
+        Returns:
+            list: Attachment per readable image, in order
+        """
+        attachments = []
+        pending = []
+        for value in paths:
+            identified = self._identify(value)
+            if identified is None:
+                continue
+            source, digest = identified
+            attachment = self._cached(source, os.path.basename(value), digest)
+            attachments.append(attachment)
+            if attachment.thumbnail_path is None and pillow_available():
+                pending.append(attachment)
+
+        if pending:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._render(pending)
+        return attachments
+
+    def digests(self, paths):
+        """
+        The content digests prepare() would report, without decoding anything.
+        Missing or unreadable files are skipped, as in prepare().
+
+        Args:
+            paths: Blob references or original image paths
+
+        Returns:
+            list: Digest per readable image, in order
+        """
+        identified = (self._identify(value) for value in paths)
+        return [digest for _, digest in filter(None, identified)]
+
+    def report_images(self, paths):
+        """
+        Args:
+            paths: Blob references or original image paths
+
+        Returns:
+            list: Paths of the images to embed in the report, in order
+        """
+        return [attachment.report_path for attachment in self.prepare(paths)]
+
+    def thumbnails_async(self, paths):
+        """
+        Prepare the images on a background thread, for the GUI.
+
+        Args:
+            paths: Blob references or original image paths
+
+        Returns:
+            Future: Resolves to the list of Attachments; poll done() from the Tk loop
+        """
+        with self._lock:
+            if self._background is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self._background = ThreadPoolExecutor(max_workers=1)
+            return self._background.submit(self.prepare, paths)
+
+    def close(self):
+        """Shut down the worker processes and the background thread."""
+        with self._lock:
+            for executor in (self._executor, self._background):
+                if executor is not None:
+                    executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._background = None
+
+    def _identify(self, value):
+        """The image's source path and digest, or None if it cannot be read."""
+        source = self.store.resolve(value)
+        # A reference names its blob's digest; only plain paths need hashing
+        digest = parse_reference(value)
+        try:
+            if digest is None:
+                digest = hash_file(source)
+            elif not os.path.isfile(source):
+                raise FileNotFoundError(f"blob {digest} is not in {self.store.directory}")
+        except OSError as e:
+            print(f"Skipping attachment {value}: {e}")
+            return None
+        return source, digest
+
+    def _rendition_paths(self, digest):
+        stem = self.directory / f'{digest}-v{PIPELINE_VERSION}'
+        return f'{stem}.jpg', f'{stem}-thumb.png'
+
+    def _cached(self, source, name, digest):
+        """The image's Attachment, with renditions only if they are already cached."""
+        if not pillow_available():
+            return Attachment(source, name, digest, source, None)
+        report_path, thumbnail_path = self._rendition_paths(digest)
+        if os.path.exists(report_path) and os.path.exists(thumbnail_path):
+            return Attachment(source, name, digest, report_path, thumbnail_path)
+        return Attachment(source, name, digest, source, None)
+
+    def _render(self, pending):
+        """Decode the pending images, in parallel when there is more than one."""
+        jobs = [(attachment, self._rendition_paths(attachment.digest)) for attachment in pending]
+        if len(jobs) == 1 or self.max_workers == 1:
+            results = []
+            for attachment, (report_path, thumbnail_path) in jobs:
+                try:
+                    render_renditions(attachment.source, report_path, thumbnail_path)
+                    results.append(None)
+                except Exception as e:
+                    results.append(e)
+        else:
+            executor = self._get_executor()
+            futures = [executor.submit(render_renditions, attachment.source, *paths)
+                       for attachment, paths in jobs]
+            results = [future.exception() for future in futures]
+
+        for (attachment, (report_path, thumbnail_path)), error in zip(jobs, results):
+            if error is None:
+                attachment.report_path = report_path
+                attachment.thumbnail_path = thumbnail_path
+            else:
+                # Fall back to embedding the original; python-docx reads most formats
+                print(f"Error preparing attachment {attachment.source}: {error}")
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # multiprocessing is slow to import; the GUI creates the pipeline at startup
+                from concurrent.futures import ProcessPoolExecutor
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
@@ -0,0 +1,151 @@
+# src/document/batch.py
+"""
+Headless batch report generation.
+Regenerates reports for saved claims without a Tk window, spreading the
+work over a process pool.
+
+Usage:
+    python -m src.document.batch --source saved_data --output reports
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ..data.file_persistence import FilePersistenceHandler
+from ..data.form_snapshot import FormSnapshot
+from .report_generator import ReportGenerator
+
+# One generator per worker process, created on first use
+_worker_generator = None
+
+
+def _get_worker_generator():
+    """Return this process's ReportGenerator, creating it once."""
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = ReportGenerator()
+    return _worker_generator
+
+
+def render_claim(source_dir, claim_number, output_dir, streaming=False):
+    """
+    Load a single claim and write its report to the output directory.
+    Runs inside a worker process.
+
+    Args:
+        source_dir: Directory holding the claim JSON files
+        claim_number: Claim number to render
+        output_dir: Directory to write the .docx report to
+        streaming: Use the streaming docx backend
+
+    Returns:
+        str: Path of the written report
+
+    Raises:
+        ValueError: If the claim has no readable data
+    """
+    # run_batch() compacts the edit journal up front; workers only read files
+    persistence = FilePersistenceHandler(source_dir, use_index=False, use_journal=False)
+    data = persistence.load_by_claim_number(claim_number)
+    if not data:
+        raise ValueError(f"No readable data for claim {claim_number}")
+
+    safe_filename = persistence._sanitize_filename(claim_number)
+    report_path = os.path.join(output_dir, f"{safe_filename}.docx")
+    return _get_worker_generator().generate_to_path(FormSnapshot(data), report_path, streaming)
+
+
+class BatchResult:
+    """Outcome of a batch run: written reports, failures and timing."""
+
+    def __init__(self):
+        self.succeeded = []  # list of (claim_number, report_path)
+        self.failed = []     # list of (claim_number, error message)
+        self.elapsed = 0.0
+
+    @property
+    def total(self):
+        return len(self.succeeded) + len(self.failed)
+
+    @property
+    def throughput(self):
+        """Reports per second over the whole run."""
+        if self.elapsed <= 0:
+            return 0.0
+        return self.total / self.elapsed
+
+
+def run_batch(source_dir, output_dir, claim_numbers=None, max_workers=None, streaming=False):
+    """
+    Generate reports for many claims in parallel.
+
+    Args:
+        source_dir: Directory holding the claim JSON files
+        output_dir: Directory to write reports to (created if missing)
+        claim_numbers: Claims to render, or None for every saved claim
+        max_workers: Process pool size, or None for the CPU count
+        streaming: Use the streaming docx backend, for claims with very long texts
+
+    Returns:
+        BatchResult: Per-claim successes and failures with timing
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Opening the handler folds any journaled edits into the claim files
+    persistence = FilePersistenceHandler(source_dir)
+    try:
+        if claim_numbers is None:
+            claim_numbers = persistence.get_all_claim_numbers()
+    finally:
+        persistence.close()
+
+    result = BatchResult()
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(render_claim, source_dir, claim_number, output_dir, streaming): claim_number
+            for claim_number in claim_numbers
+        }
+        for future in as_completed(futures):
+            claim_number = futures[future]
+            try:
+                result.succeeded.append((claim_number, future.result()))
+            except Exception as e:
+                result.failed.append((claim_number, f"{type(e).__name__}: {e}"))
+
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def main(argv=None):
+    """Command line entry point. Returns a process exit code."""
+    parser = argparse.ArgumentParser(description="Generate reports for saved claims without the GUI.")
+    parser.add_argument('--source', default='saved_data', help="Directory of claim JSON files")
+    parser.add_argument('--output', default='reports', help="Directory to write .docx reports to")
+    parser.add_argument('--workers', type=int, default=None, help="Number of worker processes")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Stream document.xml instead of building it in memory")
+    parser.add_argument('claims', nargs='*', help="Claim numbers to render (default: all)")
+    args = parser.parse_args(argv)
+
+    result = run_batch(
+        args.source,
+        args.output,
+        claim_numbers=args.claims or None,
+        max_workers=args.workers,
+        streaming=args.streaming
+    )
+
+    print(f"Generated {len(result.succeeded)}/{result.total} reports "
+          f"in {result.elapsed:.2f}s ({result.throughput:.1f} reports/s)")
+    for claim_number, error in sorted(result.failed):
+        print(f"FAILED {claim_number}: {error}")
+
+    return 1 if result.failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,528 @@
+# src/document/conclusion.py
+"""
+Drafting the report's conclusion (the summary field) with a language model.
+ConclusionClient builds a prompt from the claim's fields and sends it to a
+ConclusionBackend - Gemini by default - with at most max_concurrency requests
+in flight, retrying rate limits and server errors with exponential backoff.
+Responses are cached on disk under a hash of everything the prompt is built
+from, so drafting an unchanged claim again costs one file read.
+
+The client is asyncio based; ConclusionJob runs it on a worker thread for the
+Tk thread to poll, like ReportJob. Conclusions for many saved claims are
+drafted concurrently from the command line:
+    python -m src.document.conclusion --backend json --location saved_data --save
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import weakref
+from abc import ABC, abstractmethod
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+from ..data.atomic_io import atomic_write_json
+from ..data.form_snapshot import FormSnapshot
+
+API_KEY_VARIABLE = 'GEMINI_API_KEY'
+ENDPOINT_VARIABLE = 'GEMINI_ENDPOINT'
+DEFAULT_MODEL = 'gemini-1.5-flash'
+DEFAULT_ENDPOINT = 'https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent'
+
+# Part of every cache key: bump when the prompt wording changes
+PROMPT_VERSION = 1
+
+# Fields the prompt is built from, in the order the report presents them
+PROMPT_FIELDS = (
+    ('event_type', 'סוג האירוע'),
+    ('event_date', 'תאריך אירוע'),
+    ('full_name', 'שם המבוטח'),
+    ('vehicle_company', 'יצרן הרכב'),
+    ('vehicle_model', 'דגם הרכב'),
+    ('vehicle_manufacture_year', 'שנת ייצור'),
+    ('vehicle_license_number', 'מספר רישוי'),
+    ('third_party_name', 'שם צד ג\''),
+    ('circumstances', 'נסיבות האירוע'),
+    ('investigation', 'החקירה'),
+)
+
+PROMPT_INSTRUCTIONS = (
+    "אתה חוקר ביטוח. נסח את פרק הסיכום והמסקנות של דוח החקירה על סמך הפרטים שלהלן. "
+    "כתוב בעברית, בגוף שלישי ובלשון עניינית, בפסקה אחת עד שלוש, ללא כותרת. "
+    "ציין סתירות או ממצאים חשודים אם יש כאלה, ואל תמציא עובדות שאינן מופיעות בפרטים."
+)
+
+# Longer field values are cut, so an hours-long transcript doesn't blow the request size
+MAX_FIELD_LENGTH = 30000
+
+# Value the form puts in fields the user chose to leave empty
+_PLACEHOLDER = 'NOT_FILLED'
+
+
+def build_prompt(snapshot):
+    """
+    Args:
+        snapshot: FormSnapshot (or mapping) of the claim's values
+
+    Returns:
+        str: The prompt asking for the claim's conclusion
+    """
+    lines = [PROMPT_INSTRUCTIONS, '']
+    for field, label in PROMPT_FIELDS:
+        value = str(snapshot.get(field) or '').strip()
+        if not value or value == _PLACEHOLDER:
+            continue
+        if len(value) > MAX_FIELD_LENGTH:
+            value = value[:MAX_FIELD_LENGTH] + '…'
+        separator = '\n' if '\n' in value else ' '
+        lines.append(f"{label}:{separator}{value}")
+    return '\n'.join(lines)
+
+
+class ConclusionError(Exception):
+    """A conclusion could not be drafted."""
+
+
+class TransientConclusionError(ConclusionError):
+    """A failure worth retrying: rate limiting, a server error or a lost connection."""
+
+    def __init__(self, message, retry_after=None):
+        """
+        Args:
+            message: Error description
+            retry_after: Seconds the server asked us to wait, if it said
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ConclusionBackend(ABC):
+    """A text generation service the conclusion is requested from."""
+
+    # Part of the cache key, so switching models doesn't serve stale drafts
+    model = ''
+
+    @abstractmethod
+    async def complete(self, prompt):
+        """
+        Generate text for a prompt.
+
+        Args:
+            prompt: The full prompt
+
+        Returns:
+            str: The generated text
+
+        Raises:
+            TransientConclusionError: If the request may succeed when retried
+            ConclusionError: If it won't
+        """
+
+
+class GeminiBackend(ConclusionBackend):
+    """Gemini's generateContent REST API over HTTPS, with the standard library only."""
+
+    def __init__(self, api_key=None, model=DEFAULT_MODEL, endpoint=None, timeout=60):
+        """
+        Args:
+            api_key: API key (default: the GEMINI_API_KEY environment variable)
+            model: Model name, substituted into the endpoint
+            endpoint: URL template with a {model} placeholder (default: the
+                GEMINI_ENDPOINT environment variable, then Google's API)
+            timeout: Seconds to wait for a response
+        """
+        self.api_key = api_key if api_key is not None else os.environ.get(API_KEY_VARIABLE, '')
+        self.model = model
+        self.endpoint = endpoint or os.environ.get(ENDPOINT_VARIABLE) or DEFAULT_ENDPOINT
+        self.timeout = timeout
+
+    def is_configured(self):
+        """True if requests can be sent: an API key is set, or a custom endpoint is used."""
+        return bool(self.api_key) or self.endpoint != DEFAULT_ENDPOINT
+
+    async def complete(self, prompt):
+        """See ConclusionBackend.complete(); the blocking request runs on a worker thread."""
+        return await asyncio.to_thread(self._post, prompt)
+
+    def _post(self, prompt):
+        if not self.is_configured():
+            raise ConclusionError(f"{API_KEY_VARIABLE} is not set")
+
+        body = json.dumps({'contents': [{'parts': [{'text': prompt}]}]}, ensure_ascii=False)
+        request = urllib.request.Request(
+            self.endpoint.format(model=self.model), data=body.encode('utf-8'), method='POST',
+            headers={'Content-Type': 'application/json; charset=utf-8', 'x-goog-api-key': self.api_key}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                payload = json.loads(response.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            detail = e.read(500).decode('utf-8', 'replace')
+            message = f"HTTP {e.code} from {self.model}: {detail}"
+            if e.code == 429 or e.code >= 500:
+                raise TransientConclusionError(message, _retry_after(e.headers.get('Retry-After')))
+            raise ConclusionError(message)
+        except (urllib.error.URLError, OSError) as e:
+            # Connection refused or reset, DNS failure, timeout
+            raise TransientConclusionError(f"Request to {self.model} failed: {e}")
+        except ValueError as e:
+            raise ConclusionError(f"Malformed response from {self.model}: {e}")
+
+        try:
+            parts = payload['candidates'][0]['content']['parts']
+            text = ''.join(part.get('text', '') for part in parts).strip()
+        except (KeyError, IndexError, TypeError):
+            text = ''
+        if not text:
+            reason = (payload.get('promptFeedback') or {}).get('blockReason', 'no text')
+            raise ConclusionError(f"{self.model} returned no conclusion ({reason})")
+        return text
+
+
+def _retry_after(value):
+    """Seconds from a Retry-After header (a number or an HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class ConclusionCache:
+    """Directory of <key>.json drafts."""
+
+    DEFAULT_DIRECTORY = 'conclusion_cache'
+
+    def __init__(self, directory=DEFAULT_DIRECTORY):
+        """
+        Args:
+            directory: Cache directory; created on the first store
+        """
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model, prompt):
+        """
+        Args:
+            model: Name of the model drafting the conclusion
+            prompt: The full prompt
+
+        Returns:
+            str: Hex digest to use as the cache key
+        """
+        payload = json.dumps([PROMPT_VERSION, model, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            str: The cached draft, or None on a miss
+        """
+        try:
+            with open(self.directory / f'{key}.json', encoding='utf-8') as f:
+                text = json.load(f).get('text')
+        except (OSError, ValueError, AttributeError):
+            text = None
+
+        with self._lock:
+            if text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return text
+
+    def put(self, key, model, text):
+        """
+        Args:
+            key: Cache key from make_key()
+            model: Name of the model that drafted it
+            text: The draft
+        """
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            atomic_write_json(self.directory / f'{key}.json', {'model': model, 'text': text})
+        except OSError as e:
+            # A cache that can't be written only costs another request next time
+            print(f"Error writing conclusion cache: {e}")
+
+
+class ConclusionClient:
+    """Drafts conclusions through a backend with bounded concurrency, retries and a cache."""
+
+    def __init__(self, backend=None, cache=None, max_concurrency=4, max_retries=4,
+                 backoff=1.0, max_backoff=30.0):
+        """
+        Args:
+            backend: ConclusionBackend to draft with (default: GeminiBackend())
+            cache: ConclusionCache, or None for the one in the working directory
+            max_concurrency: Most requests in flight at once
+            max_retries: Retries of a transient failure before giving up
+            backoff: Delay before the first retry, in seconds; doubles on each retry
+            max_backoff: Longest delay between retries
+        """
+        self.backend = backend or GeminiBackend()
+        self.cache = cache or ConclusionCache()
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        # asyncio primitives belong to one event loop; ConclusionJob starts a new one per job
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    async def draft(self, snapshot):
+        """
+        Draft one claim's conclusion.
+
+        Args:
+            snapshot: FormSnapshot (or mapping) of the claim's values
+
+        Returns:
+            str: The conclusion text
+
+        Raises:
+            ConclusionError: If it could not be drafted
+        """
+        prompt = build_prompt(snapshot)
+        key = self.cache.make_key(self.backend.model, prompt)
+        text = self.cache.get(key)
+        if text is None:
+            text = await self._complete(prompt)
+            self.cache.put(key, self.backend.model, text)
+        return text
+
+    async def draft_many(self, snapshots):
+        """
+        Draft several conclusions concurrently, within max_concurrency.
+
+        Args:
+            snapshots: Iterable of FormSnapshots or mappings
+
+        Returns:
+            list: Per snapshot, in order, the text or the ConclusionError raised
+        """
+        return await asyncio.gather(*(self.draft(snapshot) for snapshot in snapshots),
+                                    return_exceptions=True)
+
+    async def _complete(self, prompt):
+        """Send the prompt, retrying transient failures with jittered exponential backoff."""
+        semaphore = self._semaphore()
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with semaphore:
+                    return await self.backend.complete(prompt)
+            except TransientConclusionError as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+                if e.retry_after is not None:
+                    delay = min(self.max_backoff, max(delay, e.retry_after))
+                else:
+                    # Jitter, so requests throttled together don't all retry together
+                    delay *= random.uniform(0.5, 1.0)
+                # The slot is released while waiting, for requests that can proceed
+                await asyncio.sleep(delay)
+
+    def _semaphore(self):
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+
+class ConclusionBatchResult:
+    """Outcome of drafting conclusions for saved claims."""
+
+    def __init__(self):
+        self.succeeded = []  # list of (claim_number, conclusion)
+        self.failed = []     # list of (claim_number, error message)
+        self.skipped = []    # claim numbers that already have a summary
+        self.elapsed = 0.0
+
+
+async def draft_claims(client, storage_backend, claim_numbers=None, overwrite=False, save=False):
+    """
+    Draft conclusions for saved claims, concurrently.
+
+    Args:
+        client: ConclusionClient to draft with
+        storage_backend: StorageBackend the claims are read from
+        claim_numbers: Claims to draft (default: every saved claim)
+        overwrite: Also draft claims whose summary is already filled in
+        save: Write each conclusion to its claim's summary field
+
+    Returns:
+        ConclusionBatchResult: Drafted, failed and skipped claims
+    """
+    result = ConclusionBatchResult()
+    start = time.perf_counter()
+
+    if claim_numbers is None:
+        records = storage_backend.iter_records()
+    else:
+        records = ((number, storage_backend.load_by_claim_number(number)) for number in claim_numbers)
+
+    pending = []
+    for claim_number, data in records:
+        if not data:
+            result.failed.append((claim_number, "No readable data"))
+        elif not overwrite and str(data.get('summary') or '').strip() not in ('', _PLACEHOLDER):
+            result.skipped.append(claim_number)
+        else:
+            pending.append((claim_number, FormSnapshot(data)))
+
+    drafts = await client.draft_many(snapshot for _, snapshot in pending)
+    # The drafts are saved together: one journal commit or transaction
+    with storage_backend.batch():
+        for (claim_number, _), draft in zip(pending, drafts):
+            if isinstance(draft, BaseException):
+                if not isinstance(draft, Exception):
+                    raise draft
+                result.failed.append((claim_number, str(draft)))
+                continue
+            if save:
+                try:
+                    storage_backend.save_changes(claim_number, {'summary': draft})
+                except Exception as e:
+                    result.failed.append((claim_number, f"Drafted but not saved: {e}"))
+                    continue
+            result.succeeded.append((claim_number, draft))
+
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+class ConclusionJob:
+    """
+    A single conclusion draft running on a background thread, with its own
+    event loop, so the Tk loop never waits on the network.
+
+    poll() returns the messages produced since the last call, each a tuple:
+        ('done', conclusion)
+        ('cancelled',)
+        ('error', exception)
+    """
+
+    def __init__(self, client, snapshot):
+        """
+        Args:
+            client: ConclusionClient to draft with
+            snapshot: FormSnapshot taken on the Tk thread before starting
+        """
+        self.client = client
+        self.snapshot = snapshot
+        self._messages = queue.Queue()
+        self._lock = threading.Lock()
+        self._loop = None
+        self._task = None
+        self._cancelled = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """Start drafting in the background."""
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Stop waiting for the draft; a request already sent is abandoned."""
+        with self._lock:
+            self._cancelled = True
+            if self._task is not None:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+
+    def is_running(self):
+        """True while the worker thread is still drafting."""
+        return self._thread.is_alive()
+
+    def poll(self):
+        """
+        Drain pending messages without blocking.
+
+        Returns:
+            list: Message tuples in the order they were produced
+        """
+        messages = []
+        while True:
+            try:
+                messages.append(self._messages.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def _run(self):
+        """Worker thread body."""
+        try:
+            self._messages.put(('done', asyncio.run(self._draft())))
+        except asyncio.CancelledError:
+            self._messages.put(('cancelled',))
+        except Exception as e:
+            self._messages.put(('error', e))
+
+    async def _draft(self):
+        with self._lock:
+            if self._cancelled:
+                raise asyncio.CancelledError
+            self._loop = asyncio.get_running_loop()
+            self._task = asyncio.current_task()
+        return await self.client.draft(self.snapshot)
+
+
+def main(argv=None):
+    """Draft conclusions for saved claims. Returns an exit code."""
+    parser = argparse.ArgumentParser(description="Draft report conclusions for saved claims.")
+    parser.add_argument('--backend', default='json', help="Claim storage backend (json or sqlite)")
+    parser.add_argument('--location', default=None, help="Claim directory or database")
+    parser.add_argument('--claims', nargs='*', default=None, help="Claim numbers (default: all)")
+    parser.add_argument('--overwrite', action='store_true', help="Also draft claims that have a summary")
+    parser.add_argument('--save', action='store_true', help="Write the drafts to the claims' summary")
+    parser.add_argument('--concurrency', type=int, default=4, help="Most requests in flight")
+    parser.add_argument('--model', default=DEFAULT_MODEL, help="Model name")
+    parser.add_argument('--cache', default=ConclusionCache.DEFAULT_DIRECTORY, help="Cache directory")
+    args = parser.parse_args(argv)
+
+    backend = GeminiBackend(model=args.model)
+    if not backend.is_configured():
+        print(f"Set {API_KEY_VARIABLE} to draft conclusions")
+        return 2
+    client = ConclusionClient(backend, ConclusionCache(args.cache), max_concurrency=args.concurrency)
+
+    # Imported here: opening a backend pulls in the claim index
+    from ..data.storage import create_storage_backend
+
+    storage_backend = create_storage_backend(args.backend, args.location)
+    try:
+        result = asyncio.run(draft_claims(client, storage_backend, args.claims,
+                                          overwrite=args.overwrite, save=args.save))
+    finally:
+        storage_backend.close()
+
+    for claim_number, conclusion in result.succeeded:
+        print(f"=== {claim_number} ===\n{conclusion}\n")
+    for claim_number, error in result.failed:
+        print(f"FAILED {claim_number}: {error}")
+    print(f"Drafted {len(result.succeeded)}, failed {len(result.failed)}, "
+          f"skipped {len(result.skipped)} in {result.elapsed:.2f}s "
+          f"({client.cache.hits} from cache)")
+    return 1 if result.failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,9 +3,15 @@ from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 from docx.enum.table import WD_TABLE_ALIGNMENT
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
 from datetime import datetime
+import copy
 
 class DocumentUtils:
+    # Prototype (pPr, rPr) elements per paragraph style, built once and copied
+    # into every new paragraph instead of setting each property again.
+    _prototypes = {}
+
     def set_document_rtl(self, doc):
         """Sets the whole document to RTL and aligns text right"""
         # Set RTL for section
@@ -28,23 +34,32 @@ class DocumentUtils:
 
     def set_run_rtl(self, run):
         """Set Hebrew RTL text properties for a run"""
-        run.font.name = 'David'
-        run.font.size = Pt(11)
-        run.font.rtl = True
-        
+        r = run._r
+        if r.rPr is None:
+            # Fast path: copy the prebuilt run properties
+            _, rPr = self._get_prototype(('run_rtl',))
+            r.insert(0, copy.deepcopy(rPr))
+        else:
+            self._format_run_rtl(run)
+
         # Add RTL paragraph direction
         paragraph = run.element.getparent()
         if paragraph is not None:
             pPr = paragraph.get_or_add_pPr()
-            bidi = OxmlElement('w:bidi')
-            pPr.append(bidi)
-            
+            pPr.append(OxmlElement('w:bidi'))
+
             # Set paragraph direction RTL
-            if not pPr.xpath('w:textDirection'):
+            if pPr.find(qn('w:textDirection')) is None:
                 textDirection = OxmlElement('w:textDirection')
                 textDirection.set(qn('w:val'), 'rtl')
                 pPr.append(textDirection)
 
+    def _format_run_rtl(self, run):
+        """Set the run's Hebrew font properties one by one (slow path)."""
+        run.font.name = 'David'
+        run.font.size = Pt(11)
+        run.font.rtl = True
+
     def add_custom_header_footer(self, doc):
         """
         Add professional header and footer with company branding.
@@ -91,45 +106,52 @@ class DocumentUtils:
     def make_hebrew_paragraph(self, doc, text, bold=False, size=11, alignment=WD_PARAGRAPH_ALIGNMENT.JUSTIFY):
         """Create a hebrew paragraph with proper RTL settings - using JUSTIFY like example.docx"""
         paragraph = doc.add_paragraph()
-        run = paragraph.add_run(text)
+        pPr, rPr = self._get_prototype(('hebrew', bold, size, alignment))
+        self._attach_prototype(paragraph._p, text, pPr, rPr)
+        return paragraph
+
+    def add_long_hebrew_text(self, doc, text):
+        """
+        Add a paragraph of long free text (circumstances, summary, ...).
+        Streaming documents write it straight to the output without building it in memory;
+        regular documents get the same paragraph as make_hebrew_paragraph.
+        """
+        stream_paragraph = getattr(doc, 'stream_paragraph', None)
+        if stream_paragraph is None:
+            return self.make_hebrew_paragraph(doc, text)
+
+        pPr, rPr = self._get_prototype(('hebrew', False, 11, WD_PARAGRAPH_ALIGNMENT.JUSTIFY))
+        stream_paragraph(pPr, rPr, text)
+        return None
+
+    def _format_hebrew_paragraph(self, paragraph, run, bold=False, size=11, alignment=WD_PARAGRAPH_ALIGNMENT.JUSTIFY):
+        """Set a paragraph's Hebrew formatting property by property (slow path, builds prototypes)"""
         run.font.name = 'David'
         run.font.size = Pt(size)
         run.font.bold = bold
         paragraph.alignment = alignment
-        
+
         # Set RTL for paragraph
         pPr = paragraph._p.get_or_add_pPr()
         bidi = OxmlElement('w:bidi')
         pPr.append(bidi)
-        
+
         # Set RTL for run
         rPr = run._r.get_or_add_rPr()
         rtl = OxmlElement('w:rtl')
         rPr.append(rtl)
-        
-        return paragraph
 
     def add_table_row(self, table, cells_data, bold=False, alignment=WD_PARAGRAPH_ALIGNMENT.RIGHT):
         """Add a row to a table with proper RTL settings"""
         row = table.add_row()
+        pPr, rPr = self._get_prototype(('hebrew', bold, 11, alignment))
         for i, text in enumerate(cells_data):
-            cell = row.cells[i]
-            paragraph = cell.paragraphs[0]
-            run = paragraph.add_run(text)
-            run.font.name = 'David'
-            run.font.size = Pt(11)
-            run.font.bold = bold
-            paragraph.alignment = alignment
-            
-            # Set RTL for paragraph
-            pPr = paragraph._p.get_or_add_pPr()
-            bidi = OxmlElement('w:bidi')
-            pPr.append(bidi)
-            
-            # Set RTL for run
-            rPr = run._r.get_or_add_rPr()
-            rtl = OxmlElement('w:rtl')
-            rPr.append(rtl)
+            paragraph = row.cells[i].paragraphs[0]
+            if paragraph._p.pPr is None:
+                self._attach_prototype(paragraph._p, text, pPr, rPr)
+            else:
+                run = paragraph.add_run(text)
+                self._format_hebrew_paragraph(paragraph, run, bold, 11, alignment)
 
     def create_section_header(self, doc, text, level=1):
         """Create a section header with proper formatting"""
@@ -148,10 +170,38 @@ class DocumentUtils:
         """Add a bullet point with proper RTL formatting - using JUSTIFY like example.docx"""
         # Don't use style, just create paragraph manually with bullet character
         paragraph = doc.add_paragraph()
-        paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
+        pPr, rPr = self._get_prototype(('bullet', level))
+        self._attach_prototype(paragraph._p, '• ' + text, pPr, rPr)
+        return paragraph
+
+    def add_picture(self, doc, image_path, max_width=Inches(6), max_height=Inches(8)):
+        """
+        Add a centered picture, scaled down to fit max_width x max_height.
+        Streaming documents can't take new media parts, so they get a note instead.
+        Files python-docx can't read are noted and skipped.
+        """
+        if getattr(doc, 'stream_paragraph', None) is not None:
+            return self.make_hebrew_paragraph(doc, "(התמונה אינה נכללת בדוח מוזרם)",
+                                              alignment=WD_PARAGRAPH_ALIGNMENT.CENTER)
+
+        paragraph = doc.add_paragraph()
+        paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+        try:
+            picture = paragraph.add_run().add_picture(image_path)
+        except Exception as e:
+            print(f"Error adding picture {image_path}: {e}")
+            paragraph._p.getparent().remove(paragraph._p)
+            return None
+
+        scale = min(1, max_width / picture.width, max_height / picture.height)
+        if scale < 1:
+            picture.width = int(picture.width * scale)
+            picture.height = int(picture.height * scale)
+        return paragraph
 
-        # Add bullet character manually (Hebrew-compatible)
-        run = paragraph.add_run('• ' + text)
+    def _format_bullet_point(self, paragraph, run, level=0):
+        """Set a bullet paragraph's formatting property by property (slow path, builds prototypes)"""
+        paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
         self.set_run_rtl(run)
 
         # Add indentation based on level
@@ -162,4 +212,44 @@ class DocumentUtils:
         bidi = OxmlElement('w:bidi')
         pPr.append(bidi)
 
-        return paragraph
\ No newline at end of file
+    def _get_prototype(self, key):
+        """
+        Get the prototype (pPr, rPr) elements for a paragraph style, building
+        them on first use by running the slow path on a scratch paragraph.
+
+        Args:
+            key: ('hebrew', bold, size, alignment), ('bullet', level) or ('run_rtl',)
+
+        Returns:
+            tuple: (pPr or None, rPr) elements; copy them, never attach directly
+        """
+        prototype = self._prototypes.get(key)
+        if prototype is None:
+            paragraph = Paragraph(OxmlElement('w:p'), None)
+            run = paragraph.add_run()
+            if key[0] == 'hebrew':
+                self._format_hebrew_paragraph(paragraph, run, *key[1:])
+            elif key[0] == 'bullet':
+                self._format_bullet_point(paragraph, run, *key[1:])
+            else:
+                self._format_run_rtl(run)
+            prototype = (paragraph._p.pPr, run._r.rPr)
+            self._prototypes[key] = prototype
+        return prototype
+
+    def _attach_prototype(self, p, text, pPr, rPr):
+        """
+        Fill an empty w:p with copies of the prototype properties and one run of text.
+
+        Args:
+            p: The paragraph's CT_P element
+            text: Run text; tabs and newlines become w:tab and w:br
+            pPr: Prototype paragraph properties
+            rPr: Prototype run properties
+        """
+        if pPr is not None:
+            p.insert(0, copy.deepcopy(pPr))
+        r = p.add_r()
+        r.append(copy.deepcopy(rPr))
+        if text:
+            r.text = text
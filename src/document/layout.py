@@ -0,0 +1,389 @@
+# src/document/layout.py
+"""
+Declarative report layouts.
+A layout file (src/document/layouts/*.json) lists the report's sections and
+their headings, paragraphs, bullets, images and question/answer lists, with
+{field} placeholders for form values. Any block can carry its own "when"
+field. Each file is compiled once into a RenderPlan: every text is split into
+literal parts and field names up front, and each section knows which fields it
+reads. Rendering a report then reads every field from the snapshot once and
+only joins strings.
+
+A heading with "numbered": true is numbered at render time by the sections
+that actually appear, so an absent section leaves no gap.
+
+default.json maps event types to variant files. A variant names the layout it
+extends and replaces that layout's sections by name.
+"""
+import hashlib
+import json
+import os
+import string
+import threading
+from datetime import datetime
+
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+
+from ..data.transcript import ANSWER_LABEL, QUESTION_LABEL
+from .attachments import split_paths
+
+LAYOUTS_DIR = os.path.join(os.path.dirname(__file__), 'layouts')
+DEFAULT_LAYOUT = 'default.json'
+
+ALIGNMENTS = {
+    'justify': WD_PARAGRAPH_ALIGNMENT.JUSTIFY,
+    'center': WD_PARAGRAPH_ALIGNMENT.CENTER,
+    'right': WD_PARAGRAPH_ALIGNMENT.RIGHT,
+    'left': WD_PARAGRAPH_ALIGNMENT.LEFT,
+}
+
+# Placeholders filled from the render time rather than the form
+BUILTIN_FIELDS = {
+    'today': lambda now: now.strftime('%d.%m.%Y'),
+    'ref_number': lambda now: now.strftime('%d%m%y'),
+}
+
+
+class LayoutError(ValueError):
+    """Raised when a layout file is malformed."""
+
+
+def _number_field(section_name):
+    """Pseudo field holding a section's number, filled in by RenderPlan.resolve()."""
+    return f'#{section_name}'
+
+
+class PlanSection:
+    """One compiled report section: its operations and the fields they read."""
+
+    __slots__ = ('name', 'label', 'when', 'fields', 'ops', 'cacheable')
+
+    def __init__(self, name, label, when, fields, ops):
+        """
+        Args:
+            name: Section name, unique within the layout
+            label: Progress label shown while the section is built
+            when: Field that must be non-empty for the section to appear, or None
+            fields: Sorted tuple of every field the section reads
+            ops: Tuple of compiled operations (see _compile_block)
+        """
+        self.name = name
+        self.label = label
+        self.when = when
+        self.fields = fields
+        self.ops = ops
+        # Pictures reference media parts of their own document, so their XML can't be reused
+        self.cacheable = all(_unwrap(op)[0] != 'images' for op in ops)
+
+    def key_values(self, values):
+        """The values of this section's fields, in a fixed order (for cache keys)."""
+        return tuple(values[field] for field in self.fields)
+
+    def render(self, doc, values, doc_utils):
+        """
+        Append the section to the document.
+
+        Args:
+            doc: python-docx Document or StreamingDocument
+            values: Resolved field values from RenderPlan.resolve()
+            doc_utils: DocumentUtils used to build the paragraphs
+        """
+        if self.when is not None and not values[self.when]:
+            return
+        for op in self.ops:
+            _render_op(op, doc, values, doc_utils)
+
+
+def _render_op(op, doc, values, doc_utils):
+    """Append one compiled operation (see _compile_block) to the document."""
+    kind = op[0]
+    if kind == 'if':
+        if values[op[1]]:
+            _render_op(op[2], doc, values, doc_utils)
+    elif kind == 'paragraph':
+        _, parts, bold, size, alignment = op
+        doc_utils.make_hebrew_paragraph(doc, _join(parts, values), bold=bold,
+                                        size=size, alignment=alignment)
+    elif kind == 'heading':
+        doc_utils.create_section_header(doc, _join(op[1], values))
+    elif kind == 'bullet':
+        doc_utils.add_bullet_point(doc, _join(op[1], values))
+    elif kind == 'text':
+        doc_utils.add_long_hebrew_text(doc, values[op[1]])
+    elif kind == 'images':
+        for image_path in split_paths(values[op[1]]):
+            doc_utils.add_picture(doc, image_path)
+    elif kind == 'qa':
+        _, field, fallback = op
+        try:
+            pairs = json.loads(values[field]) if values[field] else []
+            if not isinstance(pairs, list) or not all(isinstance(pair, dict) for pair in pairs):
+                raise TypeError("not a list of question/answer pairs")
+        except (ValueError, TypeError) as e:
+            # A hand-edited or damaged record; the fallback text still has the content
+            print(f"Ignoring unreadable {field}: {e}")
+            pairs = []
+        if not pairs and fallback:
+            doc_utils.add_long_hebrew_text(doc, values[fallback])
+        for pair in pairs:
+            if pair.get('question'):
+                doc_utils.make_hebrew_paragraph(doc, f"{QUESTION_LABEL}: {pair['question']}", bold=True)
+            if pair.get('answer'):
+                answer = pair['answer']
+                doc_utils.add_long_hebrew_text(doc, f"{ANSWER_LABEL}: {answer}" if pair.get('question') else answer)
+    else:  # spacing
+        spacing = doc.add_paragraph()
+        spacing.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
+
+
+def _unwrap(op):
+    """The operation inside any 'if' wrappers."""
+    while op[0] == 'if':
+        op = op[2]
+    return op
+
+
+class RenderPlan:
+    """A compiled layout, shared by every report that uses it."""
+
+    def __init__(self, sections, digest, variants=None):
+        """
+        Args:
+            sections: List of PlanSection in report order
+            digest: Hash of the layout files the plan was compiled from
+            variants: Event type -> layout file mapping (default layout only)
+        """
+        self.sections = sections
+        self.digest = digest
+        self.variants = variants or {}
+        number_fields = {_number_field(section.name) for section in sections}
+        # Sections with a numbered heading, in report order
+        self.numbered = [section for section in sections if _number_field(section.name) in section.fields]
+        self.fields = tuple(sorted({field for section in sections for field in section.fields
+                                    if field not in number_fields}))
+
+    def resolve(self, snapshot, now=None):
+        """
+        Read every field the plan uses exactly once, and number the
+        numbered sections that will appear.
+
+        Args:
+            snapshot: FormSnapshot of the form values
+            now: Render time for the built-in date fields (default: now)
+
+        Returns:
+            dict: Field name -> string value
+        """
+        now = now or datetime.now()
+        values = {}
+        for field in self.fields:
+            builtin = BUILTIN_FIELDS.get(field)
+            values[field] = builtin(now) if builtin else (snapshot.get(field) or '')
+
+        number = 0
+        for section in self.numbered:
+            if section.when is None or values[section.when]:
+                number += 1
+                values[_number_field(section.name)] = str(number)
+            else:
+                values[_number_field(section.name)] = ''
+        return values
+
+
+def compile_layout(layout, digest=''):
+    """
+    Compile a parsed layout into a render plan.
+
+    Args:
+        layout: Layout dict with a 'sections' list
+        digest: Identifies the layout's source, see RenderPlan
+
+    Returns:
+        RenderPlan: The compiled plan
+
+    Raises:
+        LayoutError: If the layout is malformed
+    """
+    sections = []
+    names = set()
+    for section in layout.get('sections', []):
+        name = section.get('name')
+        if not name or name in names:
+            raise LayoutError(f"Section without a unique name: {section!r}")
+        names.add(name)
+
+        fields = set()
+        ops = []
+        for block in section.get('blocks', []):
+            ops.extend(_compile_block(block, fields, name))
+        when = section.get('when')
+        if when is not None:
+            fields.add(when)
+        sections.append(PlanSection(name, section.get('label', name), when, tuple(sorted(fields)), tuple(ops)))
+    return RenderPlan(sections, digest, layout.get('variants'))
+
+
+def _compile_block(block, fields, section_name):
+    """
+    Compile one layout block of a section into operations, adding the fields
+    it reads to `fields`.
+
+    Returns:
+        list: ('paragraph', parts, bold, size, alignment), ('heading', parts),
+            ('bullet', parts), ('text', field), ('images', field),
+            ('qa', field, fallback field or None) or ('spacing',) tuples, each
+            wrapped in ('if', field, op) for blocks with a "when" field
+    """
+    when = block.get('when')
+    if when is not None:
+        fields.add(when)
+        return [('if', when, op) for op in _compile_block(dict(block, when=None), fields, section_name)]
+
+    kind = block.get('type')
+    if kind in ('paragraph', 'paragraphs'):
+        alignment = ALIGNMENTS.get(block.get('align', 'justify'))
+        if alignment is None:
+            raise LayoutError(f"Unknown alignment: {block['align']!r}")
+        texts = [block['text']] if kind == 'paragraph' else block['texts']
+        return [('paragraph', _compile_text(text, fields), block.get('bold', False),
+                 block.get('size', 11), alignment) for text in texts]
+    if kind == 'heading':
+        parts = _compile_text(block['text'], fields)
+        if block.get('numbered'):
+            number_field = _number_field(section_name)
+            fields.add(number_field)
+            parts = (('', number_field), ('. ', None)) + parts
+        return [('heading', parts)]
+    if kind == 'bullets':
+        return [('bullet', _compile_text(text, fields)) for text in block['items']]
+    if kind in ('text', 'images'):
+        fields.add(block['field'])
+        return [(kind, block['field'])]
+    if kind == 'qa':
+        # A JSON list of {'question', 'answer'} pairs; the fallback text field
+        # is rendered instead when the list is empty
+        fallback = block.get('fallback')
+        fields.add(block['field'])
+        if fallback:
+            fields.add(fallback)
+        return [('qa', block['field'], fallback)]
+    if kind == 'spacing':
+        return [('spacing',)]
+    raise LayoutError(f"Unknown block type: {kind!r}")
+
+
+def _compile_text(text, fields):
+    """
+    Split a text with {field} placeholders into (literal, field or None) parts.
+    Braces are escaped by doubling them, as in str.format.
+    """
+    parts = []
+    try:
+        parsed = list(string.Formatter().parse(text))
+    except ValueError as e:
+        raise LayoutError(f"Bad placeholder in {text!r}: {e}") from e
+    for literal, field, format_spec, conversion in parsed:
+        if field is not None:
+            if format_spec or conversion or not field.isidentifier():
+                raise LayoutError(f"Unsupported placeholder {{{field}}} in {text!r}")
+            fields.add(field)
+        parts.append((literal, field))
+    return tuple(parts)
+
+
+def _join(parts, values):
+    return ''.join(literal + values[field] if field else literal for literal, field in parts)
+
+
+class RenderPlanCache:
+    """Compiles each layout file once and recompiles it when a file it uses changes."""
+
+    def __init__(self, directory=LAYOUTS_DIR):
+        """
+        Args:
+            directory: Directory holding default.json and its variants
+        """
+        self.directory = directory
+        # layout file name -> (paths read, their (mtime_ns, size) stamps, RenderPlan)
+        self._plans = {}
+        self._lock = threading.Lock()
+
+    def get(self, event_type=''):
+        """
+        Get the render plan for an event type.
+
+        Args:
+            event_type: The claim's event type; types without a variant use the default layout
+
+        Returns:
+            RenderPlan: The compiled plan
+        """
+        default = self._get(DEFAULT_LAYOUT)
+        variant = default.variants.get(event_type)
+        return self._get(variant) if variant else default
+
+    def clear(self):
+        """Drop all compiled plans."""
+        with self._lock:
+            self._plans.clear()
+
+    def _get(self, name):
+        with self._lock:
+            entry = self._plans.get(name)
+            if entry is not None and [_stamp(path) for path in entry[0]] == entry[1]:
+                return entry[2]
+
+            paths = []
+            layout = self._read(name, paths)
+            stamps = [_stamp(path) for path in paths]
+            digest = hashlib.sha256()
+            for path in paths:
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+            plan = compile_layout(layout, digest.hexdigest())
+            self._plans[name] = (paths, stamps, plan)
+            return plan
+
+    def _read(self, name, paths):
+        """
+        Load a layout file, merged over the layout it extends.
+
+        Args:
+            name: Layout file name inside the directory
+            paths: List that receives every file read, extended layouts included
+        """
+        path = os.path.join(self.directory, name)
+        if path in paths:
+            raise LayoutError(f"Layout {name} extends itself")
+        paths.append(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            layout = json.load(f)
+
+        base_name = layout.get('extends')
+        if not base_name:
+            return layout
+
+        base = self._read(base_name, paths)
+        overrides = {section.get('name'): section for section in layout.get('sections', [])}
+        unknown = set(overrides) - {section.get('name') for section in base.get('sections', [])}
+        if unknown:
+            raise LayoutError(f"Layout {name} overrides unknown sections: {sorted(unknown)}")
+        return {
+            'sections': [overrides.get(section.get('name'), section) for section in base.get('sections', [])]
+        }
+
+
+def _stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+_default_cache = RenderPlanCache()
+
+
+def get_plan_cache():
+    """Return the process-wide render plan cache."""
+    return _default_cache
@@ -0,0 +1,159 @@
+# src/document/report_cache.py
+"""
+On-disk cache of rendered reports.
+A report is keyed by a hash of everything its bytes depend on: the form
+snapshot, the template, the generator version and the render date (the header
+prints today's date). Regenerating an unchanged report - a reprint or a resend -
+then costs one file read. Entries are evicted least recently used first once
+the cache grows past its size limit.
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+from ..data.atomic_io import atomic_write_bytes
+
+
+class ReportCache:
+    """Directory of <key>.docx files with LRU, size-bounded eviction."""
+
+    DEFAULT_DIRECTORY = 'report_cache'
+    DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            directory: Cache directory; created on the first store
+            max_bytes: Total size the cached reports may take
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(snapshot, template_fingerprint, generator_version, render_date):
+        """
+        Hash everything a rendered report depends on.
+
+        Args:
+            snapshot: FormSnapshot of the form values
+            template_fingerprint: Identifies the template's contents
+            generator_version: Bumped whenever the report layout changes
+            render_date: The date printed in the report
+
+        Returns:
+            str: Hex digest to use as the cache key
+        """
+        payload = json.dumps(
+            [snapshot.to_dict(), str(template_fingerprint), str(generator_version), str(render_date)],
+            ensure_ascii=False, sort_keys=True, separators=(',', ':')
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            bytes: The cached report, or None on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Mark as recently used; eviction removes the oldest mtimes first
+            os.utime(path)
+        except OSError:
+            data = None
+
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """
+        Store a rendered report, then evict old entries beyond the size limit.
+        Reports larger than the whole cache are not stored.
+
+        Args:
+            key: Cache key from make_key()
+            data: The .docx bytes
+        """
+        if len(data) > self.max_bytes:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(self._path(key), data)
+            self._evict()
+        except OSError as e:
+            # A cache that can't be written only costs a re-render next time
+            print(f"Error writing report cache: {e}")
+
+    def stats(self):
+        """
+        Returns:
+            dict: hits, misses, entries and total bytes on disk
+        """
+        entries = self._entries()
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(entries),
+                'bytes': sum(size for _, size, _ in entries),
+            }
+
+    def clear(self):
+        """Remove every cached report and reset the counters."""
+        for path, _, _ in self._entries():
+            self._remove(path)
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def _path(self, key):
+        return self.directory / f'{key}.docx'
+
+    def _entries(self):
+        """(path, size, mtime) of every cached report."""
+        entries = []
+        try:
+            with os.scandir(self.directory) as scan:
+                for entry in scan:
+                    if not entry.name.endswith('.docx'):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue  # Evicted by another process meanwhile
+                    entries.append((entry.path, stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _evict(self):
+        """Remove least recently used reports until the cache fits max_bytes."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            self._remove(path)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -1,271 +1,336 @@
 # src/document/report_generator.py
-import tkinter as tk
-from tkinter import ttk, filedialog
+from tkinter import filedialog
 from docx import Document
 from docx.shared import Pt, Inches
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 from datetime import datetime
+import io
+import os
+from ..data.form_snapshot import FormSnapshot
+from .attachments import PATH_SEPARATOR, AttachmentPipeline, split_paths
 from .document_utils import DocumentUtils
+from .layout import get_plan_cache
+from .section_cache import SectionCache, capture_section, splice_section
+from .streaming_writer import StreamingDocument
+from .template_cache import get_template_cache
+
+# Template whose header/footer structure every report reuses
+EXAMPLE_TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'example.docx')
+
+
+class GenerationCancelled(Exception):
+    """Raised when report generation is cancelled between sections."""
+
 
 class ReportGenerator:
-    def __init__(self):
-        self.doc_utils = DocumentUtils()
+    # Part of every report cache key: bump whenever the generated report changes
+    GENERATOR_VERSION = 1
 
-    def get_safe_value(self, form_data, key, default=''):
+    def __init__(self, report_cache=None, section_cache=None, attachments=None):
         """
-        Safely get a value from form_data, converting to string.
-        Handles different widget types appropriately.
+        Args:
+            report_cache: Optional ReportCache; render_bytes() then serves
+                reports rendered before from unchanged data
+            section_cache: Optional SectionCache; build_document() then rebuilds
+                only the sections whose fields changed
+            attachments: AttachmentPipeline that prepares the correspondence
+                images; by default one that decodes in this process
         """
-        try:
-            value = form_data.get(key, default)
-            
-            if value is None:
-                return default
-                
-            if isinstance(value, tk.Text):
-                text_content = value.get('1.0', 'end-1c')
-                return text_content.strip() or default
-                
-            if isinstance(value, (ttk.Entry, ttk.Combobox)):
-                entry_content = value.get()
-                return entry_content or default
-                
-            if hasattr(value, 'get_date'):
-                try:
-                    return value.get_date().strftime('%d/%m/%Y')
-                except:
-                    return default
-                    
-            return str(value)
+        self.doc_utils = DocumentUtils()
+        self.template_cache = get_template_cache()
+        self.report_cache = report_cache
+        self.section_cache = section_cache
+        self.plan_cache = get_plan_cache()
+        self.attachments = attachments
+        self._fallback_template = None
+
+    def build_document(self, form_data, progress_callback=None, cancel_event=None):
+        """
+        Build the complete report document without saving it.
+        Uses example.docx as a template to preserve exact formatting.
+        Does not touch any dialog or widget, so it can run without a Tk window.
 
-        except Exception as e:
-            print(f"Error getting value for {key}: {str(e)}")
-            return default
+        Args:
+            form_data: FormSnapshot, or a mapping of field names to widgets or plain values
+            progress_callback: Optional callable(done, total, label) called after each section
+            cancel_event: Optional threading.Event; checked before each section
 
-    def generate_header(self, doc, form_data):
-        """Generate the header section of the report."""
+        Returns:
+            Document: The generated python-docx document
+
+        Raises:
+            GenerationCancelled: If cancel_event was set
+        """
         try:
-            # Current date and reference number
-            current_date = datetime.now().strftime("%d.%m.%Y")
-            ref_number = datetime.now().strftime("%d%m%y")
-            
-            # Add date and reference (using JUSTIFY alignment like example.docx)
-            date_para = self.doc_utils.make_hebrew_paragraph(
-                doc,
-                f"תאריך: {current_date}",
-                bold=True,
-                alignment=WD_PARAGRAPH_ALIGNMENT.JUSTIFY
-            )
-
-            ref_para = self.doc_utils.make_hebrew_paragraph(
-                doc,
-                f"מספר תיק: {ref_number}",
-                bold=True,
-                alignment=WD_PARAGRAPH_ALIGNMENT.JUSTIFY
-            )
-
-            # Add spacing
-            spacing = doc.add_paragraph()
-            spacing.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
-
-            # Add recipient section
-            self.doc_utils.make_hebrew_paragraph(doc, "לכבוד", bold=True)
-            self.doc_utils.make_hebrew_paragraph(doc, 'הפניקס חברה לביטוח בע"מ', bold=True)
-
-            # Add spacing
-            spacing = doc.add_paragraph()
-            spacing.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
-
-            # Add report title and details
-            headers = [
-                "הנדון: דו\"ח חקירה",
-                "======================",
-                f"שם המבוטח: {self.get_safe_value(form_data, 'full_name')}",
-                f"סוג האירוע: {self.get_safe_value(form_data, 'event_type')}",
-                f"מספר רישוי: {self.get_safe_value(form_data, 'vehicle_license_number')}",
-                f"תאריך אירוע: {self.get_safe_value(form_data, 'event_date')}",
-                f"מספר תביעה: {self.get_safe_value(form_data, 'claim_number')}",
-                "========================="
-            ]
-
-            for text in headers:
-                self.doc_utils.make_hebrew_paragraph(
-                    doc,
-                    text,
-                    bold=True,
-                    alignment=WD_PARAGRAPH_ALIGNMENT.CENTER
-                )
-
-            # Add spacing after headers
-            spacing = doc.add_paragraph()
-            spacing.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
+            # Read every value once; the sections only see the snapshot
+            form_data = FormSnapshot.coerce(form_data)
+            form_data = self.prepare_attachments(form_data)
+
+            if os.path.exists(EXAMPLE_TEMPLATE_PATH):
+                # Use example as template - this preserves header/footer structure.
+                # The cache parses and strips it once and hands out copies.
+                doc = self.template_cache.get_document(EXAMPLE_TEMPLATE_PATH)
+            else:
+                # Fallback to blank document if example not found
+                doc = self._create_blank_document()
+
+            self._apply_page_setup(doc)
+            self._run_sections(doc, form_data, progress_callback, cancel_event)
+            return doc
 
+        except GenerationCancelled:
+            raise
         except Exception as e:
-            print(f"Error in generate_header: {str(e)}")
+            print(f"Detailed error in build_document: {str(e)}")
             raise
 
-    def generate_general_section(self, doc, form_data):
-        """Generate the general section of the report."""
-        try:
-            # Add section title
-            self.doc_utils.create_section_header(doc, "1. כללי")
-
-            # Create general content
-            vehicle_info = (
-                f"נתבקשנו על ידי חברתכם לבצע חקירה בעקבות הודעת המבוטח על "
-                f"{self.get_safe_value(form_data, 'event_type')} שארע/ה לו ברכבו מסוג "
-                f"{self.get_safe_value(form_data, 'vehicle_company')} "
-                f"{self.get_safe_value(form_data, 'vehicle_model')} "
-                f"בצבע {self.get_safe_value(form_data, 'vehicle_color')}, "
-                f"שנת ייצור {self.get_safe_value(form_data, 'vehicle_manufacture_year')}."
-            )
-
-            self.doc_utils.make_hebrew_paragraph(doc, vehicle_info)
-
-            # Add investigation actions header
-            self.doc_utils.make_hebrew_paragraph(
-                doc, 
-                "במסגרת החקירה ביצענו את הפעולות הבאות:",
-                bold=True
-            )
-
-            # Add bullet points for actions taken
-            actions = [
-                f"פגשנו וחקרנו את המבוטח {self.get_safe_value(form_data, 'full_name')}.",
-                "ערכנו בדיקה במאגרי המידע הרלוונטיים.",
-                "בדקנו את מסמכי הביטוח והרישוי.",
-                "צילמנו תמונות של הרכב והנזקים."
-            ]
-
-            for action in actions:
-                self.doc_utils.add_bullet_point(doc, action)
-
-            # Add spacing after general section
-            spacing = doc.add_paragraph()
-            spacing.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
+    def render_streaming(self, form_data, output, progress_callback=None, cancel_event=None):
+        """
+        Build the report with the streaming backend, writing word/document.xml
+        paragraph by paragraph. Peak memory stays flat however long the free text fields are.
 
-        except Exception as e:
-            print(f"Error in generate_general_section: {str(e)}")
-            raise
+        Args:
+            form_data: FormSnapshot, or a mapping of field names to plain values
+            output: Destination path or binary file object
+            progress_callback: Optional callable(done, total, label) called after each section
+            cancel_event: Optional threading.Event; checked before each section
 
-    def generate_vehicle_section(self, doc, form_data):
-        """Generate the vehicle details section of the report."""
-        try:
-            self.doc_utils.create_section_header(doc, "2. פרטי הרכב")
+        Returns:
+            The output argument
+        """
+        form_data = FormSnapshot.coerce(form_data)
+        form_data = self.prepare_attachments(form_data)
+        if os.path.exists(EXAMPLE_TEMPLATE_PATH):
+            template = EXAMPLE_TEMPLATE_PATH
+        else:
+            template = io.BytesIO(self._get_fallback_template())
+
+        with StreamingDocument(template, output) as doc:
+            self._apply_page_setup(doc)
+            self._run_sections(doc, form_data, progress_callback, cancel_event)
+        return output
+
+    def prepare_attachments(self, form_data):
+        """
+        Add the images to embed in the report to the snapshot, as the
+        report_images field (one path per line), and the digests of their
+        originals as report_image_digests, so the report cache sees content
+        changes. Already prepared snapshots are returned as they are.
 
-            vehicle_details = [
-                f"יצרן ודגם: {self.get_safe_value(form_data, 'vehicle_company')} {self.get_safe_value(form_data, 'vehicle_model')}",
-                f"צבע: {self.get_safe_value(form_data, 'vehicle_color')}",
-                f"שנת ייצור: {self.get_safe_value(form_data, 'vehicle_manufacture_year')}",
-                f"מספר רישוי: {self.get_safe_value(form_data, 'vehicle_license_number')}",
-                f"נפח מנוע: {self.get_safe_value(form_data, 'vehicle_engine_capacity')} סמ\"ק",
-                f"סוג תיבת הילוכים: {self.get_safe_value(form_data, 'vehicle_gearbox')}"
-            ]
+        Args:
+            form_data: FormSnapshot with correspondence_image paths
 
-            for detail in vehicle_details:
-                self.doc_utils.make_hebrew_paragraph(doc, detail)
+        Returns:
+            FormSnapshot: The snapshot with report_images set
+        """
+        if 'report_images' in form_data:
+            return form_data
+
+        attachments = []
+        paths = split_paths(form_data.get('correspondence_image'))
+        if paths:
+            attachments = self._get_attachments().prepare(paths)
+        return form_data.replace(
+            report_images=PATH_SEPARATOR.join(a.report_path for a in attachments),
+            report_image_digests=PATH_SEPARATOR.join(a.digest for a in attachments)
+        )
+
+    def _get_attachments(self):
+        """The attachment pipeline, created on first use."""
+        if self.attachments is None:
+            self.attachments = AttachmentPipeline(max_workers=1)
+        return self.attachments
+
+    def _create_blank_document(self):
+        """Blank document with RTL settings and our header and footer, used without example.docx."""
+        doc = Document()
+        self.doc_utils.set_document_rtl(doc)
+        self.doc_utils.add_custom_header_footer(doc)
+        return doc
+
+    def _get_fallback_template(self):
+        """The blank document's bytes, built once, as a template for the streaming backend."""
+        if self._fallback_template is None:
+            buffer = io.BytesIO()
+            self._create_blank_document().save(buffer)
+            self._fallback_template = buffer.getvalue()
+        return self._fallback_template
+
+    def _apply_page_setup(self, doc):
+        """Set margins (matching example)."""
+        section = doc.sections[0]
+        section.left_margin = Inches(1)
+        section.right_margin = Inches(1)
+
+    def render_plan(self, form_data):
+        """
+        The compiled layout for the claim's event type.
 
-            # Add spacing after vehicle section
-            spacing = doc.add_paragraph()
-            spacing.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
+        Args:
+            form_data: FormSnapshot of the form values
 
-        except Exception as e:
-            print(f"Error in generate_vehicle_section: {str(e)}")
-            raise
+        Returns:
+            RenderPlan: Plan from the shared plan cache
+        """
+        return self.plan_cache.get(form_data.get('event_type'))
 
-    def generate_circumstances_section(self, doc, form_data):
-        """Generate the circumstances section of the report."""
-        try:
-            circumstances = self.get_safe_value(form_data, 'circumstances')
-            if circumstances:
-                self.doc_utils.create_section_header(doc, "3. נסיבות האירוע")
-                self.doc_utils.make_hebrew_paragraph(doc, circumstances)
-                spacing = doc.add_paragraph()
-                spacing.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
+    def _run_sections(self, doc, form_data, progress_callback=None, cancel_event=None):
+        """
+        Generate all sections in order, reporting progress and honouring cancellation.
 
-        except Exception as e:
-            print(f"Error in generate_circumstances_section: {str(e)}")
-            raise
+        Raises:
+            GenerationCancelled: If cancel_event was set
+        """
+        plan = self.render_plan(form_data)
+        values = plan.resolve(form_data)
+        # Streaming documents are write-only, so only python-docx documents use the section cache
+        use_cache = self.section_cache is not None and hasattr(doc, 'element')
+        context = self._render_context(plan) if use_cache else None
+
+        for done, section in enumerate(plan.sections, start=1):
+            if cancel_event is not None and cancel_event.is_set():
+                raise GenerationCancelled()
+            if use_cache:
+                self._run_cached_section(doc, section, values, context)
+            else:
+                section.render(doc, values, self.doc_utils)
+            if progress_callback:
+                progress_callback(done, len(plan.sections), section.label)
 
-    def generate_summary_section(self, doc, form_data):
-        """Generate the summary section of the report."""
-        try:
-            summary = self.get_safe_value(form_data, 'summary')
-            if summary:
-                self.doc_utils.create_section_header(doc, "4. סיכום")
-                self.doc_utils.make_hebrew_paragraph(doc, summary)
-                spacing = doc.add_paragraph()
-                spacing.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
+    def _run_cached_section(self, doc, section, values, context):
+        """
+        Splice a section in from the section cache, or build it and cache it.
 
-        except Exception as e:
-            print(f"Error in generate_summary_section: {str(e)}")
-            raise
+        Args:
+            doc: python-docx Document being built
+            section: PlanSection to render
+            values: Field values resolved by the plan
+            context: Output dependencies shared by all sections (see _render_context)
+        """
+        if not section.cacheable:
+            section.render(doc, values, self.doc_utils)
+            return
 
-    def generate_signature(self, doc):
-        """Generate the signature section of the report."""
-        try:
-            spacing = doc.add_paragraph()
-            spacing.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
-            self.doc_utils.make_hebrew_paragraph(doc, "בכבוד רב,")
-            self.doc_utils.make_hebrew_paragraph(doc, "אניגמה חקירות")
+        key = SectionCache.make_key(section.name, section.key_values(values), context)
+        body = doc.element.body
 
-        except Exception as e:
-            print(f"Error in generate_signature: {str(e)}")
-            raise
+        fragment = self.section_cache.get(key)
+        if fragment is None:
+            fragment = capture_section(body, lambda: section.render(doc, values, self.doc_utils))
+            self.section_cache.put(key, fragment)
+        else:
+            splice_section(body, fragment)
+
+    def _render_context(self, plan):
+        """
+        What a report's output depends on besides the form values.
+
+        Args:
+            plan: RenderPlan the report is rendered with
+
+        Returns:
+            tuple: (template and layout fingerprint, GENERATOR_VERSION, today's date)
+        """
+        if os.path.exists(EXAMPLE_TEMPLATE_PATH):
+            template_fingerprint = self.template_cache.fingerprint(EXAMPLE_TEMPLATE_PATH)
+        else:
+            template_fingerprint = 'blank'
+        return (f'{template_fingerprint}:{plan.digest}', self.GENERATOR_VERSION,
+                datetime.now().strftime('%Y-%m-%d'))
+
+    def render_bytes(self, form_data, progress_callback=None, cancel_event=None):
+        """
+        Build the report and serialize it to .docx bytes.
+        With a report cache, a report already rendered today from the same
+        values and template is returned without building anything.
+        Safe to call from a background thread.
+
+        Args:
+            form_data: FormSnapshot, or a mapping of field names to plain values
+            progress_callback: Optional callable(done, total, label) called after each section
+            cancel_event: Optional threading.Event; checked before each section
+
+        Returns:
+            bytes: The .docx file contents
+        """
+        form_data = FormSnapshot.coerce(form_data)
+        cache_key = None
+        if self.report_cache is not None:
+            cache_key = self.cache_key(form_data)
+            cached = self.report_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        form_data = self.prepare_attachments(form_data)
+        doc = self.build_document(form_data, progress_callback, cancel_event)
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        report_bytes = buffer.getvalue()
+
+        if cache_key is not None:
+            self.report_cache.put(cache_key, report_bytes)
+        return report_bytes
+
+    def cache_key(self, form_data):
+        """
+        Report cache key for the form values as they would render now.
+        Images count by the digests of their originals, which are known
+        without decoding them, so a cache hit costs no image work.
+
+        Args:
+            form_data: FormSnapshot of the form values, prepared or not
+
+        Returns:
+            str: Key covering the values, template, layout, GENERATOR_VERSION and today's date
+        """
+        from .report_cache import ReportCache
+
+        values = form_data.to_dict()
+        if 'report_image_digests' not in values:
+            paths = split_paths(form_data.get('correspondence_image'))
+            digests = self._get_attachments().digests(paths) if paths else []
+            values['report_image_digests'] = PATH_SEPARATOR.join(digests)
+        # The rendition paths follow from the digests
+        values.pop('report_images', None)
+        return ReportCache.make_key(FormSnapshot(values), *self._render_context(self.render_plan(form_data)))
 
     def generate(self, form_data):
         """
         Main method to generate the complete report.
-        Uses example.docx as a template to preserve exact formatting.
+        Renders the report (from the cache if unchanged) and asks the user where to save it.
         """
-        try:
-            # Load example.docx as template instead of creating blank document
-            import os
-            example_path = os.path.join(os.path.dirname(__file__), '..', '..', 'example.docx')
-
-            if os.path.exists(example_path):
-                # Use example as template - this preserves header/footer structure
-                doc = Document(example_path)
-                # Delete all existing paragraphs (not just clear them)
-                # Need to delete in reverse order to avoid index issues
-                for i in range(len(doc.paragraphs) - 1, -1, -1):
-                    p = doc.paragraphs[i]
-                    p_element = p._element
-                    p_element.getparent().remove(p_element)
-            else:
-                # Fallback to blank document if example not found
-                doc = Document()
-                self.doc_utils.set_document_rtl(doc)
-                self.doc_utils.add_custom_header_footer(doc)
-
-            # Set margins (matching example)
-            section = doc.sections[0]
-            section.left_margin = Inches(1)
-            section.right_margin = Inches(1)
-
-            # Generate all sections
-            self.generate_header(doc, form_data)
-            self.generate_general_section(doc, form_data)
-            self.generate_vehicle_section(doc, form_data)
-            self.generate_circumstances_section(doc, form_data)
-            self.generate_summary_section(doc, form_data)
-            self.generate_signature(doc)
-
-            # Save the document
-            return self.save_document(doc)
+        return self.save_report_bytes(self.render_bytes(form_data))
 
-        except Exception as e:
-            print(f"Detailed error in generate: {str(e)}")
-            raise
+    def generate_to_path(self, form_data, report_path, streaming=False):
+        """
+        Generate the report and save it directly to a path, without a dialog.
+
+        Args:
+            form_data: FormSnapshot, or a mapping of field names to widgets or plain values
+            report_path: Destination .docx path
+            streaming: Use the streaming backend (for very long texts)
+
+        Returns:
+            str: The path the report was written to
+        """
+        if streaming:
+            try:
+                self.render_streaming(form_data, report_path)
+            except Exception:
+                # Don't leave a truncated report behind
+                if os.path.exists(report_path):
+                    os.remove(report_path)
+                raise
+            return report_path
+
+        report_bytes = self.render_bytes(form_data)
+        with open(report_path, 'wb') as f:
+            f.write(report_bytes)
+        return report_path
 
     def save_document(self, doc):
         """Save the generated document."""
         try:
-            report_path = filedialog.asksaveasfilename(
-                defaultextension=".docx",
-                filetypes=[("Word Documents", "*.docx")],
-                initialfile=f"דוח חקירה_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx"
-            )
+            report_path = self._ask_report_path()
             if report_path:
                 doc.save(report_path)
                 return True
@@ -273,4 +338,34 @@ class ReportGenerator:
 
         except Exception as e:
             print(f"Error in save_document: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    def save_report_bytes(self, report_bytes):
+        """
+        Ask the user where to save and write already rendered report bytes.
+
+        Args:
+            report_bytes: .docx contents from render_bytes
+
+        Returns:
+            bool: True if saved, False if the user cancelled the dialog
+        """
+        try:
+            report_path = self._ask_report_path()
+            if report_path:
+                with open(report_path, 'wb') as f:
+                    f.write(report_bytes)
+                return True
+            return False
+
+        except Exception as e:
+            print(f"Error in save_report_bytes: {str(e)}")
+            raise
+
+    def _ask_report_path(self):
+        """Show the save dialog and return the chosen path ('' if cancelled)."""
+        return filedialog.asksaveasfilename(
+            defaultextension=".docx",
+            filetypes=[("Word Documents", "*.docx")],
+            initialfile=f"דוח חקירה_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx"
+        )
@@ -0,0 +1,79 @@
+# src/document/report_job.py
+"""
+Background report generation.
+Runs ReportGenerator.render_bytes on a worker thread and hands progress back
+through a queue, so the Tk thread only has to poll it (e.g. with root.after).
+"""
+import queue
+import threading
+
+
+class ReportJob:
+    """
+    A single report generation running on a background thread.
+
+    poll() returns the messages produced since the last call, each a tuple:
+        ('progress', done, total, label)
+        ('done', report_bytes)
+        ('cancelled',)
+        ('error', exception)
+    """
+
+    def __init__(self, report_generator, snapshot):
+        """
+        Args:
+            report_generator: ReportGenerator to render with
+            snapshot: FormSnapshot taken on the Tk thread before starting
+        """
+        self.report_generator = report_generator
+        self.snapshot = snapshot
+        self._messages = queue.Queue()
+        self._cancel_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """Start generating in the background."""
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Ask the worker to stop before the next section."""
+        self._cancel_event.set()
+
+    def is_running(self):
+        """True while the worker thread is still generating."""
+        return self._thread.is_alive()
+
+    def poll(self):
+        """
+        Drain pending messages without blocking.
+
+        Returns:
+            list: Message tuples in the order they were produced
+        """
+        messages = []
+        while True:
+            try:
+                messages.append(self._messages.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def _run(self):
+        """Worker thread body."""
+        # Imported here so that importing this module doesn't pull in docx
+        from .report_generator import GenerationCancelled
+
+        try:
+            report_bytes = self.report_generator.render_bytes(
+                self.snapshot,
+                progress_callback=self._report_progress,
+                cancel_event=self._cancel_event
+            )
+            self._messages.put(('done', report_bytes))
+        except GenerationCancelled:
+            self._messages.put(('cancelled',))
+        except Exception as e:
+            self._messages.put(('error', e))
+
+    def _report_progress(self, done, total, label):
+        self._messages.put(('progress', done, total, label))
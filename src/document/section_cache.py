@@ -0,0 +1,122 @@
+# src/document/section_cache.py
+"""
+Cache of rendered report sections.
+Each section's body paragraphs are kept as an XML fragment, keyed by the form
+fields the section reads. When a report is regenerated after a small edit,
+unchanged sections are spliced back into the template body from their
+fragments and only the sections whose inputs changed are built again.
+"""
+import threading
+from collections import OrderedDict
+
+from lxml import etree
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+
+
+class SectionCache:
+    """In-memory LRU cache of section XML fragments."""
+
+    def __init__(self, max_entries=256):
+        """
+        Args:
+            max_entries: Fragments kept before the least recently used is dropped
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._fragments = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(section, values, context):
+        """
+        Args:
+            section: Section name
+            values: The values of the fields the section reads, in a fixed order
+            context: Anything else the output depends on (generator version, template, date)
+
+        Returns:
+            tuple: Hashable cache key
+        """
+        return (section, tuple(values), tuple(context))
+
+    def get(self, key):
+        """
+        Returns:
+            str: The section's XML fragment, or None on a miss
+        """
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._fragments.move_to_end(key)
+            return fragment
+
+    def put(self, key, fragment):
+        """Store a section's XML fragment, dropping the least recently used beyond max_entries."""
+        with self._lock:
+            self._fragments[key] = fragment
+            self._fragments.move_to_end(key)
+            while len(self._fragments) > self.max_entries:
+                self._fragments.popitem(last=False)
+
+    def stats(self):
+        """
+        Returns:
+            dict: hits, misses and entries
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._fragments)}
+
+    def clear(self):
+        """Drop every fragment and reset the counters."""
+        with self._lock:
+            self._fragments.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def capture_section(body, build):
+    """
+    Run a section builder and serialize the body elements it added.
+
+    Args:
+        body: The document's w:body element
+        build: Callable that appends the section's paragraphs to the document
+
+    Returns:
+        str: XML fragment of the added elements
+    """
+    start = _content_end(body)
+    build()
+    end = _content_end(body)
+    return ''.join(etree.tostring(element, encoding='unicode') for element in body[start:end])
+
+
+def splice_section(body, fragment):
+    """
+    Append a cached section's elements to the document body, before sectPr.
+
+    Args:
+        body: The document's w:body element
+        fragment: XML fragment from capture_section()
+    """
+    if not fragment:
+        return
+    wrapper = parse_xml(f'<w:body {nsdecls("w")}>{fragment}</w:body>')
+    sectPr = body.find(qn('w:sectPr'))
+    for element in list(wrapper):
+        if sectPr is not None:
+            sectPr.addprevious(element)
+        else:
+            body.append(element)
+
+
+def _content_end(body):
+    """Index just past the body's content: python-docx adds paragraphs before the trailing sectPr."""
+    if len(body) and body[-1].tag == qn('w:sectPr'):
+        return len(body) - 1
+    return len(body)
@@ -0,0 +1,214 @@
+# src/document/streaming_writer.py
+"""
+Streaming .docx writer for very large reports.
+Paragraphs are serialized into word/document.xml as soon as they are added,
+instead of being kept in a python-docx object model. Every other part of the
+template (styles, header, footer, relationships, media) is copied unchanged.
+"""
+import re
+import shutil
+import zipfile
+from contextlib import ExitStack
+
+from lxml import etree
+from docx.oxml import OxmlElement, parse_xml
+from docx.oxml.ns import qn
+from docx.section import Section
+from docx.text.paragraph import Paragraph
+
+DOCUMENT_PART = 'word/document.xml'
+
+# A namespace declaration in a serialized start tag
+_NAMESPACE_DECLARATION = re.compile(rb' xmlns:([\w.-]+)="([^"]*)"')
+
+# Splits run text the way python-docx does: tabs, line breaks and plain text
+_RUN_TEXT_PATTERN = re.compile(r'\t|[\r\n]|[^\t\r\n]+')
+
+
+class StreamingDocument:
+    """
+    Write-only stand-in for a python-docx Document.
+
+    Use as a context manager around the code that adds paragraphs:
+
+        with StreamingDocument(template, 'report.docx') as doc:
+            doc.add_paragraph('...')
+
+    The most recently added paragraph stays editable until the next one is
+    added, so helpers that tweak a paragraph right after creating it still
+    work. Long free text can be written with stream_paragraph(), which never
+    builds the paragraph in memory at all.
+    """
+
+    def __init__(self, template, output):
+        """
+        Args:
+            template: Path or binary file object of the .docx to take the other parts from
+            output: Path or binary file object to write the new .docx to
+        """
+        self.template = template
+        self.output = output
+        self._stack = None
+        self._xml = None
+        self._pending = None
+        self._sectPr = None
+        self._stream = None
+        # Namespaces declared on the root element, as bytes: children don't repeat them
+        self._declared = {}
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        try:
+            template_zip = self._stack.enter_context(zipfile.ZipFile(self.template))
+            self._output_zip = self._stack.enter_context(
+                zipfile.ZipFile(self.output, 'w', zipfile.ZIP_DEFLATED)
+            )
+            self._copy_other_parts(template_zip)
+
+            self._stream = self._stack.enter_context(
+                self._output_zip.open(DOCUMENT_PART, 'w', force_zip64=True)
+            )
+            self._xml = self._stack.enter_context(etree.xmlfile(self._stream, encoding='UTF-8'))
+            self._xml.write_declaration(standalone=True)
+            with template_zip.open(DOCUMENT_PART) as template_document:
+                self._open_body(template_document)
+        except BaseException:
+            self._stack.close()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self._flush_pending()
+                if self._sectPr is not None:
+                    self._write_element(self._sectPr)
+        finally:
+            self._stack.close()
+        return False
+
+    @property
+    def sections(self):
+        """The document's single section, for page setup such as margins."""
+        return [Section(self._sectPr, None)]
+
+    def add_paragraph(self, text='', style=None):
+        """
+        Add a paragraph, python-docx style.
+
+        Args:
+            text: Optional text for a single run
+            style: Not supported; must be None
+
+        Returns:
+            Paragraph: Editable until the next paragraph is added
+        """
+        if style is not None:
+            raise ValueError("StreamingDocument does not support paragraph styles")
+        self._flush_pending()
+        self._pending = OxmlElement('w:p')
+        paragraph = Paragraph(self._pending, self)
+        if text:
+            paragraph.add_run(text)
+        return paragraph
+
+    def stream_paragraph(self, pPr, rPr, text):
+        """
+        Write a single-run paragraph straight to the output.
+        Tabs and newlines become w:tab and w:br, exactly as python-docx does,
+        but no element tree is built for the text.
+
+        Args:
+            pPr: Paragraph properties element (or None)
+            rPr: Run properties element (or None)
+            text: Run text
+        """
+        self._flush_pending()
+        xml = self._xml
+        with xml.element(qn('w:p')):
+            if pPr is not None:
+                self._write_element(pPr)
+            with xml.element(qn('w:r')):
+                if rPr is not None:
+                    self._write_element(rPr)
+                for match in _RUN_TEXT_PATTERN.finditer(text or ''):
+                    piece = match.group()
+                    if piece == '\t':
+                        self._write_raw(b'<w:tab/>')
+                    elif piece in ('\r', '\n'):
+                        self._write_raw(b'<w:br/>')
+                    else:
+                        # Spelled out: xmlfile would bind the xml namespace to a made-up prefix
+                        attributes = {'xml:space': 'preserve'} if len(piece.strip()) < len(piece) else {}
+                        with xml.element(qn('w:t'), attributes):
+                            xml.write(piece)
+        xml.flush()
+
+    def _flush_pending(self):
+        """Serialize the paragraph waiting for edits, if any."""
+        if self._pending is not None:
+            self._write_element(self._pending)
+            self._pending = None
+
+    def _write_element(self, element):
+        """
+        Serialize an element without repeating the namespace declarations the
+        root element already makes. xmlfile.write() would declare them again
+        on every detached element, making the body half as large again.
+        """
+        data = etree.tostring(element, encoding='UTF-8', xml_declaration=False, with_tail=False)
+        # Declarations are on the first start tag; lxml escapes '>' in attribute values
+        end = data.index(b'>')
+        start_tag = _NAMESPACE_DECLARATION.sub(
+            lambda match: b'' if self._declared.get(match[1]) == match[2] else match[0],
+            data[:end]
+        )
+        self._write_raw(start_tag + data[end:])
+
+    def _write_raw(self, data):
+        """Write serialized XML straight to the part, after what xmlfile has buffered."""
+        self._xml.flush()
+        self._stream.write(data)
+
+    def _copy_other_parts(self, template_zip):
+        """Copy every template part except the main document, one at a time."""
+        for info in template_zip.infolist():
+            if info.filename == DOCUMENT_PART:
+                continue
+            with template_zip.open(info) as source, self._output_zip.open(info, 'w') as target:
+                shutil.copyfileobj(source, target)
+
+    def _open_body(self, template_document):
+        """
+        Stream the template's main document: open the same root and body
+        elements in the output, copy body content other than paragraphs
+        (e.g. tables) and keep the section properties for the end.
+        """
+        depth = 0
+        for event, element in etree.iterparse(template_document, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                if depth == 1:
+                    self._declared = {prefix.encode('utf-8'): uri.encode('utf-8')
+                                      for prefix, uri in element.nsmap.items() if prefix}
+                    self._stack.enter_context(
+                        self._xml.element(element.tag, dict(element.attrib), nsmap=element.nsmap)
+                    )
+                elif depth == 2 and element.tag == qn('w:body'):
+                    self._stack.enter_context(self._xml.element(element.tag))
+                continue
+
+            depth -= 1
+            if depth == 2 and element.getparent().tag == qn('w:body'):
+                # Direct child of the body
+                if element.tag == qn('w:sectPr'):
+                    # Re-parse so python-docx's Section API works on it
+                    self._sectPr = parse_xml(etree.tostring(element))
+                elif element.tag != qn('w:p'):
+                    self._write_element(element)
+                element.clear()
+                element.getparent().remove(element)
+            elif depth == 1 and element.tag != qn('w:body'):
+                # Root-level parts such as the page background
+                self._write_element(element)
+                element.clear()
@@ -0,0 +1,100 @@
+# src/document/template_cache.py
+"""
+Cache of parsed report templates.
+Each template is parsed and stripped of its body paragraphs once per process;
+every report then gets a deep copy of the clean document.
+"""
+import copy
+import hashlib
+import os
+import threading
+
+from docx import Document
+from docx.oxml.ns import qn
+
+
+class TemplateCache:
+    """Keeps one stripped, parsed copy of each template and hands out clones."""
+
+    def __init__(self):
+        # path -> ((mtime_ns, size), stripped Document)
+        self._entries = {}
+        # path -> ((mtime_ns, size), content digest)
+        self._digests = {}
+        self._lock = threading.Lock()
+
+    def get_document(self, template_path):
+        """
+        Get a fresh document based on the template, with all body paragraphs removed.
+        The template is reloaded when its modification time or size changes.
+
+        Args:
+            template_path: Path to the .docx template
+
+        Returns:
+            Document: A private copy that the caller may modify freely
+        """
+        key = os.path.abspath(template_path)
+        stat = os.stat(key)
+        fingerprint = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != fingerprint:
+                entry = (fingerprint, self._load_stripped(key))
+                self._entries[key] = entry
+            return copy.deepcopy(entry[1])
+
+    def fingerprint(self, template_path):
+        """
+        Digest of the template file's contents, recomputed only when its
+        modification time or size changes.
+
+        Args:
+            template_path: Path to the .docx template
+
+        Returns:
+            str: SHA-256 hex digest of the file
+        """
+        key = os.path.abspath(template_path)
+        stat = os.stat(key)
+        file_stamp = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._digests.get(key)
+            if entry is None or entry[0] != file_stamp:
+                with open(key, 'rb') as f:
+                    entry = (file_stamp, hashlib.sha256(f.read()).hexdigest())
+                self._digests[key] = entry
+            return entry[1]
+
+    def clear(self):
+        """Drop all cached templates."""
+        with self._lock:
+            self._entries.clear()
+            self._digests.clear()
+
+    def _load_stripped(self, template_path):
+        """
+        Parse the template and remove every body paragraph in a single pass.
+        Tables and the section properties are kept, as before.
+
+        Args:
+            template_path: Path to the .docx template
+
+        Returns:
+            Document: The stripped template
+        """
+        doc = Document(template_path)
+        body = doc.element.body
+        for p_element in body.findall(qn('w:p')):
+            body.remove(p_element)
+        return doc
+
+
+_default_cache = TemplateCache()
+
+
+def get_template_cache():
+    """Return the process-wide template cache."""
+    return _default_cache
@@ -0,0 +1,322 @@
+# src/document/template_inspector.py
+"""
+Dump a .docx template's structure (header, footer and body paragraphs with
+their alignment and run formatting) as UTF-8 JSON, in the format of
+example_structure.json.
+
+The XML parts are read straight from the zip with lxml's iterparse. Each
+top-level paragraph or table is freed as soon as it has been written out, so
+memory stays flat even for templates hundreds of pages long. The python-docx
+object model is never built.
+
+Usage:
+    python -m src.document.template_inspector example.docx -o example_structure.json
+"""
+import argparse
+import io
+import json
+import posixpath
+import sys
+import zipfile
+
+from lxml import etree
+
+DOCUMENT_PART = 'word/document.xml'
+DOCUMENT_RELS = 'word/_rels/document.xml.rels'
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+R = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+RELS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+# w:jc values as python-docx prints WD_PARAGRAPH_ALIGNMENT members
+ALIGNMENTS = {
+    'left': 'LEFT (0)',
+    'start': 'LEFT (0)',
+    'center': 'CENTER (1)',
+    'right': 'RIGHT (2)',
+    'end': 'RIGHT (2)',
+    'both': 'JUSTIFY (3)',
+    'distribute': 'DISTRIBUTE (4)',
+    'mediumKashida': 'JUSTIFY_MED (5)',
+    'highKashida': 'JUSTIFY_HI (7)',
+    'lowKashida': 'JUSTIFY_LOW (8)',
+    'thaiDistribute': 'THAI_JUSTIFY (9)',
+}
+
+# Half-points (w:sz) to EMU, the unit python-docx reports font sizes in
+EMU_PER_HALF_POINT = 6350
+
+_FALSE_VALUES = ('0', 'false', 'off')
+
+
+def inspect_template(path, max_paragraphs=None):
+    """
+    Read a template's structure into memory.
+    For large templates prefer write_structure(), which streams the body.
+
+    Args:
+        path: Path or binary file object of the .docx
+        max_paragraphs: Keep only the first N body paragraphs (default: all)
+
+    Returns:
+        dict: header, footer and main_paragraphs
+    """
+    with zipfile.ZipFile(path) as docx_zip:
+        header, footer = _header_and_footer(docx_zip)
+        return {
+            'header': header,
+            'footer': footer,
+            'main_paragraphs': list(_limit(_iter_body_paragraphs(docx_zip), max_paragraphs)),
+        }
+
+
+def write_structure(path, output, max_paragraphs=None):
+    """
+    Write a template's structure as indented UTF-8 JSON, streaming the body paragraphs.
+    The output matches json.dump(inspect_template(path), indent=2, ensure_ascii=False).
+
+    Args:
+        path: Path or binary file object of the .docx
+        output: Text file object opened with encoding='utf-8'
+        max_paragraphs: Write only the first N body paragraphs (default: all)
+    """
+    with zipfile.ZipFile(path) as docx_zip:
+        header, footer = _header_and_footer(docx_zip)
+        output.write('{\n')
+        output.write(f'  "header": {_dumps(header, 2)},\n')
+        output.write(f'  "footer": {_dumps(footer, 2)},\n')
+        output.write('  "main_paragraphs": [')
+
+        written = 0
+        for paragraph in _limit(_iter_body_paragraphs(docx_zip), max_paragraphs):
+            output.write(',\n    ' if written else '\n    ')
+            output.write(_dumps_flat(paragraph, 4))
+            written += 1
+        output.write('\n  ]\n}\n' if written else ']\n}\n')
+
+
+def _dumps(value, indent):
+    """JSON for a value nested `indent` spaces deep, formatted as json.dump(indent=2) would."""
+    return json.dumps(value, ensure_ascii=False, indent=2).replace('\n', '\n' + ' ' * indent)
+
+
+def _dumps_flat(value, indent):
+    """
+    Same as _dumps() for a dict of strings, without the pure-Python encoder
+    json.dumps falls back to when indenting, which dominated large dumps.
+    """
+    pad = ' ' * (indent + 2)
+    items = ',\n'.join(f'{pad}{_encode_string(key)}: {_encode_string(item)}' for key, item in value.items())
+    return f'{{\n{items}\n{" " * indent}}}'
+
+
+_encode_string = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def _limit(iterable, count):
+    for index, item in enumerate(iterable):
+        if count is not None and index >= count:
+            return
+        yield item
+
+
+# Block-level elements the inspector reads; iterparse reports only these
+BLOCK_TAGS = (W + 'p', W + 'tbl', W + 'sectPr')
+
+
+def _iter_blocks(source, container_tag):
+    """
+    Yield each direct child paragraph, table or sectPr of a part's container
+    element (w:body, w:hdr or w:ftr) once it is fully parsed, then free it and
+    everything before it.
+    """
+    events = etree.iterparse(source, events=('end',), tag=BLOCK_TAGS, resolve_entities=False)
+    for _, element in events:
+        parent = element.getparent()
+        if parent is None or parent.tag != container_tag:
+            continue
+        yield element
+        element.clear()
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def _iter_body_paragraphs(docx_zip):
+    """Yield {'text', 'alignment'} for each top-level body paragraph."""
+    with docx_zip.open(DOCUMENT_PART) as source:
+        for element in _iter_blocks(source, W + 'body'):
+            if element.tag == W + 'p':
+                yield {'text': _paragraph_text(element), 'alignment': _alignment(element)}
+
+
+def _header_and_footer(docx_zip):
+    """The first section's default header and footer, as dumped by the original tool."""
+    references = _first_section_references(docx_zip)
+    targets = _relationship_targets(docx_zip)
+
+    parts = {}
+    for kind, container in (('header', 'hdr'), ('footer', 'ftr')):
+        part = targets.get(references.get(kind))
+        parts[kind] = _read_header_part(docx_zip, part, W + container)
+    return parts['header'], parts['footer']
+
+
+def _first_section_references(docx_zip):
+    """
+    Relationship ids of the first section's default header and footer.
+    A section ends at a paragraph with pPr/sectPr, or at the body's own sectPr.
+    """
+    with docx_zip.open(DOCUMENT_PART) as source:
+        for element in _iter_blocks(source, W + 'body'):
+            if element.tag == W + 'p':
+                sectPr = element.find(f'{W}pPr/{W}sectPr')
+            elif element.tag == W + 'sectPr':
+                sectPr = element
+            else:
+                continue
+            if sectPr is None:
+                continue
+            references = {}
+            for kind in ('header', 'footer'):
+                for reference in sectPr.iterfind(f'{W}{kind}Reference'):
+                    if reference.get(W + 'type', 'default') == 'default':
+                        references[kind] = reference.get(R + 'id')
+            return references
+    return {}
+
+
+def _relationship_targets(docx_zip):
+    """Relationship id -> part name in the zip, for document.xml's relationships."""
+    try:
+        source = docx_zip.open(DOCUMENT_RELS)
+    except KeyError:
+        return {}
+    with source:
+        tree = etree.parse(source, etree.XMLParser(resolve_entities=False))
+    targets = {}
+    for relationship in tree.getroot().iterfind(RELS + 'Relationship'):
+        target = relationship.get('Target', '')
+        if target.startswith('/'):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join('word', target))
+        targets[relationship.get('Id')] = target
+    return targets
+
+
+def _read_header_part(docx_zip, part, container_tag):
+    """Paragraphs (with runs) and tables of a header or footer part."""
+    structure = {'paragraphs': [], 'tables': []}
+    if part is None or part not in docx_zip.namelist():
+        return structure
+    with docx_zip.open(part) as source:
+        for element in _iter_blocks(source, container_tag):
+            if element.tag == W + 'p':
+                structure['paragraphs'].append({
+                    'text': _paragraph_text(element),
+                    'alignment': _alignment(element),
+                    'runs': [_run_structure(run) for run in element.iterfind(W + 'r')],
+                })
+            elif element.tag == W + 'tbl':
+                structure['tables'].append([
+                    [_cell_text(cell) for cell in row.iterfind(W + 'tc')]
+                    for row in element.iterfind(W + 'tr')
+                ])
+    return structure
+
+
+def _alignment(paragraph):
+    jc = paragraph.find(f'{W}pPr/{W}jc')
+    if jc is None:
+        return 'None'
+    value = jc.get(W + 'val')
+    return ALIGNMENTS.get(value, value)
+
+
+def _paragraph_text(paragraph):
+    """Text of the paragraph's runs, including runs inside hyperlinks."""
+    parts = []
+    for child in paragraph:
+        if child.tag == W + 'r':
+            parts.append(_run_text(child))
+        elif child.tag == W + 'hyperlink':
+            parts.extend(_run_text(run) for run in child.iterfind(W + 'r'))
+    return ''.join(parts)
+
+
+def _run_text(run):
+    """A run's text, translating tabs and breaks the way python-docx does."""
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == W + 't':
+            parts.append(child.text or '')
+        elif tag in (W + 'tab', W + 'ptab'):
+            parts.append('\t')
+        elif tag == W + 'br':
+            if child.get(W + 'type', 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        elif tag == W + 'cr':
+            parts.append('\n')
+        elif tag == W + 'noBreakHyphen':
+            parts.append('-')
+    return ''.join(parts)
+
+
+def _cell_text(cell):
+    return '\n'.join(_paragraph_text(paragraph) for paragraph in cell.iterfind(W + 'p'))
+
+
+def _run_structure(run):
+    rPr = run.find(W + 'rPr')
+    bold = font_name = font_size = underline = None
+    if rPr is not None:
+        b = rPr.find(W + 'b')
+        if b is not None:
+            bold = b.get(W + 'val', 'true') not in _FALSE_VALUES
+        fonts = rPr.find(W + 'rFonts')
+        if fonts is not None:
+            font_name = fonts.get(W + 'ascii')
+        size = rPr.find(W + 'sz')
+        if size is not None and size.get(W + 'val', '').isdigit():
+            font_size = str(int(size.get(W + 'val')) * EMU_PER_HALF_POINT)
+        u = rPr.find(W + 'u')
+        if u is not None:
+            value = u.get(W + 'val')
+            underline = True if value == 'single' else False if value == 'none' else value
+    return {
+        'text': _run_text(run),
+        'bold': bold,
+        'font_name': font_name,
+        'font_size': font_size,
+        'underline': underline,
+    }
+
+
+def main(argv=None):
+    """Dump a template's structure as JSON. Returns an exit code."""
+    parser = argparse.ArgumentParser(description="Dump a .docx template's structure as JSON")
+    parser.add_argument('template', help='.docx file to inspect')
+    parser.add_argument('-o', '--output', help='JSON file to write (default: standard output)')
+    parser.add_argument('--max-paragraphs', type=int, default=None,
+                        help='Only dump the first N body paragraphs')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8', newline='\n') as output:
+                write_structure(args.template, output, args.max_paragraphs)
+        else:
+            # The console encoding may not cover Hebrew; always write UTF-8
+            output = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', newline='\n')
+            write_structure(args.template, output, args.max_paragraphs)
+            output.flush()
+            output.detach()
+    except (OSError, zipfile.BadZipFile, KeyError, etree.XMLSyntaxError) as e:
+        print(f"Error inspecting template: {e}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -11,12 +11,18 @@ from .tabs import ModernTabManager
 from ..data.data_manager import DataManager
 from ..data.widget_handlers import WidgetHandlerFactory
 from ..data.constants import Constants
-from ..document.report_generator import ReportGenerator
+from ..document.attachments import AttachmentPipeline
+from ..document.report_job import ReportJob
+from .progress_dialog import ReportProgressDialog
+from .search_dialog import ClaimSearchDialog
 
 
 class ModernInsuranceApp:
     """Modern insurance report application with improved UX."""
 
+    # How often the Tk loop checks a running report job, in milliseconds
+    REPORT_POLL_INTERVAL_MS = 100
+
     def __init__(self, root):
         self.root = root
         self.root.title("Enigma Assistant - מערכת דוחות ביטוח")
@@ -28,11 +34,17 @@ class ModernInsuranceApp:
 
         # Initialize managers
         self.data_manager = DataManager()
-        self.report_generator = ReportGenerator()
+        self.attachments = AttachmentPipeline(store=self.data_manager.blob_store)
+        self._report_generator = None
+        self._conclusion_client = None
 
         # State
         self.form_visible = False
         self.tab_manager = None
+        self.change_case_btn = None
+        self.report_job = None
+        self.progress_dialog = None
+        self.conclusion_job = None
 
         # Create UI
         self.create_header()
@@ -40,8 +52,26 @@ class ModernInsuranceApp:
         self.create_form_container()
         self.create_bottom_buttons()
 
-        # Load saved data if exists
-        self.data_manager.load_saved_data()
+    @property
+    def report_generator(self):
+        """ReportGenerator, created on first use so docx isn't imported at startup."""
+        if self._report_generator is None:
+            from ..document.report_cache import ReportCache
+            from ..document.report_generator import ReportGenerator
+            from ..document.section_cache import SectionCache
+            self._report_generator = ReportGenerator(
+                report_cache=ReportCache(), section_cache=SectionCache(),
+                attachments=self.attachments
+            )
+        return self._report_generator
+
+    @property
+    def conclusion_client(self):
+        """ConclusionClient, created on first use so asyncio isn't imported at startup."""
+        if self._conclusion_client is None:
+            from ..document.conclusion import ConclusionClient
+            self._conclusion_client = ConclusionClient()
+        return self._conclusion_client
 
     def center_window(self):
         """Center the window on screen."""
@@ -114,6 +144,23 @@ class ModernInsuranceApp:
         )
         load_btn.pack(pady=10)
 
+        # Full-text search button
+        search_btn = tk.Button(
+            self.selector_frame,
+            text="חיפוש תיקים",
+            font=('Alef', 12),
+            bg='#16a085',
+            fg='white',
+            activebackground='#138d75',
+            activeforeground='white',
+            border=0,
+            cursor='hand2',
+            command=self.open_search_dialog,
+            width=20,
+            height=2
+        )
+        search_btn.pack(pady=10)
+
         # Hint text
         hint_label = tk.Label(
             self.selector_frame,
@@ -130,7 +177,7 @@ class ModernInsuranceApp:
         # Don't pack yet - will show when case type is selected
 
     def create_bottom_buttons(self):
-        """Create save and generate report buttons."""
+        """Create the save, generate report and draft conclusion buttons."""
         self.button_frame = tk.Frame(self.root, bg='#f5f5f5', height=70)
         self.button_frame.pack(side='bottom', fill='x', pady=10)
         self.button_frame.pack_propagate(False)
@@ -162,7 +209,7 @@ class ModernInsuranceApp:
         save_btn.pack(side='right', padx=10)
 
         # Generate report button
-        generate_btn = tk.Button(
+        self.generate_btn = tk.Button(
             btn_container,
             text="📄 צור דוח",
             bg='#27ae60',
@@ -174,7 +221,22 @@ class ModernInsuranceApp:
             command=self.generate_report,
             **button_style
         )
-        generate_btn.pack(side='right', padx=10)
+        self.generate_btn.pack(side='right', padx=10)
+
+        # Draft conclusion button
+        self.conclusion_btn = tk.Button(
+            btn_container,
+            text="📝 נסח סיכום",
+            bg='#8e44ad',
+            fg='white',
+            activebackground='#7d3c98',
+            activeforeground='white',
+            border=0,
+            cursor='hand2',
+            command=self.draft_conclusion,
+            **button_style
+        )
+        self.conclusion_btn.pack(side='right', padx=10)
 
         # Initially hide buttons
         self.button_frame.pack_forget()
@@ -192,20 +254,24 @@ class ModernInsuranceApp:
         # Show form container
         self.form_container.pack(fill='both', expand=True, padx=20, pady=10)
 
-        # Create tab manager with selected case type
+        # Create the tab manager once; later case types reuse its widgets
         if self.tab_manager:
-            # Destroy previous tab manager
-            for widget in self.form_container.winfo_children():
-                widget.destroy()
-
-        self.tab_manager = ModernTabManager(
-            self.form_container,
-            self.data_manager,
-            case_type
-        )
+            self.tab_manager.set_case_type(case_type)
+        else:
+            self.tab_manager = ModernTabManager(
+                self.form_container,
+                self.data_manager,
+                case_type,
+                on_claim_selected=self.load_claim,
+                attachments=self.attachments
+            )
 
         # Store event type in data manager
-        self.data_manager.form_data['event_type'] = self.case_type_combo
+        if 'event_type' in self.data_manager.form_data:
+            # Set programmatically or from the list; either way re-read it
+            self.data_manager.form_data.mark_dirty('event_type')
+        else:
+            self.data_manager.form_data['event_type'] = self.case_type_combo
 
         # Show buttons
         self.button_frame.pack(side='bottom', fill='x', pady=10)
@@ -214,8 +280,11 @@ class ModernInsuranceApp:
         self.add_change_case_button()
 
     def add_change_case_button(self):
-        """Add button to change case type."""
-        change_btn = tk.Button(
+        """Add button to change case type (created on first use)."""
+        if self.change_case_btn:
+            return
+
+        self.change_case_btn = tk.Button(
             self.root.winfo_children()[0],  # Header frame
             text="← שנה סוג תיק",
             font=('Alef', 10),
@@ -227,7 +296,7 @@ class ModernInsuranceApp:
             cursor='hand2',
             command=self.show_case_selector
         )
-        change_btn.place(relx=0.05, rely=0.5, anchor='w')
+        self.change_case_btn.place(relx=0.05, rely=0.5, anchor='w')
 
     def show_case_selector(self):
         """Show case selector again."""
@@ -256,27 +325,72 @@ class ModernInsuranceApp:
                 messagebox.showwarning("אזהרה", "לא נמצאו נתונים שמורים")
                 return
 
-            # Get the event type from the saved data
-            event_type = saved_data.get('event_type')
-
-            if not event_type:
-                messagebox.showwarning("אזהרה", "לא נמצא סוג תיק בנתונים השמורים")
+            if not self.prepare_form_for(saved_data):
                 return
 
-            # Set the case type combo to the loaded event type
-            self.case_type_combo.set(event_type)
-
-            # Show the form (this creates the widgets)
-            self.on_case_type_selected()
-
-            # Now reload the data into the newly created widgets
             self.data_manager.load_data_from_json(saved_data)
+            self.tab_manager.show_thumbnails()
 
             messagebox.showinfo("הצלחה", "הנתונים נטענו בהצלחה!")
 
         except Exception as e:
             messagebox.showerror("שגיאה", f"שגיאה בטעינת הנתונים: {str(e)}")
 
+    def prepare_form_for(self, saved_data):
+        """
+        Show a blank form for the case type of some saved data, ready to load it.
+
+        Args:
+            saved_data (dict): Saved form data, including its event_type
+
+        Returns:
+            bool: False if the data has no case type (a warning is shown)
+        """
+        # Get the event type from the saved data
+        event_type = saved_data.get('event_type')
+
+        if not event_type:
+            messagebox.showwarning("אזהרה", "לא נמצא סוג תיק בנתונים השמורים")
+            return False
+
+        # Set the case type combo to the loaded event type
+        self.case_type_combo.set(event_type)
+
+        # Show the form (widgets are created once and then reused)
+        self.on_case_type_selected()
+
+        # Start from a blank form
+        self.data_manager.clear_all_fields()
+        self.case_type_combo.set(event_type)
+        return True
+
+    def open_search_dialog(self):
+        """Open the full-text search window over all saved claims."""
+        ClaimSearchDialog(self.root, self.data_manager.search_claims, self.load_claim)
+
+    def load_claim(self, claim_number):
+        """
+        Load a saved claim into the form.
+
+        Args:
+            claim_number: Claim number to load
+        """
+        try:
+            saved_data = self.data_manager.file_persistence.load_by_claim_number(claim_number)
+            if not saved_data:
+                messagebox.showwarning(
+                    "לא נמצא",
+                    f"לא נמצאו נתונים עבור תיק מספר: {claim_number}"
+                )
+                return
+
+            if self.prepare_form_for(saved_data):
+                self.data_manager.apply_claim_data(claim_number, saved_data)
+                self.tab_manager.show_thumbnails()
+
+        except Exception as e:
+            messagebox.showerror("שגיאה", f"שגיאה בטעינת הנתונים: {str(e)}")
+
     def save_data(self):
         """Save form data."""
         try:
@@ -310,9 +424,91 @@ class ModernInsuranceApp:
                     # User chose לא (No) - cancel report generation
                     return
 
-            # Generate the report
-            success = self.report_generator.generate(self.data_manager.form_data)
-            if success:
-                messagebox.showinfo("הצלחה", "הדוח נוצר בהצלחה!")
+            # Snapshot the form on the Tk thread, then build the report in the background
+            snapshot = self.data_manager.build_snapshot()
+            self.start_report_job(snapshot)
         except Exception as e:
             messagebox.showerror("שגיאה", f"שגיאה ביצירת הדוח: {str(e)}")
+
+    def start_report_job(self, snapshot):
+        """
+        Start generating the report on a background thread and show progress.
+
+        Args:
+            snapshot: FormSnapshot of the form values
+        """
+        if self.report_job and self.report_job.is_running():
+            return
+
+        self.generate_btn.config(state='disabled')
+        self.report_job = ReportJob(self.report_generator, snapshot).start()
+        self.progress_dialog = ReportProgressDialog(self.root, on_cancel=self.report_job.cancel)
+        self.root.after(self.REPORT_POLL_INTERVAL_MS, self.poll_report_job)
+
+    def poll_report_job(self):
+        """Apply progress from the running report job; reschedule until it finishes."""
+        for message in self.report_job.poll():
+            kind = message[0]
+            if kind == 'progress':
+                self.progress_dialog.update_progress(*message[1:])
+            elif kind == 'done':
+                self.finish_report_job()
+                # Only the save dialog and the file write run on the Tk thread
+                if self.report_generator.save_report_bytes(message[1]):
+                    messagebox.showinfo("הצלחה", "הדוח נוצר בהצלחה!")
+                return
+            elif kind == 'cancelled':
+                self.finish_report_job()
+                messagebox.showinfo("בוטל", "יצירת הדוח בוטלה")
+                return
+            elif kind == 'error':
+                self.finish_report_job()
+                messagebox.showerror("שגיאה", f"שגיאה ביצירת הדוח: {str(message[1])}")
+                return
+
+        self.root.after(self.REPORT_POLL_INTERVAL_MS, self.poll_report_job)
+
+    def finish_report_job(self):
+        """Close the progress window and re-enable the generate button."""
+        if self.progress_dialog:
+            self.progress_dialog.close()
+            self.progress_dialog = None
+        self.generate_btn.config(state='normal')
+
+    def draft_conclusion(self):
+        """Draft the summary with the language model on a background thread."""
+        if self.conclusion_job and self.conclusion_job.is_running():
+            return
+        if not self.conclusion_client.backend.is_configured():
+            messagebox.showwarning("ניסוח סיכום", "לא הוגדר מפתח GEMINI_API_KEY לניסוח הסיכום")
+            return
+
+        try:
+            snapshot = self.data_manager.build_snapshot()
+        except Exception as e:
+            messagebox.showerror("שגיאה", f"שגיאה בקריאת הנתונים: {str(e)}")
+            return
+
+        # Imported here so asyncio and urllib aren't loaded at startup
+        from ..document.conclusion import ConclusionJob
+
+        self.conclusion_btn.config(state='disabled', text="⏳ מנסח...")
+        self.conclusion_job = ConclusionJob(self.conclusion_client, snapshot).start()
+        self.root.after(self.REPORT_POLL_INTERVAL_MS, self.poll_conclusion_job)
+
+    def poll_conclusion_job(self):
+        """Put the drafted summary in the form once the job finishes."""
+        for message in self.conclusion_job.poll():
+            kind = message[0]
+            self.conclusion_btn.config(state='normal', text="📝 נסח סיכום")
+            if kind == 'done':
+                current = self.data_manager.get_field_value('summary').strip()
+                if current and current != 'NOT_FILLED' and not messagebox.askyesno(
+                        "ניסוח סיכום", "שדה הסיכום כבר מולא. להחליף אותו בסיכום שנוסח?"):
+                    return
+                self.data_manager.set_field_value('summary', message[1])
+            elif kind == 'error':
+                messagebox.showerror("שגיאה", f"שגיאה בניסוח הסיכום: {str(message[1])}")
+            return
+
+        self.root.after(self.REPORT_POLL_INTERVAL_MS, self.poll_conclusion_job)
@@ -0,0 +1,193 @@
+# src/gui/autocomplete.py
+"""
+Type-ahead helpers: a suggestion list shown under an Entry while the user
+types, and Combobox lists narrowed to what has been typed.
+"""
+import tkinter as tk
+
+
+class AutocompleteDropdown:
+    """Suggests saved claims matching the start of an Entry's text."""
+
+    MAX_SUGGESTIONS = 8
+
+    # Keys that move through or close the list rather than edit the text
+    NAVIGATION_KEYS = frozenset({'Up', 'Down', 'Return', 'KP_Enter', 'Escape', 'Tab'})
+
+    def __init__(self, entry, suggest, on_select, show_claim_number=True):
+        """
+        Args:
+            entry: The Entry widget to complete
+            suggest: Callable(prefix, limit) returning dictionaries with
+                claim_number and value (see DataManager.suggest_claims)
+            on_select: Called with the chosen suggestion's claim number
+            show_claim_number: List the claim number next to each value
+        """
+        self.entry = entry
+        self.suggest = suggest
+        self.on_select = on_select
+        self.show_claim_number = show_claim_number
+        self.popup = None
+        self.listbox = None
+        self._claim_numbers = []
+
+        entry.bind('<KeyRelease>', self.on_key_release, add='+')
+        entry.bind('<Down>', self.focus_list, add='+')
+        entry.bind('<Escape>', self.hide, add='+')
+        entry.bind('<FocusOut>', self.on_focus_out, add='+')
+
+    def on_key_release(self, event=None):
+        """Refresh the suggestions for the text typed so far."""
+        if event is not None and event.keysym in self.NAVIGATION_KEYS:
+            return
+
+        prefix = self.entry.get().strip()
+        try:
+            suggestions = self.suggest(prefix, self.MAX_SUGGESTIONS) if prefix else []
+        except Exception as e:
+            print(f"Error getting suggestions: {e}")
+            suggestions = []
+
+        # The only suggestion is what was typed: nothing left to complete
+        if len(suggestions) == 1 and suggestions[0]['value'] == prefix:
+            suggestions = []
+
+        if suggestions:
+            self.show(suggestions)
+        else:
+            self.hide()
+
+    def show(self, suggestions):
+        """
+        Show a list of suggestions under the entry.
+
+        Args:
+            suggestions: Dictionaries with claim_number and value
+        """
+        if self.popup is None:
+            self.popup = tk.Toplevel(self.entry)
+            self.popup.overrideredirect(True)
+            self.listbox = tk.Listbox(
+                self.popup, font=('Alef', 10), justify='right',
+                activestyle='dotbox', exportselection=False
+            )
+            self.listbox.pack(fill='both', expand=True)
+            self.listbox.bind('<ButtonRelease-1>', self.select)
+            self.listbox.bind('<Return>', self.select)
+            self.listbox.bind('<KP_Enter>', self.select)
+            self.listbox.bind('<Escape>', self.cancel)
+            self.listbox.bind('<FocusOut>', self.on_focus_out)
+
+        self.listbox.delete(0, 'end')
+        self._claim_numbers = []
+        for suggestion in suggestions:
+            label = suggestion['value']
+            if self.show_claim_number and suggestion['claim_number'] != label:
+                label = f"{label}   (תיק {suggestion['claim_number']})"
+            self.listbox.insert('end', label)
+            self._claim_numbers.append(suggestion['claim_number'])
+        self.listbox.configure(height=len(suggestions))
+
+        x = self.entry.winfo_rootx()
+        y = self.entry.winfo_rooty() + self.entry.winfo_height()
+        self.popup.geometry(f"{self.entry.winfo_width()}x{self.listbox.winfo_reqheight()}+{x}+{y}")
+        self.popup.deiconify()
+        self.popup.lift()
+
+    def hide(self, event=None):
+        """Close the suggestion list."""
+        if self.popup is not None:
+            self.popup.withdraw()
+
+    def cancel(self, event=None):
+        """Close the list and return to the entry."""
+        self.hide()
+        self.entry.focus_set()
+
+    def focus_list(self, event=None):
+        """Move from the entry into the list (Down arrow)."""
+        if self.popup is None or not self.popup.winfo_viewable():
+            return None
+        self.listbox.focus_set()
+        self.listbox.selection_clear(0, 'end')
+        self.listbox.selection_set(0)
+        self.listbox.activate(0)
+        return 'break'
+
+    def on_focus_out(self, event=None):
+        """Close the list once focus leaves both the entry and the list."""
+        # Focus moves after FocusOut is delivered; check where it went
+        self.entry.after(100, self._hide_if_unfocused)
+
+    def _hide_if_unfocused(self):
+        try:
+            focused = self.entry.focus_get()
+        except (KeyError, tk.TclError):
+            # Focus is in a window Tk can't name, e.g. a dialog
+            focused = None
+        if focused not in (self.entry, self.listbox):
+            self.hide()
+
+    def select(self, event=None):
+        """Load the highlighted suggestion's claim."""
+        selection = self.listbox.curselection()
+        if not selection:
+            return
+        claim_number = self._claim_numbers[selection[0]]
+        self.hide()
+        self.on_select(claim_number)
+
+
+class ComboboxFilter:
+    """Narrows a Combobox's drop-down list to the entries matching its text, as the user types."""
+
+    # Typing pause before the list is filtered, so a burst of keys filters once
+    DEBOUNCE_MS = 150
+
+    def __init__(self, combobox, values_for):
+        """
+        Args:
+            combobox: An editable ttk.Combobox
+            values_for: Callable(typed_text) returning the matching values
+        """
+        self.combobox = combobox
+        self.values_for = values_for
+        self._pending = None
+        combobox.bind('<KeyRelease>', self.on_key_release, add='+')
+        # Also filter when the list drops down, in case it opens mid-pause
+        combobox.configure(postcommand=self.refresh)
+        combobox.bind('<Return>', self.complete, add='+')
+
+    def on_key_release(self, event=None):
+        """Filter the list once the user pauses typing."""
+        if event is not None and event.keysym in AutocompleteDropdown.NAVIGATION_KEYS:
+            return
+        if self._pending is not None:
+            self.combobox.after_cancel(self._pending)
+        self._pending = self.combobox.after(self.DEBOUNCE_MS, self.refresh)
+
+    def refresh(self):
+        """Show only the values matching the current text."""
+        if self._pending is not None:
+            self.combobox.after_cancel(self._pending)
+            self._pending = None
+        try:
+            values = self.values_for(self.combobox.get())
+        except Exception as e:
+            print(f"Error filtering values: {e}")
+            return
+        self.combobox.configure(values=values)
+
+    def complete(self, event=None):
+        """On Return, replace partial text with the first match."""
+        typed = self.combobox.get().strip()
+        if not typed:
+            return
+        try:
+            values = self.values_for(typed)
+        except Exception as e:
+            print(f"Error filtering values: {e}")
+            return
+        if values and typed not in values:
+            self.combobox.set(values[0])
+            self.combobox.event_generate('<<ComboboxSelected>>')
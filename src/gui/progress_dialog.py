@@ -0,0 +1,71 @@
+# src/gui/progress_dialog.py
+"""
+Modal progress window shown while a report is generated in the background.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+
+class ReportProgressDialog:
+    """Small window with a progress bar, the current section and a cancel button."""
+
+    def __init__(self, root, on_cancel):
+        """
+        Args:
+            root: Parent Tk window
+            on_cancel: Called when the user presses cancel or closes the window
+        """
+        self.on_cancel = on_cancel
+
+        self.window = tk.Toplevel(root)
+        self.window.title("יצירת דוח")
+        self.window.configure(bg='#f5f5f5')
+        self.window.resizable(False, False)
+        self.window.transient(root)
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self.status_label = tk.Label(
+            self.window,
+            text="מכין את הדוח...",
+            font=('Alef', 12),
+            bg='#f5f5f5',
+            fg='#2c3e50'
+        )
+        self.status_label.pack(padx=30, pady=(20, 10))
+
+        self.progress_bar = ttk.Progressbar(self.window, length=300, mode='determinate')
+        self.progress_bar.pack(padx=30, pady=5)
+
+        self.cancel_button = tk.Button(
+            self.window,
+            text="ביטול",
+            font=('Alef', 11),
+            bg='#e74c3c',
+            fg='white',
+            activebackground='#c0392b',
+            activeforeground='white',
+            border=0,
+            cursor='hand2',
+            command=self.cancel,
+            width=10
+        )
+        self.cancel_button.pack(pady=(10, 20))
+
+        self.window.grab_set()
+
+    def update_progress(self, done, total, label):
+        """Show that `done` of `total` sections are finished, the last being `label`."""
+        self.progress_bar['maximum'] = total
+        self.progress_bar['value'] = done
+        self.status_label.config(text=f"הושלם: {label} ({done}/{total})")
+
+    def cancel(self):
+        """Disable the button and notify the owner."""
+        self.cancel_button.config(state='disabled')
+        self.status_label.config(text="מבטל...")
+        self.on_cancel()
+
+    def close(self):
+        """Release the grab and destroy the window."""
+        self.window.grab_release()
+        self.window.destroy()
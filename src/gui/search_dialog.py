@@ -0,0 +1,107 @@
+# src/gui/search_dialog.py
+"""
+Window for full-text search across all saved claims.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+
+class ClaimSearchDialog:
+    """Search box with a ranked result list; choosing a result loads that claim."""
+
+    # Wait this long after the last keystroke before searching, in milliseconds
+    SEARCH_DELAY_MS = 200
+    MAX_RESULTS = 50
+
+    # Right-to-left: the first column is displayed leftmost
+    COLUMNS = (
+        ('snippet', 'קטע תואם', 360),
+        ('event_date', 'תאריך אירוע', 90),
+        ('event_type', 'סוג אירוע', 110),
+        ('full_name', 'שם המבוטח', 140),
+        ('claim_number', 'מספר תביעה', 100),
+    )
+
+    def __init__(self, root, search, on_select):
+        """
+        Args:
+            root: Parent Tk window
+            search: Callable(query, limit) returning result dictionaries
+                (see DataManager.search_claims)
+            on_select: Called with the chosen claim number
+        """
+        self.search = search
+        self.on_select = on_select
+        self._pending_search = None
+
+        self.window = tk.Toplevel(root)
+        self.window.title("חיפוש תיקים")
+        self.window.configure(bg='#f5f5f5')
+        self.window.transient(root)
+
+        tk.Label(
+            self.window,
+            text="חפש לפי שם, מספר או קטע מהנסיבות, החקירה או הסיכום",
+            font=('Alef', 11),
+            bg='#f5f5f5',
+            fg='#2c3e50'
+        ).pack(padx=20, pady=(15, 5), anchor='e')
+
+        self.query_entry = ttk.Entry(self.window, width=60, font=('Alef', 12), justify='right')
+        self.query_entry.pack(padx=20, pady=5, fill='x')
+        self.query_entry.bind('<KeyRelease>', self.schedule_search)
+        self.query_entry.bind('<Return>', self.run_search)
+        self.query_entry.focus_set()
+
+        self.results_tree = ttk.Treeview(
+            self.window,
+            columns=[name for name, _, _ in self.COLUMNS],
+            show='headings',
+            height=15
+        )
+        for name, title, width in self.COLUMNS:
+            self.results_tree.heading(name, text=title, anchor='e')
+            self.results_tree.column(name, width=width, anchor='e')
+        self.results_tree.pack(padx=20, pady=5, fill='both', expand=True)
+        self.results_tree.bind('<Double-1>', self.select_result)
+        self.results_tree.bind('<Return>', self.select_result)
+
+        self.status_label = tk.Label(
+            self.window, text="", font=('Alef', 10), bg='#f5f5f5', fg='#7f8c8d'
+        )
+        self.status_label.pack(padx=20, pady=(0, 15), anchor='e')
+
+    def schedule_search(self, event=None):
+        """Search once the user pauses typing."""
+        if self._pending_search:
+            self.window.after_cancel(self._pending_search)
+        self._pending_search = self.window.after(self.SEARCH_DELAY_MS, self.run_search)
+
+    def run_search(self, event=None):
+        """Search for the current query and show the results."""
+        self._pending_search = None
+        query = self.query_entry.get().strip()
+        self.results_tree.delete(*self.results_tree.get_children())
+        if not query:
+            self.status_label.config(text="")
+            return
+
+        try:
+            results = self.search(query, self.MAX_RESULTS)
+        except Exception as e:
+            print(f"Error searching claims: {e}")
+            self.status_label.config(text=f"שגיאה בחיפוש: {str(e)}")
+            return
+
+        for result in results:
+            values = [result.get(name) or '' for name, _, _ in self.COLUMNS]
+            self.results_tree.insert('', 'end', iid=result['claim_number'], values=values)
+        self.status_label.config(text=f"נמצאו {len(results)} תיקים")
+
+    def select_result(self, event=None):
+        """Load the highlighted claim and close the window."""
+        selection = self.results_tree.selection()
+        if not selection:
+            return
+        self.window.destroy()
+        self.on_select(selection[0])
@@ -1,13 +1,26 @@
 import tkinter as tk
+from datetime import datetime
 from tkinter import ttk, filedialog, messagebox
-from tkcalendar import DateEntry
+from .autocomplete import AutocompleteDropdown, ComboboxFilter
 from .utils import create_scrollable_frame
 from ..data.constants import Constants
+from ..data.transcript import TranscriptImport, format_pair
+from ..data.vehicle_catalog import VehicleCatalog
+from ..document.attachments import AttachmentPipeline, split_paths
 
 
 class ModernTabManager:
     """Manages dynamic form display based on case type."""
 
+    # How often the Tk loop checks for finished thumbnails, in milliseconds
+    THUMBNAIL_POLL_INTERVAL_MS = 100
+    # How often the Tk loop checks whether picked files are stored
+    ATTACHMENT_POLL_INTERVAL_MS = 100
+    THUMBNAILS_PER_ROW = 6
+    # Transcript pairs are inserted into the investigation field a batch per tick
+    TRANSCRIPT_POLL_INTERVAL_MS = 30
+    TRANSCRIPT_PAIRS_PER_TICK = 40
+
     # Define which tabs to show for each case type
     TAB_VISIBILITY_RULES = {
         'גניבת רכב': ['basic', 'vehicle', 'additional'],
@@ -25,10 +38,74 @@ class ModernTabManager:
         'נזקי מים': ['basic', 'additional'],
     }
 
-    def __init__(self, parent, data_manager, case_type):
+    # Tab kind -> (notebook title, method that fills the tab)
+    TAB_BUILDERS = {
+        'basic': ('פרטים בסיסיים', 'create_basic_tab'),
+        'vehicle': ('פרטי רכב', 'create_vehicle_tab'),
+        'third_party': ('פרטי צד ג\'', 'create_third_party_tab'),
+        'additional': ('פרטים נוספים', 'create_additional_tab'),
+    }
+
+    # Fields of each tab as (row, field_name, label_text, widget_type, options),
+    # so they can be declared to the data manager before the tab is built
+    TAB_FIELDS = {
+        'basic': [
+            (0, 'event_date', 'תאריך אירוע', 'date', {}),
+            (1, 'claim_number', 'מספר תביעה', 'entry', {'autocomplete': True}),
+            (2, 'full_name', 'שם מלא של המבוטח', 'entry', {}),
+            (3, 'policy_number', 'מספר פוליסה', 'entry', {'autocomplete': True}),
+        ],
+        'vehicle': [
+            (0, 'vehicle_company', 'יצרן הרכב', 'combo',
+             {'values': Constants.CAR_MANUFACTURERS, 'editable': True}),
+            (1, 'vehicle_color', 'צבע הרכב', 'combo', {'values': Constants.CAR_COLORS}),
+            (2, 'vehicle_model', 'דגם הרכב', 'combo', {'values': [], 'editable': True}),
+            (3, 'vehicle_manufacture_year', 'שנת ייצור', 'entry', {}),
+            (4, 'vehicle_license_number', 'מספר רישוי', 'entry', {'autocomplete': True}),
+            (5, 'vehicle_engine_type', 'סוג מנוע', 'entry', {}),
+            (6, 'vehicle_engine_capacity', 'נפח מנוע', 'entry', {}),
+            (7, 'vehicle_engine_power', 'הספק מנוע', 'entry', {}),
+            (8, 'vehicle_gearbox', 'סוג גיר', 'entry', {}),
+        ],
+        'third_party': [
+            (0, 'third_party_name', 'שם צד ג\'', 'entry', {}),
+            (1, 'third_party_policy_number', 'מספר פוליסה צד ג\'', 'entry', {}),
+            (2, 'third_party_contact', 'טלפון צד ג\'', 'entry', {}),
+        ],
+        'additional': [
+            (0, 'circumstances', 'נסיבות האירוע', 'text', {'height': 5}),
+            (3, 'investigation', 'החקירה עצמה', 'text', {'height': 5}),
+            (4, 'summary', 'סיכום', 'text', {'height': 5}),
+        ],
+    }
+
+    def __init__(self, parent, data_manager, case_type, on_claim_selected=None,
+                 vehicle_catalog=None, attachments=None):
+        """
+        Args:
+            parent: Frame to place the notebook in
+            data_manager: DataManager the fields register with
+            case_type: Case type whose tabs are shown first
+            on_claim_selected: Called with a claim number when an autocomplete
+                suggestion is chosen; None disables autocomplete
+            vehicle_catalog: VehicleCatalog for the vehicle tab; defaults to
+                the catalog file in the working directory (opened on first use)
+            attachments: AttachmentPipeline that renders the image thumbnails
+        """
         self.parent = parent
         self.data_manager = data_manager
         self.case_type = case_type
+        self.on_claim_selected = on_claim_selected
+        self.autocomplete = {}  # field name -> AutocompleteDropdown
+        self.vehicle_catalog = vehicle_catalog or VehicleCatalog()
+        # Values last filled in from the catalog, which a new model may replace
+        self.catalog_filled = {}
+        self.attachments = attachments or AttachmentPipeline()
+        self.thumbnail_frame = None  # Created with the additional tab
+        self.thumbnail_job = None
+        self.thumbnail_images = []  # Tk drops images nothing references
+        self.transcript_job = None
+        self.transcript_pairs = 0  # Pairs inserted by the running import
 
         # Create notebook
         self.notebook = ttk.Notebook(parent)
@@ -38,101 +115,153 @@ class ModernTabManager:
         style = ttk.Style()
         style.configure('TNotebook.Tab', font=('Alef', 11), padding=[15, 8])
 
+        # One page per tab kind for the whole session; a case type only
+        # shows or hides them, and widgets are built on first view
+        self.tab_frames = {}
+        self.unbuilt_tabs = {}  # notebook tab id -> tab kind
+        for kind in self.TAB_BUILDERS:
+            self.add_tab(kind)
+
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        self.set_case_type(case_type)
+
+    def set_case_type(self, case_type):
+        """
+        Show the tabs for a case type and hide the rest.
+        Hidden tabs keep their widgets and values, but their fields are left
+        out of saves, validation and reports.
+
+        Args:
+            case_type: One of Constants.EVENT_TYPES
+        """
+        self.case_type = case_type
+
         # Determine which tabs to show
         tabs_to_show = self.TAB_VISIBILITY_RULES.get(
             case_type,
             ['basic', 'additional']  # Default fallback
         )
 
-        # Create only the relevant tabs
-        if 'basic' in tabs_to_show:
-            self.create_basic_tab()
-
-        if 'vehicle' in tabs_to_show:
-            self.create_vehicle_tab()
+        inactive_fields = []
+        for kind, frame in self.tab_frames.items():
+            if kind in tabs_to_show:
+                self.notebook.tab(frame, state='normal')
+            else:
+                self.notebook.tab(frame, state='hidden')
+                inactive_fields.extend(field[1] for field in self.TAB_FIELDS[kind])
+        self.data_manager.form_data.set_inactive(inactive_fields)
 
-        if 'third_party' in tabs_to_show:
-            self.create_third_party_tab()
+        self.notebook.select(self.tab_frames[tabs_to_show[0]])
+        self.build_tab(tabs_to_show[0])
 
-        if 'additional' in tabs_to_show:
-            self.create_additional_tab()
+    def add_tab(self, kind):
+        """
+        Add a tab's page and declare its fields without building any widgets.
 
-    def create_basic_tab(self):
-        """Create basic information tab."""
+        Args:
+            kind: Key of TAB_BUILDERS
+        """
+        title, _ = self.TAB_BUILDERS[kind]
         frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text='פרטים בסיסיים')
-
-        scrollable = create_scrollable_frame(frame)
+        self.notebook.add(frame, text=title)
+        self.tab_frames[kind] = frame
+        self.unbuilt_tabs[str(frame)] = kind
 
-        # Date (DatePicker)
-        self.create_field(scrollable, 0, 'תאריך אירוע', 'event_date',
-                         widget_type='date')
+        for _, field_name, _, widget_type, _ in self.TAB_FIELDS[kind]:
+            default = datetime.now().strftime('%d/%m/%Y') if widget_type == 'date' else ''
+            self.data_manager.form_data.declare(field_name, default)
 
-        # Basic text fields
-        fields = [
-            ('claim_number', 'מספר תביעה'),
-            ('full_name', 'שם מלא של המבוטח'),
-            ('policy_number', 'מספר פוליסה')
-        ]
+    def on_tab_changed(self, event=None):
+        """Build the selected tab's widgets the first time it is shown."""
+        kind = self.unbuilt_tabs.get(self.notebook.select())
+        if kind:
+            self.build_tab(kind)
 
-        for i, (field_name, label_text) in enumerate(fields, start=1):
-            self.create_field(scrollable, i, label_text, field_name)
+    def build_tab(self, kind):
+        """
+        Create a tab's widgets if they don't exist yet.
+        Values staged for its fields are applied as the widgets register.
 
-    def create_vehicle_tab(self):
-        """Create vehicle information tab."""
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text='פרטי רכב')
+        Args:
+            kind: Key of TAB_BUILDERS
+        """
+        frame = self.tab_frames[kind]
+        if self.unbuilt_tabs.pop(str(frame), None) is None:
+            return
 
         scrollable = create_scrollable_frame(frame)
+        _, builder = self.TAB_BUILDERS[kind]
+        getattr(self, builder)(scrollable)
 
-        # Manufacturer (Dropdown)
-        self.create_field(scrollable, 0, 'יצרן הרכב', 'vehicle_company',
-                         widget_type='combo', values=Constants.CAR_MANUFACTURERS)
-
-        # Color (Dropdown)
-        self.create_field(scrollable, 1, 'צבע הרכב', 'vehicle_color',
-                         widget_type='combo', values=Constants.CAR_COLORS)
-
-        # Vehicle text fields
-        fields = [
-            ('vehicle_model', 'דגם הרכב'),
-            ('vehicle_manufacture_year', 'שנת ייצור'),
-            ('vehicle_license_number', 'מספר רישוי'),
-            ('vehicle_engine_type', 'סוג מנוע'),
-            ('vehicle_engine_capacity', 'נפח מנוע'),
-            ('vehicle_engine_power', 'הספק מנוע'),
-            ('vehicle_gearbox', 'סוג גיר')
-        ]
-
-        for i, (field_name, label_text) in enumerate(fields, start=2):
-            self.create_field(scrollable, i, label_text, field_name)
-
-    def create_third_party_tab(self):
-        """Create third party information tab."""
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text='פרטי צד ג\'')
+    def build_all_tabs(self):
+        """Create every remaining tab's widgets."""
+        for kind in list(self.unbuilt_tabs.values()):
+            self.build_tab(kind)
 
-        scrollable = create_scrollable_frame(frame)
-
-        fields = [
-            ('third_party_name', 'שם צד ג\''),
-            ('third_party_policy_number', 'מספר פוליסה צד ג\''),
-            ('third_party_contact', 'טלפון צד ג\'')
-        ]
+    def create_tab_fields(self, parent, kind):
+        """Create the fields listed in TAB_FIELDS for a tab."""
+        for row, field_name, label_text, widget_type, options in self.TAB_FIELDS[kind]:
+            self.create_field(parent, row, label_text, field_name,
+                              widget_type=widget_type, **options)
 
-        for i, (field_name, label_text) in enumerate(fields):
-            self.create_field(scrollable, i, label_text, field_name)
+    def create_basic_tab(self, scrollable):
+        """Create basic information tab."""
+        # Date (DatePicker) and basic text fields
+        self.create_tab_fields(scrollable, 'basic')
 
-    def create_additional_tab(self):
-        """Create additional information tab with text areas."""
-        frame = ttk.Frame(self.notebook)
-        self.notebook.add(frame, text='פרטים נוספים')
+    def create_vehicle_tab(self, scrollable):
+        """Create vehicle information tab."""
+        # Manufacturer and color dropdowns, then vehicle text fields
+        self.create_tab_fields(scrollable, 'vehicle')
+
+        # Manufacturer and model lists come from the vehicle catalog
+        form_data = self.data_manager.form_data
+        company = form_data['vehicle_company']
+        model = form_data['vehicle_model']
+        ComboboxFilter(company, lambda typed: self.vehicle_catalog.manufacturers(typed))
+        ComboboxFilter(model, lambda typed: self.vehicle_catalog.models(company.get().strip(), typed))
+
+        company.bind('<<ComboboxSelected>>', self.on_vehicle_company_selected, add='+')
+        model.bind('<<ComboboxSelected>>', self.fill_vehicle_specs, add='+')
+        model.bind('<FocusOut>', self.fill_vehicle_specs, add='+')
+        form_data['vehicle_manufacture_year'].bind('<FocusOut>', self.fill_vehicle_specs, add='+')
+
+    def on_vehicle_company_selected(self, event=None):
+        """Clear a model that belongs to a different manufacturer."""
+        company = self.data_manager.get_field_value('vehicle_company').strip()
+        model = self.data_manager.get_field_value('vehicle_model').strip()
+        if model and model not in self.vehicle_catalog.models(company):
+            self.data_manager.set_field_value('vehicle_model', '')
+
+    def fill_vehicle_specs(self, event=None):
+        """
+        Fill engine and gearbox details from the catalog for the chosen model.
+        Only empty fields, or fields still holding an earlier catalog value,
+        are filled; details the user typed are kept.
+        """
+        get_value = self.data_manager.get_field_value
+        company = get_value('vehicle_company').strip()
+        model = get_value('vehicle_model').strip()
+        if not company or not model:
+            return
+
+        specs = self.vehicle_catalog.common_specs(
+            company, model, get_value('vehicle_manufacture_year')
+        )
+        for field_name, value in specs.items():
+            current = get_value(field_name).strip()
+            if not current or current == self.catalog_filled.get(field_name):
+                self.data_manager.set_field_value(field_name, value)
+                self.catalog_filled[field_name] = value
 
-        scrollable = create_scrollable_frame(frame)
+    def create_third_party_tab(self, scrollable):
+        """Create third party information tab."""
+        self.create_tab_fields(scrollable, 'third_party')
 
-        # Circumstances
-        self.create_field(scrollable, 0, 'נסיבות האירוע', 'circumstances',
-                         widget_type='text', height=5)
+    def create_additional_tab(self, scrollable):
+        """Create additional information tab with text areas."""
+        # Circumstances, investigation and summary
+        self.create_tab_fields(scrollable, 'additional')
 
         # File uploads
         ttk.Label(scrollable, text='סרטוני וידאו',
@@ -147,13 +276,15 @@ class ModernTabManager:
                               command=lambda: self.upload_file('image'))
         image_btn.grid(row=2, column=0, padx=5, pady=5, sticky='ew')
 
-        # Investigation
-        self.create_field(scrollable, 3, 'החקירה עצמה', 'investigation',
-                         widget_type='text', height=5)
+        self.thumbnail_frame = ttk.Frame(scrollable)
+        self.thumbnail_frame.grid(row=5, column=0, columnspan=2, padx=5, pady=5, sticky='e')
+        self.show_thumbnails()
 
-        # Summary
-        self.create_field(scrollable, 4, 'סיכום', 'summary',
-                         widget_type='text', height=5)
+        ttk.Label(scrollable, text='תמלול שיחת חקירה',
+                 font=('Alef', 10)).grid(row=6, column=1, padx=5, pady=5, sticky='e')
+        transcript_btn = ttk.Button(scrollable, text='ייבא תמלול לשאלות ותשובות',
+                                   command=self.import_transcript)
+        transcript_btn.grid(row=6, column=0, padx=5, pady=5, sticky='ew')
 
     def create_field(self, parent, row, label_text, field_name,
                     widget_type='entry', **kwargs):
@@ -166,7 +297,9 @@ class ModernTabManager:
             label_text: Label text
             field_name: Field name for data_manager
             widget_type: 'entry', 'combo', 'text', or 'date'
-            **kwargs: Additional arguments for widget
+            **kwargs: Additional arguments for widget; autocomplete=True
+                suggests saved claims under an entry, editable=True lets
+                a combo take typed text
         """
         # Label
         ttk.Label(parent, text=label_text,
@@ -176,11 +309,19 @@ class ModernTabManager:
         if widget_type == 'entry':
             widget = ttk.Entry(parent, width=40, font=('Alef', 10))
             widget.grid(row=row, column=0, padx=5, pady=5, sticky='ew')
+            if kwargs.get('autocomplete') and self.on_claim_selected:
+                self.autocomplete[field_name] = AutocompleteDropdown(
+                    widget,
+                    lambda prefix, limit: self.data_manager.suggest_claims(field_name, prefix, limit),
+                    self.on_claim_selected,
+                    show_claim_number=field_name != 'claim_number'
+                )
 
         elif widget_type == 'combo':
             values = kwargs.get('values', [])
+            state = 'normal' if kwargs.get('editable') else 'readonly'
             widget = ttk.Combobox(parent, values=values, width=37,
-                                 state='readonly', font=('Alef', 10))
+                                 state=state, font=('Alef', 10))
             widget.grid(row=row, column=0, padx=5, pady=5, sticky='ew')
 
         elif widget_type == 'text':
@@ -189,6 +330,8 @@ class ModernTabManager:
             widget.grid(row=row, column=0, padx=5, pady=5, sticky='ew')
 
         elif widget_type == 'date':
+            # tkcalendar is slow to import; load it with the first date field
+            from tkcalendar import DateEntry
             widget = DateEntry(parent, width=37, background='darkblue',
                              foreground='white', borderwidth=2,
                              date_pattern='dd/mm/yyyy', font=('Alef', 10))
@@ -205,13 +348,126 @@ class ModernTabManager:
                 filetypes=[("Video Files", "*.mp4;*.avi;*.mov")]
             )
             if file_path:
-                self.data_manager.uploaded_video = file_path
+                self.start_attachment_import('uploaded_video', [file_path])
                 messagebox.showinfo("הצלחה", f"וידאו נבחר: {file_path.split('/')[-1]}")
         else:
-            file_path = filedialog.askopenfilename(
-                title="בחר קובץ תמונה",
+            file_paths = filedialog.askopenfilenames(
+                title="בחר קבצי תמונה",
                 filetypes=[("Image Files", "*.png;*.jpg;*.jpeg;*.gif")]
             )
-            if file_path:
-                self.data_manager.uploaded_image = file_path
-                messagebox.showinfo("הצלחה", f"תמונה נבחרה: {file_path.split('/')[-1]}")
+            if file_paths:
+                self.start_attachment_import('uploaded_image', file_paths)
+                messagebox.showinfo("הצלחה", f"נבחרו {len(file_paths)} תמונות")
+
+    def start_attachment_import(self, attribute, paths):
+        """
+        Store picked files in the background; their plain paths are used until then.
+
+        Args:
+            attribute: DataManager attribute the files belong to ('uploaded_video' or 'uploaded_image')
+            paths: Paths the user picked
+        """
+        paths = list(paths)
+        setattr(self.data_manager, attribute, '\n'.join(paths))
+        job = self.data_manager.store_attachments_async(paths)
+        self.parent.after(self.ATTACHMENT_POLL_INTERVAL_MS, self.poll_attachment_import, attribute, paths, job)
+
+    def poll_attachment_import(self, attribute, paths, job):
+        """Switch to the blob references once the files are stored; reschedule until then."""
+        if not job.done():
+            self.parent.after(self.ATTACHMENT_POLL_INTERVAL_MS, self.poll_attachment_import,
+                              attribute, paths, job)
+            return
+
+        try:
+            references = job.result()
+        except Exception as e:
+            print(f"Error storing attachments: {e}")
+            return
+        applied = self.data_manager.apply_stored_attachments(attribute, paths, references)
+        if applied and attribute == 'uploaded_image':
+            # Shown once stored, so the thumbnails don't read the originals again
+            self.show_thumbnails()
+
+    def import_transcript(self):
+        """Append a call transcript to the investigation field as questions and answers."""
+        file_path = filedialog.askopenfilename(
+            title="בחר קובץ תמלול",
+            filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")]
+        )
+        if not file_path or 'investigation' not in self.data_manager.form_data:
+            return
+
+        if self.transcript_job is not None:
+            self.transcript_job.cancel()
+        widget = self.data_manager.form_data['investigation']
+        if widget.get('1.0', 'end-1c').strip():
+            widget.insert('end', '\n\n')
+        self.transcript_pairs = 0
+        self.transcript_job = TranscriptImport(file_path).start()
+        widget.after(self.TRANSCRIPT_POLL_INTERVAL_MS, self.poll_transcript, self.transcript_job)
+
+    def poll_transcript(self, job):
+        """Insert the next batch of transcript pairs; reschedule until the import is done."""
+        if job is not self.transcript_job:
+            return  # Replaced by a newer import
+        widget = self.data_manager.form_data['investigation']
+        pairs, done = job.poll(self.TRANSCRIPT_PAIRS_PER_TICK)
+        if pairs:
+            # One insert per batch; the widget redraws once
+            widget.insert('end', ''.join(format_pair(pair) for pair in pairs))
+            self.data_manager.form_data.mark_dirty('investigation')
+            self.transcript_pairs += len(pairs)
+        if not done:
+            widget.after(self.TRANSCRIPT_POLL_INTERVAL_MS, self.poll_transcript, job)
+            return
+
+        self.transcript_job = None
+        if job.error is not None:
+            print(f"Error importing transcript {job.path}: {job.error}")
+            messagebox.showerror("שגיאה", f"שגיאה בייבוא התמלול: {job.error}")
+        else:
+            messagebox.showinfo("הצלחה", f"יובאו {self.transcript_pairs} שאלות ותשובות")
+
+    def show_thumbnails(self):
+        """Show thumbnails of the correspondence images, rendered in the background."""
+        if self.thumbnail_frame is None:
+            return  # The additional tab shows them when it is built
+
+        for child in self.thumbnail_frame.winfo_children():
+            child.destroy()
+        self.thumbnail_images = []
+        self.thumbnail_job = None
+
+        paths = split_paths(self.data_manager.uploaded_image)
+        if paths:
+            self.thumbnail_job = self.attachments.thumbnails_async(paths)
+            self.thumbnail_frame.after(self.THUMBNAIL_POLL_INTERVAL_MS,
+                                       self.poll_thumbnails, self.thumbnail_job)
+
+    def poll_thumbnails(self, job):
+        """Add the thumbnails once the background job is done; reschedule until then."""
+        if job is not self.thumbnail_job:
+            return  # Replaced by a newer selection
+        if not job.done():
+            self.thumbnail_frame.after(self.THUMBNAIL_POLL_INTERVAL_MS, self.poll_thumbnails, job)
+            return
+
+        try:
+            attachments = job.result()
+        except Exception as e:
+            print(f"Error preparing thumbnails: {e}")
+            return
+
+        for index, attachment in enumerate(attachments):
+            name = attachment.name
+            if attachment.thumbnail_path:
+                image = tk.PhotoImage(file=attachment.thumbnail_path)
+                self.thumbnail_images.append(image)
+                label = ttk.Label(self.thumbnail_frame, image=image, text=name,
+                                  compound='top', font=('Alef', 8))
+            else:
+                # No Pillow, or an image it can't read
+                label = ttk.Label(self.thumbnail_frame, text=name, font=('Alef', 9))
+            label.grid(row=index // self.THUMBNAILS_PER_ROW,
+                       column=index % self.THUMBNAILS_PER_ROW, padx=4, pady=4)
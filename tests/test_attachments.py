@@ -0,0 +1,229 @@
+# tests/test_attachments.py
+"""
+Tests for the attachment pipeline: cached renditions of the correspondence
+images and embedding them in reports.
+"""
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from docx.shared import Inches
+
+from src.data.form_snapshot import FormSnapshot
+from src.document import attachments as attachments_module
+from src.document.attachments import (
+    PATH_SEPARATOR, REPORT_MAX_SIZE, THUMBNAIL_MAX_SIZE, AttachmentPipeline, pillow_available,
+    split_paths
+)
+from src.document.report_cache import ReportCache
+from src.document.report_generator import ReportGenerator
+from src.document.section_cache import SectionCache
+
+if pillow_available():
+    from PIL import Image
+
+
+class CountingPipeline(AttachmentPipeline):
+    """Counts how many images are actually decoded, and how often images are prepared."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.decoded = 0
+        self.prepared = 0
+
+    def prepare(self, paths):
+        self.prepared += 1
+        return super().prepare(paths)
+
+    def _render(self, pending):
+        self.decoded += len(pending)
+        return super()._render(pending)
+
+
+class AttachmentTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.pipeline = CountingPipeline(os.path.join(self.temp_dir, 'cache'), max_workers=1)
+
+    def tearDown(self):
+        self.pipeline.close()
+        shutil.rmtree(self.temp_dir)
+
+    def make_image(self, name, size=(3000, 2000), mode='RGB', color=(200, 40, 40)):
+        path = os.path.join(self.temp_dir, name)
+        image = Image.new(mode, size, color)
+        image.save(path)
+        return path
+
+
+class TestSplitPaths(unittest.TestCase):
+    def test_split_paths(self):
+        self.assertEqual(split_paths(None), [])
+        self.assertEqual(split_paths(' a.jpg \n\nb.png\n'), ['a.jpg', 'b.png'])
+
+
+@unittest.skipUnless(pillow_available(), "Pillow is not installed")
+class TestRenditions(AttachmentTestCase):
+    """Test decoding, downscaling and caching by content."""
+
+    def test_renditions_are_downscaled(self):
+        attachment, = self.pipeline.prepare([self.make_image('photo.jpg')])
+        with Image.open(attachment.report_path) as report:
+            self.assertEqual(report.format, 'JPEG')
+            self.assertEqual(report.size, (REPORT_MAX_SIZE[0], REPORT_MAX_SIZE[0] * 2 // 3))
+        with Image.open(attachment.thumbnail_path) as thumbnail:
+            self.assertEqual(thumbnail.format, 'PNG')
+            self.assertLessEqual(max(thumbnail.size), max(THUMBNAIL_MAX_SIZE))
+
+    def test_transparent_png_is_flattened(self):
+        path = self.make_image('screenshot.png', (400, 800), 'RGBA', (0, 0, 0, 0))
+        attachment, = self.pipeline.prepare([path])
+        with Image.open(attachment.report_path) as report:
+            self.assertEqual(report.mode, 'RGB')
+            self.assertEqual(report.getpixel((10, 10)), (255, 255, 255))
+
+    def test_images_are_decoded_once_per_content(self):
+        path = self.make_image('photo.jpg')
+        copy_path = os.path.join(self.temp_dir, 'copy.jpg')
+        shutil.copy(path, copy_path)
+
+        first, = self.pipeline.prepare([path])
+        again, copied = self.pipeline.prepare([path, copy_path])
+        self.assertEqual(self.pipeline.decoded, 1)
+        self.assertEqual(first.report_path, copied.report_path)
+
+        self.make_image('photo.jpg', color=(0, 0, 255))
+        changed, = self.pipeline.prepare([path])
+        self.assertEqual(self.pipeline.decoded, 2)
+        self.assertNotEqual(changed.digest, first.digest)
+
+    def test_unreadable_files(self):
+        broken = os.path.join(self.temp_dir, 'broken.jpg')
+        with open(broken, 'wb') as f:
+            f.write(b'not an image')
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                result = self.pipeline.prepare([os.path.join(self.temp_dir, 'missing.jpg'), broken])
+            finally:
+                sys.stdout = stdout
+        self.assertEqual([a.source for a in result], [broken])
+        self.assertEqual((result[0].report_path, result[0].thumbnail_path), (broken, None))
+
+    def test_process_pool(self):
+        pipeline = AttachmentPipeline(os.path.join(self.temp_dir, 'pool'), max_workers=2)
+        try:
+            paths = [self.make_image(f'photo{i}.jpg', color=(i * 60, 0, 0)) for i in range(3)]
+            result = pipeline.prepare(paths)
+        finally:
+            pipeline.close()
+        self.assertEqual([a.source for a in result], paths)
+        self.assertTrue(all(a.thumbnail_path for a in result))
+
+    def test_thumbnails_async(self):
+        future = self.pipeline.thumbnails_async([self.make_image('photo.jpg')])
+        self.assertTrue(os.path.exists(future.result(timeout=30)[0].thumbnail_path))
+
+
+@unittest.skipUnless(pillow_available(), "Pillow is not installed")
+class TestReportImages(AttachmentTestCase):
+    """Test embedding the prepared images in reports."""
+
+    def setUp(self):
+        super().setUp()
+        self.paths = [self.make_image('photo.jpg'), self.make_image('chat.png', (1080, 2400))]
+        self.snapshot = FormSnapshot({
+            'full_name': 'ישראל ישראלי',
+            'correspondence_image': PATH_SEPARATOR.join(self.paths),
+        })
+        self.generator = ReportGenerator(attachments=self.pipeline)
+
+    def test_images_are_embedded_scaled_to_the_page(self):
+        doc = self.generator.build_document(self.snapshot)
+        shapes = doc.inline_shapes
+        self.assertEqual(len(shapes), 2)
+        for shape in shapes:
+            self.assertLessEqual(shape.width, Inches(6))
+            self.assertLessEqual(shape.height, Inches(8))
+        self.assertIn('3. התכתבויות ותמונות', [p.text for p in doc.paragraphs])
+
+    def test_report_embeds_the_downscaled_copies(self):
+        report = zipfile.ZipFile(io.BytesIO(self.generator.render_bytes(self.snapshot)))
+        media = [info.file_size for info in report.infolist() if info.filename.startswith('word/media/')]
+        self.assertEqual(len(media), 2)
+        prepared = split_paths(self.generator.prepare_attachments(self.snapshot)['report_images'])
+        self.assertEqual(sorted(media), sorted(os.path.getsize(path) for path in prepared))
+
+    def test_image_content_is_part_of_the_cache_key(self):
+        before = self.generator.cache_key(self.generator.prepare_attachments(self.snapshot))
+        self.make_image('photo.jpg', color=(0, 0, 255))
+        after = self.generator.cache_key(self.generator.prepare_attachments(self.snapshot))
+        self.assertNotEqual(before, after)
+
+    def test_report_cache_hit_prepares_no_images(self):
+        generator = ReportGenerator(report_cache=ReportCache(os.path.join(self.temp_dir, 'reports')),
+                                    attachments=self.pipeline)
+        first = generator.render_bytes(self.snapshot)
+        self.assertEqual(self.pipeline.prepared, 1)
+        self.assertEqual(generator.render_bytes(self.snapshot), first)
+        self.assertEqual(self.pipeline.prepared, 1)
+
+        self.make_image('photo.jpg', color=(0, 0, 255))
+        generator.render_bytes(self.snapshot)
+        self.assertEqual(self.pipeline.prepared, 2)
+
+    def test_section_cache_skips_image_sections(self):
+        generator = ReportGenerator(section_cache=SectionCache(), attachments=self.pipeline)
+        generator.build_document(self.snapshot)
+        doc = generator.build_document(self.snapshot)
+        self.assertEqual(len(doc.inline_shapes), 2)
+
+    def test_streaming_report_notes_the_images(self):
+        output = io.BytesIO()
+        self.generator.render_streaming(self.snapshot, output)
+        document_xml = zipfile.ZipFile(output).read('word/document.xml').decode('utf-8')
+        self.assertEqual(document_xml.count('התמונה אינה נכללת'), 2)
+
+    def test_no_images_no_section(self):
+        doc = self.generator.build_document(self.snapshot.replace(correspondence_image=''))
+        self.assertEqual(len(doc.inline_shapes), 0)
+        self.assertFalse([p.text for p in doc.paragraphs if p.text.endswith('התכתבויות ותמונות')])
+
+
+class TestWithoutPillow(AttachmentTestCase):
+    """Test the fallback when Pillow can't be imported."""
+
+    def setUp(self):
+        super().setUp()
+        self.saved_pil = sys.modules.get('PIL')
+        sys.modules['PIL'] = None  # makes `from PIL import ...` raise ImportError
+        attachments_module._load_pillow.cache_clear()
+
+    def tearDown(self):
+        if self.saved_pil is None:
+            del sys.modules['PIL']
+        else:
+            sys.modules['PIL'] = self.saved_pil
+        attachments_module._load_pillow.cache_clear()
+        super().tearDown()
+
+    def test_originals_are_used_without_thumbnails(self):
+        path = os.path.join(self.temp_dir, 'photo.jpg')
+        with open(path, 'wb') as f:
+            f.write(b'jpeg bytes')
+        attachment, = self.pipeline.prepare([path])
+        self.assertFalse(pillow_available())
+        self.assertEqual((attachment.report_path, attachment.thumbnail_path), (path, None))
+        self.assertEqual(self.pipeline.decoded, 0)
+        self.assertEqual(self.pipeline.report_images([path]), [path])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# tests/test_batch.py
+"""
+Tests for headless batch report generation.
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from docx import Document
+
+from src.document.batch import run_batch, main
+
+
+class TestBatchGeneration(unittest.TestCase):
+    """Test that reports are generated from saved claim files."""
+
+    def setUp(self):
+        """Create a source directory with two good claims and one corrupt claim."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.tmp_dir, 'saved_data')
+        self.output_dir = os.path.join(self.tmp_dir, 'reports')
+        os.makedirs(self.source_dir)
+
+        for claim_number, name in [('1001', 'ישראל ישראלי'), ('1002', 'משה כהן')]:
+            with open(os.path.join(self.source_dir, f'{claim_number}.json'), 'w', encoding='utf-8') as f:
+                json.dump({'claim_number': claim_number, 'full_name': name,
+                           'event_type': 'נזק לרכב', 'summary': 'לסיכום'}, f, ensure_ascii=False)
+
+        with open(os.path.join(self.source_dir, 'broken.json'), 'w', encoding='utf-8') as f:
+            f.write('{not json')
+
+    def tearDown(self):
+        """Remove the temporary directories."""
+        shutil.rmtree(self.tmp_dir)
+
+    def test_run_batch_writes_reports_and_records_failures(self):
+        """Test that good claims produce reports and corrupt ones are reported."""
+        result = run_batch(self.source_dir, self.output_dir, max_workers=2)
+
+        self.assertEqual(sorted(c for c, _ in result.succeeded), ['1001', '1002'])
+        self.assertEqual([c for c, _ in result.failed], ['broken'])
+        self.assertEqual(result.total, 3)
+
+        doc = Document(os.path.join(self.output_dir, '1001.docx'))
+        text = '\n'.join(p.text for p in doc.paragraphs)
+        self.assertIn('ישראל ישראלי', text)
+
+    def test_run_batch_with_explicit_claims(self):
+        """Test rendering only the requested claims."""
+        result = run_batch(self.source_dir, self.output_dir, claim_numbers=['1002'], max_workers=1)
+
+        self.assertEqual([c for c, _ in result.succeeded], ['1002'])
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, '1001.docx')))
+
+    def test_main_returns_error_code_on_failures(self):
+        """Test that the CLI exits non-zero when a claim fails."""
+        exit_code = main(['--source', self.source_dir, '--output', self.output_dir,
+                          '--workers', '1'])
+        self.assertEqual(exit_code, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
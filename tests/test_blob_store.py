@@ -0,0 +1,282 @@
+# tests/test_blob_store.py
+"""
+Tests for the content-addressed attachment store.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data import blob_store
+from src.data.blob_store import (
+    BlobStore, file_referenced_digests, hash_file, make_reference, parse_reference, referenced_digests
+)
+from src.data.data_manager import DataManager
+from src.data.file_persistence import FilePersistenceHandler
+from src.document.attachments import AttachmentPipeline
+
+
+class BlobStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = BlobStore(os.path.join(self.temp_dir, 'attachments'))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def make_file(self, name, content):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+
+class TestReferences(unittest.TestCase):
+    def test_parse_reference(self):
+        digest = 'ab' * 32
+        self.assertEqual(parse_reference(make_reference(digest, 'תמונה.jpg')), digest)
+        self.assertEqual(parse_reference(f'blob:{digest}'), digest)
+        self.assertIsNone(parse_reference('C:/Users/Pictures/993631.jpg'))
+        self.assertIsNone(parse_reference('blob:not-a-digest/a.jpg'))
+        self.assertIsNone(parse_reference(None))
+
+    def test_referenced_digests(self):
+        first, second = 'a' * 64, 'b' * 64
+        data = {
+            'correspondence_image': f'blob:{first}/1.jpg\nC:/old.jpg\nblob:{second}/2.jpg',
+            'video_file': f'blob:{first}/call.mp4',
+            'summary': 'טקסט חופשי',
+            'count': 3,
+        }
+        self.assertEqual(referenced_digests(data), {first, second})
+        self.assertEqual(referenced_digests(None), set())
+
+
+class TestHashing(BlobStoreTestCase):
+    def test_mmap_and_chunked_hashes_agree(self):
+        content = os.urandom(3 * 1024 * 1024 + 17)
+        path = self.make_file('video.mp4', content)
+        expected = hashlib.sha256(content).hexdigest()
+        self.assertEqual(hash_file(path), expected)
+        with mock.patch.object(blob_store, 'MMAP_THRESHOLD', 1024):
+            self.assertEqual(hash_file(path), expected)
+
+    def test_empty_file(self):
+        path = self.make_file('empty.jpg', b'')
+        self.assertEqual(hash_file(path), hashlib.sha256(b'').hexdigest())
+
+
+class TestPut(BlobStoreTestCase):
+    def test_identical_files_are_stored_once(self):
+        first = self.store.put(self.make_file('993631.jpg', b'photo'))
+        second = self.store.put(self.make_file('copy.jpg', b'photo'))
+        digest = hashlib.sha256(b'photo').hexdigest()
+
+        self.assertEqual(first, f'blob:{digest}/993631.jpg')
+        self.assertEqual(parse_reference(second), digest)
+        self.assertEqual(self.store.digests(), [digest])
+        with open(self.store.resolve(second), 'rb') as f:
+            self.assertEqual(f.read(), b'photo')
+
+    def test_references_survive_moving_the_original(self):
+        path = self.make_file('photo.jpg', b'photo')
+        reference = self.store.put(path)
+        os.remove(path)
+        self.assertTrue(os.path.isfile(self.store.resolve(reference)))
+
+    def test_truncated_blob_is_replaced(self):
+        path = self.make_file('photo.jpg', b'photo')
+        blob_path = self.store.resolve(self.store.put(path))
+        with open(blob_path, 'wb') as f:
+            f.write(b'ph')
+        self.store.put(path)
+        with open(blob_path, 'rb') as f:
+            self.assertEqual(f.read(), b'photo')
+
+    def test_new_file_is_read_once(self):
+        path = self.make_file('video.mp4', b'video')
+        with mock.patch.object(blob_store, 'hash_file') as hash_mock:
+            reference = self.store.put(path)
+        hash_mock.assert_not_called()
+        self.assertEqual(parse_reference(reference), hashlib.sha256(b'video').hexdigest())
+
+    def test_unchanged_file_is_not_read_again(self):
+        path = self.make_file('video.mp4', b'video')
+        reference = self.store.put(path)
+        with mock.patch.object(self.store, '_copy_in') as copy_mock:
+            self.assertEqual(self.store.put(path), reference)
+        copy_mock.assert_not_called()
+
+    def test_import_paths(self):
+        reference = self.store.put(self.make_file('a.jpg', b'a'))
+        path = self.make_file('b.jpg', b'b')
+        missing = os.path.join(self.temp_dir, 'missing.jpg')
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                value = self.store.import_paths(f'{reference}\n{path}\n\n{missing}')
+            finally:
+                sys.stdout = stdout
+
+        items = value.split('\n')
+        self.assertEqual(items[0], reference)
+        self.assertEqual(parse_reference(items[1]), hashlib.sha256(b'b').hexdigest())
+        self.assertEqual(items[2], missing)
+        self.assertIsNone(self.store.import_paths(None))
+
+    def test_plain_paths_resolve_to_themselves(self):
+        self.assertEqual(self.store.resolve('C:/Users/Pictures/993631.jpg'), 'C:/Users/Pictures/993631.jpg')
+
+
+class TestMaintenance(BlobStoreTestCase):
+    def test_verify(self):
+        good = parse_reference(self.store.put(self.make_file('a.jpg', b'a')))
+        bad = parse_reference(self.store.put(self.make_file('b.jpg', b'b')))
+        with open(self.store.path(bad), 'wb') as f:
+            f.write(b'bit rot')
+
+        self.assertEqual(self.store.verify(), [bad])
+        self.assertEqual(self.store.verify([good]), [])
+        self.assertEqual(self.store.verify(remove=True), [bad])
+        self.assertEqual(self.store.digests(), [good])
+
+    def test_collect_garbage_walks_the_claim_index(self):
+        kept = self.store.put(self.make_file('kept.jpg', b'kept'))
+        dropped = self.store.put(self.make_file('dropped.jpg', b'dropped'))
+        backend = FilePersistenceHandler(os.path.join(self.temp_dir, 'saved_data'))
+        try:
+            backend.save_by_claim_number('1', {'correspondence_image': f'{kept}\n{dropped}'})
+            backend.save_by_claim_number('2', {'correspondence_image': kept})
+            backend.delete_by_claim_number('1')
+            referenced = backend.referenced_blobs()
+        finally:
+            backend.close()
+
+        # Too recent: the blob may belong to a form that isn't saved yet
+        self.assertEqual(self.store.collect_garbage(referenced), 0)
+        self.assertEqual(self.store.collect_garbage(referenced, grace_seconds=0), 1)
+        self.assertEqual(self.store.digests(), [parse_reference(kept)])
+
+    def test_gc_keeps_blobs_of_the_form_saved_without_a_claim_number(self):
+        saved = self.store.put(self.make_file('saved.jpg', b'saved'))
+        dropped = self.store.put(self.make_file('dropped.jpg', b'dropped'))
+        old = time.time() - blob_store.GC_GRACE_SECONDS - 60
+        for reference in (saved, dropped):
+            os.utime(self.store.path(parse_reference(reference)), (old, old))
+        saved_form = os.path.join(self.temp_dir, 'saved_data.json')
+        with open(saved_form, 'w', encoding='utf-8') as f:
+            json.dump({'correspondence_image': saved}, f)
+
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                exit_code = blob_store.main([
+                    'gc', '--store', str(self.store.directory), '--backend', 'json',
+                    '--location', os.path.join(self.temp_dir, 'saved_data'), '--saved-form', saved_form
+                ])
+            finally:
+                sys.stdout = stdout
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(self.store.digests(), [parse_reference(saved)])
+
+    def test_file_referenced_digests(self):
+        self.assertEqual(file_referenced_digests(os.path.join(self.temp_dir, 'missing.json')), set())
+
+    def test_collect_garbage_removes_stale_temporary_files(self):
+        os.makedirs(self.store.directory)
+        stale = self.store.directory / '.abc.tmp'
+        stale.write_bytes(b'partial copy')
+        old = time.time() - blob_store.GC_GRACE_SECONDS - 60
+        os.utime(stale, (old, old))
+        self.assertEqual(self.store.collect_garbage(set()), 1)
+        self.assertFalse(stale.exists())
+
+    def test_missing_store(self):
+        self.assertEqual(self.store.digests(), [])
+        self.assertEqual(self.store.collect_garbage(set()), 0)
+
+
+class TestDataManagerAttachments(BlobStoreTestCase):
+    """Test that attachments are stored when picked, not when the form is saved."""
+
+    def setUp(self):
+        super().setUp()
+        self.storage = FilePersistenceHandler(os.path.join(self.temp_dir, 'saved_data'))
+        self.data_manager = DataManager(self.storage, blob_store=self.store)
+
+    def tearDown(self):
+        self.storage.close()
+        super().tearDown()
+
+    def test_picked_files_are_stored(self):
+        path = self.make_file('chat.png', b'chat')
+        reference = self.data_manager.store_attachments([path])
+        self.assertEqual(reference, make_reference(hash_file(path), 'chat.png'))
+        self.assertEqual(self.store.digests(), [parse_reference(reference)])
+
+    def test_picked_files_are_stored_in_the_background(self):
+        path = self.make_file('chat.png', b'chat')
+        self.data_manager.uploaded_image = path
+        references = self.data_manager.store_attachments_async([path]).result(timeout=10)
+        self.assertTrue(self.data_manager.apply_stored_attachments('uploaded_image', [path], references))
+        self.assertEqual(parse_reference(self.data_manager.uploaded_image), hash_file(path))
+
+    def test_references_are_not_applied_over_a_newer_pick(self):
+        first, second = self.make_file('1.png', b'1'), self.make_file('2.png', b'2')
+        references = self.data_manager.store_attachments_async([first]).result(timeout=10)
+        self.data_manager.uploaded_image = second
+        self.assertFalse(self.data_manager.apply_stored_attachments('uploaded_image', [first], references))
+        self.assertEqual(self.data_manager.uploaded_image, second)
+
+    def test_save_does_not_copy_attachments(self):
+        path = self.make_file('old.jpg', b'saved before the store existed')
+        self.data_manager.form_data.declare('claim_number', '7')
+        self.data_manager.uploaded_image = path
+        with mock.patch('src.data.data_manager.messagebox'):
+            self.data_manager.save_data()
+        self.assertEqual(self.store.digests(), [])
+        self.assertEqual(self.storage.load_by_claim_number('7')['correspondence_image'], path)
+
+
+class TestPipelineReferences(BlobStoreTestCase):
+    """Test that the attachment pipeline reads blobs without hashing them again."""
+
+    def test_reference_is_not_rehashed(self):
+        reference = self.store.put(self.make_file('chat.png', b'not really a png'))
+        pipeline = AttachmentPipeline(os.path.join(self.temp_dir, 'cache'), max_workers=1, store=self.store)
+        try:
+            with mock.patch('src.document.attachments.hash_file') as hash_mock, \
+                    open(os.devnull, 'w') as devnull:
+                stdout, sys.stdout = sys.stdout, devnull
+                try:
+                    attachment, = pipeline.prepare([reference])
+                finally:
+                    sys.stdout = stdout
+        finally:
+            pipeline.close()
+
+        hash_mock.assert_not_called()
+        self.assertEqual(attachment.digest, parse_reference(reference))
+        self.assertEqual(attachment.name, 'chat.png')
+        self.assertEqual(attachment.source, self.store.resolve(reference))
+
+    def test_missing_blob_is_skipped(self):
+        pipeline = AttachmentPipeline(os.path.join(self.temp_dir, 'cache'), max_workers=1, store=self.store)
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                self.assertEqual(pipeline.prepare([make_reference('d' * 64, 'gone.jpg')]), [])
+            finally:
+                sys.stdout = stdout
+
+
+if __name__ == '__main__':
+    unittest.main()
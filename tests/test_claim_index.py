@@ -0,0 +1,91 @@
+# tests/test_claim_index.py
+"""
+Tests for the SQLite claim index and its use by FilePersistenceHandler.
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.file_persistence import FilePersistenceHandler
+
+
+class TestClaimIndex(unittest.TestCase):
+    """Test that the index follows saves, deletes and external file changes."""
+
+    def setUp(self):
+        """Create a persistence handler on an empty directory."""
+        self.base_dir = tempfile.mkdtemp()
+        self.persistence = FilePersistenceHandler(self.base_dir)
+
+    def tearDown(self):
+        """Close the index and remove the directory."""
+        self.persistence.close()
+        shutil.rmtree(self.base_dir)
+
+    def save(self, claim_number, mtime, **data):
+        path = self.persistence.save_by_claim_number(claim_number, data)
+        os.utime(path, (mtime, mtime))
+        # Record the adjusted mtime the same way a save would
+        self.persistence.index.update(claim_number, data, os.path.getmtime(path))
+
+    def test_recent_claims_are_most_recent_first(self):
+        """Test ordering by save time rather than by claim number."""
+        self.save('300', 1000, event_type='נזק לרכב')
+        self.save('100', 3000, event_type='נזק לרכב')
+        self.save('200', 2000, event_type='נזק לרכב')
+
+        self.assertEqual(self.persistence.get_recent_claim_numbers(2), ['100', '200'])
+        self.assertEqual(self.persistence.get_all_claim_numbers(), ['100', '200', '300'])
+
+    def test_filters(self):
+        """Test filtering by event type, name and event date."""
+        self.save('1', 1000, event_type='גניבת רכב', full_name='ניצן אברג\'יל', event_date='25/10/2024')
+        self.save('2', 2000, event_type='נזקי מים', full_name='יובל כהן', event_date='01/01/2023')
+
+        def numbers(**filters):
+            return [c['claim_number'] for c in self.persistence.find_claims(**filters)]
+
+        self.assertEqual(numbers(event_type='נזקי מים'), ['2'])
+        self.assertEqual(numbers(name_contains='אברג'), ['1'])
+        self.assertEqual(numbers(date_from='01/06/2024'), ['1'])
+        self.assertEqual(numbers(date_to='2023-12-31'), ['2'])
+
+    def test_delete_removes_entry(self):
+        """Test that deleting a claim removes it from the index."""
+        self.save('1', 1000)
+        self.persistence.delete_by_claim_number('1')
+        self.assertEqual(self.persistence.get_recent_claim_numbers(), [])
+
+    def test_sync_picks_up_external_changes(self):
+        """Test incremental rebuild from file mtimes at startup."""
+        self.save('1', 1000, full_name='לפני')
+        self.save('2', 1000)
+
+        with open(os.path.join(self.base_dir, '1.json'), 'w', encoding='utf-8') as f:
+            json.dump({'full_name': 'אחרי'}, f, ensure_ascii=False)
+        os.utime(os.path.join(self.base_dir, '1.json'), (5000, 5000))
+        os.remove(os.path.join(self.base_dir, '2.json'))
+        with open(os.path.join(self.base_dir, '3.json'), 'w', encoding='utf-8') as f:
+            json.dump({'full_name': 'חדש'}, f, ensure_ascii=False)
+
+        self.assertEqual(self.persistence.index.sync(self.persistence), 3)
+        self.assertEqual(self.persistence.index.sync(self.persistence), 0)
+        claims = {c['claim_number']: c['full_name'] for c in self.persistence.find_claims()}
+        self.assertEqual(claims, {'1': 'אחרי', '3': 'חדש'})
+
+    def test_handler_without_index_still_lists_recent_claims(self):
+        """Test the fallback when the persistent index is disabled."""
+        self.save('1', 1000)
+        self.save('2', 2000)
+        plain = FilePersistenceHandler(self.base_dir, use_index=False)
+        self.assertEqual(plain.get_recent_claim_numbers(), ['2', '1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
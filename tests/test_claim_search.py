@@ -0,0 +1,73 @@
+# tests/test_claim_search.py
+"""
+Tests for Hebrew normalization and the full-text index's upgrade; search
+through each backend is part of the contract in test_storage_backends.
+"""
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.file_persistence import FilePersistenceHandler
+from src.data.search_index import build_match_query, make_snippet, normalize_hebrew, search_columns
+
+
+class TestHebrewNormalization(unittest.TestCase):
+    """Test that spelling variants normalize to the same text."""
+
+    def test_final_letters(self):
+        self.assertEqual(normalize_hebrew('שלום'), normalize_hebrew('שלומ'))
+        self.assertEqual(normalize_hebrew('ארץ כנף'), 'ארצ כנפ')
+
+    def test_niqqud_is_removed(self):
+        self.assertEqual(normalize_hebrew('שָׁלוֹם'), normalize_hebrew('שלום'))
+
+    def test_geresh_and_gershayim(self):
+        self.assertEqual(normalize_hebrew("צד ג'"), normalize_hebrew('צד ג׳'))
+        self.assertEqual(normalize_hebrew('נח"ל'), normalize_hebrew('נח״ל'))
+        self.assertEqual(normalize_hebrew('נח"ל'), 'נחל')
+
+    def test_prefix_letters_are_also_indexed_without_them(self):
+        self.assertEqual(search_columns({'summary': 'ומהצפה בבית'})[-1], 'ומהצפה בבית מהצפה הצפה בית')
+
+    def test_match_query_uses_word_prefixes(self):
+        self.assertEqual(build_match_query('  כהן, נח"ל '), '"כהנ"* "נחל"*')
+        self.assertEqual(build_match_query('!?'), '')
+
+    def test_snippet_comes_from_original_text(self):
+        data = {'circumstances': 'הרכב חנה ליד ביתו. בבוקר גילה המבוטח שהרכב נגנב מהחניון.'}
+        snippet = make_snippet(data, 'חניון', width=30)
+        self.assertIn('מהחניון', snippet)
+        self.assertEqual(make_snippet(data, 'שריפה'), '')
+
+
+class TestIndexUpgrade(unittest.TestCase):
+    """Test that an index file from before full-text search is rebuilt."""
+
+    def test_version_one_index_is_rebuilt_with_search(self):
+        base_dir = tempfile.mkdtemp()
+        try:
+            db_path = os.path.join(base_dir, FilePersistenceHandler.INDEX_FILENAME)
+            conn = sqlite3.connect(db_path)
+            conn.execute('CREATE TABLE claims (claim_number TEXT PRIMARY KEY, mtime REAL)')
+            conn.execute('PRAGMA user_version = 1')
+            conn.commit()
+            conn.close()
+
+            with open(os.path.join(base_dir, '300.json'), 'w', encoding='utf-8') as f:
+                f.write('{"full_name": "יוסי מזרחי"}')
+
+            backend = FilePersistenceHandler(base_dir)
+            self.assertEqual(backend.index.search('מזרחי')[0]['claim_number'], '300')
+            backend.close()
+        finally:
+            shutil.rmtree(base_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
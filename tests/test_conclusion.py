@@ -0,0 +1,252 @@
+# tests/test_conclusion.py
+"""
+Tests for drafting the report's conclusion, against a local fake of the
+Gemini generateContent endpoint.
+"""
+import asyncio
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.file_persistence import FilePersistenceHandler
+from src.data.form_snapshot import FormSnapshot
+from src.document.conclusion import (
+    ConclusionCache, ConclusionClient, ConclusionError, ConclusionJob, GeminiBackend,
+    TransientConclusionError, build_prompt, draft_claims
+)
+
+
+class FakeGemini(ThreadingHTTPServer):
+    """
+    Answers generateContent requests with the claimant's name from the prompt.
+    Queued status codes are returned first, one per request.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, delay=0.0):
+        super().__init__(('127.0.0.1', 0), FakeGeminiHandler)
+        self.delay = delay
+        self.statuses = []
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def endpoint(self):
+        return f'http://127.0.0.1:{self.server_address[1]}/models/{{model}}:generateContent'
+
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8'))
+        prompt = body['contents'][0]['parts'][0]['text']
+        with server.lock:
+            server.prompts.append(prompt)
+            status = server.statuses.pop(0) if server.statuses else 200
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(server.delay)
+            if status == 200:
+                name = prompt.split('שם המבוטח: ', 1)[-1].split('\n', 1)[0]
+                payload = {'candidates': [{'content': {'parts': [{'text': f'סיכום עבור {name}'}]}}]}
+            else:
+                payload = {'error': {'code': status}}
+            data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            if status == 429:
+                self.send_header('Retry-After', '0')
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ConclusionTestCase(unittest.TestCase):
+    delay = 0.0
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.server = FakeGemini(self.delay)
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        self.backend = GeminiBackend(api_key='test-key', endpoint=self.server.endpoint, timeout=5)
+        self.client = self.make_client()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.temp_dir)
+
+    def make_client(self, **kwargs):
+        kwargs.setdefault('backoff', 0.01)
+        cache = ConclusionCache(os.path.join(self.temp_dir, 'cache'))
+        return ConclusionClient(self.backend, cache, **kwargs)
+
+
+class TestPrompt(unittest.TestCase):
+    def test_prompt_lists_the_filled_in_fields(self):
+        prompt = build_prompt(FormSnapshot({
+            'full_name': 'ישראל ישראלי',
+            'vehicle_model': 'NOT_FILLED',
+            'investigation': 'ש: איפה חנית?\nת: ליד הבית',
+            'summary': 'טיוטה קודמת',
+        }))
+        self.assertIn('שם המבוטח: ישראל ישראלי', prompt)
+        self.assertIn('החקירה:\nש: איפה חנית?', prompt)
+        self.assertNotIn('דגם הרכב', prompt)
+        self.assertNotIn('טיוטה קודמת', prompt)
+
+
+class TestDraft(ConclusionTestCase):
+    def test_draft(self):
+        text = asyncio.run(self.client.draft(FormSnapshot({'full_name': 'ניצן'})))
+        self.assertEqual(text, 'סיכום עבור ניצן')
+
+    def test_server_errors_are_retried(self):
+        self.server.statuses = [503, 429]
+        text = asyncio.run(self.client.draft({'full_name': 'ניצן'}))
+        self.assertEqual(text, 'סיכום עבור ניצן')
+        self.assertEqual(len(self.server.prompts), 3)
+
+    def test_retries_give_up(self):
+        self.server.statuses = [500] * 3
+        client = self.make_client(max_retries=2)
+        with self.assertRaises(TransientConclusionError):
+            asyncio.run(client.draft({'full_name': 'ניצן'}))
+        self.assertEqual(len(self.server.prompts), 3)
+
+    def test_client_errors_are_not_retried(self):
+        self.server.statuses = [400]
+        with self.assertRaises(ConclusionError) as context:
+            asyncio.run(self.client.draft({'full_name': 'ניצן'}))
+        self.assertNotIsInstance(context.exception, TransientConclusionError)
+        self.assertEqual(len(self.server.prompts), 1)
+
+    def test_unreachable_server_is_transient(self):
+        backend = GeminiBackend(api_key='test-key', endpoint='http://127.0.0.1:9/{model}', timeout=1)
+        with self.assertRaises(TransientConclusionError):
+            asyncio.run(backend.complete('prompt'))
+
+    def test_missing_api_key(self):
+        backend = GeminiBackend(api_key='')
+        self.assertFalse(backend.is_configured())
+        with self.assertRaises(ConclusionError):
+            asyncio.run(backend.complete('prompt'))
+
+
+class TestCache(ConclusionTestCase):
+    def test_unchanged_claim_is_served_from_cache(self):
+        snapshot = FormSnapshot({'full_name': 'ניצן', 'circumstances': 'הרכב נגנב'})
+        first = asyncio.run(self.client.draft(snapshot))
+        # A fresh client, as after restarting the application
+        second = asyncio.run(self.make_client().draft(snapshot))
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.server.prompts), 1)
+
+    def test_changed_claim_is_drafted_again(self):
+        asyncio.run(self.client.draft({'full_name': 'ניצן', 'circumstances': 'הרכב נגנב'}))
+        asyncio.run(self.client.draft({'full_name': 'ניצן', 'circumstances': 'הרכב נפרץ'}))
+        self.assertEqual(len(self.server.prompts), 2)
+
+    def test_failures_are_not_cached(self):
+        self.server.statuses = [400]
+        with self.assertRaises(ConclusionError):
+            asyncio.run(self.client.draft({'full_name': 'ניצן'}))
+        self.assertEqual(asyncio.run(self.client.draft({'full_name': 'ניצן'})), 'סיכום עבור ניצן')
+
+
+class TestConcurrency(ConclusionTestCase):
+    delay = 0.1
+
+    def test_requests_in_flight_are_bounded(self):
+        client = self.make_client(max_concurrency=2)
+        snapshots = [{'full_name': f'מבוטח {i}'} for i in range(6)]
+        texts = asyncio.run(client.draft_many(snapshots))
+        self.assertEqual(texts, [f'סיכום עבור מבוטח {i}' for i in range(6)])
+        self.assertEqual(self.server.max_in_flight, 2)
+
+    def test_client_is_reusable_across_event_loops(self):
+        asyncio.run(self.client.draft({'full_name': 'א'}))
+        asyncio.run(self.client.draft({'full_name': 'ב'}))
+        self.assertEqual(len(self.server.prompts), 2)
+
+
+class TestDraftClaims(ConclusionTestCase):
+    def setUp(self):
+        super().setUp()
+        self.storage = FilePersistenceHandler(os.path.join(self.temp_dir, 'saved_data'))
+        self.storage.save_by_claim_number('1', {'claim_number': '1', 'full_name': 'א'})
+        self.storage.save_by_claim_number('2', {'claim_number': '2', 'full_name': 'ב', 'summary': 'קיים'})
+        self.storage.save_by_claim_number('3', {'claim_number': '3', 'full_name': 'ג', 'summary': 'NOT_FILLED'})
+
+    def tearDown(self):
+        self.storage.close()
+        super().tearDown()
+
+    def test_batch_drafts_claims_without_a_summary(self):
+        result = asyncio.run(draft_claims(self.client, self.storage, save=True))
+        self.assertEqual(sorted(result.succeeded), [('1', 'סיכום עבור א'), ('3', 'סיכום עבור ג')])
+        self.assertEqual(result.skipped, ['2'])
+        self.assertEqual(self.storage.load_by_claim_number('1')['summary'], 'סיכום עבור א')
+        self.assertEqual(self.storage.load_by_claim_number('2')['summary'], 'קיים')
+
+    def test_batch_reports_failures(self):
+        self.server.statuses = [400]
+        result = asyncio.run(draft_claims(self.client, self.storage, ['1', 'missing']))
+        self.assertEqual(len(result.failed), 2)
+        self.assertEqual(result.succeeded, [])
+        self.assertNotIn('summary', self.storage.load_by_claim_number('1'))
+
+
+class TestConclusionJob(ConclusionTestCase):
+    def wait_for_messages(self, job, timeout=10):
+        """Poll the job like the Tk loop does until it finishes."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            messages = job.poll()
+            if messages:
+                return messages
+            time.sleep(0.01)
+        raise AssertionError("Conclusion job did not finish in time")
+
+    def test_job_returns_the_conclusion(self):
+        job = ConclusionJob(self.client, FormSnapshot({'full_name': 'ניצן'})).start()
+        self.assertEqual(self.wait_for_messages(job), [('done', 'סיכום עבור ניצן')])
+
+    def test_job_reports_errors(self):
+        self.server.statuses = [403]
+        job = ConclusionJob(self.client, FormSnapshot({'full_name': 'ניצן'})).start()
+        (kind, error), = self.wait_for_messages(job)
+        self.assertEqual(kind, 'error')
+        self.assertIsInstance(error, ConclusionError)
+
+    def test_cancel(self):
+        self.server.statuses = [503] * 10
+        client = self.make_client(backoff=5)
+        job = ConclusionJob(client, FormSnapshot({'full_name': 'ניצן'})).start()
+        while not self.server.prompts:
+            time.sleep(0.01)
+        job.cancel()
+        self.assertEqual(self.wait_for_messages(job), [('cancelled',)])
+
+
+if __name__ == '__main__':
+    unittest.main()
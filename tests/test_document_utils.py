@@ -0,0 +1,74 @@
+# tests/test_document_utils.py
+"""
+Tests that DocumentUtils' prototype fast path produces the same XML as
+setting each RTL property one by one.
+"""
+import unittest
+
+# Add parent directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from docx import Document
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+
+from src.document.document_utils import DocumentUtils
+
+
+class TestPrototypeParagraphs(unittest.TestCase):
+    """Compare prototype-based paragraphs with the property-by-property path."""
+
+    def setUp(self):
+        """Create the utils and two blank documents."""
+        self.utils = DocumentUtils()
+        self.fast_doc = Document()
+        self.slow_doc = Document()
+
+    def assertSameBody(self):
+        self.assertEqual(self.fast_doc.element.body.xml, self.slow_doc.element.body.xml)
+
+    def test_hebrew_paragraph_matches_slow_path(self):
+        """Test bold, centered paragraphs with tabs and newlines."""
+        text = 'שם המבוטח:\tניצן\nשורה שנייה'
+        self.utils.make_hebrew_paragraph(self.fast_doc, text, bold=True, size=14,
+                                         alignment=WD_PARAGRAPH_ALIGNMENT.CENTER)
+
+        paragraph = self.slow_doc.add_paragraph()
+        run = paragraph.add_run(text)
+        self.utils._format_hebrew_paragraph(paragraph, run, True, 14, WD_PARAGRAPH_ALIGNMENT.CENTER)
+
+        self.assertSameBody()
+
+    def test_bullet_point_matches_slow_path(self):
+        """Test indented bullets."""
+        self.utils.add_bullet_point(self.fast_doc, 'בדקנו את מסמכי הביטוח', level=1)
+
+        paragraph = self.slow_doc.add_paragraph()
+        run = paragraph.add_run('• בדקנו את מסמכי הביטוח')
+        self.utils._format_bullet_point(paragraph, run, level=1)
+
+        self.assertSameBody()
+
+    def test_table_row_matches_slow_path(self):
+        """Test table cells get the same properties as paragraphs."""
+        self.utils.add_table_row(self.fast_doc.add_table(rows=0, cols=2), ['א', 'ב'], bold=True)
+
+        row = self.slow_doc.add_table(rows=0, cols=2).add_row()
+        for cell, text in zip(row.cells, ['א', 'ב']):
+            paragraph = cell.paragraphs[0]
+            run = paragraph.add_run(text)
+            self.utils._format_hebrew_paragraph(paragraph, run, True, 11, WD_PARAGRAPH_ALIGNMENT.RIGHT)
+
+        self.assertSameBody()
+
+    def test_paragraphs_do_not_share_elements(self):
+        """Test that changing one paragraph's run does not affect another."""
+        first = self.utils.create_section_header(self.fast_doc, 'כותרת')
+        second = self.utils.make_hebrew_paragraph(self.fast_doc, 'טקסט', bold=True, size=14)
+        self.assertTrue(first.runs[0].underline)
+        self.assertIsNone(second.runs[0].underline)
+
+
+if __name__ == '__main__':
+    unittest.main()
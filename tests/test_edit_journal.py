@@ -0,0 +1,211 @@
+# tests/test_edit_journal.py
+"""
+Tests for atomic saves and the field-level edit journal.
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.atomic_io import atomic_write_json
+from src.data.edit_journal import EditJournal
+from src.data.file_persistence import FilePersistenceHandler
+
+
+class TestAtomicWrite(unittest.TestCase):
+    """Test the temp-file-plus-rename writer."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, '100.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_replaces_file_and_leaves_no_temp_files(self):
+        """Test that the target holds the new data and nothing else is left behind."""
+        atomic_write_json(self.path, {'summary': 'ישן'})
+        atomic_write_json(self.path, {'summary': 'חדש'})
+
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {'summary': 'חדש'})
+        self.assertEqual(os.listdir(self.tmp_dir), ['100.json'])
+
+    def test_failed_write_keeps_old_file(self):
+        """Test that an error while serializing leaves the previous file intact."""
+        atomic_write_json(self.path, {'summary': 'ישן'})
+
+        with self.assertRaises(TypeError):
+            atomic_write_json(self.path, {'summary': object()})
+
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {'summary': 'ישן'})
+        self.assertEqual(os.listdir(self.tmp_dir), ['100.json'])
+
+    @unittest.skipUnless(os.name == 'posix', "POSIX permissions")
+    def test_permissions_are_kept(self):
+        """Test that rewriting a file keeps its mode, and new files get open()'s."""
+        plain = os.path.join(self.tmp_dir, 'plain.json')
+        with open(plain, 'w'):
+            pass
+        atomic_write_json(self.path, {})
+        self.assertEqual(os.stat(self.path).st_mode, os.stat(plain).st_mode)
+
+        os.chmod(self.path, 0o640)
+        atomic_write_json(self.path, {'summary': 'חדש'})
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o640)
+
+
+class TestEditJournal(unittest.TestCase):
+    """Test journaling, group commit and replay."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'edits.journal')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def read_lines(self):
+        with open(self.path, encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def test_group_commits_once_at_end(self):
+        """Test that appends inside group() are written together."""
+        journal = EditJournal(self.path)
+        with journal.group():
+            journal.append('100', {'summary': 'א'})
+            journal.append('200', {'summary': 'ב'})
+            self.assertEqual(self.read_lines(), [])
+        self.assertEqual(len(self.read_lines()), 2)
+        journal.close()
+
+    def test_replay_merges_edits_and_skips_torn_record(self):
+        """Test that reopening recovers edits and ignores a half-written line."""
+        journal = EditJournal(self.path)
+        journal.append('100', {'summary': 'א', 'full_name': 'ישראל'})
+        journal.append('100', {'summary': 'ב'})
+        journal.close()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"claim": "100", "fields": {"summ')
+
+        reopened = EditJournal(self.path)
+        self.assertEqual(
+            reopened.pending_changes('100'), {'summary': 'ב', 'full_name': 'ישראל'}
+        )
+        reopened.close()
+
+    def test_append_after_torn_record_is_replayed(self):
+        """Test that a torn final line is cut off before appending again."""
+        journal = EditJournal(self.path)
+        journal.append('100', {'summary': 'א'})
+        journal.close()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"claim": "100", "fields": {"summ')
+
+        journal = EditJournal(self.path)
+        journal.append('100', {'summary': 'ב'})
+        journal.close()
+        self.assertEqual(len(self.read_lines()), 2)
+        reopened = EditJournal(self.path)
+        self.assertEqual(reopened.pending_changes('100'), {'summary': 'ב'})
+        reopened.close()
+
+    def test_compact_applies_changes_and_empties_journal(self):
+        """Test that compaction hands every claim's merged edits to the callback."""
+        journal = EditJournal(self.path, compact_threshold=2)
+        journal.append('100', {'summary': 'א'})
+        self.assertFalse(journal.should_compact())
+        journal.append('200', {'summary': 'ב'})
+        self.assertTrue(journal.should_compact())
+
+        applied = {}
+        self.assertEqual(journal.compact(applied.__setitem__), 2)
+        self.assertEqual(applied, {'100': {'summary': 'א'}, '200': {'summary': 'ב'}})
+        self.assertEqual(self.read_lines(), [])
+        self.assertFalse(journal.has_pending_changes('100'))
+        journal.close()
+
+
+class TestJournaledPersistence(unittest.TestCase):
+    """Test FilePersistenceHandler's use of the journal."""
+
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        self.persistence = FilePersistenceHandler(self.base_dir)
+        self.persistence.save_by_claim_number('100', {'summary': 'ישן', 'full_name': 'ישראל'})
+
+    def tearDown(self):
+        self.persistence.close()
+        shutil.rmtree(self.base_dir)
+
+    def read_claim_file(self):
+        with open(os.path.join(self.base_dir, '100.json'), encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_save_changes_appends_without_rewriting(self):
+        """Test that changes are visible on load while the file is untouched."""
+        self.persistence.save_changes('100', {'summary': 'חדש'})
+
+        self.assertEqual(self.read_claim_file()['summary'], 'ישן')
+        self.assertEqual(
+            self.persistence.load_by_claim_number('100'),
+            {'summary': 'חדש', 'full_name': 'ישראל'}
+        )
+
+    def test_save_changes_indexes_the_file_mtime(self):
+        """Test that the index isn't stale after a journaled save, so sync() reads nothing."""
+        self.persistence.save_changes('100', {'summary': 'חדש'})
+        self.assertEqual(self.persistence.index.sync(self.persistence), 0)
+
+    def test_batch_commits_the_journal_once(self):
+        """Test that journaled saves inside batch() share one fsync."""
+        self.persistence.save_by_claim_number('200', {'summary': 'ישן'})
+        with mock.patch('src.data.edit_journal.os.fsync') as fsync:
+            with self.persistence.batch():
+                self.persistence.save_changes('100', {'summary': 'א'})
+                self.persistence.save_changes('200', {'summary': 'ב'})
+                fsync.assert_not_called()
+        fsync.assert_called_once()
+        self.assertEqual(self.persistence.load_by_claim_number('200')['summary'], 'ב')
+
+    def test_startup_replays_journal_into_files(self):
+        """Test recovery of edits journaled before an unclean exit."""
+        self.persistence.save_changes('100', {'summary': 'חדש'})
+        # Simulate a crash: the journal is never compacted
+        self.persistence.journal.close()
+        self.persistence.index.close()
+
+        self.persistence = FilePersistenceHandler(self.base_dir)
+        self.assertEqual(self.read_claim_file()['summary'], 'חדש')
+        self.assertEqual(
+            os.path.getsize(os.path.join(self.base_dir, FilePersistenceHandler.JOURNAL_FILENAME)), 0
+        )
+
+    def test_full_save_supersedes_journaled_edits(self):
+        """Test that older journaled edits are not replayed over a full save."""
+        self.persistence.save_changes('100', {'summary': 'ביניים'})
+        self.persistence.save_by_claim_number('100', {'summary': 'סופי', 'full_name': 'ישראל'})
+        self.persistence.close()
+
+        self.persistence = FilePersistenceHandler(self.base_dir)
+        self.assertEqual(self.persistence.load_by_claim_number('100')['summary'], 'סופי')
+
+    def test_delete_drops_journaled_edits(self):
+        """Test that a deleted claim is not resurrected by compaction."""
+        self.persistence.save_changes('100', {'summary': 'חדש'})
+        self.assertTrue(self.persistence.delete_by_claim_number('100'))
+        self.persistence.compact_journal()
+
+        self.assertFalse(self.persistence.file_exists('100'))
+        self.assertEqual(self.persistence.get_all_claim_numbers(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
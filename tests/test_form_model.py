@@ -0,0 +1,216 @@
+# tests/test_form_model.py
+"""
+Tests for dirty-field tracking in FormModel and DataManager.
+Uses widget subclasses that never touch Tk, so no display is needed.
+"""
+import os
+import shutil
+import tempfile
+import tkinter as tk
+from tkinter import ttk
+import unittest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.data_manager import DataManager
+from src.data.file_persistence import FilePersistenceHandler
+from src.data.form_model import FormModel
+
+
+class FakeWidgetMixin:
+    """Records bindings and value reads instead of talking to Tk."""
+
+    def __init__(self, value=''):
+        self.value = value
+        self.reads = 0
+        self.bindings = {}
+
+    def bind(self, sequence, func, add=None):
+        self.bindings.setdefault(sequence, []).append(func)
+
+    def fire(self, sequence):
+        for func in self.bindings.get(sequence, []):
+            func(None)
+
+    def type_text(self, value):
+        """Simulate the user typing a new value."""
+        self.value = value
+        self.fire('<KeyRelease>')
+
+
+class FakeEntry(FakeWidgetMixin, ttk.Entry):
+    def get(self):
+        self.reads += 1
+        return self.value
+
+    def delete(self, first, last=None):
+        self.value = ''
+
+    def insert(self, index, text):
+        self.value += text
+
+
+class FakeCombobox(FakeWidgetMixin, ttk.Combobox):
+    def get(self):
+        self.reads += 1
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class FakeText(FakeWidgetMixin, tk.Text):
+    def __init__(self, value=''):
+        super().__init__(value)
+        self.modified = False
+
+    def get(self, start, end):
+        self.reads += 1
+        return self.value
+
+    def delete(self, start, end=None):
+        self.value = ''
+
+    def insert(self, index, text):
+        self.value += text
+
+    def edit_modified(self, flag=None):
+        if flag is None:
+            return self.modified
+        self.modified = flag
+        self.fire('<<Modified>>')
+
+
+class TestFormModel(unittest.TestCase):
+    """Test that only fields touched by change events are read back."""
+
+    def setUp(self):
+        self.model = FormModel()
+        self.entry = FakeEntry('100')
+        self.combo = FakeCombobox('טויוטה')
+        self.text = FakeText('נסיבות')
+        self.model['claim_number'] = self.entry
+        self.model['vehicle_company'] = self.combo
+        self.model['circumstances'] = self.text
+
+    def test_first_read_then_cache(self):
+        """Test that each widget is read once, then served from the cache."""
+        expected = {'claim_number': '100', 'vehicle_company': 'טויוטה', 'circumstances': 'נסיבות'}
+        self.assertEqual(self.model.current_values(), expected)
+        self.assertEqual(self.model.current_values(), expected)
+        self.assertEqual((self.entry.reads, self.combo.reads, self.text.reads), (1, 1, 1))
+
+    def test_change_events_mark_fields_dirty(self):
+        """Test KeyRelease, ComboboxSelected and Text modified-flag events."""
+        self.model.current_values()
+
+        self.entry.type_text('200')
+        self.combo.value = 'מאזדה'
+        self.combo.fire('<<ComboboxSelected>>')
+        self.text.value = 'נסיבות חדשות'
+        self.text.edit_modified(True)
+        self.assertEqual(
+            self.model.dirty_fields, {'claim_number', 'vehicle_company', 'circumstances'}
+        )
+
+        values = self.model.current_values()
+        self.assertEqual(values['claim_number'], '200')
+        self.assertEqual(values['vehicle_company'], 'מאזדה')
+        self.assertEqual(values['circumstances'], 'נסיבות חדשות')
+        self.assertFalse(self.text.modified)
+        self.assertEqual(self.model.dirty_fields, frozenset())
+
+    def test_replaced_widget_events_are_ignored(self):
+        """Test that an old widget's events don't dirty its replacement."""
+        self.model.current_values()
+        self.model['claim_number'] = FakeEntry('300')
+        self.model.current_values()
+
+        self.entry.type_text('999')
+        self.assertNotIn('claim_number', self.model.dirty_fields)
+        self.assertEqual(self.model.current_value('claim_number'), '300')
+
+    def test_inactive_fields_keep_values_but_are_left_out(self):
+        """Test that fields on hidden tabs are excluded until reactivated."""
+        self.model.set_inactive(['vehicle_company'])
+        self.assertNotIn('vehicle_company', self.model.current_values())
+
+        self.model.set_inactive([])
+        self.assertEqual(self.model.current_values()['vehicle_company'], 'טויוטה')
+
+    def test_removed_field_is_dropped(self):
+        """Test that deleting a field removes its cached value."""
+        self.model.current_values()
+        del self.model['vehicle_company']
+        self.assertNotIn('vehicle_company', self.model.current_values())
+
+
+class TestPendingFields(unittest.TestCase):
+    """Test fields declared before their (lazily built) widgets exist."""
+
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        self.data_manager = DataManager(FilePersistenceHandler(self.base_dir))
+        self.form_data = self.data_manager.form_data
+        self.form_data.declare('summary')
+        self.form_data.declare('event_date', '01/01/2025')
+
+    def tearDown(self):
+        self.data_manager.file_persistence.close()
+        shutil.rmtree(self.base_dir)
+
+    def test_loaded_values_are_staged_and_applied_on_build(self):
+        """Test that loading into an unbuilt tab stages the value for its widget."""
+        self.data_manager.load_data_from_json({'summary': 'סיכום שמור'})
+        self.assertEqual(self.data_manager.build_snapshot()['summary'], 'סיכום שמור')
+
+        text = FakeText()
+        self.form_data['summary'] = text
+        self.assertEqual(text.value, 'סיכום שמור')
+        self.assertFalse(self.form_data.is_pending('summary'))
+        self.assertEqual(self.data_manager.get_field_value('summary'), 'סיכום שמור')
+
+    def test_validation_sees_unbuilt_fields(self):
+        """Test that empty-field checks and placeholders cover unbuilt fields."""
+        self.assertEqual(self.data_manager.get_empty_fields(), [('summary', 'סיכום')])
+
+        self.data_manager.fill_empty_fields_with_placeholder(['summary'])
+        self.assertEqual(self.data_manager.get_field_value('summary'), 'NOT_FILLED')
+
+        self.data_manager.clear_all_fields()
+        self.assertEqual(self.data_manager.get_field_value('summary'), '')
+        self.assertEqual(self.data_manager.get_field_value('event_date'), '01/01/2025')
+
+
+class TestDataManagerDirtyTracking(unittest.TestCase):
+    """Test DataManager's use of the cached model."""
+
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        self.data_manager = DataManager(FilePersistenceHandler(self.base_dir))
+        self.entry = FakeEntry('')
+        self.data_manager.form_data['full_name'] = self.entry
+
+    def tearDown(self):
+        self.data_manager.file_persistence.close()
+        shutil.rmtree(self.base_dir)
+
+    def test_programmatic_set_marks_dirty(self):
+        """Test that set_field_value is picked up without a widget event."""
+        self.assertEqual(self.data_manager.get_empty_fields(), [('full_name', 'שם מלא של המבוטח')])
+        self.data_manager.set_field_value('full_name', 'ישראל ישראלי')
+        self.assertEqual(self.data_manager.get_empty_fields(), [])
+        self.assertEqual(self.data_manager.build_snapshot()['full_name'], 'ישראל ישראלי')
+
+    def test_unchanged_fields_are_not_read_again(self):
+        """Test that validation and snapshots reuse cached values."""
+        self.data_manager.get_empty_fields()
+        self.data_manager.build_snapshot()
+        self.data_manager.get_field_value('full_name')
+        self.assertEqual(self.entry.reads, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# tests/test_form_snapshot.py
+"""
+Tests for the immutable FormSnapshot value object.
+"""
+import pickle
+import unittest
+
+# Add parent directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.form_snapshot import FormSnapshot
+from src.document.report_generator import ReportGenerator
+
+
+class TestFormSnapshot(unittest.TestCase):
+    """Test FormSnapshot behaviour."""
+
+    def test_values_are_normalized_to_strings(self):
+        """Test that None becomes '' and numbers become strings."""
+        snapshot = FormSnapshot({'claim_number': 15189, 'summary': None})
+        self.assertEqual(snapshot['claim_number'], '15189')
+        self.assertEqual(snapshot['summary'], '')
+
+    def test_structured_values_become_json(self):
+        """Test that lists are kept as JSON text and empty ones as ''."""
+        pairs = [{'question': 'מה קרה?', 'answer': 'נסעתי'}]
+        snapshot = FormSnapshot({'investigation_qa': pairs, 'other_qa': []})
+        self.assertEqual(snapshot['investigation_qa'], '[{"question": "מה קרה?", "answer": "נסעתי"}]')
+        self.assertEqual(snapshot['other_qa'], '')
+        self.assertEqual(FormSnapshot.coerce({'investigation_qa': pairs})['investigation_qa'],
+                         snapshot['investigation_qa'])
+
+    def test_missing_field_returns_empty_string(self):
+        """Test that get() defaults to an empty string."""
+        snapshot = FormSnapshot({'full_name': 'ניצן'})
+        self.assertEqual(snapshot.get('policy_number'), '')
+
+    def test_snapshot_is_immutable(self):
+        """Test that attributes cannot be assigned."""
+        snapshot = FormSnapshot({'full_name': 'ניצן'})
+        with self.assertRaises(AttributeError):
+            snapshot.full_name = 'אחר'
+        with self.assertRaises(TypeError):
+            snapshot['full_name'] = 'אחר'
+
+    def test_equal_snapshots_hash_equal(self):
+        """Test value semantics, so snapshots can be used as cache keys."""
+        first = FormSnapshot({'a': '1', 'b': '2'})
+        second = FormSnapshot({'b': '2', 'a': '1'})
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertNotEqual(first, first.replace(a='3'))
+
+    def test_snapshot_survives_pickling(self):
+        """Test that snapshots can be sent to worker processes."""
+        snapshot = FormSnapshot({'full_name': 'ניצן אברג\'יל'})
+        self.assertEqual(pickle.loads(pickle.dumps(snapshot)), snapshot)
+
+    def test_coerce_keeps_plain_values(self):
+        """Test that a mapping of plain values is snapshotted as is."""
+        snapshot = FormSnapshot.coerce({'full_name': 'ניצן', 'event_date': '25/10/2024'})
+        self.assertEqual(snapshot.to_dict(), {'full_name': 'ניצן', 'event_date': '25/10/2024'})
+        self.assertIs(FormSnapshot.coerce(snapshot), snapshot)
+
+    def test_report_generator_reads_snapshot(self):
+        """Test that the report contains values from the snapshot."""
+        snapshot = FormSnapshot({'full_name': 'ניצן', 'summary': 'לסיכום יפה'})
+        doc = ReportGenerator().build_document(snapshot)
+        text = '\n'.join(p.text for p in doc.paragraphs)
+        self.assertIn('שם המבוטח: ניצן', text)
+        self.assertIn('לסיכום יפה', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
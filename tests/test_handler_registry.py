@@ -0,0 +1,96 @@
+# tests/test_handler_registry.py
+"""
+Tests for WidgetHandlerFactory's registry dispatch.
+Widgets are created without initializing Tk, so no display is needed.
+"""
+import os
+import tkinter as tk
+from tkinter import ttk
+import unittest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.widget_handlers import BaseWidgetHandler, WidgetHandlerFactory
+from src.data.widget_handlers.combobox_widget_handler import ComboboxWidgetHandler
+from src.data.widget_handlers.date_widget_handler import DateWidgetHandler
+from src.data.widget_handlers.entry_widget_handler import EntryWidgetHandler
+from src.data.widget_handlers.text_widget_handler import TextWidgetHandler
+
+
+def bare(widget_class):
+    """An instance of a widget class that never touches Tk."""
+    return widget_class.__new__(widget_class)
+
+
+class DateEntry(ttk.Entry):
+    """Stands in for tkcalendar.DateEntry, which is matched by name."""
+
+
+class LabelHandler(BaseWidgetHandler):
+    def get_value(self, widget):
+        return widget.cget('text')
+
+    def set_value(self, widget, value):
+        widget.config(text=value)
+
+    def clear_value(self, widget):
+        widget.config(text='')
+
+
+class TestHandlerRegistry(unittest.TestCase):
+    """Test dispatch, subclass resolution, memoization and registration."""
+
+    def setUp(self):
+        WidgetHandlerFactory.get_handler(bare(tk.Text))
+        self.saved_types = dict(WidgetHandlerFactory._handlers_by_type)
+
+    def tearDown(self):
+        WidgetHandlerFactory._handlers_by_type = self.saved_types
+        WidgetHandlerFactory._resolved.clear()
+
+    def test_builtin_dispatch(self):
+        """Test that the most specific handler wins for each built-in widget."""
+        cases = [
+            (tk.Text, TextWidgetHandler),
+            (ttk.Entry, EntryWidgetHandler),
+            (tk.Entry, EntryWidgetHandler),
+            (ttk.Combobox, ComboboxWidgetHandler),
+            (DateEntry, DateWidgetHandler),
+        ]
+        for widget_class, handler_class in cases:
+            with self.subTest(widget_class=widget_class.__name__):
+                handler = WidgetHandlerFactory.get_handler(bare(widget_class))
+                self.assertIsInstance(handler, handler_class)
+
+    def test_handlers_are_shared_singletons(self):
+        """Test that repeated lookups return the same handler instance."""
+        first = WidgetHandlerFactory.get_handler(bare(ttk.Entry))
+        self.assertIs(WidgetHandlerFactory.get_handler(bare(ttk.Entry)), first)
+        self.assertIs(WidgetHandlerFactory.get_handler(bare(tk.Entry)), first)
+
+    def test_subclass_resolves_through_mro(self):
+        """Test that subclasses of registered widgets get the parent's handler."""
+        class AutocompleteEntry(ttk.Combobox):
+            pass
+
+        handler = WidgetHandlerFactory.get_handler(bare(AutocompleteEntry))
+        self.assertIsInstance(handler, ComboboxWidgetHandler)
+
+    def test_register_new_widget_type(self):
+        """Test that register() plugs in a handler for an unsupported type."""
+        with self.assertRaises(ValueError):
+            WidgetHandlerFactory.get_handler(bare(tk.Label))
+
+        WidgetHandlerFactory.register(tk.Label, LabelHandler)
+        self.assertIsInstance(WidgetHandlerFactory.get_handler(bare(tk.Label)), LabelHandler)
+
+    def test_register_rejects_non_handlers(self):
+        """Test that only BaseWidgetHandler instances or classes are accepted."""
+        with self.assertRaises(TypeError):
+            WidgetHandlerFactory.register(tk.Label, object())
+
+
+if __name__ == '__main__':
+    unittest.main()
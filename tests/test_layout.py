@@ -0,0 +1,211 @@
+# tests/test_layout.py
+"""
+Tests for declarative report layouts and their compiled render plans.
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from docx import Document
+
+from src.data.form_snapshot import FormSnapshot
+from src.document.document_utils import DocumentUtils
+from src.document.layout import LAYOUTS_DIR, LayoutError, RenderPlanCache, compile_layout
+from src.document.report_generator import ReportGenerator
+
+
+class CountingSnapshot(FormSnapshot):
+    """Counts reads per field."""
+
+    __slots__ = ('reads',)
+
+    def __init__(self, values=None):
+        super().__init__(values)
+        object.__setattr__(self, 'reads', {})
+
+    def get(self, key, default=''):
+        self.reads[key] = self.reads.get(key, 0) + 1
+        return super().get(key, default)
+
+
+def render(plan, values):
+    doc = Document()
+    for section in plan.sections:
+        section.render(doc, values, DocumentUtils())
+    return [paragraph.text for paragraph in doc.paragraphs]
+
+
+class TestCompileLayout(unittest.TestCase):
+    """Test compiling layout dicts."""
+
+    def test_fields_per_section(self):
+        plan = compile_layout({'sections': [
+            {'name': 'a', 'blocks': [{'type': 'paragraph', 'text': '{x} ו-{y}'}]},
+            {'name': 'b', 'when': 'z', 'blocks': [{'type': 'bullets', 'items': ['{x}', 'קבוע']}]},
+        ]})
+        self.assertEqual([section.fields for section in plan.sections], [('x', 'y'), ('x', 'z')])
+        self.assertEqual(plan.fields, ('x', 'y', 'z'))
+
+    def test_placeholders_and_escaped_braces(self):
+        plan = compile_layout({'sections': [
+            {'name': 'a', 'blocks': [{'type': 'paragraph', 'text': '{{קבוע}} {x}!'}]},
+        ]})
+        self.assertEqual(render(plan, {'x': 'ערך'}), ['{קבוע} ערך!'])
+
+    def test_values_are_not_formatted_again(self):
+        plan = compile_layout({'sections': [
+            {'name': 'a', 'blocks': [{'type': 'paragraph', 'text': 'שם: {x}'}]},
+        ]})
+        self.assertEqual(render(plan, {'x': '{y}'}), ['שם: {y}'])
+
+    def test_section_skipped_when_field_empty(self):
+        plan = compile_layout({'sections': [
+            {'name': 'a', 'when': 'x', 'blocks': [{'type': 'heading', 'text': 'כותרת'},
+                                                   {'type': 'text', 'field': 'x'}]},
+        ]})
+        self.assertEqual(render(plan, {'x': ''}), [])
+        self.assertEqual(render(plan, {'x': 'טקסט'}), ['כותרת', 'טקסט'])
+
+    def test_numbered_headings(self):
+        plan = compile_layout({'sections': [
+            {'name': 'a', 'blocks': [{'type': 'heading', 'numbered': True, 'text': 'ראשון'}]},
+            {'name': 'b', 'when': 'x', 'blocks': [{'type': 'heading', 'numbered': True, 'text': 'שני'}]},
+            {'name': 'c', 'blocks': [{'type': 'heading', 'numbered': True, 'text': '{y}'}]},
+        ]})
+        self.assertEqual(plan.fields, ('x', 'y'))
+        self.assertEqual(render(plan, plan.resolve(FormSnapshot({'y': 'שלישי'}))), ['1. ראשון', '2. שלישי'])
+        self.assertEqual(render(plan, plan.resolve(FormSnapshot({'x': '1', 'y': 'שלישי'}))),
+                         ['1. ראשון', '2. שני', '3. שלישי'])
+
+    def test_unreadable_qa_pairs_use_the_fallback(self):
+        plan = compile_layout({'sections': [
+            {'name': 'a', 'blocks': [{'type': 'qa', 'field': 'pairs', 'fallback': 'text'}]},
+        ]})
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                for pairs in ('[{"question": "מה', '"טקסט"', '[1, 2]'):
+                    self.assertEqual(render(plan, {'pairs': pairs, 'text': 'גרסה'}), ['גרסה'], msg=pairs)
+            finally:
+                sys.stdout = stdout
+
+    def test_malformed_layouts(self):
+        for layout in (
+            {'sections': [{'name': 'a', 'blocks': [{'type': 'table'}]}]},
+            {'sections': [{'name': 'a', 'blocks': [{'type': 'paragraph', 'text': '{x:>5}'}]}]},
+            {'sections': [{'name': 'a', 'blocks': [{'type': 'paragraph', 'text': '{x'}]}]},
+            {'sections': [{'name': 'a', 'blocks': [{'type': 'paragraph', 'text': '{}'}]}]},
+            {'sections': [{'name': 'a', 'blocks': [{'type': 'paragraph', 'text': '', 'align': 'top'}]}]},
+            {'sections': [{'name': 'a'}, {'name': 'a'}]},
+        ):
+            with self.assertRaises(LayoutError, msg=layout):
+                compile_layout(layout)
+
+
+class TestRenderPlan(unittest.TestCase):
+    """Test the shipped layouts through the report generator."""
+
+    def setUp(self):
+        self.generator = ReportGenerator()
+
+    def test_each_field_is_read_once(self):
+        snapshot = CountingSnapshot({'vehicle_company': 'טויוטה', 'summary': 'סיכום'})
+        plan = self.generator.render_plan(snapshot)
+        snapshot.reads.clear()
+        plan.resolve(snapshot)
+        self.assertIn('vehicle_company', snapshot.reads)
+        self.assertEqual(set(snapshot.reads.values()), {1})
+
+    def test_builtin_date_fields(self):
+        plan = self.generator.render_plan(FormSnapshot())
+        values = plan.resolve(FormSnapshot(), now=datetime(2026, 3, 4))
+        self.assertEqual((values['today'], values['ref_number']), ('04.03.2026', '040326'))
+
+    def test_default_report(self):
+        doc = self.generator.build_document(FormSnapshot({
+            'full_name': 'ישראל ישראלי',
+            'event_type': 'נזק לרכב',
+            'vehicle_company': 'טויוטה',
+            'vehicle_model': 'קורולה',
+            'summary': 'סיכום קצר',
+        }))
+        texts = [paragraph.text for paragraph in doc.paragraphs]
+        self.assertIn('שם המבוטח: ישראל ישראלי', texts)
+        self.assertIn('יצרן ודגם: טויוטה קורולה', texts)
+        self.assertIn('• פגשנו וחקרנו את המבוטח ישראל ישראלי.', texts)
+        self.assertIn('3. סיכום', texts)
+        self.assertNotIn('3. נסיבות האירוע', texts)
+        self.assertEqual(texts[-1], 'אניגמה חקירות')
+
+    def test_sections_are_numbered_by_presence(self):
+        def headings(values):
+            texts = [p.text for p in self.generator.build_document(FormSnapshot(values)).paragraphs]
+            return [text for text in texts if text[:1].isdigit()]
+
+        self.assertEqual(headings({'circumstances': 'נסיבות', 'summary': 'סיכום קצר'}),
+                         ['1. כללי', '2. פרטי הרכב', '3. נסיבות האירוע', '4. סיכום'])
+        self.assertEqual(headings({'circumstances': 'נסיבות', 'investigation': 'ש: מה?\nת: כן',
+                                   'summary': 'סיכום קצר'}),
+                         ['1. כללי', '2. פרטי הרכב', '3. נסיבות האירוע', '4. החקירה', '5. סיכום'])
+
+    def test_event_type_variant(self):
+        default = self.generator.render_plan(FormSnapshot({'event_type': 'נזק לרכב'}))
+        theft = self.generator.render_plan(FormSnapshot({'event_type': 'גניבת רכב'}))
+        self.assertNotEqual(default.digest, theft.digest)
+        self.assertEqual([s.name for s in theft.sections], [s.name for s in default.sections])
+
+        changed = [s.name for s, d in zip(theft.sections, default.sections) if s.ops != d.ops]
+        self.assertEqual(changed, ['general'])
+
+    def test_progress_uses_section_labels(self):
+        labels = []
+        self.generator.build_document(FormSnapshot(), lambda done, total, label: labels.append(label))
+        self.assertEqual(labels, ['כותרת', 'כללי', 'פרטי הרכב', 'נסיבות האירוע', 'החקירה',
+                                  'סיכום', 'התכתבויות ותמונות', 'חתימה'])
+
+
+class TestRenderPlanCache(unittest.TestCase):
+    """Test compiling each layout once and reloading edited files."""
+
+    def setUp(self):
+        self.layouts_dir = tempfile.mkdtemp()
+        for name in ('default.json', 'vehicle_theft.json'):
+            shutil.copy(os.path.join(LAYOUTS_DIR, name), self.layouts_dir)
+        self.cache = RenderPlanCache(self.layouts_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.layouts_dir)
+
+    def test_plan_is_compiled_once(self):
+        self.assertIs(self.cache.get('גניבת רכב'), self.cache.get('גניבת רכב'))
+        self.assertIs(self.cache.get(''), self.cache.get('סוג לא מוכר'))
+
+    def test_variant_is_recompiled_when_base_changes(self):
+        theft = self.cache.get('גניבת רכב')
+        path = os.path.join(self.layouts_dir, 'default.json')
+        with open(path, encoding='utf-8') as f:
+            layout = json.load(f)
+        layout['sections'][-1]['blocks'].append({'type': 'paragraph', 'text': 'שורה נוספת'})
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(layout, f, ensure_ascii=False)
+
+        reloaded = self.cache.get('גניבת רכב')
+        self.assertIsNot(reloaded, theft)
+        self.assertEqual(len(reloaded.sections[-1].ops), len(theft.sections[-1].ops) + 1)
+
+    def test_variant_must_override_known_sections(self):
+        with open(os.path.join(self.layouts_dir, 'vehicle_theft.json'), 'w', encoding='utf-8') as f:
+            json.dump({'extends': 'default.json', 'sections': [{'name': 'appendix'}]}, f)
+        with self.assertRaises(LayoutError):
+            self.cache.get('גניבת רכב')
+
+
+if __name__ == '__main__':
+    unittest.main()
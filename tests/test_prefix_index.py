@@ -0,0 +1,100 @@
+# tests/test_prefix_index.py
+"""
+Tests for claim, policy and license number autocomplete.
+"""
+import os
+import unittest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.claim_index import ClaimIndex
+from src.data.prefix_index import PrefixIndex, make_entries, normalize_key
+
+
+class TestPrefixIndex(unittest.TestCase):
+    """Test the sorted-array prefix index on its own."""
+
+    def setUp(self):
+        self.index = PrefixIndex()
+        self.index.build([
+            ('1001', {'claim_number': '1001', 'policy_number': 'P-77', 'vehicle_license_number': '12-345-67'}),
+            ('1002', {'claim_number': '1002', 'policy_number': 'P-78'}),
+            ('2001', {'claim_number': '2001', 'vehicle_license_number': '12-399-01'}),
+        ])
+
+    def suggested(self, field, prefix, limit=10):
+        return [s['claim_number'] for s in self.index.suggest(field, prefix, limit)]
+
+    def test_normalize_key_ignores_separators_and_case(self):
+        self.assertEqual(normalize_key(' 12-345 67 '), '1234567')
+        self.assertEqual(normalize_key('p.77'), 'P77')
+        self.assertEqual(normalize_key(None), '')
+
+    def test_suggestions_in_key_order(self):
+        self.assertEqual(self.suggested('claim_number', '10'), ['1001', '1002'])
+        self.assertEqual(self.suggested('claim_number', '1'), ['1001', '1002'])
+        self.assertEqual(self.suggested('claim_number', '3'), [])
+
+    def test_limit(self):
+        self.assertEqual(self.suggested('claim_number', '10', limit=1), ['1001'])
+
+    def test_separators_in_prefix_and_value(self):
+        self.assertEqual(self.suggested('vehicle_license_number', '123'), ['1001', '2001'])
+        self.assertEqual(self.suggested('vehicle_license_number', '12-34'), ['1001'])
+        self.assertEqual(self.suggested('policy_number', 'p7'), ['1001', '1002'])
+
+    def test_suggestion_keeps_original_value(self):
+        self.assertEqual(
+            self.index.suggest('vehicle_license_number', '1234'),
+            [{'claim_number': '1001', 'value': '12-345-67'}]
+        )
+
+    def test_empty_prefix_and_unknown_field(self):
+        self.assertEqual(self.suggested('claim_number', '  '), [])
+        self.assertEqual(self.suggested('full_name', '1'), [])
+
+    def test_make_entries_skips_empty_fields(self):
+        self.assertEqual(
+            make_entries('9', {'claim_number': '9', 'policy_number': ' - '}),
+            [('claim_number', ('9', '9', '9'))]
+        )
+
+    def test_insert_and_discard(self):
+        self.index.insert('policy_number', ('Q1', '1002', 'Q-1'))
+        self.index.discard('policy_number', ('P78', '1002', 'P-78'))
+        self.index.discard('policy_number', ('X', 'missing', 'X'))
+        self.assertEqual(self.suggested('policy_number', 'P'), ['1001'])
+        self.assertEqual(self.suggested('policy_number', 'Q'), ['1002'])
+
+
+class TestClaimIndexSuggest(unittest.TestCase):
+    """Test that the claim index keeps the prefix index current."""
+
+    def setUp(self):
+        self.index = ClaimIndex(':memory:')
+        self.index.update('500', {'policy_number': 'POL-1', 'vehicle_license_number': '55-111-22'}, 1.0)
+
+    def tearDown(self):
+        self.index.close()
+
+    def test_loaded_from_table_on_first_use(self):
+        self.assertEqual(self.index.suggest('policy_number', 'pol'),
+                         [{'claim_number': '500', 'value': 'POL-1'}])
+
+    def test_updates_after_first_use(self):
+        self.index.suggest('claim_number', '5')
+        self.index.update('501', {'vehicle_license_number': '55-999-00'}, 2.0)
+        self.index.update('500', {'vehicle_license_number': '77-111-22'}, 3.0)
+        self.assertEqual(
+            [s['claim_number'] for s in self.index.suggest('vehicle_license_number', '55')],
+            ['501']
+        )
+        self.index.remove('501')
+        self.assertEqual(self.index.suggest('vehicle_license_number', '55'), [])
+        self.assertEqual([s['claim_number'] for s in self.index.suggest('claim_number', '50')], ['500'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+# tests/test_report_cache.py
+"""
+Tests for the on-disk cache of rendered reports.
+"""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.form_snapshot import FormSnapshot
+from src.document.report_cache import ReportCache
+from src.document.report_generator import ReportGenerator
+
+
+class TestReportCache(unittest.TestCase):
+    """Test storing, looking up and evicting cached reports."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = ReportCache(os.path.join(self.cache_dir, 'reports'), max_bytes=100)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def _age(self, key, seconds):
+        """Make an entry look last used `seconds` ago."""
+        path = self.cache._path(key)
+        then = time.time() - seconds
+        os.utime(path, (then, then))
+
+    def test_miss_then_hit(self):
+        self.assertIsNone(self.cache.get('a'))
+        self.cache.put('a', b'report')
+        self.assertEqual(self.cache.get('a'), b'report')
+        self.assertEqual(self.cache.stats(), {'hits': 1, 'misses': 1, 'entries': 1, 'bytes': 6})
+
+    def test_least_recently_used_is_evicted_first(self):
+        for key, age in (('old', 30), ('used', 20), ('new', 10)):
+            self.cache.put(key, b'x' * 40)
+            self._age(key, age)
+        self.cache.get('used')
+
+        self.cache.put('newest', b'x' * 40)
+        self.assertIsNone(self.cache.get('old'))
+        self.assertIsNone(self.cache.get('new'))
+        self.assertIsNotNone(self.cache.get('used'))
+        self.assertIsNotNone(self.cache.get('newest'))
+        self.assertLessEqual(self.cache.stats()['bytes'], 100)
+
+    def test_oversized_report_is_not_stored(self):
+        self.cache.put('big', b'x' * 101)
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+    def test_clear(self):
+        self.cache.put('a', b'report')
+        self.cache.get('a')
+        self.cache.clear()
+        self.assertEqual(self.cache.stats(), {'hits': 0, 'misses': 0, 'entries': 0, 'bytes': 0})
+
+    def test_key_covers_every_input(self):
+        snapshot = FormSnapshot({'full_name': 'ישראל ישראלי'})
+        key = ReportCache.make_key(snapshot, 'template', 1, '2026-01-01')
+        self.assertEqual(key, ReportCache.make_key(FormSnapshot(snapshot), 'template', 1, '2026-01-01'))
+        for other in (
+            ReportCache.make_key(snapshot.replace(full_name='אחר'), 'template', 1, '2026-01-01'),
+            ReportCache.make_key(snapshot, 'other template', 1, '2026-01-01'),
+            ReportCache.make_key(snapshot, 'template', 2, '2026-01-01'),
+            ReportCache.make_key(snapshot, 'template', 1, '2026-01-02'),
+        ):
+            self.assertNotEqual(key, other)
+
+
+class CountingReportGenerator(ReportGenerator):
+    """Counts how many documents are actually built."""
+
+    def __init__(self, report_cache=None):
+        super().__init__(report_cache)
+        self.builds = 0
+
+    def build_document(self, form_data, progress_callback=None, cancel_event=None):
+        self.builds += 1
+        return super().build_document(form_data, progress_callback, cancel_event)
+
+
+class TestReportGeneratorCache(unittest.TestCase):
+    """Test that render_bytes serves unchanged reports from the cache."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = ReportCache(self.cache_dir)
+        self.generator = CountingReportGenerator(report_cache=self.cache)
+        self.snapshot = FormSnapshot({
+            'full_name': 'ישראל ישראלי',
+            'event_type': 'נזק לרכב',
+            'summary': 'סיכום קצר',
+        })
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_unchanged_report_is_rendered_once(self):
+        first = self.generator.render_bytes(self.snapshot)
+        second = self.generator.render_bytes(FormSnapshot(self.snapshot.to_dict()))
+        self.assertEqual(first, second)
+        self.assertEqual(self.generator.builds, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_changed_values_are_rendered_again(self):
+        self.generator.render_bytes(self.snapshot)
+        self.generator.render_bytes(self.snapshot.replace(summary='סיכום אחר'))
+        self.assertEqual(self.generator.builds, 2)
+
+    def test_version_bump_invalidates(self):
+        self.generator.render_bytes(self.snapshot)
+        self.generator.GENERATOR_VERSION = ReportGenerator.GENERATOR_VERSION + 1
+        self.generator.render_bytes(self.snapshot)
+        self.assertEqual(self.generator.builds, 2)
+
+    def test_generate_to_path_uses_cache(self):
+        path = os.path.join(self.cache_dir, 'out.docx')
+        self.generator.render_bytes(self.snapshot)
+        self.generator.generate_to_path(self.snapshot, path)
+        self.assertEqual(self.generator.builds, 1)
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read()[:2], b'PK')
+
+    def test_without_cache_always_builds(self):
+        generator = CountingReportGenerator()
+        generator.render_bytes(self.snapshot)
+        generator.render_bytes(self.snapshot)
+        self.assertEqual(generator.builds, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
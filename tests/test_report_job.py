@@ -0,0 +1,60 @@
+# tests/test_report_job.py
+"""
+Tests for background report generation.
+"""
+import time
+import unittest
+
+# Add parent directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.form_snapshot import FormSnapshot
+from src.document.report_generator import ReportGenerator
+from src.document.report_job import ReportJob
+
+
+def wait_for_messages(job, timeout=10):
+    """Poll the job like the Tk loop does until it finishes."""
+    messages = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        messages.extend(job.poll())
+        if messages and messages[-1][0] in ('done', 'cancelled', 'error'):
+            return messages
+        time.sleep(0.01)
+    raise AssertionError("Report job did not finish in time")
+
+
+class TestReportJob(unittest.TestCase):
+    """Test ReportJob progress, completion and cancellation."""
+
+    def setUp(self):
+        """Create a generator and a small snapshot."""
+        self.generator = ReportGenerator()
+        self.snapshot = FormSnapshot({'full_name': 'ניצן', 'summary': 'לסיכום'})
+
+    def test_job_reports_progress_and_returns_docx_bytes(self):
+        """Test that every section reports progress before the bytes arrive."""
+        messages = wait_for_messages(ReportJob(self.generator, self.snapshot).start())
+
+        progress = [m for m in messages if m[0] == 'progress']
+        self.assertEqual([m[1] for m in progress], list(range(1, len(progress) + 1)))
+        self.assertEqual(progress[-1][1], progress[-1][2])
+
+        kind, report_bytes = messages[-1]
+        self.assertEqual(kind, 'done')
+        self.assertTrue(report_bytes.startswith(b'PK'))
+
+    def test_cancelled_job_stops_before_next_section(self):
+        """Test that a cancelled job reports cancellation instead of bytes."""
+        job = ReportJob(self.generator, self.snapshot)
+        job.cancel()
+        messages = wait_for_messages(job.start())
+
+        self.assertEqual(messages, [('cancelled',)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# tests/test_section_cache.py
+"""
+Tests for caching rendered report sections as XML fragments.
+"""
+import os
+import unittest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lxml import etree
+
+from src.data.form_snapshot import FormSnapshot
+from src.document.report_generator import ReportGenerator
+from src.document.section_cache import SectionCache, capture_section
+
+FORM_DATA = {
+    'full_name': 'ישראל ישראלי',
+    'event_type': 'נזק לרכב',
+    'event_date': '01/02/2026',
+    'claim_number': '12345',
+    'vehicle_company': 'טויוטה',
+    'vehicle_model': 'קורולה',
+    'vehicle_color': 'לבן',
+    'vehicle_manufacture_year': '2019',
+    'vehicle_license_number': '12-345-67',
+    'vehicle_engine_capacity': '1600',
+    'vehicle_gearbox': 'אוטומטי',
+    'circumstances': 'הרכב נפגע בחניה',
+    'summary': 'סיכום קצר',
+}
+
+
+def body_xml(doc):
+    return etree.tostring(doc.element.body, encoding='unicode')
+
+
+class TestSectionCache(unittest.TestCase):
+    """Test the LRU store itself."""
+
+    def test_miss_then_hit(self):
+        cache = SectionCache()
+        key = SectionCache.make_key('summary', ['א'], ('blank', 1, '2026-01-01'))
+        self.assertIsNone(cache.get(key))
+        cache.put(key, '<w:p/>')
+        self.assertEqual(cache.get(key), '<w:p/>')
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'entries': 1})
+
+    def test_least_recently_used_is_dropped(self):
+        cache = SectionCache(max_entries=2)
+        cache.put('a', 'A')
+        cache.put('b', 'B')
+        cache.get('a')
+        cache.put('c', 'C')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 'A')
+        self.assertEqual(cache.get('c'), 'C')
+
+    def test_clear(self):
+        cache = SectionCache()
+        cache.put('a', 'A')
+        cache.get('a')
+        cache.clear()
+        self.assertEqual(cache.stats(), {'hits': 0, 'misses': 0, 'entries': 0})
+
+
+class TestCachedSections(unittest.TestCase):
+    """Test that the generator splices cached sections into the same document."""
+
+    def setUp(self):
+        self.cache = SectionCache()
+        self.generator = ReportGenerator(section_cache=self.cache)
+        self.snapshot = FormSnapshot(FORM_DATA)
+
+    def test_cached_report_matches_uncached(self):
+        expected = body_xml(ReportGenerator().build_document(self.snapshot))
+        self.assertEqual(body_xml(self.generator.build_document(self.snapshot)), expected)
+        self.assertEqual(body_xml(self.generator.build_document(self.snapshot)), expected)
+        self.assertEqual(self.cache.hits, self._cacheable_sections())
+
+    def test_only_changed_section_is_rebuilt(self):
+        self.generator.build_document(self.snapshot)
+        changed = self.snapshot.replace(summary='סיכום אחר')
+        doc = self.generator.build_document(changed)
+
+        sections = self._cacheable_sections()
+        self.assertEqual(self.cache.misses, sections + 1)
+        self.assertEqual(self.cache.hits, sections - 1)
+        self.assertEqual(body_xml(doc), body_xml(ReportGenerator().build_document(changed)))
+
+    def test_sections_read_only_their_fields(self):
+        plan = self.generator.render_plan(self.snapshot)
+        for section in plan.sections:
+            others = {field: 'שונה' for field in FORM_DATA
+                      if field not in section.fields and field != 'event_type'}
+            fragments = [self._section_fragment(plan, section, self.snapshot),
+                         self._section_fragment(plan, section, self.snapshot.replace(**others))]
+            self.assertEqual(fragments[0], fragments[1], section.name)
+
+    def _cacheable_sections(self):
+        return sum(section.cacheable for section in self.generator.render_plan(self.snapshot).sections)
+
+    def _section_fragment(self, plan, section, snapshot):
+        generator = ReportGenerator()
+        doc = generator._create_blank_document()
+        values = plan.resolve(snapshot)
+        return capture_section(doc.element.body, lambda: section.render(doc, values, generator.doc_utils))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+# tests/test_startup_imports.py
+"""
+Guards the GUI's cold start: heavy libraries must not be imported with the app module.
+"""
+import os
+import subprocess
+import sys
+import unittest
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestStartupImports(unittest.TestCase):
+    """Test that docx, lxml, tkcalendar and Pillow are imported only when first used."""
+
+    def test_app_import_defers_heavy_modules(self):
+        script = (
+            "import sys\n"
+            "import src.gui.app\n"
+            "print(','.join(m for m in ('docx', 'lxml', 'tkcalendar', 'PIL') if m in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', script], cwd=REPO_ROOT, capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), '')
+
+    def test_storage_layer_does_not_import_tk(self):
+        script = (
+            "import sys\n"
+            "import src.data.file_persistence, src.data.claim_index, src.data.storage\n"
+            "print('tkinter' in sys.modules)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', script], cwd=REPO_ROOT, capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
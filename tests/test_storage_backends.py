@@ -0,0 +1,262 @@
+# tests/test_storage_backends.py
+"""
+Tests that every storage backend honours the StorageBackend contract -
+saving, listing, search and autocomplete - plus SQLite-specific batching
+and import.
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.file_persistence import FilePersistenceHandler
+from src.data.storage import SQLiteStorageBackend, StorageBackend, create_storage_backend
+
+
+class BackendContractMixin:
+    """Tests shared by all backends; subclasses implement make_backend()."""
+
+    def setUp(self):
+        """Create the backend in a temporary directory."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.backend = self.make_backend()
+
+    def tearDown(self):
+        """Close the backend and remove the directory."""
+        self.backend.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_is_storage_backend(self):
+        """Test that the backend implements the interface."""
+        self.assertIsInstance(self.backend, StorageBackend)
+
+    def test_save_and_load_round_trip(self):
+        """Test that Hebrew data survives a save and load."""
+        data = {'full_name': 'ניצן אברג\'יל', 'event_type': 'נח"ל'}
+        self.backend.save_by_claim_number('15189', data)
+        self.assertEqual(self.backend.load_by_claim_number('15189'), data)
+        self.assertTrue(self.backend.file_exists('15189'))
+
+    def test_missing_claim(self):
+        """Test loading, checking and deleting a claim that was never saved."""
+        self.assertIsNone(self.backend.load_by_claim_number('404'))
+        self.assertFalse(self.backend.file_exists('404'))
+        self.assertFalse(self.backend.delete_by_claim_number('404'))
+
+    def test_empty_claim_number_is_rejected(self):
+        """Test that saving without a claim number raises ValueError."""
+        with self.assertRaises(ValueError):
+            self.backend.save_by_claim_number('', {})
+
+    def test_delete_and_listing(self):
+        """Test listing is sorted and reflects deletes."""
+        for claim_number in ['3', '1', '2']:
+            self.backend.save_by_claim_number(claim_number, {'full_name': claim_number})
+        self.assertTrue(self.backend.delete_by_claim_number('2'))
+
+        self.assertEqual(self.backend.get_all_claim_numbers(), ['1', '3'])
+        self.assertEqual(sorted(self.backend.get_recent_claim_numbers()), ['1', '3'])
+        self.assertEqual(dict(self.backend.iter_records()), {'1': {'full_name': '1'}, '3': {'full_name': '3'}})
+
+    def test_referenced_blobs(self):
+        """Test that blob references in any field are found and deletes release them."""
+        shared, video, image = ('a' * 64, 'b' * 64, 'c' * 64)
+        self.backend.save_by_claim_number('1', {
+            'correspondence_image': f'blob:{shared}/1.jpg\nblob:{image}/2.png',
+            'video_file': f'blob:{video}/call.mp4',
+        })
+        self.backend.save_by_claim_number('2', {'correspondence_image': f'blob:{shared}/copy.jpg'})
+        self.backend.save_changes('2', {'summary': 'blob: אינו הפניה'})
+        self.assertEqual(self.backend.referenced_blobs(), {shared, video, image})
+
+        self.backend.delete_by_claim_number('1')
+        self.assertEqual(self.backend.referenced_blobs(), {shared})
+
+    def save_search_claims(self):
+        self.backend.save_by_claim_number('100', {
+            'full_name': 'משה כהן',
+            'event_type': "צד ג' - רכב",
+            'circumstances': 'התאונה ארעה בצומת ליד פארק הירקון',
+        })
+        self.backend.save_by_claim_number('200', {
+            'full_name': 'דנה לוי',
+            'event_type': 'נח"ל',
+            'summary': 'המבוטח משה העיד שהנזק נגרם מהצפה',
+        })
+
+    def searched(self, query, limit=20):
+        return [result['claim_number'] for result in self.backend.search_claims(query, limit)]
+
+    def test_search_by_part_of_name(self):
+        self.save_search_claims()
+        self.assertEqual(self.searched('כה'), ['100'])
+
+    def test_search_by_phrase_from_free_text(self):
+        self.save_search_claims()
+        self.assertEqual(self.searched('הצפה נזק'), ['200'])
+
+    def test_search_geresh_and_final_letters_match(self):
+        self.save_search_claims()
+        self.assertEqual(self.searched('צד ג'), ['100'])
+        self.assertEqual(self.searched('נח״ל'), ['200'])
+        self.assertEqual(self.searched('הירקונ'), ['100'])
+
+    def test_search_name_matches_rank_first(self):
+        """Test that a match in the insured name outranks one in the summary."""
+        self.save_search_claims()
+        results = self.backend.search_claims('משה')
+        self.assertEqual([r['claim_number'] for r in results], ['100', '200'])
+        self.assertIn('משה', results[1]['snippet'])
+
+    def test_search_ranks_every_match(self):
+        """Test that the best match is found however many weaker ones were saved after it."""
+        self.backend.save_by_claim_number('1', {'full_name': 'משה כהן'})
+        for claim_number in range(2, 40):
+            self.backend.save_by_claim_number(str(claim_number), {'summary': 'שיחה עם משה'})
+        self.assertEqual(self.searched('משה', limit=1), ['1'])
+
+    def test_search_follows_saves_and_deletes(self):
+        self.save_search_claims()
+        self.backend.save_by_claim_number('100', {'full_name': 'משה כהן', 'summary': 'תיק סגור'})
+        self.assertEqual(self.searched('ירקון'), [])
+        self.assertEqual(self.searched('סגור'), ['100'])
+
+        self.backend.delete_by_claim_number('100')
+        self.assertEqual(self.searched('כהן'), [])
+
+    def suggested(self, field, prefix):
+        return [s['claim_number'] for s in self.backend.suggest_claims(field, prefix)]
+
+    def test_suggest_saved_claims(self):
+        self.backend.save_by_claim_number('7001', {'claim_number': '7001', 'policy_number': '880'})
+        self.assertEqual(self.suggested('claim_number', '70'), ['7001'])
+        self.assertEqual(self.suggested('policy_number', '88'), ['7001'])
+
+    def test_suggest_new_and_deleted_claims(self):
+        self.backend.save_by_claim_number('7001', {'claim_number': '7001'})
+        self.suggested('claim_number', '7')
+        self.backend.save_by_claim_number('7002', {'claim_number': '7002'})
+        self.assertEqual(self.suggested('claim_number', '700'), ['7001', '7002'])
+        self.backend.delete_by_claim_number('7001')
+        self.assertEqual(self.suggested('claim_number', '700'), ['7002'])
+
+    def test_suggest_changed_values(self):
+        self.backend.save_by_claim_number('7001', {'claim_number': '7001', 'policy_number': '880'})
+        self.suggested('policy_number', '8')
+        self.backend.save_changes('7001', {'policy_number': '990'})
+        self.assertEqual(self.suggested('policy_number', '88'), [])
+        self.assertEqual(self.suggested('policy_number', '99'), ['7001'])
+
+
+class TestJsonFilesBackend(BackendContractMixin, unittest.TestCase):
+    def make_backend(self):
+        return FilePersistenceHandler(os.path.join(self.tmp_dir, 'saved_data'))
+
+    def test_journaled_changes_are_searchable(self):
+        self.save_search_claims()
+        self.backend.save_changes('200', {'summary': 'נמצאה דליפה בצנרת'})
+        self.assertEqual(self.searched('דליפה'), ['200'])
+
+
+class TestJsonFilesBackendWithoutIndex(BackendContractMixin, unittest.TestCase):
+    """The same contract, served without the persistent claim index."""
+
+    def make_backend(self):
+        return FilePersistenceHandler(os.path.join(self.tmp_dir, 'saved_data'), use_index=False)
+
+
+class TestSQLiteBackend(BackendContractMixin, unittest.TestCase):
+    def make_backend(self):
+        return SQLiteStorageBackend(os.path.join(self.tmp_dir, 'claims.sqlite3'))
+
+    def test_batch_is_one_transaction(self):
+        """Test that a failing batch leaves nothing behind."""
+        with self.assertRaises(RuntimeError):
+            with self.backend.batch():
+                self.backend.save_by_claim_number('1', {})
+                raise RuntimeError("boom")
+        self.assertEqual(self.backend.get_all_claim_numbers(), [])
+
+        self.assertEqual(self.backend.save_many([('1', {}), ('2', {})]), 2)
+        self.assertEqual(sorted(self.backend.get_recent_claim_numbers()), ['1', '2'])
+
+    def test_delete_inside_batch(self):
+        """Test that deletes join the batch's transaction, index entries included."""
+        self.backend.save_many([('1', {}), ('2', {})])
+        with self.backend.batch():
+            self.backend.save_by_claim_number('3', {})
+            self.backend.save_by_claim_number('4', {})
+            self.assertTrue(self.backend.delete_by_claim_number('1'))
+            self.assertTrue(self.backend.delete_by_claim_number('4'))
+        self.assertEqual(self.backend.get_all_claim_numbers(), ['2', '3'])
+        self.assertEqual(sorted(self.backend.get_recent_claim_numbers()), ['2', '3'])
+
+    def test_failing_batch_rolls_back_the_index(self):
+        """Test that a rolled back batch leaves records and index as they were."""
+        self.backend.save_by_claim_number('15189', {'policy_number': '4410'})
+        self.assertEqual(len(self.backend.suggest_claims('claim_number', '151')), 1)
+        with self.assertRaises(RuntimeError):
+            with self.backend.batch():
+                self.backend.delete_by_claim_number('15189')
+                self.backend.save_by_claim_number('15190', {})
+                raise RuntimeError("boom")
+
+        self.assertEqual(self.backend.get_all_claim_numbers(), ['15189'])
+        self.assertEqual(self.backend.get_recent_claim_numbers(), ['15189'])
+        self.assertEqual([s['claim_number'] for s in self.backend.suggest_claims('claim_number', '151')],
+                         ['15189'])
+
+    def test_other_threads_wait_for_a_batch(self):
+        """Test that a save from another thread isn't lost when a batch rolls back."""
+        other = threading.Thread(target=self.backend.save_by_claim_number, args=('2', {}))
+        with self.assertRaises(RuntimeError):
+            with self.backend.batch():
+                self.backend.save_by_claim_number('1', {})
+                other.start()
+                other.join(timeout=0.2)
+                self.assertTrue(other.is_alive())
+                raise RuntimeError("boom")
+        other.join(timeout=5)
+        self.assertEqual(self.backend.get_all_claim_numbers(), ['2'])
+        self.assertEqual(self.backend.get_recent_claim_numbers(), ['2'])
+
+    def test_import_json_directory(self):
+        """Test the bulk importer keeps file mtimes and reports unreadable files."""
+        json_dir = os.path.join(self.tmp_dir, 'saved_data')
+        os.makedirs(json_dir)
+        for claim_number, mtime in [('old', 1000), ('new', 2000)]:
+            path = os.path.join(json_dir, f'{claim_number}.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'full_name': claim_number}, f)
+            os.utime(path, (mtime, mtime))
+        with open(os.path.join(json_dir, 'bad.json'), 'w', encoding='utf-8') as f:
+            f.write('{')
+
+        imported, skipped = self.backend.import_json_directory(json_dir, chunk_size=1)
+
+        self.assertEqual((imported, skipped), (2, ['bad.json']))
+        self.assertEqual(self.backend.get_recent_claim_numbers(), ['new', 'old'])
+
+    def test_data_survives_reopen(self):
+        """Test that saved claims and the index persist across connections."""
+        self.backend.save_by_claim_number('1', {'event_type': 'נזקי מים'})
+        self.backend.close()
+        self.backend = self.make_backend()
+        self.assertEqual(self.backend.find_claims(event_type='נזקי מים')[0]['claim_number'], '1')
+
+
+class TestCreateStorageBackend(unittest.TestCase):
+    def test_unknown_backend_raises(self):
+        """Test that unsupported backend names raise ValueError."""
+        with self.assertRaises(ValueError):
+            create_storage_backend('xml')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+# tests/test_streaming_writer.py
+"""
+Tests for the streaming docx backend.
+"""
+import io
+import re
+import unittest
+import zipfile
+
+# Add parent directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from docx import Document
+from docx.shared import Inches
+
+from src.data.form_snapshot import FormSnapshot
+from src.document.report_generator import ReportGenerator
+from src.document.streaming_writer import StreamingDocument
+
+
+def body_xml_without_namespace_declarations(doc):
+    return re.sub(r' xmlns:\w+="[^"]*"', '', doc.element.body.xml)
+
+
+class TestStreamingDocument(unittest.TestCase):
+    """Test StreamingDocument against a python-docx template."""
+
+    def setUp(self):
+        """Build a template with a header, a table and body paragraphs."""
+        template = Document()
+        template.sections[0].header.paragraphs[0].add_run('כותרת עליונה')
+        template.add_paragraph('פסקה שתוסר')
+        template.add_table(rows=1, cols=1).cell(0, 0).text = 'טבלה'
+        self.template = io.BytesIO()
+        template.save(self.template)
+
+    def write(self, fill):
+        self.template.seek(0)
+        output = io.BytesIO()
+        with StreamingDocument(self.template, output) as doc:
+            fill(doc)
+        output.seek(0)
+        return Document(output)
+
+    def test_keeps_template_parts_and_drops_body_paragraphs(self):
+        """Test that header and tables survive and template paragraphs are removed."""
+        result = self.write(lambda doc: doc.add_paragraph('חדש'))
+
+        self.assertEqual([p.text for p in result.paragraphs], ['חדש'])
+        self.assertEqual(result.tables[0].cell(0, 0).text, 'טבלה')
+        self.assertEqual(result.sections[0].header.paragraphs[0].text, 'כותרת עליונה')
+
+    def test_last_paragraph_is_editable(self):
+        """Test that a paragraph can be changed until the next one is added."""
+        def fill(doc):
+            doc.add_paragraph('ראשון').runs[0].bold = True
+            doc.sections[0].left_margin = Inches(1)
+
+        result = self.write(fill)
+        self.assertTrue(result.paragraphs[0].runs[0].bold)
+        self.assertEqual(result.sections[0].left_margin, Inches(1))
+
+    def test_stream_paragraph_converts_tabs_and_newlines(self):
+        """Test that streamed text matches python-docx's run text handling."""
+        result = self.write(lambda doc: doc.stream_paragraph(None, None, 'א\tב\nג '))
+        self.assertEqual(result.paragraphs[0].text, 'א\tב\nג ')
+
+
+class TestStreamingReport(unittest.TestCase):
+    """Test that the streaming backend produces the same report body."""
+
+    def test_streaming_report_matches_in_memory_report(self):
+        """Test both backends produce identical body XML."""
+        generator = ReportGenerator()
+        snapshot = FormSnapshot({
+            'full_name': 'ניצן',
+            'circumstances': 'שורה ראשונה\tעם טאב\n' * 50,
+            'summary': 'לסיכום'
+        })
+
+        streamed = io.BytesIO()
+        generator.render_streaming(snapshot, streamed)
+        streamed.seek(0)
+        in_memory = io.BytesIO(generator.render_bytes(snapshot))
+
+        self.assertEqual(body_xml_without_namespace_declarations(Document(streamed)),
+                         body_xml_without_namespace_declarations(Document(in_memory)))
+
+    def test_namespaces_are_declared_once(self):
+        """Test that streamed elements don't repeat the root's namespace declarations."""
+        generator = ReportGenerator()
+        snapshot = FormSnapshot({'full_name': 'ניצן', 'circumstances': 'שורה\n' * 50})
+
+        streamed = io.BytesIO()
+        generator.render_streaming(snapshot, streamed)
+        streamed_xml = zipfile.ZipFile(streamed).read('word/document.xml')
+        in_memory_xml = zipfile.ZipFile(io.BytesIO(generator.render_bytes(snapshot))).read('word/document.xml')
+
+        self.assertEqual(streamed_xml.count(b'xmlns:w='), 1)
+        self.assertLessEqual(len(streamed_xml), len(in_memory_xml) * 1.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
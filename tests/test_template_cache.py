@@ -0,0 +1,71 @@
+# tests/test_template_cache.py
+"""
+Tests for the parsed template cache.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from docx import Document
+
+from src.document.template_cache import TemplateCache
+
+
+class TestTemplateCache(unittest.TestCase):
+    """Test template loading, stripping and reloading."""
+
+    def setUp(self):
+        """Write a small template with a header and body paragraphs."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.template_path = os.path.join(self.tmp_dir, 'example.docx')
+        self._write_template('כותרת ראשונה')
+        self.cache = TemplateCache()
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.tmp_dir)
+
+    def _write_template(self, header_text, mtime=None):
+        doc = Document()
+        doc.sections[0].header.paragraphs[0].add_run(header_text)
+        doc.add_paragraph('גוף התבנית')
+        doc.add_paragraph('עוד פסקה')
+        doc.save(self.template_path)
+        if mtime is not None:
+            os.utime(self.template_path, (mtime, mtime))
+
+    def test_body_paragraphs_are_stripped(self):
+        """Test that the cached template has no body paragraphs but keeps the header."""
+        doc = self.cache.get_document(self.template_path)
+        self.assertEqual(len(doc.paragraphs), 0)
+        self.assertEqual(doc.sections[0].header.paragraphs[0].text, 'כותרת ראשונה')
+
+    def test_each_call_returns_independent_copy(self):
+        """Test that modifying one report does not leak into the next."""
+        first = self.cache.get_document(self.template_path)
+        first.add_paragraph('תוכן דוח')
+        second = self.cache.get_document(self.template_path)
+        self.assertEqual(len(second.paragraphs), 0)
+
+    def test_reloads_when_template_changes(self):
+        """Test that a modified template file is parsed again."""
+        self.cache.get_document(self.template_path)
+        self._write_template('כותרת חדשה', mtime=os.path.getmtime(self.template_path) + 10)
+        doc = self.cache.get_document(self.template_path)
+        self.assertEqual(doc.sections[0].header.paragraphs[0].text, 'כותרת חדשה')
+
+    def test_fingerprint_follows_file_contents(self):
+        """Test that the content digest changes with the template and only then."""
+        first = self.cache.fingerprint(self.template_path)
+        self.assertEqual(first, self.cache.fingerprint(self.template_path))
+        self._write_template('כותרת חדשה', mtime=os.path.getmtime(self.template_path) + 10)
+        self.assertNotEqual(first, self.cache.fingerprint(self.template_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
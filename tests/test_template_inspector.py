@@ -0,0 +1,128 @@
+# tests/test_template_inspector.py
+"""
+Tests for the streaming template inspector, checked against what python-docx
+reads from the same files.
+"""
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from docx import Document
+from docx.enum.section import WD_SECTION
+from docx.enum.text import WD_BREAK, WD_PARAGRAPH_ALIGNMENT
+from docx.shared import Pt
+
+from src.document.template_inspector import inspect_template, main, write_structure
+
+
+def python_docx_paragraph(paragraph, runs=True):
+    """The structure the original python-docx based tool dumped."""
+    structure = {'text': paragraph.text, 'alignment': str(paragraph.alignment)}
+    if runs:
+        structure['runs'] = [{
+            'text': run.text,
+            'bold': run.bold,
+            'font_name': run.font.name,
+            'font_size': None if run.font.size is None else str(run.font.size),
+            'underline': run.font.underline,
+        } for run in paragraph.runs]
+    return structure
+
+
+class TestTemplateInspector(unittest.TestCase):
+    """Test dumping header, footer and body paragraphs."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'template.docx')
+
+        doc = Document()
+        header = doc.sections[0].header.paragraphs[0]
+        header.add_run('אניגמה').bold = True
+        tab_run = header.add_run('\t')
+        tab_run.font.size = Pt(18)
+        underlined = header.add_run('חקירות')
+        underlined.font.underline = True
+        underlined.font.name = 'David'
+        header.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+        doc.sections[0].header.add_table(1, 2, doc.sections[0].page_width).rows[0].cells[1].text = 'תא'
+        footer = doc.sections[0].footer.paragraphs[0]
+        footer.add_run('טל: 03-5222766').bold = False
+
+        date = doc.add_paragraph('20 ביוני 2024\tמספרנו')
+        date.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
+        doc.add_paragraph('לכבוד').add_run().add_break(WD_BREAK.LINE)
+        doc.add_table(1, 1).rows[0].cells[0].text = 'לא בגוף הטקסט'
+        page = doc.add_paragraph('הנדון: דו"ח חקירה')
+        page.add_run().add_break(WD_BREAK.PAGE)
+        page.alignment = WD_PARAGRAPH_ALIGNMENT.RIGHT
+        doc.save(self.path)
+        self.doc = Document(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_matches_python_docx(self):
+        structure = inspect_template(self.path)
+        section = self.doc.sections[0]
+        self.assertEqual(structure['header']['paragraphs'],
+                         [python_docx_paragraph(p) for p in section.header.paragraphs])
+        self.assertEqual(structure['footer']['paragraphs'],
+                         [python_docx_paragraph(p) for p in section.footer.paragraphs])
+        self.assertEqual(structure['main_paragraphs'],
+                         [python_docx_paragraph(p, runs=False) for p in self.doc.paragraphs])
+
+    def test_header_runs_and_tables(self):
+        header = inspect_template(self.path)['header']
+        runs = header['paragraphs'][0]['runs']
+        self.assertEqual([run['bold'] for run in runs], [True, None, None])
+        self.assertEqual(runs[1]['font_size'], '228600')
+        self.assertEqual((runs[2]['underline'], runs[2]['font_name']), (True, 'David'))
+        self.assertEqual(header['tables'], [[['', 'תא']]])
+
+    def test_first_section_header_is_used(self):
+        doc = Document(self.path)
+        second = doc.add_section(WD_SECTION.NEW_PAGE)
+        second.header.is_linked_to_previous = False
+        second.header.paragraphs[0].text = 'כותרת שנייה'
+        doc.save(self.path)
+
+        header = inspect_template(self.path)['header']
+        self.assertEqual(header['paragraphs'][0]['text'], 'אניגמה\tחקירות')
+
+    def test_streamed_json_matches_dump(self):
+        for max_paragraphs in (None, 1, 0):
+            expected = json.dumps(inspect_template(self.path, max_paragraphs),
+                                  ensure_ascii=False, indent=2) + '\n'
+            output = io.StringIO()
+            write_structure(self.path, output, max_paragraphs)
+            self.assertEqual(output.getvalue(), expected)
+            self.assertEqual(len(json.loads(output.getvalue())['main_paragraphs']),
+                             3 if max_paragraphs is None else max_paragraphs)
+
+    def test_command_line_writes_utf8(self):
+        output_path = os.path.join(self.temp_dir, 'structure.json')
+        self.assertEqual(main([self.path, '-o', output_path]), 0)
+        with open(output_path, 'rb') as f:
+            raw = f.read()
+        self.assertIn('לכבוד'.encode('utf-8'), raw)
+        self.assertEqual(json.loads(raw.decode('utf-8'))['main_paragraphs'][1]['text'], 'לכבוד\n')
+
+    def test_command_line_bad_file(self):
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                self.assertEqual(main([os.path.join(self.temp_dir, 'missing.docx')]), 1)
+            finally:
+                sys.stdout = stdout
+
+
+if __name__ == '__main__':
+    unittest.main()
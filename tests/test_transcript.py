@@ -0,0 +1,205 @@
+# tests/test_transcript.py
+"""
+Tests for streaming call transcripts into question/answer pairs, and for
+rendering the pairs in the report.
+"""
+import io
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+import unittest
+from unittest import mock
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data import transcript
+from src.data.form_snapshot import FormSnapshot
+from src.data.transcript import (
+    TranscriptImport, format_pair, iter_lines, iter_qa_pairs, iter_turns, parse_qa_text,
+    read_transcript, strip_timestamps
+)
+from src.document.report_generator import ReportGenerator
+
+CALL = """1
+00:00:01,000 --> 00:00:04,000
+חוקר: שלום, מדבר מאניגמה חקירות.
+מבוטח: שלום.
+[00:00:10] חוקר: ספר לי מה קרה
+ביום האירוע?
+מבוטח: נסעתי ברחוב הרצל.
+מבוטח: ואז: בום.
+"""
+
+
+def pairs_of(text, investigator=None):
+    lines = strip_timestamps(iter_lines(io.StringIO(text)))
+    return list(iter_qa_pairs(iter_turns(lines), investigator))
+
+
+class TestParsing(unittest.TestCase):
+    """Test splitting transcripts into turns and pairs."""
+
+    def test_call_with_known_labels(self):
+        self.assertEqual(pairs_of(CALL), [
+            {'question': 'שלום, מדבר מאניגמה חקירות.', 'answer': 'שלום.'},
+            {'question': 'ספר לי מה קרה\nביום האירוע?', 'answer': 'נסעתי ברחוב הרצל.\nואז: בום.'},
+        ])
+
+    def test_numbered_speakers(self):
+        # The investigator opens the call
+        text = 'דובר 1: איפה חנית?\nדובר 2: ליד הבית.\nדובר 1: באיזו שעה?\nדובר 2: בערב.\n'
+        self.assertEqual([pair['question'] for pair in pairs_of(text)], ['איפה חנית?', 'באיזו שעה?'])
+
+    def test_interviewee_speaks_first(self):
+        text = 'מבוטח: הלו?\nדני: שלום, אני החוקר. מה קרה?\nמבוטח: פרצו לי לרכב.\n'
+        self.assertEqual(pairs_of(text), [
+            {'question': '', 'answer': 'הלו?'},
+            {'question': 'שלום, אני החוקר. מה קרה?', 'answer': 'פרצו לי לרכב.'},
+        ])
+
+    def test_known_label_wins_over_an_earlier_speaker(self):
+        self.assertEqual(pairs_of('הערה: השיחה הוקלטה\nחוקר: מה?\nנחקר: כן\n'), [
+            {'question': '', 'answer': 'השיחה הוקלטה'},
+            {'question': 'מה?', 'answer': 'כן'},
+        ])
+
+    def test_explicit_investigator(self):
+        text = 'א: מה קרה?\nב: נגנב הרכב.\n'
+        self.assertEqual(pairs_of(text, investigator='ב'), [
+            {'question': '', 'answer': 'מה קרה?'},
+            {'question': 'נגנב הרכב.', 'answer': ''},
+        ])
+
+    def test_long_lines_are_read_in_pieces(self):
+        stream = io.StringIO('מילה ' * 100000)
+        with mock.patch.object(transcript, 'MAX_LINE_LENGTH', 1000), \
+                mock.patch.object(transcript, 'READ_SIZE', 4096):
+            lines = list(iter_lines(stream))
+        self.assertTrue(all(len(line) <= 1000 for line in lines))
+        self.assertEqual(' '.join(lines).split(), ['מילה'] * 100000)
+
+
+class TestQaText(unittest.TestCase):
+    """Test the investigation field's "ש:" / "ת:" form."""
+
+    def test_round_trip(self):
+        pairs = pairs_of(CALL)
+        self.assertEqual(parse_qa_text(''.join(format_pair(pair) for pair in pairs)), pairs)
+
+    def test_notes_and_other_colons_are_kept(self):
+        self.assertEqual(parse_qa_text('הערה: שיחה קצרה\nש: מה קרה?\nת: שעה: 10:00'), [
+            {'question': '', 'answer': 'הערה: שיחה קצרה'},
+            {'question': 'מה קרה?', 'answer': 'שעה: 10:00'},
+        ])
+
+    def test_free_text_has_no_pairs(self):
+        self.assertEqual(parse_qa_text('המבוטח נחקר במשרדנו.\n2019'), [])
+        self.assertEqual(parse_qa_text(''), [])
+
+
+class TestReadTranscript(unittest.TestCase):
+    """Test reading transcript files."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, name, payload):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(payload)
+        return path
+
+    def test_encodings(self):
+        expected = pairs_of(CALL)
+        for name, payload in (
+            ('utf8.txt', CALL.encode('utf-8')),
+            ('bom.txt', CALL.encode('utf-8-sig')),
+            ('windows.txt', CALL.encode('cp1255')),
+            ('utf16.txt', CALL.encode('utf-16')),
+        ):
+            self.assertEqual(list(read_transcript(self.write(name, payload))), expected, name)
+
+    def test_memory_stays_bounded(self):
+        answer = 'תשובה מפורטת ' * 20
+        for investigator, interviewee in (('חוקר', 'מבוטח'), ('דובר 1', 'דובר 2')):
+            with self.subTest(investigator):
+                turn = f'{investigator}: שאלה ארוכה על נסיבות האירוע?\n{interviewee}: {answer}\n'
+                path = self.write('long.txt', (turn * 40000).encode('utf-8'))
+                self.assertGreater(os.path.getsize(path), 20 * 1024 * 1024)
+
+                tracemalloc.start()
+                try:
+                    count = sum(1 for _ in read_transcript(path))
+                    _, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+                self.assertEqual(count, 40000)
+                self.assertLess(peak, 2 * 1024 * 1024)
+
+    def test_known_label_is_looked_for_a_bounded_number_of_turns(self):
+        text = 'דובר 1: שאלה?\nדובר 2: תשובה.\n' * 100 + 'חוקר: עוד שאלה?\n'
+        pairs = pairs_of(text)
+        self.assertEqual(pairs[0], {'question': 'שאלה?', 'answer': 'תשובה.'})
+        self.assertEqual(len(pairs), 100)
+
+    def test_background_import(self):
+        path = self.write('call.txt', (CALL * 30).encode('utf-8'))
+        job = TranscriptImport(path)
+        job.QUEUE_SIZE = 5
+        job.start()
+        pairs, done = [], False
+        deadline = time.monotonic() + 30
+        while not done and time.monotonic() < deadline:
+            batch, done = job.poll(3)
+            self.assertLessEqual(len(batch), 3)
+            pairs.extend(batch)
+        self.assertTrue(done)
+        self.assertIsNone(job.error)
+        self.assertEqual(pairs, list(read_transcript(path)))
+
+    def test_background_import_error(self):
+        job = TranscriptImport(os.path.join(self.temp_dir, 'missing.txt')).start()
+        deadline = time.monotonic() + 30
+        while not job.poll(10)[1] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertIsInstance(job.error, OSError)
+
+
+class TestReport(unittest.TestCase):
+    """Test the investigation section and the circumstances cross-reference."""
+
+    def setUp(self):
+        self.generator = ReportGenerator()
+
+    def texts(self, values):
+        return [paragraph.text for paragraph in self.generator.build_document(FormSnapshot(values)).paragraphs]
+
+    def test_pairs_are_rendered(self):
+        investigation = ''.join(format_pair(pair) for pair in pairs_of(CALL))
+        texts = self.texts({
+            'circumstances': 'המבוטח נסע ברחוב.',
+            'investigation': investigation,
+            'investigation_qa': parse_qa_text(investigation),
+        })
+        start = texts.index('4. החקירה')
+        self.assertEqual(texts[start + 1:start + 5], [
+            'ש: שלום, מדבר מאניגמה חקירות.', 'ת: שלום.',
+            'ש: ספר לי מה קרה\nביום האירוע?', 'ת: נסעתי ברחוב הרצל.\nואז: בום.',
+        ])
+        self.assertTrue(texts[texts.index('3. נסיבות האירוע') + 2].startswith('גרסת המבוטח'))
+
+    def test_free_text_investigation(self):
+        texts = self.texts({'circumstances': 'המבוטח נסע ברחוב.', 'investigation': 'המבוטח נחקר במשרדנו.'})
+        self.assertEqual(texts[texts.index('4. החקירה') + 1], 'המבוטח נחקר במשרדנו.')
+        self.assertFalse(any(text.startswith('גרסת המבוטח') for text in texts))
+
+
+if __name__ == '__main__':
+    unittest.main()
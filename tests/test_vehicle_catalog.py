@@ -0,0 +1,134 @@
+# tests/test_vehicle_catalog.py
+"""
+Tests for the vehicle catalog: building it from CSV and looking up models.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+# Add parent directory to path for imports
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.constants import Constants
+from src.data.vehicle_catalog import VehicleCatalog, build_catalog, main
+
+CSV_TEXT = (
+    '﻿manufacturer,model,year,engine_type,engine_capacity,engine_power,gearbox\n'
+    'טויוטה,קורולה,2018,בנזין,1600,132,אוטומטי\n'
+    'טויוטה,קורולה,2019,בנזין,1600,132,אוטומטי\n'
+    'טויוטה,קורולה,2019,היברידי,1800,122,אוטומטי\n'
+    'טויוטה,יאריס,,בנזין,1300,99,ידני\n'
+    'טויוטה,ראב 4,2020,היברידי,2500,218,אוטומטי\n'
+    "פיג'ו,208,2020,בנזין,1200,100,אוטומטי\n"
+    ',חסר יצרן,2020,,,,\n'
+)
+
+
+class VehicleCatalogTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, 'catalog.csv')
+        with open(self.csv_path, 'w', encoding='utf-8') as f:
+            f.write(CSV_TEXT)
+        self.catalog_path = os.path.join(self.temp_dir, 'vehicle_catalog.sqlite3')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+
+class TestBuildCatalog(VehicleCatalogTestCase):
+    """Test building the catalog file."""
+
+    def test_rows_without_manufacturer_are_skipped(self):
+        self.assertEqual(build_catalog(self.csv_path, self.catalog_path), 6)
+        self.assertFalse(os.path.exists(self.catalog_path + '.tmp'))
+
+    def test_missing_columns(self):
+        with open(self.csv_path, 'w', encoding='utf-8') as f:
+            f.write('make,year\nטויוטה,2020\n')
+        with self.assertRaises(ValueError):
+            build_catalog(self.csv_path, self.catalog_path)
+        self.assertFalse(os.path.exists(self.catalog_path))
+        self.assertFalse(os.path.exists(self.catalog_path + '.tmp'))
+
+    def test_command_line(self):
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                self.assertEqual(main([self.csv_path, '--output', self.catalog_path]), 0)
+                self.assertEqual(main([os.path.join(self.temp_dir, 'missing.csv')]), 1)
+            finally:
+                sys.stdout = stdout
+        self.assertTrue(os.path.exists(self.catalog_path))
+
+
+class TestVehicleCatalog(VehicleCatalogTestCase):
+    """Test lookups against a built catalog."""
+
+    def setUp(self):
+        super().setUp()
+        build_catalog(self.csv_path, self.catalog_path)
+        self.catalog = VehicleCatalog(self.catalog_path)
+
+    def tearDown(self):
+        self.catalog.close()
+        super().tearDown()
+
+    def test_manufacturers(self):
+        self.assertEqual(self.catalog.manufacturers(), ['טויוטה', "פיג'ו"])
+
+    def test_type_ahead_ignores_geresh_and_prefers_prefix(self):
+        self.assertEqual(self.catalog.manufacturers('פיגו'), ["פיג'ו"])
+        self.assertEqual(self.catalog.models('טויוטה', 'ר'), ['ראב 4', 'יאריס', 'קורולה'])
+        self.assertEqual(self.catalog.models('טויוטה', 'ק', limit=1), ['קורולה'])
+
+    def test_unknown_manufacturer_has_no_models(self):
+        self.assertEqual(self.catalog.models('לא קיים'), [])
+
+    def test_specs_for_year(self):
+        specs = self.catalog.specs('טויוטה', 'קורולה', '2019')
+        self.assertEqual(sorted(spec['engine_capacity'] for spec in specs), ['1600', '1800'])
+        self.assertEqual(self.catalog.specs('טויוטה', 'קורולה', 'שנה'), [])
+
+    def test_common_specs_leave_out_ambiguous_details(self):
+        self.assertEqual(
+            self.catalog.common_specs('טויוטה', 'קורולה', 2018),
+            {'vehicle_engine_type': 'בנזין', 'vehicle_engine_capacity': '1600',
+             'vehicle_engine_power': '132', 'vehicle_gearbox': 'אוטומטי'}
+        )
+        self.assertEqual(
+            self.catalog.common_specs('טויוטה', 'קורולה', 2019),
+            {'vehicle_gearbox': 'אוטומטי'}
+        )
+
+    def test_rows_without_year_match_every_year(self):
+        self.assertEqual(
+            self.catalog.common_specs('טויוטה', 'יאריס', '2011')['vehicle_engine_capacity'], '1300'
+        )
+
+    def test_catalog_is_opened_on_first_lookup(self):
+        self.assertIsNone(self.catalog._conn)
+        self.catalog.models('טויוטה')
+        self.assertIsNotNone(self.catalog._conn)
+
+
+class TestMissingCatalog(unittest.TestCase):
+    """Test the fallback when no catalog file has been built."""
+
+    def setUp(self):
+        self.catalog = VehicleCatalog(os.path.join(tempfile.gettempdir(), 'no_such_catalog.sqlite3'))
+
+    def test_manufacturers_fall_back_to_constants(self):
+        self.assertFalse(self.catalog.available)
+        self.assertEqual(self.catalog.manufacturers(), Constants.CAR_MANUFACTURERS)
+        self.assertEqual(self.catalog.manufacturers('טוי'), ['טויוטה'])
+
+    def test_no_models_or_specs(self):
+        self.assertEqual(self.catalog.models('טויוטה'), [])
+        self.assertEqual(self.catalog.common_specs('טויוטה', 'קורולה'), {})
+
+
+if __name__ == '__main__':
+    unittest.main()